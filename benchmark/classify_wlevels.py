@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken, end to end, by the database connection worker to
+classify the water level of the active monitoring stations of a Sardes Lite
+database in the percentile classes of their historical water levels, from
+10 years of hourly water levels per station.
+"""
+import os.path as osp
+import tempfile
+import uuid
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.api.timeseries import DataType
+from sardes.database.accessors import DatabaseAccessorSardesLite
+from sardes.database.database_manager import DatabaseConnectionWorker
+
+NWELLS = 100
+NYEARS = 10
+NREPEAT = 3
+
+
+def create_readings_data(nyears):
+    """Return hourly water levels spanning nyears years."""
+    data = pd.DataFrame({
+        'datetime': pd.date_range(
+            '2010-01-01', periods=nyears * 365 * 24, freq='H')})
+    data[DataType.WaterLevel] = np.random.rand(len(data)) + 5
+    return data
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tempdir:
+        dbaccessor = DatabaseAccessorSardesLite(
+            osp.join(tempdir, 'database.db'))
+        dbaccessor.init_database()
+        dbaccessor.connect()
+
+        obs_well_uuids = [uuid.uuid4() for i in range(NWELLS)]
+        dbaccessor.add(
+            'observation_wells_data',
+            values=[{'obs_well_id': '{:08d}'.format(i),
+                     'is_station_active': True} for i in range(NWELLS)],
+            indexes=obs_well_uuids)
+        dbaccessor.add(
+            'repere_data',
+            values=[{'sampling_feature_uuid': obs_well_uuid,
+                     'top_casing_alt': 100, 'casing_length': 1,
+                     'start_date': datetime(2000, 1, 1),
+                     'end_date': None, 'is_alt_geodesic': True}
+                    for obs_well_uuid in obs_well_uuids])
+        ts = perf_counter()
+        for obs_well_uuid in obs_well_uuids:
+            dbaccessor.add_timeseries_data(
+                create_readings_data(NYEARS), obs_well_uuid)
+        nrows = NWELLS * NYEARS * 365 * 24
+        print("Add {} readings: {:0.1f} s".format(
+            nrows, perf_counter() - ts))
+
+        worker = DatabaseConnectionWorker()
+        worker.db_accessor = dbaccessor
+        times = []
+        for i in range(NREPEAT):
+            worker.clear_cache()
+            ts = perf_counter()
+            classes = worker._classify_wlevels(2015, 7, 'min_max_median')[0]
+            times.append(perf_counter() - ts)
+        assert classes['percentile_class'].notnull().all()
+        assert (classes['nyear'] == NYEARS).all()
+        print("Classify the water levels of {} stations ({} readings): "
+              "{:0.2f} s".format(NWELLS, nrows, min(times)))
+
+        dbaccessor.close_connection()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to fetch the daily and monthly aggregates of 10 years
+of water levels acquired every 15 minutes from the table of the daily
+aggregates of a Sardes Lite database, compared with aggregating the
+readings themselves.
+"""
+import os
+import os.path as osp
+import tempfile
+import uuid
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.api.database_accessor import DatabaseAccessor
+from sardes.api.timeseries import DataType
+from sardes.database.accessors import DatabaseAccessorSardesLite
+
+NYEARS = 10
+NREPEAT = 3
+
+# An end date that does not fall on midnight, so that the aggregated
+# readings are computed from the readings themselves.
+END_NOT_MIDNIGHT = pd.Timestamp('2030-01-01 00:00:01')
+
+
+def best_time(func):
+    """Return the best time of NREPEAT calls of func and its result."""
+    times = []
+    for i in range(NREPEAT):
+        ts = perf_counter()
+        result = func()
+        times.append(perf_counter() - ts)
+    return min(times), result
+
+
+if __name__ == '__main__':
+    database = osp.join(tempfile.mkdtemp(), 'daily_aggregates.db')
+    dbaccessor = DatabaseAccessorSardesLite(database)
+    dbaccessor.init_database()
+    dbaccessor.connect()
+
+    sampling_feature_uuid = uuid.uuid4()
+    readings = pd.DataFrame({'datetime': pd.date_range(
+        '{}-01-01'.format(2020 - NYEARS), '2019-12-31 23:45', freq='15min')})
+    readings[DataType.WaterLevel] = np.random.rand(len(readings))
+    ts = perf_counter()
+    dbaccessor.add_timeseries_data(readings, sampling_feature_uuid, None)
+    print("Add {} readings: {:0.1f} s".format(
+        len(readings), perf_counter() - ts))
+
+    t1, expected = best_time(
+        lambda: DatabaseAccessor._get_daily_timeseries_aggregates(
+            dbaccessor, sampling_feature_uuid, DataType.WaterLevel))
+    t2, aggregates = best_time(
+        lambda: dbaccessor.get_daily_timeseries_aggregates(
+            sampling_feature_uuid, DataType.WaterLevel))
+    pd.testing.assert_frame_equal(aggregates, expected)
+    print("Daily aggregates from {} readings: {:0.0f} ms".format(
+        len(readings), t1 * 1000))
+    print("Daily aggregates from {} daily rows: {:0.0f} ms ({:0.0f}x)".format(
+        len(aggregates), t2 * 1000, t1 / t2))
+
+    t1, expected = best_time(
+        lambda: dbaccessor.get_timeseries_for_obs_well(
+            sampling_feature_uuid, DataType.WaterLevel,
+            end=END_NOT_MIDNIGHT, freq='M', agg='mean'))
+    t2, monthly = best_time(
+        lambda: dbaccessor.get_timeseries_for_obs_well(
+            sampling_feature_uuid, DataType.WaterLevel,
+            freq='M', agg='mean'))
+    assert np.allclose(monthly[DataType.WaterLevel].values.astype(float),
+                       expected[DataType.WaterLevel].values.astype(float))
+    print("Monthly means from readings: {:0.0f} ms".format(t1 * 1000))
+    print("Monthly means from daily rows: {:0.0f} ms ({:0.0f}x)".format(
+        t2 * 1000, t1 / t2))
+
+    dbaccessor.close_connection()
+    os.remove(database)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to format for publication 20 years of readings
+acquired every 15 minutes by two level loggers, compared with the former
+implementation based on pandas daily resampling.
+"""
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.api.timeseries import DataType
+from sardes.utils.data_operations import format_reading_data
+
+NYEARS = 20
+NREPEAT = 5
+
+
+def create_readings_data(nyears, seed=0):
+    """
+    Return nyears years of readings acquired every 15 minutes, split in
+    observations of one year done alternately with two level loggers
+    installed at different depths.
+    """
+    random = np.random.RandomState(seed)
+    datetimes = pd.date_range(
+        '{}-01-01'.format(2020 - nyears), '2019-12-31 23:45', freq='15min')
+    data = pd.DataFrame({
+        'datetime': datetimes,
+        'sonde_id': np.where(datetimes.year % 2, 'sonde_1', 'sonde_2'),
+        DataType.WaterLevel: 5 + random.rand(len(datetimes)),
+        DataType.WaterTemp: 8 + random.rand(len(datetimes)),
+        'install_depth': np.where(datetimes.year % 2, 10.0, 12.5),
+        'obs_id': datetimes.year - 2000 + 1})
+    # Add a few gaps and missing values in the readings.
+    data = data[random.rand(len(data)) > 0.001].reset_index(drop=True)
+    data.loc[random.rand(len(data)) < 0.01, DataType.WaterTemp] = np.nan
+    return data
+
+
+def format_reading_data_with_resample(data, repere_data):
+    """
+    Format readings data for publication with pandas daily resampling.
+
+    This is the former implementation of 'format_reading_data'.
+    """
+    if data.empty:
+        return data
+
+    if not repere_data.empty:
+        for i in range(len(repere_data)):
+            repere_iloc = repere_data.iloc[i]
+            reference_altitude = repere_iloc['top_casing_alt']
+            start_date = repere_iloc['start_date']
+            end_date = repere_iloc['end_date']
+            if pd.isnull(end_date):
+                indexes = data.index[data['datetime'] >= start_date]
+            else:
+                indexes = data.index[
+                    (data['datetime'] >= start_date) &
+                    (data['datetime'] < end_date)]
+            data.loc[indexes, DataType.WaterLevel] = (
+                reference_altitude - data.loc[indexes, DataType.WaterLevel])
+
+    data = (
+        data
+        .dropna(subset=[DataType.WaterLevel])
+        .groupby('obs_id').resample('D', on='datetime').first()
+        .dropna(subset=[DataType.WaterLevel])
+        .droplevel(0, axis=0).drop('datetime', axis=1)
+        .reset_index(drop=False)
+        .sort_values(by=['datetime', 'install_depth'],
+                     ascending=[True, True])
+        .drop_duplicates(subset='datetime', keep='first')
+        .reset_index(drop=True)
+        )
+    return data
+
+
+if __name__ == '__main__':
+    data = create_readings_data(NYEARS)
+    repere_data = pd.DataFrame(
+        [[105, 1, True, datetime(2000, 1, 1), datetime(2010, 6, 1)],
+         [104.5, 0.5, True, datetime(2010, 6, 1), None]],
+        columns=['top_casing_alt', 'casing_length', 'is_alt_geodesic',
+                 'start_date', 'end_date'])
+    print("Readings: {} rows".format(len(data)))
+
+    elapsed = {}
+    for label, func in [
+            ('Daily resampling', format_reading_data_with_resample),
+            ('Vectorized', format_reading_data)]:
+        times = []
+        for i in range(NREPEAT):
+            data_copy = data.copy()
+            ts = perf_counter()
+            formatted_data = func(data_copy, repere_data)
+            times.append(perf_counter() - ts)
+        elapsed[label] = min(times)
+        print("{}: {:0.1f} ms ({} daily values)".format(
+            label, elapsed[label] * 1000, len(formatted_data)))
+    print("Speed-up: {:0.1f}x".format(
+        elapsed['Daily resampling'] / elapsed['Vectorized']))
+
+    assert format_reading_data(data.copy(), repere_data).equals(
+        format_reading_data_with_resample(data.copy(), repere_data))
+
+    # The observation IDs returned by the database accessors have the
+    # nullable integer dtype, which must be kept.
+    data['obs_id'] = data['obs_id'].astype('Int64')
+    assert format_reading_data(data.copy(), repere_data).equals(
+        format_reading_data_with_resample(data.copy(), repere_data))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to compute the monthly percentiles of the
+statistical hydrographs for every pooling method, one pooling method at a
+time and all at once, and when they are retrieved from the cache while
+stepping through the years of a time series.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.tools.hydrostats import (
+    POOLS, compute_monthly_percentiles, compute_monthly_percentiles_for_pools,
+    get_monthly_percentiles)
+
+Q = [100, 90, 75, 50, 25, 10, 0]
+NYEARS = 50
+
+
+def create_wlevels(freq, nyears, seed=0):
+    """Return a water level time series spanning nyears years."""
+    random = np.random.RandomState(seed)
+    index = pd.date_range(
+        '{}-01-01'.format(2020 - nyears), '2019-12-31 23:59', freq=freq)
+    return pd.DataFrame(
+        {'wlevel': 100 + random.rand(len(index))}, index=index)
+
+
+if __name__ == '__main__':
+    for freq in ('D', 'H'):
+        wlevels = create_wlevels(freq, NYEARS)
+        print("{} readings ({}):".format(len(wlevels), freq))
+
+        ts = perf_counter()
+        for pool in POOLS:
+            compute_monthly_percentiles(wlevels, Q, pool)
+        print("  One pool at a time: {:0.1f} ms".format(
+            (perf_counter() - ts) * 1000))
+
+        ts = perf_counter()
+        compute_monthly_percentiles_for_pools(wlevels, Q)
+        print("  All pools at once: {:0.1f} ms".format(
+            (perf_counter() - ts) * 1000))
+
+        # Step through the years as when using the navigation buttons
+        # of the statistical hydrograph tool.
+        get_monthly_percentiles(wlevels, Q, 'min_max_median')
+        ts = perf_counter()
+        for year in range(NYEARS):
+            get_monthly_percentiles(wlevels, Q, 'min_max_median')
+        print("  Cached, per year: {:0.2f} ms".format(
+            (perf_counter() - ts) * 1000 / NYEARS))
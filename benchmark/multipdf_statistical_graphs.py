@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to create the multipage pdf file of the statistical
+hydrographs of a monitoring station with 50 years of daily readings, when
+the pages are rendered one after the other in the current process and when
+they are rendered by chunks in a pool of processes.
+"""
+import os.path as osp
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.tools.hydrostats import (
+    MULTIPDF_PROCESSES_COUNT, PERCENTILES_Q, SatisticalHydrographWorker,
+    compute_monthly_percentiles_for_pools, render_statistical_hydrographs)
+
+NYEARS = 50
+FIGSIZE = (8, 6)
+DPI = 100
+
+
+def create_wlevels(nyears, seed=0):
+    """Return daily water levels spanning nyears years."""
+    random = np.random.RandomState(seed)
+    index = pd.date_range(
+        '{}-01-01'.format(2020 - nyears), '2019-12-31', freq='D')
+    return pd.DataFrame(
+        {'wlevel': 100 + np.sin(np.arange(len(index)) / 365 * 2 * np.pi) +
+         random.rand(len(index)) * 0.1},
+        index=index)
+
+
+if __name__ == '__main__':
+    wlevels = create_wlevels(NYEARS)
+    with tempfile.TemporaryDirectory() as tempdir:
+        ts = perf_counter()
+        render_statistical_hydrographs(
+            osp.join(tempdir, 'sequential.pdf'), wlevels,
+            np.unique(wlevels.index.year).tolist(), 'min_max_median',
+            compute_monthly_percentiles_for_pools(wlevels, PERCENTILES_Q),
+            FIGSIZE, DPI)
+        print("Sequential, one process: {:0.1f} sec".format(
+            perf_counter() - ts))
+
+        worker = SatisticalHydrographWorker()
+        ts = perf_counter()
+        worker._save_multipdf_statistical_graphs(
+            osp.join(tempdir, 'parallel.pdf'), wlevels, 'min_max_median',
+            FIGSIZE, DPI)
+        print("Process pool ({} processes): {:0.1f} sec".format(
+            MULTIPDF_PROCESSES_COUNT, perf_counter() - ts))
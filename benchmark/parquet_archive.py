@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time and peak memory taken to export a Sardes Lite database to
+a columnar archive of Parquet files and to rebuild a database from it.
+
+The time taken to rebuild the database with the accessor API, one
+observation at a time, is given for comparison.
+"""
+import os.path as osp
+import tempfile
+import tracemalloc
+import uuid
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.api.timeseries import DataType
+from sardes.database.accessors import DatabaseAccessorSardesLite
+
+NWELLS = 20
+NYEARS = 10
+
+
+def create_readings_data(nyears):
+    """Return hourly readings data spanning nyears years."""
+    data = pd.DataFrame({
+        'datetime': pd.date_range(
+            '2000-01-01', periods=nyears * 365 * 24, freq='H')})
+    data[DataType.WaterLevel] = np.random.rand(len(data)) + 100
+    data[DataType.WaterTemp] = np.random.rand(len(data)) + 5
+    return data
+
+
+def measure(func, *args, **kwargs):
+    """
+    Execute func with the specified arguments and return the time taken in
+    seconds and the peak of memory allocated in MB.
+    """
+    tracemalloc.start()
+    ts = perf_counter()
+    func(*args, **kwargs)
+    elapsed = perf_counter() - ts
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def rebuild_with_accessor_api(dbaccessor, dbaccessor2, obs_well_uuids):
+    """
+    Copy the readings of the given wells from dbaccessor to dbaccessor2
+    one observation at a time.
+    """
+    for obs_well_uuid in obs_well_uuids:
+        readings = dbaccessor.get_timeseries_for_obs_well(obs_well_uuid)
+        for obs_id, obs_readings in readings.groupby('obs_id'):
+            dbaccessor2.add_timeseries_data(obs_readings, obs_well_uuid)
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tempdir:
+        dbaccessor = DatabaseAccessorSardesLite(
+            osp.join(tempdir, 'database.db'))
+        dbaccessor.init_database()
+        dbaccessor.connect()
+        obs_well_uuids = [uuid.uuid4() for i in range(NWELLS)]
+        for obs_well_uuid in obs_well_uuids:
+            dbaccessor.add_timeseries_data(
+                create_readings_data(NYEARS), obs_well_uuid)
+        nrows = NWELLS * NYEARS * 365 * 24 * 2
+
+        dirname = osp.join(tempdir, 'archive')
+        elapsed, peak = measure(dbaccessor.export_parquet_archive, dirname)
+        print("Export ({} readings): {:0.1f} sec, peak memory {:0.1f} MB"
+              .format(nrows, elapsed, peak))
+
+        dbaccessor2 = DatabaseAccessorSardesLite(
+            osp.join(tempdir, 'database_from_archive.db'))
+        elapsed, peak = measure(dbaccessor2.import_parquet_archive, dirname)
+        print("Import ({} readings): {:0.1f} sec, peak memory {:0.1f} MB"
+              .format(nrows, elapsed, peak))
+
+        dbaccessor3 = DatabaseAccessorSardesLite(
+            osp.join(tempdir, 'database_from_api.db'))
+        dbaccessor3.init_database()
+        dbaccessor3.connect()
+        elapsed, peak = measure(
+            rebuild_with_accessor_api, dbaccessor, dbaccessor3,
+            obs_well_uuids)
+        print("Accessor API ({} readings): {:0.1f} sec, "
+              "peak memory {:0.1f} MB".format(nrows, elapsed, peak))
+
+        for accessor in (dbaccessor, dbaccessor2, dbaccessor3):
+            accessor.close_connection()
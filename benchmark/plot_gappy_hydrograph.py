@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to plot and save to PDF the hydrograph of a
+monitoring station with 50 years of daily readings and frequent gaps.
+
+The manual readings acquired before 2000 are weekly and the daily
+readings acquired after 2000 are missing about one day out of seven.
+"""
+import os.path as osp
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from matplotlib.lines import Line2D
+
+from sardes.api.timeseries import DataType
+from sardes.tools.hydrographs import HydrographCanvas
+
+OBS_WELL_DATA = {
+    'municipality': 'municipality_test',
+    'obs_well_id': '0123456'}
+
+
+def create_gappy_readings_data(seed=0):
+    """
+    Return 50 years of formatted readings data with frequent gaps.
+    """
+    random = np.random.RandomState(seed)
+
+    # Weekly manual readings before 2000, with a few gaps of more
+    # than a year.
+    dates_av_2000 = pd.date_range('1970-01-01', '1999-12-31', freq='7D')
+    dates_av_2000 = dates_av_2000[
+        ~((dates_av_2000.year % 7 == 0) & (dates_av_2000.month < 12))]
+
+    # Daily readings after 2000, with about 15% of missing days.
+    dates_af_2000 = pd.date_range('2000-01-01', '2019-12-31', freq='D')
+    dates_af_2000 = dates_af_2000[random.rand(len(dates_af_2000)) > 0.15]
+
+    data = pd.DataFrame({
+        'datetime': dates_av_2000.append(dates_af_2000),
+        'sonde_id': None})
+    data[DataType.WaterLevel] = (
+        100 + np.sin(np.arange(len(data)) / 365 * 2 * np.pi) +
+        random.rand(len(data)) * 0.1)
+
+    # Readings acquired with a sonde are interleaved with readings with
+    # no sonde id every few months after 2005.
+    is_sonde = (data['datetime'].dt.year >= 2005) & (
+        data['datetime'].dt.month % 3 != 0)
+    data.loc[is_sonde, 'sonde_id'] = 'sonde_test'
+    return data
+
+
+if __name__ == '__main__':
+    data = create_gappy_readings_data()
+    print("Readings: {} rows".format(len(data)))
+    with tempfile.TemporaryDirectory() as tempdir:
+        ts = perf_counter()
+        hydrograph = HydrographCanvas(
+            data, OBS_WELL_DATA, ground_altitude=100, is_alt_geodesic=True)
+        elapsed_plot = perf_counter() - ts
+
+        ts = perf_counter()
+        hydrograph.figure.savefig(
+            osp.join(tempdir, 'hydrograph.pdf'), dpi=300)
+        elapsed_save = perf_counter() - ts
+
+    nlines = len([artist for artist in hydrograph.figure.axes[0].lines if
+                  isinstance(artist, Line2D)])
+    print("Line2D artists: {}".format(nlines))
+    print("Plot: {:0.2f} sec, save to pdf: {:0.2f} sec".format(
+        elapsed_plot, elapsed_save))
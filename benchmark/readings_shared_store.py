@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the peak and retained memory used to show the readings of a well
+with 2 million readings in a readings table, to plot them and to format
+them for the statistical hydrograph, the hydrograph and the excel tools.
+
+Run this script against the tree before and after the readings were
+shared between the table, the plot viewer and the tools to compare the
+memory footprint of both implementations.
+"""
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from qtpy.QtWidgets import QApplication
+
+from sardes.api.timeseries import DataType
+from sardes.plugins.readings.plugin import (
+    ReadingsTableModel, ReadingsTableWidget)
+
+NPOINTS = 2 * 10**6
+NTOOLS = 3
+
+
+def create_readings_data(npoints, seed=0):
+    """
+    Return npoints readings acquired every 5 minutes by two sondes and
+    fetched by chunks from the most recent to the oldest.
+    """
+    random = np.random.RandomState(seed)
+    data = pd.DataFrame({
+        'datetime': pd.date_range('1980-01-01', periods=npoints, freq='5min'),
+        DataType.WaterLevel: random.rand(npoints),
+        DataType.WaterTemp: random.rand(npoints),
+        'install_depth': 10.0,
+        'obs_id': np.where(np.arange(npoints) < npoints // 2, 1, 2),
+        'sonde_id': np.where(
+            np.arange(npoints) < npoints // 2, '1234567', '7654321')})
+    return data.iloc[::-1].reset_index(drop=True)
+
+
+def measure(label, func):
+    """
+    Print the memory retained and the peak memory used by func and
+    return its result.
+    """
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = func()
+    after, peak = tracemalloc.get_traced_memory()
+    print("{}: {:0.0f} MB retained, {:0.0f} MB peak".format(
+        label, (after - current) / 1024**2, (peak - current) / 1024**2))
+    return result
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    obs_well_data = pd.Series(
+        {'obs_well_id': '03037041', 'common_name': 'well',
+         'municipality': 'city'}, name='obs_well_uuid')
+    data = create_readings_data(NPOINTS)
+    print("Readings: {:0.0f} MB".format(
+        data.memory_usage(deep=False).sum() / 1024**2))
+
+    model = ReadingsTableModel(obs_well_data, '03037041', 'obs_well_uuid')
+    table = ReadingsTableWidget(model, parent=None)
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    measure("Set table data", lambda: model.set_model_data(data.copy()))
+    measure("Plot readings", table.plot_readings)
+    measure("Format readings for {} tools".format(NTOOLS), lambda: [
+        table.get_formatted_data() for i in range(NTOOLS)])
+    current, _ = tracemalloc.get_traced_memory()
+    print("Total retained: {:0.0f} MB".format((current - start) / 1024**2))
+    tracemalloc.stop()
+
+    table.plot_viewer.close()
+    table.close()
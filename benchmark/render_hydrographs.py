@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken per page to render the hydrographs of many
+stations in a multipage PDF file, when creating a new hydrograph figure
+for each station and when reusing the same figure for every station.
+"""
+import os.path as osp
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+
+from sardes.api.timeseries import DataType
+from sardes.tools.hydrographs import HydrographCanvas, save_hydrographs_to_pdf
+
+NSTATIONS = 20
+
+
+def iter_hydrographs_data(nstations, seed=0):
+    """
+    Yield the data needed to plot the hydrographs of nstations stations
+    with 5 to 40 years of daily readings.
+    """
+    random = np.random.RandomState(seed)
+    for i in range(nstations):
+        nyears = random.randint(5, 40)
+        dates = pd.date_range(
+            '{}-01-01'.format(2020 - nyears), '2019-12-31', freq='D')
+        data = pd.DataFrame({'datetime': dates, 'sonde_id': 'sonde_test'})
+        data[DataType.WaterLevel] = (
+            random.rand() * 100 +
+            np.sin(np.arange(len(data)) / 365 * 2 * np.pi) +
+            random.rand(len(data)) * 0.1)
+        obs_well_data = {'municipality': 'municipality_{}'.format(i),
+                         'obs_well_id': '{:07d}'.format(i)}
+        yield data, obs_well_data, random.rand() * 100, bool(i % 2)
+
+
+def save_hydrographs_to_pdf_with_new_figures(filename, hydrographs_data):
+    """
+    Save the hydrographs to a multipage PDF file, creating a new
+    figure for each page.
+    """
+    render_times = []
+    with PdfPages(filename) as pdf:
+        for data, obs_well_data, ground_altitude, is_alt_geodesic in (
+                hydrographs_data):
+            ts = perf_counter()
+            hydrograph = HydrographCanvas(
+                data, obs_well_data, ground_altitude, is_alt_geodesic)
+            pdf.savefig(hydrograph.figure)
+            render_times.append(perf_counter() - ts)
+    return render_times
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tempdir:
+        for label, func in [('New figure per page',
+                             save_hydrographs_to_pdf_with_new_figures),
+                            ('Reused figure', save_hydrographs_to_pdf)]:
+            render_times = func(
+                osp.join(tempdir, 'hydrographs.pdf'),
+                iter_hydrographs_data(NSTATIONS))
+            print("{}: {:0.3f} sec per page (first page {:0.3f} sec)".format(
+                label, np.mean(render_times[1:]), render_times[0]))
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time and peak memory taken to export readings data and
+hydrogeochemical data to Excel workbooks.
+
+The readings exported in this benchmark correspond to about 28 years of raw
+readings acquired every 15 minutes.
+"""
+import os.path as osp
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.api.timeseries import DataType
+from sardes.tools.save2excel import _save_reading_data_to_xlsx
+from sardes.tools.waterquality import _save_hg_data_to_xlsx
+
+NROWS = 1000000
+NPARAMS = 200
+NSAMPLES = 250
+
+OBS_WELL_DATA = {
+    'municipality': 'municipality_test',
+    'obs_well_id': '0123456',
+    'latitude': 45.3456,
+    'longitude': -73.3467}
+
+
+def create_readings_data(nrows):
+    """Return formatted readings data with nrows rows."""
+    data = pd.DataFrame({
+        'datetime': pd.date_range(
+            '1995-01-01', periods=nrows, freq='15min'),
+        DataType.WaterLevel: np.random.rand(nrows) + 100,
+        DataType.WaterTemp: np.random.rand(nrows) + 5,
+        DataType.WaterEC: np.random.rand(nrows) + 150})
+    data.loc[::1000, DataType.WaterEC] = np.nan
+    return data
+
+
+def create_water_quality_data(nparams, nsamples):
+    """
+    Return formatted water quality data for nparams parameters and
+    nsamples sampling dates.
+    """
+    dates = pd.date_range('1995-01-01', periods=nsamples, freq='M')
+    columns = pd.MultiIndex.from_product([dates, ['value', 'units']])
+    values = np.empty((nparams, 2 * nsamples), dtype=object)
+    values[:, ::2] = np.round(np.random.rand(nparams, nsamples), 3)
+    values[:, 1::2] = 'mg/L'
+    return pd.DataFrame(
+        values, columns=columns,
+        index=pd.Index(['param{}'.format(i) for i in range(nparams)],
+                       name='parameter'))
+
+
+def measure(func, *args, **kwargs):
+    """
+    Execute func with the specified arguments and return the time taken in
+    seconds and the peak of memory allocated in MB.
+    """
+    tracemalloc.start()
+    ts = perf_counter()
+    func(*args, **kwargs)
+    elapsed = perf_counter() - ts
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tempdir:
+        readings_data = create_readings_data(NROWS)
+        elapsed, peak = measure(
+            _save_reading_data_to_xlsx,
+            osp.join(tempdir, 'readings.xlsx'), 'readings', readings_data,
+            OBS_WELL_DATA, ground_altitude=100, is_alt_geodesic=True)
+        print("Readings ({} rows): {:0.1f} sec, peak memory {:0.1f} MB"
+              .format(NROWS, elapsed, peak))
+
+        water_quality_data = create_water_quality_data(NPARAMS, NSAMPLES)
+        elapsed, peak = measure(
+            _save_hg_data_to_xlsx,
+            osp.join(tempdir, 'water_quality.xlsx'), 'water_quality',
+            water_quality_data, OBS_WELL_DATA, ground_altitude=100,
+            is_alt_geodesic=True)
+        print("Water quality ({} x {} cells): {:0.1f} sec, "
+              "peak memory {:0.1f} MB".format(
+                  NPARAMS, 2 * NSAMPLES, elapsed, peak))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the overhead of the TaskManagerBase for executing a task in a worker
+thread and calling its callback back in the GUI thread.
+
+The tasks executed in this benchmark do nothing, so that the measured times
+correspond to the overhead of the manager only.
+"""
+import sys
+from time import perf_counter
+
+from qtpy.QtCore import QEventLoop
+from qtpy.QtWidgets import QApplication
+
+from sardes.api.taskmanagers import WorkerBase, TaskManagerBase
+
+NTASKS = 200
+
+
+class NoopWorker(WorkerBase):
+    READ_TASKS = ('noop', )
+
+    def create_read_worker(self):
+        return NoopWorker()
+
+    def _noop(self, *args):
+        return None,
+
+
+def measure_round_trips(task_manager, task):
+    """
+    Execute NTASKS tasks one after the other, waiting for the callback of
+    each task to be called before adding the next one, and return the mean
+    round-trip time in ms.
+    """
+    loop = QEventLoop()
+    ts = perf_counter()
+    for i in range(NTASKS):
+        task_manager.add_task(task, lambda *args: loop.quit(), i)
+        task_manager.run_tasks()
+        loop.exec_()
+    return (perf_counter() - ts) / NTASKS * 1000
+
+
+def measure_batch(task_manager, task):
+    """
+    Execute NTASKS tasks in a single run and return the mean time per
+    task in ms.
+    """
+    loop = QEventLoop()
+    task_manager.sig_run_tasks_finished.connect(loop.quit)
+    ts = perf_counter()
+    for i in range(NTASKS):
+        task_manager.add_task(task, None, i)
+    task_manager.run_tasks()
+    loop.exec_()
+    task_manager.sig_run_tasks_finished.disconnect(loop.quit)
+    return (perf_counter() - ts) / NTASKS * 1000
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+
+    for nbr_read_workers in (0, 3):
+        task_manager = TaskManagerBase(nbr_read_workers=nbr_read_workers)
+        task_manager.set_worker(NoopWorker())
+        print("Read workers: {}".format(nbr_read_workers))
+        print("  Round trip per task: {:0.3f} ms".format(
+            measure_round_trips(task_manager, 'noop')))
+        print("  Batched time per task: {:0.3f} ms".format(
+            measure_batch(task_manager, 'noop')))
+        task_manager.stop()
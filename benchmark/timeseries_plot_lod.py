@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to draw and zoom in the timeseries plot viewer
+5 million water levels acquired every 5 minutes, with the data decimated
+with their min/max pyramid compared with the data drawn at full resolution.
+"""
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from qtpy.QtWidgets import QApplication
+
+from sardes.api.timeseries import DataType
+import sardes.widgets.timeseries as timeseries
+
+NPOINTS = 5 * 10**6
+NZOOM = 8
+
+
+def create_readings_data(npoints, seed=0):
+    """
+    Return npoints water levels acquired every 5 minutes with a gap.
+    """
+    random = np.random.RandomState(seed)
+    data = pd.DataFrame({
+        'datetime': pd.date_range('1980-01-01', periods=npoints, freq='5min'),
+        DataType.WaterLevel: (np.sin(np.arange(npoints) / 10**4) +
+                              random.rand(npoints) / 10),
+        'obs_id': 1,
+        'sonde_id': '1234567',
+        'install_depth': 10.0})
+    data.loc[npoints // 5:npoints // 4, DataType.WaterLevel] = np.nan
+    return data
+
+
+def measure_viewer(data):
+    """
+    Return the time taken to set the data of a new plot viewer, to draw it
+    and to zoom it in NZOOM times.
+    """
+    viewer = timeseries.TimeSeriesPlotViewer()
+    viewer.show()
+
+    ts = perf_counter()
+    viewer.set_data(data)
+    viewer.canvas.draw()
+    t_draw = perf_counter() - ts
+
+    ts = perf_counter()
+    for i in range(NZOOM):
+        # Zooming only schedules a draw of the canvas, so we draw the
+        # canvas explicitly to measure the time taken to show the zoom.
+        viewer.canvas.zoom_in()
+        viewer.canvas.draw()
+    t_zoom = (perf_counter() - ts) / NZOOM
+
+    viewer.close()
+    return t_draw, t_zoom
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    data = create_readings_data(NPOINTS)
+    print("Readings: {} rows".format(len(data)))
+
+    t_draw, t_zoom = measure_viewer(data)
+
+    # Draw the data at full resolution by setting the number of points
+    # drawn at full resolution to the number of readings.
+    timeseries.LOD_MIN_SIZE = NPOINTS
+    t_draw_full, t_zoom_full = measure_viewer(data)
+
+    print("Set data and draw: {:0.0f} ms (full resolution: {:0.0f} ms)"
+          .format(t_draw * 1000, t_draw_full * 1000))
+    print("Zoom: {:0.0f} ms (full resolution: {:0.0f} ms, {:0.1f}x)".format(
+        t_zoom * 1000, t_zoom_full * 1000, t_zoom_full / t_zoom))
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken and the memory used to select, delete and restore
+the data of a timeseries of 5 million water levels and to merge the
+timeseries of a group, compared with the previous implementation, which
+appended the selected datetimes to a DatetimeIndex, stored a copy of the
+changed data in the undo stack and merged the timeseries with
+DataFrame.append.
+"""
+import datetime
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sardes.api.timeseries import DataType
+from sardes.widgets.timeseries import TimeSeries, TimeSeriesGroup
+
+NPOINTS = 5 * 10**6
+NSELECT = 20
+NSERIES = 5
+
+
+def select_data_reference(data, selected_indexes, xrange, yrange):
+    """
+    Select data with the previous implementation and return the
+    DatetimeIndex of the selected data.
+    """
+    indexes = data[(data.index >= xrange[0]) &
+                   (data.index <= xrange[1]) &
+                   (data >= yrange[0]) &
+                   (data <= yrange[1])].index
+    return selected_indexes.append(indexes)
+
+
+def merge_reference(tseries_group):
+    """Merge the timeseries of a group with the previous implementation."""
+    merged_tseries = None
+    for tseries in tseries_group:
+        tseries_to_append = tseries._data.to_frame()
+        tseries_to_append.columns = [tseries_group.data_type]
+        tseries_to_append['obs_id'] = tseries.id
+        tseries_to_append['sonde_id'] = tseries.sonde_id
+        tseries_to_append['datetime'] = tseries_to_append.index
+        tseries_to_append.reset_index(drop=True, inplace=True)
+        if merged_tseries is None:
+            merged_tseries = tseries_to_append
+        else:
+            merged_tseries = merged_tseries.append(
+                tseries_to_append, ignore_index=True,
+                verify_integrity=True, sort=True)
+    return merged_tseries
+
+
+def create_tseries(npoints, tseries_id=1, seed=0):
+    """Return a timeseries of npoints water levels acquired every minute."""
+    random = np.random.RandomState(seed)
+    return TimeSeries(
+        pd.Series(random.rand(npoints), index=pd.date_range(
+            '1990-01-01', periods=npoints, freq='min').values),
+        tseries_id=tseries_id, sonde_id=str(tseries_id))
+
+
+if __name__ == '__main__':
+    tseries = create_tseries(NPOINTS)
+    data = tseries.data
+
+    # Select NSELECT periods of 10 days of values below 0.5.
+    starts = data.index[::NPOINTS // NSELECT].to_pydatetime()
+    xranges = [(start, start + datetime.timedelta(days=10))
+               for start in starts]
+    yrange = (0, 0.5)
+
+    ts = perf_counter()
+    selected_indexes = pd.DatetimeIndex([])
+    for xrange in xranges:
+        selected_indexes = select_data_reference(
+            data, selected_indexes, xrange, yrange)
+    selected_ref = data.loc[selected_indexes]
+    t1 = (perf_counter() - ts) / NSELECT
+
+    ts = perf_counter()
+    for xrange in xranges:
+        tseries.select_data(xrange, yrange)
+    selected = tseries.get_selected_data()
+    t2 = (perf_counter() - ts) / NSELECT
+    pd.testing.assert_series_equal(selected, selected_ref)
+
+    print("Select data: {:0.1f} ms (previously {:0.1f} ms, {:0.0f}x)".format(
+        t2 * 1000, t1 * 1000, t1 / t2))
+    print("Selection: {:0.1f} MB (previously {:0.1f} MB)".format(
+        tseries._selected_data_mask.nbytes / 1024**2,
+        selected_indexes.nbytes / 1024**2))
+
+    # The previous selection grew with each selection, even when the
+    # same data were selected again.
+    for i in range(2):
+        selected_indexes = select_data_reference(
+            data, selected_indexes, (starts[0], starts[-1]), yrange)
+    print("Selection after selecting all the data twice: {:0.1f} MB "
+          "(previously {:0.1f} MB)".format(
+              tseries._selected_data_mask.nbytes / 1024**2,
+              selected_indexes.nbytes / 1024**2))
+
+    # Delete the selected data and undo the changes.
+    positions = np.flatnonzero(tseries._selected_data_mask)
+    undo_ref = data.iloc[positions].copy()
+    ts = perf_counter()
+    tseries.delete_waterlevels_at(positions)
+    t_delete = perf_counter() - ts
+    undo_positions, undo_values = tseries._undo_stack[-1]
+    ts = perf_counter()
+    tseries.undo()
+    t_undo = perf_counter() - ts
+    print("Delete {} readings: {:0.1f} ms, undo: {:0.1f} ms".format(
+        len(positions), t_delete * 1000, t_undo * 1000))
+    print("Undo record: {:0.1f} MB (previously {:0.1f} MB)".format(
+        (undo_positions.nbytes + undo_values.nbytes) / 1024**2,
+        undo_ref.memory_usage(index=True) / 1024**2))
+
+    # Merge NSERIES timeseries of 1 million readings.
+    tseries_group = TimeSeriesGroup(DataType.WaterLevel)
+    for i in range(NSERIES):
+        tseries_group.add_timeseries(create_tseries(10**6, i + 1, seed=i))
+
+    ts = perf_counter()
+    merged_ref = merge_reference(tseries_group)
+    t1 = perf_counter() - ts
+
+    ts = perf_counter()
+    merged = tseries_group.get_merged_timeseries()
+    t2 = perf_counter() - ts
+    pd.testing.assert_frame_equal(merged, merged_ref)
+    print("Merge {} timeseries: {:0.0f} ms (previously {:0.0f} ms, "
+          "{:0.1f}x)".format(NSERIES, t2 * 1000, t1 * 1000, t1 / t2))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Measure the time taken to show the data selected in the timeseries plot
+viewer when the selected data are blitted over the last full draw of the
+canvas, compared with drawing the canvas fully, and the number of full
+draws done for a burst of zoom events.
+"""
+import sys
+from time import perf_counter
+
+from qtpy.QtWidgets import QApplication
+
+from sardes.widgets.timeseries import TimeSeriesPlotViewer
+from timeseries_plot_lod import create_readings_data
+
+NPOINTS = 5 * 10**6
+NSELECT = 20
+NZOOM = 20
+
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    viewer = TimeSeriesPlotViewer()
+    viewer.show()
+    viewer.set_data(create_readings_data(NPOINTS))
+    canvas = viewer.canvas
+    canvas.draw()
+
+    axe = viewer.current_axe()
+    tseries = list(axe.tseries_group)[0]
+    # Select NSELECT periods of 1000 readings in a row.
+    starts = tseries.data.index[::NPOINTS // NSELECT].to_pydatetime()
+    ends = tseries.data.index[999::NPOINTS // NSELECT].to_pydatetime()
+
+    t_draw = 0
+    t_blit = 0
+    for xmin, xmax in zip(starts, ends):
+        axe.tseries_group.clear_selected_data()
+        axe.tseries_group.select_data(xrange=(xmin, xmax))
+        axe._draw_selected_data(draw=False)
+
+        ts = perf_counter()
+        canvas.draw()
+        t_draw += (perf_counter() - ts) / NSELECT
+
+        ts = perf_counter()
+        canvas._blit_selected_data()
+        t_blit += (perf_counter() - ts) / NSELECT
+
+    print("Show selected data: {:0.1f} ms (full draw: {:0.1f} ms, {:0.0f}x)"
+          .format(t_blit * 1000, t_draw * 1000, t_draw / t_blit))
+
+    draw_events = []
+    canvas.mpl_connect('draw_event', draw_events.append)
+    ts = perf_counter()
+    for i in range(NZOOM):
+        canvas.zoom_in()
+        app.processEvents()
+    while canvas._draw_timer.isActive():
+        app.processEvents()
+    print("{} zoom events: {} full draws in {:0.0f} ms".format(
+        NZOOM, len(draw_events), (perf_counter() - ts) * 1000))
+    viewer.close()
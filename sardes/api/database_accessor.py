@@ -9,7 +9,7 @@
 
 from __future__ import annotations
 import functools
-from time import sleep
+import threading
 
 # ---- Standard imports
 from typing import Any
@@ -37,15 +37,14 @@ def writemethod(func):
 
 
 def _transaction_wrapper(self, func, mode, *args, **kwargs):
-    while self._is_busy:
+    if not self._lock.acquire(blocking=False):
         # This can happend when the database accessor is
         # used in multiple threads.
         print('Waiting for database accessor because it is busy...')
-        sleep(1)
+        self._lock.acquire()
 
-    self._is_busy = True
-    self.begin_transaction()
     try:
+        self.begin_transaction(exclusive=(mode == 'write'))
         results = func(self, *args, **kwargs)
         # TODO: I am not sure we should auto commit transaction for every
         # read. What if we want to do a read in-between two write within
@@ -53,7 +52,7 @@ def _transaction_wrapper(self, func, mode, *args, **kwargs):
         if mode == 'read' or kwargs.get('auto_commit', True):
             self.commit_transaction()
     finally:
-        self._is_busy = False
+        self._lock.release()
 
     return results
 
@@ -78,7 +77,7 @@ class DatabaseAccessorBase(ABC):
     def __init__(self):
         self._connection = None
         self._connection_error = None
-        self._is_busy = False
+        self._lock = threading.RLock()
 
     # ---- Public API
     @readmethod
@@ -134,13 +133,119 @@ class DatabaseAccessorBase(ABC):
         """
         self._connection, self._connection_error = self._connect()
 
+    def create_read_accessor(self) -> DatabaseAccessorBase | None:
+        """
+        Create and return a new accessor, with its own connection to the
+        database, that can be used to read data from another thread
+        concurrently with this accessor.
+
+        This needs to be reimplemented in accessors that support concurrent
+        reads. Return None by default.
+        """
+        return None
+
     @readmethod
-    def get_timeseries_for_obs_well(self, obs_well_id, data_types=None):
+    def get_timeseries_for_obs_well(self, obs_well_id, data_types=None,
+                                    start=None, end=None, freq=None,
+                                    agg='mean'):
         """
         Return a pandas dataframe containing the readings for the given
         data types and monitoring station.
+
+        If start or end are specified, only the readings whose datetime
+        is within the half-open interval [start, end) are returned.
+
+        If freq is specified, the readings are aggregated by day ('D') or by
+        month ('M') with the aggregation function agg, which can be 'min',
+        'max', 'mean' or 'first'. The readings are aggregated separately
+        for each observation ID and the datetime of the aggregated readings
+        is the start of the day or month.
+        """
+        if freq is not None:
+            return self._get_aggregated_timeseries_for_obs_well(
+                obs_well_id, data_types, freq, agg, start, end)
+        return self._get_timeseries_for_obs_well(
+            obs_well_id, data_types, start, end)
+
+    @readmethod
+    def get_timeseries_for_obs_wells(self, obs_well_ids, data_types=None,
+                                     start=None, end=None, grouped=False):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring stations in long format, where the
+        monitoring station of each reading is stored in a column named
+        'sampling_feature_uuid'.
+
+        If grouped is True, an iterator of (obs_well_id, readings) tuples
+        is returned instead, where the readings of each monitoring station
+        are formatted as those returned by `get_timeseries_for_obs_well`.
+        Monitoring stations without readings are not included.
+
+        If start or end are specified, only the readings whose datetime
+        is within the half-open interval [start, end) are returned.
+
+        This is more efficient than fetching the readings of the
+        monitoring stations one by one.
+        """
+        readings = self._get_timeseries_for_obs_wells(
+            obs_well_ids, data_types, start, end)
+        if grouped:
+            from sardes.database.accessors.accessor_helpers import (
+                group_readings_by_obs_well)
+            return group_readings_by_obs_well(readings)
+        return readings
+
+    @readmethod
+    def get_timeseries_chunk_for_obs_well(self, obs_well_id, data_types=None,
+                                          end=None, size=10000):
         """
-        return self._get_timeseries_for_obs_well(obs_well_id, data_types)
+        Return a pandas dataframe containing the most recent readings for
+        the given data types and monitoring station that are older
+        than end.
+
+        The chunk contains all the readings that were taken at or after the
+        datetime of the size-th most recent reading older than end. Fetching
+        the readings of a monitoring station chunk by chunk can be done
+        by passing the oldest datetime of the previous chunk as end, until
+        an empty chunk is returned.
+        """
+        start = self._get_timeseries_chunk_start(
+            obs_well_id, data_types, end, size)
+        return self._get_timeseries_for_obs_well(
+            obs_well_id, data_types, start, end)
+
+    @readmethod
+    def get_daily_timeseries_aggregates(self, obs_well_id, data_types=None,
+                                        start=None, end=None):
+        """
+        Return a pandas dataframe containing the first, mean, min and max
+        value and the number of readings of each day for the given data
+        types and monitoring station.
+
+        The aggregates are returned in long format, with columns 'datetime',
+        'obs_id', 'data_type', 'first', 'mean', 'min', 'max' and 'count',
+        where the datetime is the start of the day. If start or end are
+        specified, only the aggregates of the days that start within
+        the half-open interval [start, end) are returned.
+        """
+        return self._get_daily_timeseries_aggregates(
+            obs_well_id, data_types, start, end)
+
+    @readmethod
+    def get_timeseries_data_versions(self, data_types=None):
+        """
+        Return a pandas dataframe indexed by monitoring station containing
+        the start of the last day with readings, the number of readings and
+        a digest of the daily aggregates of the readings for the given
+        data types.
+
+        The digest changes whenever the first, mean, min or max value or
+        the number of readings of a day changes, so that it can be used as
+        a version of the daily readings data of the monitoring stations
+        without fetching the readings. Monitoring stations without readings
+        are not included.
+        """
+        return self._get_timeseries_data_versions(data_types)
 
     @writemethod
     def add_timeseries_data(self, tseries_data: pd.DataFrame,
@@ -732,7 +837,8 @@ class DatabaseAccessor(DatabaseAccessorBase):
         """
         raise NotImplementedError
 
-    def _get_timeseries_for_obs_well(self, obs_well_id, data_types=None):
+    def _get_timeseries_for_obs_well(self, obs_well_id, data_types=None,
+                                     start=None, end=None):
         """
         Return a pandas dataframe containing the readings for the given
         data types and monitoring station.
@@ -748,6 +854,12 @@ class DatabaseAccessor(DatabaseAccessorBase):
         data_type: list of str or list of DataType
             A list of timeseries data types that we want to extract
             from the database.
+        start: datetime
+            If not None, only the readings taken at or after this datetime
+            are returned.
+        end: datetime
+            If not None, only the readings taken before this datetime
+            are returned.
 
         Returns
         -------
@@ -763,6 +875,188 @@ class DatabaseAccessor(DatabaseAccessorBase):
         """
         raise NotImplementedError
 
+    def _get_aggregated_timeseries_for_obs_well(
+            self, obs_well_id, data_types=None, freq='D', agg='mean',
+            start=None, end=None):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring station aggregated by day or month.
+
+        This can be reimplemented in accessors to aggregate the readings
+        in the database. By default, all the readings are fetched and then
+        aggregated with pandas.
+
+        Parameters
+        ----------
+        obs_well_id: object
+            A unique identifier that is used to reference the observation well
+            in the database.
+        data_type: list of str or list of DataType
+            A list of timeseries data types that we want to extract
+            from the database.
+        freq: str
+            The frequency at which the readings are aggregated, either 'D'
+            for daily or 'M' for monthly values.
+        agg: str
+            The function used to aggregate the readings of each data type,
+            either 'min', 'max', 'mean' or 'first'.
+        start: datetime
+            If not None, only the readings taken at or after this datetime
+            are aggregated.
+        end: datetime
+            If not None, only the readings taken before this datetime
+            are aggregated.
+
+        Returns
+        -------
+        tseries_dataf: pandas.DataFrame
+            A pandas dataframe formatted as the one returned by
+            :meth:`_get_timeseries_for_obs_well`, where the datetime of
+            the aggregated readings is the start of the day or month.
+        """
+        from sardes.database.accessors.accessor_helpers import (
+            aggregate_readings)
+        return aggregate_readings(
+            self._get_timeseries_for_obs_well(
+                obs_well_id, data_types, start, end),
+            freq, agg)
+
+    def _get_daily_timeseries_aggregates(self, obs_well_id, data_types=None,
+                                         start=None, end=None):
+        """
+        Return a pandas dataframe containing the daily aggregates of the
+        readings for the given data types and monitoring station.
+
+        This can be reimplemented in accessors that maintain the daily
+        aggregates of the readings in the database. By default, the
+        readings of the days that start within [start, end) are fetched
+        and then aggregated with pandas.
+
+        Parameters
+        ----------
+        obs_well_id: object
+            A unique identifier that is used to reference the observation well
+            in the database.
+        data_type: list of str or list of DataType
+            A list of timeseries data types that we want to extract
+            from the database.
+        start: datetime
+            If not None, only the aggregates of the days that start at or
+            after this datetime are returned.
+        end: datetime
+            If not None, only the aggregates of the days that start before
+            this datetime are returned.
+
+        Returns
+        -------
+        aggregates: pandas.DataFrame
+            A pandas dataframe in long format with columns 'datetime',
+            'obs_id', 'data_type', 'first', 'mean', 'min', 'max' and
+            'count', where the datetime is the start of the day.
+        """
+        from sardes.database.accessors.accessor_helpers import (
+            compute_daily_aggregates)
+        return compute_daily_aggregates(
+            self._get_timeseries_for_obs_well(
+                obs_well_id, data_types,
+                None if start is None else pd.Timestamp(start).ceil('D'),
+                None if end is None else pd.Timestamp(end).ceil('D')))
+
+    def _get_timeseries_data_versions(self, data_types=None):
+        """
+        Return a pandas dataframe indexed by monitoring station containing
+        the start of the last day with readings, the number of readings and
+        a digest of the daily aggregates of the readings for the given
+        data types.
+
+        This can be reimplemented in accessors that can compute these
+        values without fetching the readings. By default, the readings
+        of all the monitoring stations are fetched and then aggregated
+        by day with pandas.
+
+        Returns
+        -------
+        versions: pandas.DataFrame
+            A pandas dataframe indexed by monitoring station with columns
+            'last_date', 'count' and 'digest'.
+        """
+        from sardes.database.accessors.accessor_helpers import (
+            compute_daily_aggregates, compute_readings_versions)
+        readings = self._get_timeseries_for_obs_wells(
+            self._get_observation_wells_data().index, data_types)
+        obs_well_ids = (
+            readings.drop_duplicates('obs_id')
+            .set_index('obs_id')['sampling_feature_uuid'])
+        aggregates = compute_daily_aggregates(
+            readings.drop(columns=['sampling_feature_uuid']))
+        aggregates['sampling_feature_uuid'] = (
+            aggregates['obs_id'].map(obs_well_ids))
+        return compute_readings_versions(aggregates)
+
+    def _get_timeseries_for_obs_wells(self, obs_well_ids, data_types=None,
+                                      start=None, end=None):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring stations in long format.
+
+        This can be reimplemented in accessors to fetch the readings of many
+        monitoring stations at once. By default, the readings of the
+        monitoring stations are fetched one by one.
+
+        Parameters
+        ----------
+        obs_well_ids: list of object
+            A list of unique identifiers that are used to reference the
+            observation wells in the database.
+        data_type: list of str or list of DataType
+            A list of timeseries data types that we want to extract
+            from the database.
+        start: datetime
+            If not None, only the readings taken at or after this datetime
+            are returned.
+        end: datetime
+            If not None, only the readings taken before this datetime
+            are returned.
+
+        Returns
+        -------
+        tseries_dataf: pandas.DataFrame
+            A pandas dataframe formatted as the one returned by
+            :meth:`_get_timeseries_for_obs_well`, with an additional
+            column named 'sampling_feature_uuid' where the unique identifier
+            of the observation well of each reading is stored.
+        """
+        readings = []
+        for obs_well_id in obs_well_ids:
+            well_readings = self._get_timeseries_for_obs_well(
+                obs_well_id, data_types, start, end)
+            well_readings.insert(0, 'sampling_feature_uuid', obs_well_id)
+            readings.append(well_readings)
+        if not readings:
+            return pd.DataFrame(
+                [], columns=['sampling_feature_uuid', 'datetime', 'sonde_id',
+                             'install_depth', 'obs_id'])
+        readings = pd.concat(readings, ignore_index=True)
+        return readings[
+            ['sampling_feature_uuid', 'datetime', 'sonde_id'] +
+            [col for col in readings.columns if
+             col not in ('sampling_feature_uuid', 'datetime', 'sonde_id',
+                         'install_depth', 'obs_id')] +
+            ['install_depth', 'obs_id']]
+
+    def _get_timeseries_chunk_start(self, obs_well_id, data_types=None,
+                                    end=None, size=10000):
+        """
+        Return the datetime of the size-th most recent reading for the given
+        data types and monitoring station that is older than end, or None
+        if there is less than size readings older than end.
+
+        This can be reimplemented in accessors to fetch the readings of
+        a monitoring station by chunks. By default, None is returned, so
+        that all the readings older than end are returned in a single chunk.
+        """
+        return None
+
     def _save_timeseries_data_edits(self, tseries_edits):
         """
         Save in the database a set of edits that were made to to timeseries
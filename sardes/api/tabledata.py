@@ -60,6 +60,7 @@ class EditValue(TableEdit):
                     (self.row, self.col), 'value'] = original_value
 
         # We apply the new value to the data.
+        self.parent._copy_data_on_write()
         self.parent._data.iat[self.row, self.col] = self.edited_value
 
     def undo(self):
@@ -80,6 +81,7 @@ class EditValue(TableEdit):
                     (self.row, self.col), 'value'] = original_value
 
         # We apply the previous value to the data.
+        self.parent._copy_data_on_write()
         self.parent._data.iat[self.row, self.col] = self.previous_value
 
     def redo(self):
@@ -188,8 +190,9 @@ class AddRows(TableEdit):
     def undo(self):
         self.parent._new_rows = self.parent._new_rows.drop(self.row)
 
-        # We remove the new row from the data.
-        self.parent._data.drop(self.index, inplace=True)
+        # We remove the new row from the data. Note that this is not done
+        # inplace, because the dataframe may be shared with other consumers.
+        self.parent._data = self.parent._data.drop(self.index)
 
     def redo(self):
         self.execute()
@@ -207,13 +210,18 @@ class SardesTableData(object):
     Please avoid making changes to the wrapped dataframe directly outside of
     the public interface provided by SardesTableData unless you really know
     what you are doing.
+
+    The dataframe that is passed to SardesTableData is not copied, but is
+    shared with the consumers of the data until it is edited for the first
+    time (copy-on-write), so it must not be modified after that.
     """
     EditValue = EditValue.type()
     AddRows = AddRows.type()
     DeleteRows = DeleteRows.type()
 
     def __init__(self, data: pd.DataFrame):
-        self._data = data.copy()
+        self._data = data
+        self._data_is_shared = True
 
         self.edits_controller = TableEditsController()
 
@@ -253,6 +261,36 @@ class SardesTableData(object):
         """Return a copy of the wrapped dataframe."""
         return self._data.copy()
 
+    def view(self):
+        """
+        Return the wrapped dataframe without copying it.
+
+        The returned dataframe must not be modified. Since the wrapped
+        dataframe may be copied when the data are edited, the dataframe
+        must be requested again after each edit.
+        """
+        return self._data
+
+    def _copy_data_on_write(self):
+        """
+        Copy the wrapped dataframe before it is modified inplace for the
+        first time, since it may be shared with other consumers.
+        """
+        if self._data_is_shared:
+            self._data = self._data.copy()
+            self._data_is_shared = False
+
+    def append(self, data: pd.DataFrame):
+        """
+        Append the rows of data at the end of the wrapped dataframe.
+
+        This is not considered as an edit of the data. Since the rows are
+        added after the existing rows, the integer positions of the rows and
+        values that were edited remain valid.
+        """
+        self._data = pd.concat([self._data, data[self._data.columns]])
+        self._data_is_shared = False
+
     def get(self, row: int = None, col: int = None) -> object | pd.Series:
         """
         Get a single value or an entire row or column by integer position.
@@ -892,21 +892,21 @@ class SardesSortFilterModel(QSortFilterProxyModel):
             # Clear sorting.
             self._proxy_dataf_index = visual_dataf.index.copy()
         else:
-            # Sort the data by columns.
-            self._proxy_dataf_index = visual_dataf.sort_values(
-                by=[self.column_names()[index] for index in
-                    self._sort_by_columns],
+            # Sort the data by columns. Note that only the columns used to
+            # sort the data are copied and sorted.
+            by = [self.column_names()[index] for index in
+                  self._sort_by_columns]
+            self._proxy_dataf_index = visual_dataf[by].sort_values(
+                by=by,
                 ascending=[not bool(v) for v in self._columns_sort_order],
                 axis=0,
                 inplace=False,
                 key=sort_key
                 ).index
-        self._map_row_to_source = np.array([
-            self.sourceModel().visual_dataf.index.get_loc(index) for
-            index in self._proxy_dataf_index])
-        self._map_row_from_source = np.array([
-            self._proxy_dataf_index.get_loc(index) for
-            index in self.sourceModel().visual_dataf.index])
+        self._map_row_to_source = visual_dataf.index.get_indexer(
+            self._proxy_dataf_index)
+        self._map_row_from_source = self._proxy_dataf_index.get_indexer(
+            visual_dataf.index)
         self.sig_data_sorted.emit()
 
     # ---- Public methods
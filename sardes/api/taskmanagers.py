@@ -8,42 +8,392 @@
 # -----------------------------------------------------------------------------
 
 # ---- Standard imports
-from collections import OrderedDict
-from time import sleep
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from enum import IntEnum
+import math
+import multiprocessing
+import threading
+from time import perf_counter
 import uuid
 
 # ---- Third party imports
-from qtpy.QtCore import QObject, QThread, Signal, Slot
+from qtpy.QtCore import QObject, QThread, Qt, Signal, Slot
+
+
+class TaskPriority(IntEnum):
+    """
+    An enum that list the priority levels of the tasks that are executed
+    by a TaskManagerBase.
+
+    Pending read tasks with a higher priority are executed before the
+    pending read tasks with a lower priority.
+    """
+    Background = 0
+    Normal = 1
+    Interactive = 2
+
+
+def _freeze(value):
+    """
+    Return a hashable version of value, when possible, so that it can be
+    used to identify tasks that were added with identical arguments.
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(val) for val in value)
+    return value
+
+
+class TaskStats(object):
+    """
+    Rolling statistics on the time spent by the tasks of a TaskManagerBase
+    waiting to be executed, executing in a worker, and in their callback.
+
+    Parameters
+    ----------
+    window : int
+        The number of most recent samples that are kept for each task name.
+    slow_task_threshold : float
+        The total time, in seconds, above which a task is logged as slow
+        with its arguments. Slow tasks are not logged if this is None.
+    """
+    PHASES = ('queued', 'executing', 'callback')
+
+    # The upper bounds, in ms, of the bins of the latency histograms.
+    HISTOGRAM_BINS = (10, 100, 1000, 10000, float('inf'))
+
+    def __init__(self, window=500, slow_task_threshold=1):
+        self.window = window
+        self.slow_task_threshold = slow_task_threshold
+        self._samples = {}
+        self._counts = {}
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+
+    def add_sample(self, task, args, kargs, queued, executing, callback):
+        """
+        Add the times, in seconds, that were spent by a task waiting to be
+        executed, executing in a worker and in its callback.
+        """
+        if task not in self._samples:
+            self._samples[task] = deque(maxlen=self.window)
+            self._counts[task] = 0
+        self._samples[task].append((queued, executing, callback))
+        self._counts[task] += 1
+
+        total = queued + executing + callback
+        if (self.slow_task_threshold is not None and
+                total >= self.slow_task_threshold):
+            print(("Slow task '{}' took {:0.3f} sec (queued: {:0.3f} sec, "
+                   "executing: {:0.3f} sec, callback: {:0.3f} sec) "
+                   "with arguments {}.").format(
+                       task, total, queued, executing, callback,
+                       _format_task_args(args, kargs)))
+
+    def set_queue_depth(self, depth):
+        """Set the number of tasks that are waiting to be completed."""
+        self._queue_depth = depth
+        self._max_queue_depth = max(self._max_queue_depth, depth)
+
+    def tasks(self):
+        """Return the names of the tasks for which samples were added."""
+        return list(self._samples.keys())
+
+    def count(self, task):
+        """Return the number of times the given task was completed."""
+        return self._counts.get(task, 0)
+
+    def times(self, task, phase):
+        """
+        Return the list of the most recent times, in seconds, spent by the
+        given task in the given phase.
+        """
+        index = self.PHASES.index(phase)
+        return [sample[index] for sample in self._samples.get(task, [])]
+
+    def histogram(self, task, phase='executing'):
+        """
+        Return the number of the most recent times spent by the given task
+        in the given phase that fall in each bin of HISTOGRAM_BINS.
+        """
+        counts = [0] * len(self.HISTOGRAM_BINS)
+        for time in self.times(task, phase):
+            for i, upper_bound in enumerate(self.HISTOGRAM_BINS):
+                if time * 1000 < upper_bound:
+                    counts[i] += 1
+                    break
+        return counts
+
+    def clear(self):
+        """Clear all the samples."""
+        self._samples.clear()
+        self._counts.clear()
+        self._max_queue_depth = self._queue_depth
+
+    def report(self):
+        """Return a text report of the statistics."""
+        lines = ["Queue depth: {} (max: {})".format(
+            self._queue_depth, self._max_queue_depth)]
+        bin_labels = []
+        lower_bound = 0
+        for upper_bound in self.HISTOGRAM_BINS:
+            if upper_bound == float('inf'):
+                bin_labels.append('>{:g}ms'.format(lower_bound))
+            else:
+                bin_labels.append('<{:g}ms'.format(upper_bound))
+            lower_bound = upper_bound
+        for task in sorted(self._samples):
+            lines.append("")
+            lines.append("{} (count: {})".format(task, self._counts[task]))
+            for phase in self.PHASES:
+                times = sorted(self.times(task, phase))
+                lines.append(
+                    ("  {:<9} mean: {:8.1f} ms  p50: {:8.1f} ms  "
+                     "p95: {:8.1f} ms  max: {:8.1f} ms").format(
+                         phase,
+                         sum(times) / len(times) * 1000,
+                         _percentile(times, 50) * 1000,
+                         _percentile(times, 95) * 1000,
+                         times[-1] * 1000))
+            lines.append("  histogram " + "  ".join(
+                '{}: {}'.format(label, count) for label, count in
+                zip(bin_labels, self.histogram(task, 'executing'))))
+        return '\n'.join(lines)
+
+
+def _percentile(sorted_values, q):
+    """
+    Return the q-th percentile of a sorted list of values using the
+    nearest-rank method.
+    """
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _format_task_args(args, kargs, max_length=200):
+    """
+    Return a short string representation of the arguments of a task.
+    """
+    text = ', '.join(
+        [repr(arg) for arg in args] +
+        ['{}={!r}'.format(key, val) for key, val in kargs.items()])
+    text = ' '.join(text.split())
+    if len(text) > max_length:
+        text = text[:max_length - 3] + '...'
+    return '(' + text + ')'
 
 
 class WorkerBase(QObject):
     """
     A worker to execute tasks without blocking the gui.
+
+    The worker lives in a thread that is started once by its manager. Tasks
+    are added to a thread-safe queue from the GUI thread and are executed
+    by the worker in its own thread as soon as possible.
     """
-    sig_task_completed = Signal(object, object)
+    sig_task_completed = Signal(object, object, object)
+    sig_task_partial_result = Signal(object, object)
+    sig_tasks_added = Signal()
+
+    # The names of the tasks that only read data and that can be safely
+    # executed concurrently with other read tasks by the read workers
+    # of the manager.
+    READ_TASKS = ()
 
     def __init__(self):
         super().__init__()
         self._tasks = OrderedDict()
+        self._tasks_lock = threading.Lock()
+        self._current_task_uuid4 = None
+        self._current_task_cancelled = False
+
+        # Since the worker lives in another thread than the one from which
+        # tasks are added, run_tasks is always executed in the thread
+        # of the worker.
+        self.sig_tasks_added.connect(self.run_tasks, Qt.QueuedConnection)
 
     def add_task(self, task_uuid4, task, *args, **kargs):
         """
-        Add a task to the stack that will be executed when the thread of
-        this worker is started.
+        Add a task to the queue of tasks that will be executed by this
+        worker in its thread.
+
+        This can be called safely from another thread than that of
+        this worker.
         """
-        self._tasks[task_uuid4] = (task, args, kargs)
+        with self._tasks_lock:
+            self._tasks[task_uuid4] = (task, args, kargs)
+        self.sig_tasks_added.emit()
 
+    def cancel_task(self, task_uuid4):
+        """
+        Remove the given task from the queue of this worker and return
+        whether it was removed before being started.
+
+        If the task is currently being executed, it is flagged as cancelled,
+        so that tasks that check is_current_task_cancelled can stop early.
+
+        This can be called safely from another thread than that of
+        this worker.
+        """
+        with self._tasks_lock:
+            if task_uuid4 == self._current_task_uuid4:
+                self._current_task_cancelled = True
+            return self._tasks.pop(task_uuid4, None) is not None
+
+    def is_current_task_cancelled(self):
+        """
+        Return whether the task that is currently executed by this worker
+        was cancelled.
+        """
+        return self._current_task_cancelled
+
+    def emit_partial_result(self, *values):
+        """
+        Send a partial result of the task that is currently executed by
+        this worker to the partial callback of the task, if any.
+
+        This allows tasks that take a long time to complete to deliver
+        their results progressively.
+        """
+        self.sig_task_partial_result.emit(self._current_task_uuid4, values)
+
+    def is_read_task(self, task):
+        """
+        Return whether the given task only reads data and can thus be
+        executed concurrently with other read tasks.
+        """
+        return task is None or task in self.READ_TASKS
+
+    def create_read_worker(self):
+        """
+        Create and return a new worker that can execute the read tasks
+        of this worker concurrently in another thread.
+
+        This needs to be reimplemented in workers that support concurrent
+        read tasks. Return None by default, in which case all tasks are
+        executed serially by this worker.
+        """
+        return None
+
+    @Slot()
     def run_tasks(self):
-        """Execute the tasks that were added to the stack."""
-        for task_uuid4, (task, args, kargs) in self._tasks.items():
+        """Execute the tasks that were added to the queue."""
+        while True:
+            with self._tasks_lock:
+                if len(self._tasks) == 0:
+                    break
+                task_uuid4, (task, args, kargs) = self._tasks.popitem(
+                    last=False)
+                self._current_task_uuid4 = task_uuid4
+                self._current_task_cancelled = False
+            started = perf_counter()
             if task is not None:
                 method_to_exec = getattr(self, '_' + task)
                 returned_values = method_to_exec(*args, **kargs)
             else:
                 returned_values = args
-            self.sig_task_completed.emit(task_uuid4, returned_values)
-        self._tasks = OrderedDict()
-        self.thread().quit()
+            with self._tasks_lock:
+                self._current_task_uuid4 = None
+            self.sig_task_completed.emit(
+                task_uuid4, returned_values, (started, perf_counter()))
+
+
+class WorkerProcessPool(object):
+    """
+    A pool of processes in which a worker executes the jobs of its current
+    task, while it prepares the data of the next jobs in its own thread.
+
+    The number of jobs waiting to be executed is limited, so that the data
+    of all the jobs are not held in memory at once. The progress of the
+    jobs, in percent, is sent as partial results of the current task of
+    the worker and the jobs that are not started yet are cancelled when
+    the pool is shut down.
+
+    Parameters
+    ----------
+    worker : WorkerBase
+        The worker whose current task submits the jobs.
+    callback : callable
+        A function that is called in the thread of the worker with the
+        context and the future of each job once it is done.
+    max_workers : int
+        The number of processes of the pool.
+    progress_total : int
+        The total number of jobs submitted or skipped by the task, which
+        is used to compute the progress of the jobs.
+    """
+
+    def __init__(self, worker, callback, max_workers, progress_total):
+        self.worker = worker
+        self.callback = callback
+        self.max_workers = max_workers
+        self.progress_total = max(progress_total, 1)
+        self.progress = 0
+        self._futures = {}
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def submit(self, context, func, *args, **kwargs):
+        """
+        Submit a job that executes func with the given arguments in a
+        process of the pool, and block until there is room for another
+        job in the pool.
+        """
+        future = self._executor.submit(func, *args, **kwargs)
+        self._futures[future] = context
+        self._check_done(
+            None if len(self._futures) >= 2 * self.max_workers else 0)
+
+    def skip(self):
+        """Count a job that does not need to be executed in the progress."""
+        self.progress += 1
+        self._check_done(0)
+
+    def join(self):
+        """
+        Wait for the submitted jobs to be done and return whether they
+        were all done, or False if the task of the worker was cancelled.
+        """
+        while self._futures:
+            if self.worker.is_current_task_cancelled():
+                return False
+            self._check_done(0.1)
+        return True
+
+    def shutdown(self):
+        """
+        Cancel the jobs that are not started yet and wait for the jobs
+        that are running to be done.
+        """
+        # Note that we cannot use the 'cancel_futures' argument of
+        # 'shutdown', since it is not available before Python 3.9.
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _check_done(self, timeout):
+        """
+        Wait at most timeout seconds for a job to be done, pass the jobs
+        that are done to the callback and send the progress of the jobs.
+        """
+        done = wait(
+            self._futures, timeout=timeout, return_when=FIRST_COMPLETED).done
+        for future in done:
+            self.callback(self._futures.pop(future), future)
+        self.progress += len(done)
+        self.worker.emit_partial_result(
+            self.progress / self.progress_total * 100)
 
 
 class TaskManagerBase(QObject):
@@ -51,15 +401,58 @@ class TaskManagerBase(QObject):
     A basic manager to handle tasks that need to be executed in a different
     thread than that of the main application to avoid blocking the GUI event
     loop.
+
+    Tasks that only read data are executed concurrently by a pool of read
+    workers when the installed worker supports it, while all other tasks
+    are executed serially by the main worker. The callbacks of the tasks
+    are always called in the GUI thread in the order in which the tasks
+    were added to the manager.
+
+    Pending read tasks are executed by order of priority, identical read
+    tasks are executed only once with their result passed to the callbacks
+    of all of them, and tasks that are superseded by a more recent task
+    with the same key are cancelled. Read tasks with the same key are never
+    executed at the same time, so that a task does not start before the
+    task it superseded has stopped.
     """
     sig_run_tasks_finished = Signal()
 
-    def __init__(self):
+    def __init__(self, nbr_read_workers=0, slow_task_threshold=1):
         super().__init__()
         self._worker = None
+        self._thread = None
+        self._nbr_read_workers = nbr_read_workers
+        self._read_workers = []
+        self._read_threads = []
 
         self._task_callbacks = {}
         self._task_data = {}
+        self._task_results = {}
+        self._task_workers = {}
+        self._task_batches = {}
+        self._task_priorities = {}
+        self._task_keys = {}
+        self._task_partial_callbacks = {}
+
+        # The times at which each task was submitted, started and completed.
+        self._task_times = {}
+        self._task_stats = TaskStats(slow_task_threshold=slow_task_threshold)
+
+        # Identical read tasks are coalesced, so that only the first one
+        # (the primary) is executed and its result is passed to the callbacks
+        # of all the others (the followers).
+        self._coalesced_tasks = {}
+        self._task_primaries = {}
+        self._task_followers = {}
+
+        # Tasks that were cancelled while being executed by a worker, or
+        # whose result is still needed by their followers.
+        self._cancelled_tasks = set()
+
+        # The keys of the tasks that were sent to a worker and the callbacks
+        # that are waiting for cancelled tasks to stop.
+        self._worker_keys = {}
+        self._cancel_callbacks = []
 
         self._running_tasks = []
         self._queued_tasks = []
@@ -70,10 +463,13 @@ class TaskManagerBase(QObject):
         # tasks when `run_task` is called.
         #
         # Pending tasks are tasks whose execution was postponed due to
-        # the fact that the worker was busy. These tasks are run as soon
-        # as the worker becomes available.
+        # the fact that the workers were busy or that they must wait for
+        # the completion of tasks that were added before them. These tasks
+        # are run as soon as possible.
         #
-        # Running tasks are tasks that are being executed by the worker.
+        # Running tasks are tasks that were sent to a worker and whose
+        # callback has not been called yet. This also includes tasks that
+        # are waiting for the result of an identical task.
 
     def run_tasks(self, callback=None, returned_values=None):
         """
@@ -92,83 +488,480 @@ class TaskManagerBase(QObject):
             self.add_task(None, callback, returned_values)
         self._run_tasks()
 
-    def add_task(self, task, callback, *args, **kargs):
-        self._add_task(task, callback, *args, **kargs)
+    def add_task(self, task, callback, *args,
+                 priority=TaskPriority.Normal, key=None,
+                 partial_callback=None, **kargs):
+        """
+        Add a task to the stack that will be executed when run_tasks
+        is called.
+
+        Parameters
+        ----------
+        task : str
+            The name of the task that needs to be executed by the worker.
+        callback : function
+            A function that will be called in the GUI thread with the values
+            returned by the task.
+        priority : TaskPriority
+            The priority of the task. Pending read tasks are executed by
+            order of priority.
+        key : Hashable
+            An optional key to identify the task. Adding a task with a key
+            cancels all the tasks with the same key that were added before
+            it and that are not completed yet. The callbacks of cancelled
+            tasks are never called.
+        partial_callback : function
+            An optional function that will be called in the GUI thread with
+            the partial results that are sent by the task while it is
+            executed. Tasks with a partial callback are never coalesced.
+        """
+        if key is not None:
+            self._cancel_tasks(key)
+        self._add_task(task, callback, *args,
+                       priority=priority, key=key,
+                       partial_callback=partial_callback, **kargs)
+
+    def cancel_tasks(self, key, callback=None):
+        """
+        Cancel all the tasks that were added with the given key and that
+        are not completed yet. The callbacks of cancelled tasks are
+        never called.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key of the tasks to cancel.
+        callback : function
+            An optional function that will be called in the GUI thread once
+            the cancelled tasks that were being executed by a worker have
+            stopped, or right away if no cancelled task was being executed.
+        """
+        task_uuid4s = self._cancel_tasks(key)
+        if callback is not None:
+            stopping_tasks = set(task_uuid4s) & self._cancelled_tasks
+            if len(stopping_tasks):
+                self._cancel_callbacks.append((stopping_tasks, callback))
+            else:
+                callback()
+        if len(task_uuid4s):
+            if len(self._running_tasks) == 0 and len(self._pending_tasks) == 0:
+                self.sig_run_tasks_finished.emit()
+            else:
+                self._run_pending_tasks()
 
     def worker(self):
         """Return the worker that is installed on this manager."""
         return self._worker
 
+    def task_stats(self):
+        """
+        Return the statistics on the time spent by the tasks executed by
+        this manager.
+        """
+        return self._task_stats
+
+    def read_workers(self):
+        """
+        Return the list of workers that are used by this manager to
+        execute read tasks concurrently.
+        """
+        return self._read_workers
+
+    def threads(self):
+        """Return the list of all threads used by this manager."""
+        if self._thread is None:
+            return []
+        return [self._thread] + self._read_threads
+
     def set_worker(self, worker):
         """"Install the provided worker on this manager"""
         self._worker = worker
         self._thread = QThread()
         self._worker.moveToThread(self._thread)
-        self._thread.started.connect(self._worker.run_tasks)
 
         # Connect the worker signals to handlers.
         self._worker.sig_task_completed.connect(
             self._exec_task_callback)
+        self._worker.sig_task_partial_result.connect(
+            self._exec_task_partial_callback)
+
+        # Setup the pool of workers used to execute read tasks.
+        self._read_workers = []
+        self._read_threads = []
+        for i in range(self._nbr_read_workers):
+            read_worker = worker.create_read_worker()
+            if read_worker is None:
+                break
+            read_thread = QThread()
+            read_worker.moveToThread(read_thread)
+            read_worker.sig_task_completed.connect(self._exec_task_callback)
+            read_worker.sig_task_partial_result.connect(
+                self._exec_task_partial_callback)
+            self._read_workers.append(read_worker)
+            self._read_threads.append(read_thread)
+
+        # The threads of the workers are started once and run until
+        # the manager is stopped.
+        for thread in self.threads():
+            thread.start()
+
+    def stop(self):
+        """
+        Stop the threads of the workers of this manager.
+
+        This waits for the workers to complete the task they are currently
+        executing. The threads are started again automatically if new
+        tasks need to be executed.
+        """
+        for thread in self.threads():
+            thread.quit()
+        for thread in self.threads():
+            thread.wait()
+
+    def __del__(self):
+        # A QThread must not be destroyed while it is still running.
+        try:
+            self.stop()
+        except RuntimeError:
+            # The underlying C++ objects were already deleted.
+            pass
 
     # ---- Private API
-    @Slot(object, object)
-    def _exec_task_callback(self, task_uuid4, returned_values):
+    @Slot(object, object, object)
+    def _exec_task_callback(self, task_uuid4, returned_values, times):
         """
         This is the (only) slot that should be called after a task is
-        completed by the worker.
+        completed by a worker.
+        """
+        del self._task_workers[task_uuid4]
+        self._worker_keys.pop(task_uuid4, None)
+        self._uncoalesce_task(task_uuid4)
+        self._task_times[task_uuid4][1:] = times
+
+        # Pass the result of the task to the tasks that were waiting for it.
+        batches = []
+        for follower_uuid4 in self._task_followers.pop(task_uuid4, []):
+            del self._task_primaries[follower_uuid4]
+            self._task_results[follower_uuid4] = returned_values
+            self._task_times[follower_uuid4][1:] = times
+            batches.append(self._task_batches[follower_uuid4])
+
+        if task_uuid4 in self._cancelled_tasks:
+            self._cancelled_tasks.remove(task_uuid4)
+            self._running_tasks.remove(task_uuid4)
+            self._cleanup_task(task_uuid4)
+        else:
+            self._task_results[task_uuid4] = returned_values
+            batches.insert(0, self._task_batches[task_uuid4])
+
+        for batch in batches:
+            self._exec_batch_callbacks(batch)
+        self._exec_cancel_callbacks(task_uuid4)
+        self._task_stats.set_queue_depth(
+            len(self._pending_tasks) + len(self._running_tasks))
+
+        if len(self._running_tasks) == 0 and len(self._pending_tasks) == 0:
+            # This means all tasks sent to the workers were completed.
+            print('All pending tasks were executed.')
+            self.sig_run_tasks_finished.emit()
+        else:
+            self._run_pending_tasks()
+
+    @Slot(object, object)
+    def _exec_task_partial_callback(self, task_uuid4, partial_values):
+        """
+        This is the slot that is called when a worker sends a partial result
+        of the task it is executing.
         """
-        # Run the callback associated with the specified task UUID if any.
+        # Note that the partial callback of cancelled tasks are removed.
+        partial_callback = self._task_partial_callbacks.get(task_uuid4)
+        if partial_callback is not None:
+            partial_callback(*partial_values)
+
+    def _exec_cancel_callbacks(self, task_uuid4):
+        """
+        Run the callbacks that were waiting for the given task to stop and
+        for which all the cancelled tasks have now stopped.
+        """
+        cancel_callbacks = []
+        for stopping_tasks, callback in self._cancel_callbacks:
+            stopping_tasks.discard(task_uuid4)
+            if len(stopping_tasks):
+                cancel_callbacks.append((stopping_tasks, callback))
+            else:
+                callback()
+        self._cancel_callbacks = cancel_callbacks
+
+    def _exec_batch_callbacks(self, batch):
+        """
+        Run the callbacks of the completed tasks of the given batch, in the
+        order in which the tasks were added to the manager.
+        """
+        while len(batch) and batch[0] in self._task_results:
+            self._exec_callback(batch.pop(0))
+
+    def _exec_callback(self, task_uuid4):
+        """
+        Run the callback associated with the specified task UUID if any.
+        """
+        returned_values = self._task_results.pop(task_uuid4)
+        callback_started = perf_counter()
         if self._task_callbacks[task_uuid4] is not None:
             try:
                 self._task_callbacks[task_uuid4](*returned_values)
             except TypeError:
                 self._task_callbacks[task_uuid4]()
 
+        task, args, kargs = self._task_data[task_uuid4]
+        if task is not None:
+            submitted, started, completed = self._task_times[task_uuid4]
+            self._task_stats.add_sample(
+                task, args, kargs,
+                queued=started - submitted,
+                executing=completed - started,
+                callback=perf_counter() - callback_started)
+
         # Clean up internal variables.
+        self._cleanup_task(task_uuid4)
+        self._running_tasks.remove(task_uuid4)
+
+    def _cleanup_task(self, task_uuid4):
+        """Clean up the internal variables related to the given task."""
         del self._task_callbacks[task_uuid4]
         del self._task_data[task_uuid4]
-        self._running_tasks.remove(task_uuid4)
+        del self._task_priorities[task_uuid4]
+        self._task_times.pop(task_uuid4, None)
+        self._task_partial_callbacks.pop(task_uuid4, None)
+        self._task_batches.pop(task_uuid4, None)
+        self._task_keys.pop(task_uuid4, None)
 
-        if len(self._running_tasks) == 0:
-            # This means all tasks sent to the worker were completed.
-            if len(self._pending_tasks) > 0:
-                self._run_pending_tasks()
+    def _cancel_tasks(self, key):
+        """
+        Cancel the tasks that were added with the given key and return
+        the list of the tasks that were cancelled.
+        """
+        task_uuid4s = [
+            task_uuid4 for task_uuid4, task_key in self._task_keys.items() if
+            task_key == key]
+        for task_uuid4 in task_uuid4s:
+            self._cancel_task(task_uuid4)
+        return task_uuid4s
+
+    def _cancel_task(self, task_uuid4):
+        """Cancel the given task so that its callback is never called."""
+        del self._task_keys[task_uuid4]
+        self._task_partial_callbacks.pop(task_uuid4, None)
+        if task_uuid4 in self._queued_tasks:
+            self._queued_tasks.remove(task_uuid4)
+            self._cleanup_task(task_uuid4)
+            return
+
+        # We remove the task from its batch, so that it does not hold
+        # the callbacks of the tasks that were added after it.
+        batch = self._task_batches.pop(task_uuid4)
+        batch.remove(task_uuid4)
+
+        if task_uuid4 in self._task_results:
+            # The task is completed, but its callback is waiting for
+            # the completion of the tasks that were added before it.
+            del self._task_results[task_uuid4]
+            self._running_tasks.remove(task_uuid4)
+            self._cleanup_task(task_uuid4)
+        elif task_uuid4 in self._task_primaries:
+            # The task is waiting for the result of an identical task.
+            primary_uuid4 = self._task_primaries.pop(task_uuid4)
+            self._task_followers[primary_uuid4].remove(task_uuid4)
+            self._running_tasks.remove(task_uuid4)
+            self._cleanup_task(task_uuid4)
+        elif len(self._task_followers.get(task_uuid4, [])):
+            # The result of the task is still needed by its followers,
+            # so we only prevent its callback from being called.
+            self._cancelled_tasks.add(task_uuid4)
+        elif task_uuid4 in self._pending_tasks:
+            self._uncoalesce_task(task_uuid4)
+            self._task_followers.pop(task_uuid4, None)
+            self._pending_tasks.remove(task_uuid4)
+            self._cleanup_task(task_uuid4)
+        else:
+            # The task was already sent to a worker.
+            self._uncoalesce_task(task_uuid4)
+            if self._task_workers[task_uuid4].cancel_task(task_uuid4):
+                # The worker had not started the task yet.
+                del self._task_workers[task_uuid4]
+                self._worker_keys.pop(task_uuid4, None)
+                self._running_tasks.remove(task_uuid4)
+                self._cleanup_task(task_uuid4)
             else:
-                print('All pending tasks were executed.')
-                self.sig_run_tasks_finished.emit()
+                self._cancelled_tasks.add(task_uuid4)
+
+        self._exec_batch_callbacks(batch)
 
-    def _add_task(self, task, callback, *args, **kargs):
+    def _add_task(self, task, callback, *args,
+                  priority=TaskPriority.Normal, key=None,
+                  partial_callback=None, **kargs):
         task_uuid4 = uuid.uuid4()
         self._task_callbacks[task_uuid4] = callback
+        if partial_callback is not None:
+            self._task_partial_callbacks[task_uuid4] = partial_callback
         self._queued_tasks.append(task_uuid4)
         self._task_data[task_uuid4] = (task, args, kargs)
+        self._task_priorities[task_uuid4] = priority
+        if key is not None:
+            self._task_keys[task_uuid4] = key
 
     def _run_tasks(self):
         """
         Execute all the tasks that were added to the stack.
         """
-        self._pending_tasks.extend(self._queued_tasks)
+        batch = self._queued_tasks.copy()
+        submitted = perf_counter()
+        for task_uuid4 in self._queued_tasks:
+            self._task_batches[task_uuid4] = batch
+            self._task_times[task_uuid4] = [submitted, None, None]
+            task = self._task_data[task_uuid4][0]
+            if not self._worker.is_read_task(task):
+                # The read tasks that are added after a task that may change
+                # the data must not be coalesced with those added before it.
+                self._coalesced_tasks.clear()
+                self._pending_tasks.append(task_uuid4)
+                continue
+
+            signature = self._get_task_signature(task_uuid4)
+            primary_uuid4 = self._coalesced_tasks.get(signature)
+            if primary_uuid4 is None:
+                if signature is not None:
+                    self._coalesced_tasks[signature] = task_uuid4
+                self._pending_tasks.append(task_uuid4)
+            else:
+                self._task_primaries[task_uuid4] = primary_uuid4
+                self._task_followers.setdefault(
+                    primary_uuid4, []).append(task_uuid4)
+                self._task_priorities[primary_uuid4] = max(
+                    self._task_priorities[primary_uuid4],
+                    self._task_priorities[task_uuid4])
+                self._running_tasks.append(task_uuid4)
         self._queued_tasks = []
+        self._task_stats.set_queue_depth(
+            len(self._pending_tasks) + len(self._running_tasks))
+        self._sort_pending_tasks()
         self._run_pending_tasks()
 
+    def _get_task_signature(self, task_uuid4):
+        """
+        Return a hashable signature that identifies the given task and its
+        arguments, or None if the task cannot be coalesced.
+        """
+        task, args, kargs = self._task_data[task_uuid4]
+        if task is None or task_uuid4 in self._task_partial_callbacks:
+            return None
+        try:
+            signature = (task, _freeze(args), _freeze(kargs))
+            hash(signature)
+        except TypeError:
+            return None
+        return signature
+
+    def _uncoalesce_task(self, task_uuid4):
+        """
+        Make sure no new task is coalesced with the given task.
+        """
+        for signature, primary_uuid4 in list(self._coalesced_tasks.items()):
+            if primary_uuid4 == task_uuid4:
+                del self._coalesced_tasks[signature]
+
+    def _sort_pending_tasks(self):
+        """
+        Sort the pending read tasks by decreasing order of priority,
+        without moving them across the other tasks.
+        """
+        sorted_tasks = []
+        read_tasks = []
+        for task_uuid4 in self._pending_tasks:
+            if self._worker.is_read_task(self._task_data[task_uuid4][0]):
+                read_tasks.append(task_uuid4)
+            else:
+                sorted_tasks.extend(sorted(
+                    read_tasks, key=lambda u: -self._task_priorities[u]))
+                sorted_tasks.append(task_uuid4)
+                read_tasks = []
+        sorted_tasks.extend(sorted(
+            read_tasks, key=lambda u: -self._task_priorities[u]))
+        self._pending_tasks = sorted_tasks
+
+    def _is_worker_busy(self, worker):
+        """Return whether the given worker is executing tasks."""
+        return worker in self._task_workers.values()
+
+    def _is_key_busy(self, task_uuid4):
+        """
+        Return whether a task with the same key as the given task is
+        executed by a worker, including a cancelled task that has
+        not stopped yet.
+        """
+        key = self._task_keys.get(task_uuid4)
+        return key is not None and key in self._worker_keys.values()
+
     def _run_pending_tasks(self):
-        """Execute all pending tasks."""
-        if len(self._running_tasks) == 0:
-            print('Executing {} pending tasks...'.format(
-                len(self._pending_tasks)))
-            # Even though the worker has executed all its tasks,
-            # we may still need to wait a little for it to stop properly.
-            i = 0
-            while self._thread.isRunning():
-                sleep(0.1)
-                i += 1
-                if i > 100:
-                    print("Error: unable to stop {}'s working thread.".format(
-                        self.__class__.__name__))
-
-            self._running_tasks = self._pending_tasks.copy()
+        """
+        Send to the workers all pending tasks that can be executed now.
+
+        Read tasks are distributed among the read workers that are available
+        and the other tasks are executed by the main worker. A task that is
+        not a read task is not executed until all the tasks that were
+        added before it are completed, and no task added after it is
+        executed before it is completed. A read task is not executed while
+        a task with the same key is executed by a worker.
+        """
+        if len(self._read_workers) == 0:
+            # All tasks are executed serially by the main worker.
+            if self._is_worker_busy(self._worker):
+                return
+            self._start_worker(self._worker, self._pending_tasks)
             self._pending_tasks = []
-            for task_uuid4 in self._running_tasks:
-                task, args, kargs = self._task_data[task_uuid4]
-                self._worker.add_task(task_uuid4, task, *args, **kargs)
-            self._thread.start()
+            return
+
+        if self._is_worker_busy(self._worker):
+            # A task that is not a read task is currently being executed.
+            return
+
+        # Read tasks are sent one at a time to the read workers that are
+        # available, so that the pending tasks with the highest priority
+        # are always executed first.
+        available_workers = [
+            worker for worker in self._read_workers if
+            not self._is_worker_busy(worker)]
+        index = 0
+        while index < len(self._pending_tasks):
+            task_uuid4 = self._pending_tasks[index]
+            task = self._task_data[task_uuid4][0]
+            if self._worker.is_read_task(task):
+                if len(available_workers) == 0:
+                    break
+                if self._is_key_busy(task_uuid4):
+                    # This task must wait for the task with the same key
+                    # to stop, but the next read tasks can be executed.
+                    index += 1
+                    continue
+                self._start_worker(
+                    available_workers.pop(0),
+                    [self._pending_tasks.pop(index)])
+                continue
+            if index == 0 and len(self._task_workers) == 0:
+                self._start_worker(self._worker, [self._pending_tasks.pop(0)])
+            break
+
+    def _start_worker(self, worker, tasks):
+        """Send the given tasks to the worker."""
+        if len(tasks) == 0:
+            return
+        print('Executing {} pending tasks...'.format(len(tasks)))
+        if not worker.thread().isRunning():
+            # The manager was stopped.
+            worker.thread().start()
+        for task_uuid4 in tasks:
+            self._running_tasks.append(task_uuid4)
+            self._task_workers[task_uuid4] = worker
+            if task_uuid4 in self._task_keys:
+                self._worker_keys[task_uuid4] = self._task_keys[task_uuid4]
+            task, args, kargs = self._task_data[task_uuid4]
+            worker.add_task(task_uuid4, task, *args, **kargs)
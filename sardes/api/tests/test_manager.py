@@ -19,7 +19,8 @@ import pytest
 import pandas as pd
 
 # ---- Local imports
-from sardes.api.taskmanagers import WorkerBase, TaskManagerBase
+from sardes.api.taskmanagers import (
+    WorkerBase, TaskManagerBase, TaskPriority, WorkerProcessPool)
 
 
 # =============================================================================
@@ -46,14 +47,33 @@ def worker(DATAF):
     return worker
 
 
+@pytest.fixture
+def read_worker_class(DATAF):
+    class ReadWorker(WorkerBase):
+        READ_TASKS = ('get_something', )
+
+        def create_read_worker(self):
+            return ReadWorker()
+
+        def _get_something(self, delay=0.5):
+            sleep(delay)
+            return DATAF.copy(),
+
+        def _set_something(self, index, value):
+            sleep(0.5)
+            DATAF.loc[index, 'values'] = value
+
+    return ReadWorker
+
+
 @pytest.fixture
 def task_manager(worker, qtbot):
     task_manager = TaskManagerBase()
     task_manager.set_worker(worker)
     yield task_manager
 
-    # We wait for the manager's thread to fully stop to avoid segfault error.
-    qtbot.waitUntil(lambda: not task_manager._thread.isRunning())
+    # We stop the manager's threads to avoid segfault error.
+    task_manager.stop()
 
 
 # =============================================================================
@@ -121,7 +141,7 @@ def test_run_tasks_if_busy(task_manager, qtbot):
         assert len(task_manager._queued_tasks) == 0
         assert len(task_manager._pending_tasks) == 0
         assert len(task_manager._running_tasks) == 3
-        assert task_manager._thread.isRunning()
+        assert task_manager._is_worker_busy(task_manager.worker())
 
         # While the worker is running, we add two other tasks to the manager.
         task_manager.add_task('set_something', None, 1, 0.512)
@@ -129,7 +149,7 @@ def test_run_tasks_if_busy(task_manager, qtbot):
         assert len(task_manager._queued_tasks) == 2
         assert len(task_manager._pending_tasks) == 0
         assert len(task_manager._running_tasks) == 3
-        assert task_manager._thread.isRunning()
+        assert task_manager._is_worker_busy(task_manager.worker())
 
         # We then ask the manager to execute the tasks that we just added.
         # These additional tasks should be run automatically after the first
@@ -138,7 +158,7 @@ def test_run_tasks_if_busy(task_manager, qtbot):
         assert len(task_manager._queued_tasks) == 0
         assert len(task_manager._pending_tasks) == 2
         assert len(task_manager._running_tasks) == 3
-        assert task_manager._thread.isRunning()
+        assert task_manager._is_worker_busy(task_manager.worker())
 
     # We then assert that all tasks have been executed as expected.
     assert len(task_manager._queued_tasks) == 0
@@ -151,5 +171,400 @@ def test_run_tasks_if_busy(task_manager, qtbot):
     assert returned_values[2]['values'].values.tolist() == [1, 0.512, -19.5, 4]
 
 
+def test_workers_threads_are_long_lived(task_manager, qtbot):
+    """
+    Test that the threads of the workers are started once and keep running
+    between the runs of tasks, and that they are started again if tasks are
+    added after the manager was stopped.
+    """
+    assert task_manager._thread.isRunning()
+
+    returned_values = []
+
+    def task_callback(dataf):
+        returned_values.append(dataf)
+
+    for i in range(2):
+        with qtbot.waitSignal(task_manager.sig_run_tasks_finished):
+            task_manager.add_task('get_something', task_callback)
+            task_manager.run_tasks()
+        assert task_manager._thread.isRunning()
+    assert len(returned_values) == 2
+
+    task_manager.stop()
+    assert not task_manager._thread.isRunning()
+
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished):
+        task_manager.add_task('get_something', task_callback)
+        task_manager.run_tasks()
+    assert task_manager._thread.isRunning()
+    assert len(returned_values) == 3
+
+
+def test_run_read_tasks_concurrently(read_worker_class, qtbot):
+    """
+    Test that the manager is executing read tasks concurrently with its
+    pool of read workers, while write tasks are executed serially and
+    callbacks are called in the order in which the tasks were added.
+    """
+    task_manager = TaskManagerBase(nbr_read_workers=3)
+    task_manager.set_worker(read_worker_class())
+    assert len(task_manager.read_workers()) == 3
+
+    returned_values = []
+
+    def task_callback(dataf):
+        returned_values.append(dataf)
+
+    # Add some tasks to the manager. The first task takes more time to
+    # complete than the second and third task.
+    task_manager.add_task('get_something', task_callback, 1)
+    task_manager.add_task('get_something', task_callback, 0.1)
+    task_manager.add_task('get_something', task_callback, 0.2)
+    task_manager.add_task('set_something', None, 2, -19.5)
+    task_manager.add_task('get_something', task_callback, 0.1)
+
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.run_tasks()
+
+        # Assert that the three first read tasks were sent to the read
+        # workers, while the write task and the last read task are waiting.
+        assert len(task_manager._queued_tasks) == 0
+        assert len(task_manager._pending_tasks) == 2
+        assert len(task_manager._running_tasks) == 3
+        for worker in task_manager.read_workers():
+            assert task_manager._is_worker_busy(worker)
+        assert not task_manager._is_worker_busy(task_manager.worker())
+
+        # Assert that the callbacks of the second and third tasks are not
+        # called before that of the first task.
+        qtbot.wait(500)
+        assert len(returned_values) == 0
+        assert len(task_manager._running_tasks) == 3
+
+    assert len(task_manager._running_tasks) == 0
+    assert len(task_manager._pending_tasks) == 0
+    assert len(returned_values) == 4
+    for i in range(3):
+        assert returned_values[i]['values'].values.tolist() == [1, 2, 3, 4]
+    assert returned_values[3]['values'].values.tolist() == [1, 2, -19.5, 4]
+
+    task_manager.stop()
+
+
+def test_run_tasks_by_priority(read_worker_class, qtbot):
+    """
+    Test that pending read tasks are executed by order of priority.
+    """
+    task_manager = TaskManagerBase(nbr_read_workers=1)
+    task_manager.set_worker(read_worker_class())
+
+    executed_tasks = []
+
+    # Keep the read worker busy with a first task.
+    task_manager.add_task(
+        'get_something', lambda dataf: executed_tasks.append('first'), 0.5)
+    task_manager.run_tasks()
+
+    # Add a background and an interactive task while the worker is busy.
+    task_manager.add_task(
+        'get_something', lambda dataf: executed_tasks.append('background'),
+        0.1, priority=TaskPriority.Background)
+    task_manager.run_tasks()
+    task_manager.add_task(
+        'get_something', lambda dataf: executed_tasks.append('interactive'),
+        0.2, priority=TaskPriority.Interactive)
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.run_tasks()
+        assert len(task_manager._pending_tasks) == 2
+    assert executed_tasks == ['first', 'interactive', 'background']
+
+    task_manager.stop()
+
+
+def test_coalesce_identical_tasks(read_worker_class, qtbot):
+    """
+    Test that identical read tasks are executed only once and that their
+    result is passed to the callbacks of all of them, but that read tasks
+    added after a write task are not coalesced with those added before it.
+    """
+    task_manager = TaskManagerBase(nbr_read_workers=1)
+    task_manager.set_worker(read_worker_class())
+
+    returned_values = []
+
+    def task_callback(dataf):
+        returned_values.append(dataf)
+
+    for i in range(3):
+        task_manager.add_task('get_something', task_callback, 0.1)
+    task_manager.add_task('set_something', None, 2, -19.5)
+    task_manager.add_task('get_something', task_callback, 0.1)
+
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.run_tasks()
+
+        # Assert that only one of the three identical read tasks was sent
+        # to the read worker.
+        assert len(task_manager._pending_tasks) == 2
+        assert len(task_manager._running_tasks) == 3
+        assert len(task_manager._task_workers) == 1
+
+    assert len(returned_values) == 4
+    assert returned_values[0] is returned_values[1]
+    assert returned_values[0] is returned_values[2]
+    assert returned_values[0]['values'].values.tolist() == [1, 2, 3, 4]
+    assert returned_values[3]['values'].values.tolist() == [1, 2, -19.5, 4]
+    assert task_manager._coalesced_tasks == {}
+    assert task_manager._task_followers == {}
+
+    # Assert that tasks with unhashable arguments are never coalesced.
+    task_manager.add_task('get_something', None, delay=pd.Index([0.1]))
+    assert task_manager._get_task_signature(
+        task_manager._queued_tasks[0]) is None
+
+    task_manager.stop()
+
+
+def test_cancel_tasks_by_key(read_worker_class, qtbot):
+    """
+    Test that tasks superseded by a more recent task with the same key
+    are cancelled and that their callbacks are never called.
+    """
+    task_manager = TaskManagerBase(nbr_read_workers=1)
+    task_manager.set_worker(read_worker_class())
+
+    returned_values = []
+
+    # Cancel a task that is queued.
+    task_manager.add_task(
+        'get_something', lambda dataf: returned_values.append('queued'),
+        0.1, key='well')
+    assert len(task_manager._queued_tasks) == 1
+
+    # Cancel a task that was sent to the read worker.
+    task_manager.add_task(
+        'get_something', lambda dataf: returned_values.append('running'),
+        0.5, key='well')
+    assert len(task_manager._queued_tasks) == 1
+    task_manager.run_tasks()
+    assert len(task_manager._task_workers) == 1
+
+    # We wait for the worker to start the task.
+    qtbot.waitUntil(lambda: len(task_manager.read_workers()[0]._tasks) == 0)
+
+    task_manager.add_task(
+        'get_something', lambda dataf: returned_values.append('latest'),
+        0.2, key='well')
+
+    # Cancel a task that is pending.
+    task_manager.add_task(
+        'get_something', lambda dataf: returned_values.append('pending'),
+        0.3, key='other')
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.run_tasks()
+        assert len(task_manager._pending_tasks) == 2
+        task_manager.cancel_tasks('other')
+        assert len(task_manager._pending_tasks) == 1
+
+    assert returned_values == ['latest']
+    assert len(task_manager._running_tasks) == 0
+    assert task_manager._task_keys == {}
+    assert task_manager._task_callbacks == {}
+    assert task_manager._cancelled_tasks == set()
+
+    task_manager.stop()
+
+
+def test_cancel_tasks_callback(read_worker_class, qtbot):
+    """
+    Test that the callback passed to cancel_tasks is called only once the
+    cancelled task has stopped and that a read task with the same key is
+    not executed before that.
+    """
+    task_manager = TaskManagerBase(nbr_read_workers=2)
+    task_manager.set_worker(read_worker_class())
+
+    events = []
+
+    # Assert that the callback is called right away when no cancelled task
+    # was being executed by a worker.
+    task_manager.cancel_tasks('well', lambda: events.append('none'))
+    assert events == ['none']
+
+    # Cancel a task that is executed by a read worker and add a new task
+    # with the same key right away.
+    events = []
+    task_manager.add_task(
+        'get_something', lambda dataf: events.append('cancelled'),
+        1, key='well')
+    task_manager.run_tasks()
+    qtbot.waitUntil(lambda: len(task_manager.read_workers()[0]._tasks) == 0)
+    task_manager.cancel_tasks('well', lambda: events.append('stopped'))
+    task_manager.add_task(
+        'get_something', lambda dataf: events.append('latest'),
+        0.1, key='well')
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.run_tasks()
+
+        # Assert that the new task waits for the cancelled task to stop,
+        # even though a read worker is available.
+        assert events == []
+        assert len(task_manager._pending_tasks) == 1
+        assert len(task_manager._task_workers) == 1
+    assert events == ['stopped', 'latest']
+    assert task_manager._cancel_callbacks == []
+    assert task_manager._worker_keys == {}
+
+    task_manager.stop()
+
+
+def test_partial_results(qtbot):
+    """
+    Test that the partial results sent by a task are delivered in order to
+    its partial callback and that no partial results are delivered
+    anymore once the task is cancelled.
+    """
+    class ChunksWorker(WorkerBase):
+        def _get_chunks(self, nbr_chunks):
+            for i in range(nbr_chunks):
+                if self.is_current_task_cancelled():
+                    break
+                sleep(0.1)
+                self.emit_partial_result(i, i == 0)
+            return i,
+
+    task_manager = TaskManagerBase()
+    task_manager.set_worker(ChunksWorker())
+
+    # Assert that all partial results are delivered before the callback.
+    chunks = []
+    returned_values = []
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.add_task(
+            'get_chunks', lambda i: returned_values.append(len(chunks)), 3,
+            partial_callback=lambda i, is_first: chunks.append((i, is_first)))
+        task_manager.run_tasks()
+    assert chunks == [(0, True), (1, False), (2, False)]
+    assert returned_values == [3]
+    assert task_manager._task_partial_callbacks == {}
+
+    # Assert that the partial results of a cancelled task are not delivered.
+    chunks = []
+    returned_values = []
+    task_manager.add_task(
+        'get_chunks', returned_values.append, 100, key='chunks',
+        partial_callback=lambda i, is_first: chunks.append(i))
+    task_manager.run_tasks()
+    qtbot.waitUntil(lambda: len(chunks) >= 1)
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.cancel_tasks('chunks')
+    assert 1 <= len(chunks) < 100
+    assert returned_values == []
+    assert task_manager._task_partial_callbacks == {}
+
+    task_manager.stop()
+
+
+def test_worker_process_pool(qtbot):
+    """
+    Test that the jobs submitted to a WorkerProcessPool by a task are
+    executed in separate processes, that their progress is sent as partial
+    results of the task and that the pool stops when the task is cancelled.
+    """
+    class PoolWorker(WorkerBase):
+        def _square_values(self, values):
+            squares = {}
+            with WorkerProcessPool(
+                    self, squares.__setitem__, 2, len(values)) as pool:
+                for value in values:
+                    if value is None:
+                        pool.skip()
+                    else:
+                        pool.submit(value, pow, value, 2)
+                if not pool.join():
+                    return None,
+            return {key: future.result() for
+                    key, future in squares.items()},
+
+        def _sleep(self, nbr_jobs):
+            with WorkerProcessPool(
+                    self, lambda *args: None, 1, nbr_jobs) as pool:
+                for i in range(nbr_jobs):
+                    pool.submit(None, sleep, 1)
+                return pool.join(),
+
+    task_manager = TaskManagerBase()
+    task_manager.set_worker(PoolWorker())
+
+    progress = []
+    returned_values = []
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=30000):
+        task_manager.add_task(
+            'square_values', returned_values.append, [1, None, 2, 3],
+            partial_callback=progress.append)
+        task_manager.run_tasks()
+    assert returned_values == [{1: 1, 2: 4, 3: 9}]
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+
+    # Assert that the pool stops waiting for the jobs once the task
+    # is cancelled.
+    returned_values = []
+    task_manager.add_task('sleep', returned_values.append, 2, key='sleep')
+    task_manager.run_tasks()
+    qtbot.wait(500)
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.cancel_tasks('sleep')
+    assert returned_values == []
+    assert task_manager.worker()._current_task_uuid4 is None
+
+    task_manager.stop()
+
+
+def test_task_stats(task_manager, qtbot, capsys):
+    """
+    Test that the manager is recording the time spent by the tasks waiting
+    to be executed, executing, and in their callback, and that slow tasks
+    are logged with their arguments.
+    """
+    task_stats = task_manager.task_stats()
+    task_stats.slow_task_threshold = 0.75
+    assert task_stats.tasks() == []
+
+    task_manager.add_task('get_something', lambda dataf: sleep(0.1))
+    task_manager.add_task('set_something', None, 2, -19.5)
+    with qtbot.waitSignal(task_manager.sig_run_tasks_finished, timeout=5000):
+        task_manager.run_tasks()
+    assert task_manager._task_times == {}
+
+    assert sorted(task_stats.tasks()) == ['get_something', 'set_something']
+    assert task_stats.count('get_something') == 1
+    assert task_stats.count('set_something') == 1
+
+    # The 'set_something' task had to wait for the 'get_something' task
+    # to complete.
+    assert task_stats.times('get_something', 'queued')[0] < 0.1
+    assert task_stats.times('set_something', 'queued')[0] >= 0.5
+    assert task_stats.times('get_something', 'executing')[0] >= 0.5
+    assert task_stats.times('set_something', 'executing')[0] >= 0.5
+    assert task_stats.times('get_something', 'callback')[0] >= 0.1
+    assert task_stats.times('set_something', 'callback')[0] < 0.1
+    assert task_stats.histogram('get_something') == [0, 0, 1, 0, 0]
+
+    # Only the 'set_something' task took longer than the threshold.
+    captured = capsys.readouterr()
+    assert "Slow task 'get_something'" not in captured.out
+    assert "Slow task 'set_something'" in captured.out
+    assert "with arguments (2, -19.5)." in captured.out
+
+    report = task_stats.report()
+    assert 'get_something (count: 1)' in report
+    assert 'set_something (count: 1)' in report
+
+    task_stats.clear()
+    assert task_stats.tasks() == []
+
+
 if __name__ == "__main__":
     pytest.main(['-x', __file__, '-v', '-rw'])
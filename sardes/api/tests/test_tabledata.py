@@ -292,6 +292,32 @@ def test_edit_deleted_row(tabledata):
     assert tabledata.deleted_rows() == pd.Index([1])
 
 
+def test_copy_data_on_write(dataset):
+    """
+    Test that the data are shared with the dataframe passed to the table
+    data until they are edited for the first time.
+    """
+    tabledata = SardesTableData(dataset)
+    assert tabledata.view() is dataset
+
+    # Deleting rows does not change the data.
+    tabledata.delete_row(pd.Index([1]))
+    assert tabledata.view() is dataset
+
+    # The data are copied when a value is edited.
+    tabledata.set(0, 2, 9.999)
+    assert tabledata.view() is not dataset
+    assert tabledata.view().iat[0, 2] == 9.999
+    assert dataset.values.tolist() == VALUES
+
+    # Adding and removing a new row does not change the shared dataframe.
+    tabledata = SardesTableData(dataset)
+    tabledata.add_row(pd.Index(['new_row_index']), [{'col0': 'str4'}])
+    tabledata.undo_edit()
+    assert dataset.values.tolist() == VALUES
+    assert tabledata.data.values.tolist() == VALUES
+
+
 def test_undo_redo(tabledata):
     """
     Test that the undo and redo functionalities are working as expected.
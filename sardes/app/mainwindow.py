@@ -279,6 +279,16 @@ class MainWindowBase(QMainWindow):
                 triggered=self.console.show
                 )
 
+        # Create the action to show statistics on the database tasks.
+        self.task_stats_action = None
+        if self.console is not None:
+            self.task_stats_action = create_action(
+                self, _('Database Tasks Statistics...'),
+                tip=_('Show statistics on the time spent by the database '
+                      'tasks in the Sardes console.'),
+                triggered=self.show_task_stats
+                )
+
         # Create the panes and toolbars menus and actions
         self.panes_menu = QMenu(_("Panes"), self)
         self.panes_menu.setIcon(get_icon('panes'))
@@ -322,7 +332,8 @@ class MainWindowBase(QMainWindow):
         # Add the actions and menus to the options menu.
         options_menu_items = [
             self.lang_menu, preferences_action, self.console_action,
-            Separator(), self.panes_menu, self.toolbars_menu,
+            self.task_stats_action, Separator(),
+            self.panes_menu, self.toolbars_menu,
             self.lock_dockwidgets_and_toolbars_action,
             self.reset_window_layout_action, Separator(),
             report_action, update_action, self.about_action,
@@ -476,6 +487,19 @@ class MainWindowBase(QMainWindow):
         filteredMenu.removeAction(self.options_menu_toolbar.toggleViewAction())
         return filteredMenu
 
+    def show_task_stats(self):
+        """
+        Print statistics on the time spent by the database tasks in the
+        Sardes console and show it.
+        """
+        print('-' * 20)
+        print("Database tasks statistics")
+        print('-' * 20)
+        print(self.db_connection_manager.task_stats().report())
+        print('-' * 20)
+        if self.console is not None:
+            self.console.show()
+
     # ---- Handlers
     def _handle_project_manager_closed(self, *args, **kargs):
         """
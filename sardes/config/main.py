@@ -35,6 +35,7 @@ DEFAULTS = [
     ('database',
         {'dbtype_last_selected': 'Sardes SQLite',
          'auto_connect_to_database': False,
+         'slow_task_threshold': 1,
          }
      ),
     ('documents_settings',
@@ -7,6 +7,9 @@
 # Licensed under the terms of the GNU General Public License.
 # -----------------------------------------------------------------------------
 
+# ---- Standard imports
+import hashlib
+
 # ---- Third party imports
 import pandas as pd
 
@@ -69,6 +72,228 @@ def create_empty_readings(data_types):
     return dataframe
 
 
+def group_readings_by_obs_well(readings):
+    """
+    Iterate over the readings of many monitoring stations in long format,
+    as returned by the `get_timeseries_for_obs_wells` method of the
+    database accessors, grouped by monitoring station.
+
+    Parameters
+    ----------
+    readings : DataFrame
+        A pandas dataframe containing the readings of many monitoring
+        stations, where the monitoring station of each reading is stored
+        in a column named 'sampling_feature_uuid'.
+
+    Yields
+    ------
+    tuple
+        The unique identifier of a monitoring station and a pandas dataframe
+        containing the readings of that station, formatted as those returned
+        by the `get_timeseries_for_obs_well` method of the database accessors.
+    """
+    for obs_well_id, well_readings in readings.groupby(
+            'sampling_feature_uuid', sort=False):
+        # Drop the columns of the data types for which there is no
+        # reading for this monitoring station.
+        empty_columns = [
+            col for col in well_readings.columns if
+            col not in ('sampling_feature_uuid', 'datetime', 'sonde_id',
+                        'install_depth', 'obs_id') and
+            well_readings[col].isnull().all()]
+        well_readings = (
+            well_readings
+            .drop(columns=['sampling_feature_uuid'] + empty_columns)
+            .sort_values('datetime', axis=0, ascending=True)
+            .reset_index(drop=True)
+            )
+        yield obs_well_id, well_readings
+
+
+# The frequencies and the aggregation functions that are supported when
+# fetching aggregated readings from the database.
+AGGREGATION_FREQS = ('D', 'M')
+AGGREGATION_FUNCS = ('min', 'max', 'mean', 'first')
+
+
+def aggregate_readings(readings, freq, agg='mean'):
+    """
+    Aggregate the readings of a monitoring station by day or month.
+
+    Parameters
+    ----------
+    readings : DataFrame
+        A pandas dataframe containing the readings of a monitoring station,
+        as returned by the `get_timeseries_for_obs_well` method of the
+        database accessors.
+    freq : str
+        The frequency at which the readings are aggregated, either 'D' for
+        daily or 'M' for monthly values.
+    agg : str
+        The function used to aggregate the readings of each data type,
+        either 'min', 'max', 'mean' or 'first'. The default is 'mean'.
+
+    Returns
+    -------
+    DataFrame
+        A pandas dataframe formatted as the readings, where the readings are
+        aggregated for each observation ID and the datetime is the start of
+        the day or month.
+    """
+    if freq not in AGGREGATION_FREQS:
+        raise ValueError("freq must be one of {}.".format(AGGREGATION_FREQS))
+    if agg not in AGGREGATION_FUNCS:
+        raise ValueError("agg must be one of {}.".format(AGGREGATION_FUNCS))
+    if readings.empty:
+        return readings
+
+    columns = readings.columns
+    data_types = [
+        col for col in columns if
+        col not in ('datetime', 'sonde_id', 'install_depth', 'obs_id')]
+    buckets = readings['datetime'].dt.to_period(freq).dt.start_time
+
+    grouped = readings.groupby(['obs_id', buckets.rename('bucket')])
+    aggregated = grouped[data_types].agg(agg)
+    aggregated[['sonde_id', 'install_depth']] = (
+        grouped[['sonde_id', 'install_depth']].first())
+    aggregated = aggregated.reset_index().rename(
+        columns={'bucket': 'datetime'})
+
+    return (
+        aggregated[list(columns)]
+        .sort_values('datetime', axis=0, ascending=True)
+        .reset_index(drop=True)
+        )
+
+
+DAILY_AGGREGATE_COLUMNS = [
+    'datetime', 'obs_id', 'data_type', 'first', 'mean', 'min', 'max',
+    'count']
+
+
+def compute_daily_aggregates(readings):
+    """
+    Compute the first, mean, min and max value and the number of readings
+    of each day for each data type and observation ID of the readings of a
+    monitoring station.
+
+    Parameters
+    ----------
+    readings : DataFrame
+        A pandas dataframe containing the readings of a monitoring station,
+        as returned by the `get_timeseries_for_obs_well` method of the
+        database accessors.
+
+    Returns
+    -------
+    DataFrame
+        A pandas dataframe in long format, as returned by the
+        `get_daily_timeseries_aggregates` method of the database accessors.
+    """
+    data_types = [
+        col for col in readings.columns if
+        col not in ('datetime', 'sonde_id', 'install_depth', 'obs_id')]
+    aggregates_list = []
+    for data_type in data_types:
+        data = (
+            readings[['datetime', 'obs_id', data_type]]
+            .dropna(subset=[data_type])
+            .sort_values('datetime', kind='mergesort'))
+        aggregates = (
+            data.groupby(['obs_id', data['datetime'].dt.normalize()])
+            [data_type].agg(['first', 'mean', 'min', 'max', 'count'])
+            .reset_index())
+        aggregates.insert(2, 'data_type', data_type)
+        aggregates_list.append(aggregates)
+    return format_daily_aggregates(aggregates_list)
+
+
+def format_daily_aggregates(aggregates_list):
+    """
+    Concatenate the daily aggregates of the readings of a monitoring station
+    that were computed for each data type separately.
+
+    Parameters
+    ----------
+    aggregates_list : list of DataFrame
+        A list of pandas dataframes containing the daily aggregates of
+        the readings of a single data type.
+
+    Returns
+    -------
+    DataFrame
+        A pandas dataframe in long format with columns 'datetime', 'obs_id',
+        'data_type', 'first', 'mean', 'min', 'max' and 'count', where the
+        datetime is the start of the day.
+    """
+    aggregates_list = [
+        aggregates[DAILY_AGGREGATE_COLUMNS] for aggregates in
+        aggregates_list if not aggregates.empty]
+    if not aggregates_list:
+        aggregates = pd.DataFrame([], columns=DAILY_AGGREGATE_COLUMNS)
+    else:
+        aggregates = pd.concat(aggregates_list, ignore_index=True)
+
+    # Make sure the columns have the right dtype.
+    aggregates['datetime'] = pd.to_datetime(aggregates['datetime'])
+    aggregates['obs_id'] = aggregates['obs_id'].astype(pd.Int64Dtype())
+    for column in ['first', 'mean', 'min', 'max']:
+        aggregates[column] = aggregates[column].astype(float)
+    aggregates['count'] = aggregates['count'].astype(int)
+
+    return aggregates
+
+
+def compute_readings_versions(aggregates):
+    """
+    Compute a version of the readings of many monitoring stations from
+    the daily aggregates of their readings.
+
+    Parameters
+    ----------
+    aggregates : DataFrame
+        A pandas dataframe containing the daily aggregates of the readings
+        of many monitoring stations in long format, as returned by
+        `format_daily_aggregates`, with an additional column
+        'sampling_feature_uuid'.
+
+    Returns
+    -------
+    DataFrame
+        A pandas dataframe indexed by monitoring station with columns
+        'last_date', 'count' and 'digest', where 'digest' is a digest of
+        the first, mean, min and max value and the number of readings of
+        each day for each data type and observation ID of the station.
+        Monitoring stations without readings are not included.
+    """
+    aggregates = aggregates[aggregates['count'] > 0]
+    aggregates = aggregates.assign(
+        obs_id=aggregates['obs_id'].astype('int64'),
+        data_type=aggregates['data_type'].map(lambda dtype: dtype.value)
+        ).sort_values(
+            ['sampling_feature_uuid', 'obs_id', 'data_type', 'datetime'],
+            kind='mergesort', ignore_index=True)
+
+    row_hashes = pd.util.hash_pandas_object(
+        aggregates[DAILY_AGGREGATE_COLUMNS], index=False).values
+    dates = aggregates['datetime'].values
+    counts = aggregates['count'].values
+    versions = {}
+    for station_uuid, indexes in aggregates.groupby(
+            'sampling_feature_uuid', sort=False).indices.items():
+        versions[station_uuid] = {
+            'last_date': dates[indexes].max(),
+            'count': counts[indexes].sum(),
+            'digest': hashlib.sha1(row_hashes[indexes].tobytes()).hexdigest()
+            }
+    versions = pd.DataFrame.from_dict(
+        versions, orient='index', columns=['last_date', 'count', 'digest'])
+    versions['last_date'] = pd.to_datetime(versions['last_date'])
+    versions.index.name = 'sampling_feature_uuid'
+    return versions
+
+
 if __name__ == "__main__":
     from sardes.api.timeseries import DataType
     data_types = [DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC]
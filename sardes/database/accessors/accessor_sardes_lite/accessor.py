@@ -36,11 +36,14 @@ from sqlalchemy.orm.exc import NoResultFound
 # ---- Local imports
 from sardes.config.locale import _
 from sardes.api.database_accessor import (
-    DatabaseAccessor, DatabaseAccessorError)
+    DatabaseAccessor, DatabaseAccessorError, readmethod, writemethod)
 from sardes.database.accessors.accessor_errors import (
     DatabaseVersionError, SardesVersionError, DatabaseUpdateError)
-from sardes.database.accessors.accessor_helpers import create_empty_readings
+from sardes.database.accessors.accessor_helpers import (
+    create_empty_readings, format_daily_aggregates, compute_readings_versions,
+    AGGREGATION_FREQS, AGGREGATION_FUNCS)
 from sardes.database.utils import format_sqlobject_repr
+from sardes.utils.data_operations import intervals_extract
 from sardes.api.timeseries import DataType
 
 
@@ -49,7 +52,7 @@ from sardes.api.timeseries import DataType
 APPLICATION_ID = 1013042054
 
 # The latest version of the database schema.
-CURRENT_SCHEMA_VERSION = 4
+CURRENT_SCHEMA_VERSION = 5
 
 # The format that is used to store datetime values in the database.
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
@@ -371,6 +374,31 @@ class TimeSeriesData(BaseMixin, Base):
         primary_key=True, index=True)
 
 
+class TimeSeriesDailyAggregate(BaseMixin, Base):
+    """
+    An object used to map the 'timeseries_daily_aggregate' table. This
+    table contains the first, mean, min and max value and the number of
+    readings of each day for each timeseries channel.
+
+    Since the readings are usually acquired every 15 minutes or every
+    hour, reading this table instead of the 'timeseries_data' table
+    requires reading 24 to 100 times fewer rows to plot or aggregate
+    the readings over long periods. The content of this table is updated
+    incrementally each time readings are added, edited or deleted.
+    """
+    __tablename__ = 'timeseries_daily_aggregate'
+
+    channel_id = Column(
+        Integer, ForeignKey('timeseries_channel.channel_id'),
+        primary_key=True)
+    date = Column(DateTime, primary_key=True)
+    first_value = Column(Float)
+    mean_value = Column(Float)
+    min_value = Column(Float)
+    max_value = Column(Float)
+    value_count = Column(Integer)
+
+
 class GenericNumericalData(BaseMixin, Base):
     """
     An object used to map the 'generique'.
@@ -618,7 +646,13 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
         self._session = Session()
 
     def begin_transaction(self, exclusive=True):
-        """Begin a new transaction with the database."""
+        """
+        Begin a new transaction with the database.
+
+        If exclusive is False, only a shared lock is acquired on the
+        database, so that the transaction can be executed concurrently with
+        other read transactions made with other connections.
+        """
         if self._session.in_transaction():
             # The session is already in transaction with the database, so
             # there is no need to begin a new transaction.
@@ -629,8 +663,17 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
         while True:
             self._begin_transaction_try_count += 1
             try:
-                self._session.execute("BEGIN EXCLUSIVE")
+                if exclusive:
+                    self._session.execute("BEGIN EXCLUSIVE")
+                else:
+                    # A deferred transaction does not acquire any lock
+                    # until the database is first read, so we read the
+                    # schema to acquire the shared lock right away.
+                    self._session.execute("BEGIN DEFERRED")
+                    self._session.execute(
+                        "SELECT count(*) FROM sqlite_master").first()
             except OperationalError as e:
+                self._session.rollback()
                 if "database is locked" in str(e.orig).lower():
                     print(('Failed to begin a new transaction after '
                            '{:0.1f} sec because database is locked by '
@@ -694,7 +737,8 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
                   SondeFeature, SondeModel, SondeInstallation, Process, Repere,
                   ObservationType, Observation, ObservedProperty,
                   GenericNumericalData, TimeSeriesChannel,
-                  TimeSeriesData, SamplingFeatureAttachment,
+                  TimeSeriesData, TimeSeriesDailyAggregate,
+                  SamplingFeatureAttachment,
                   Remark, RemarkType,
                   PumpType, HGSamplingMethod, HGParam, Purge,
                   HGSurvey, HGParamValue, MeasurementUnits, HGLab
@@ -752,6 +796,19 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
                         DatabaseUpdateError(from_version, to_version, error))
             else:
                 self.commit_transaction()
+        to_version = 5
+        if self.version() < to_version:
+            self.begin_transaction()
+            try:
+                db_updates._update_v4_to_v5(self)
+                self.execute(f"PRAGMA user_version = {to_version}")
+            except Exception as error:
+                self._session.rollback()
+                return (from_version,
+                        to_version,
+                        DatabaseUpdateError(from_version, to_version, error))
+            else:
+                self.commit_transaction()
         if vacuum_needed is True:
             # We cannot do a vacuum from within a transaction.
             # TODO: implement a new vacuum method that handle the case
@@ -759,6 +816,53 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
             self._engine.execute("vacuum")
         return from_version, CURRENT_SCHEMA_VERSION, None
 
+    # ---- Columnar archive
+    @readmethod
+    def export_parquet_archive(self, dirname: str, chunksize: int = 100000):
+        """
+        Export the content of the database to a columnar archive of
+        Apache Parquet files saved in dirname.
+
+        The tables and readings are streamed from the database by chunks of
+        chunksize rows and the readings are partitioned by monitoring
+        station and year. This requires pyarrow.
+
+        Returns the manifest of the archive.
+        """
+        from sardes.database.accessors.accessor_sardes_lite.archive import (
+            export_parquet_archive)
+        return export_parquet_archive(self, dirname, chunksize)
+
+    @writemethod
+    def import_parquet_archive(self, dirname: str, chunksize: int = 100000,
+                               auto_commit: bool = True):
+        """
+        Replace the content of the database with the content of the
+        columnar archive saved in dirname.
+
+        The archive is read by batches of chunksize rows that are added to
+        the database with bulk inserts, so that a database can be rebuilt
+        from an archive much faster than by adding its items one by one.
+        This requires pyarrow.
+
+        Archives with an older schema version are imported at their own
+        version and the database is then updated to the current version,
+        which commits the transaction regardless of auto_commit.
+
+        Returns the manifest of the imported archive.
+        """
+        from sardes.database.accessors.accessor_sardes_lite.archive import (
+            import_parquet_archive)
+        manifest = import_parquet_archive(self, dirname, chunksize)
+        if manifest['schema_version'] < CURRENT_SCHEMA_VERSION:
+            # We need to commit the imported data before updating the
+            # database, since the updates are done in their own transactions.
+            self.commit_transaction()
+            from_version, to_version, error = self.update_database()
+            if error is not None:
+                raise error
+        return manifest
+
     # ---- Database connection
     def is_connected(self):
         """Return whether a connection to a database is currently active."""
@@ -820,6 +924,16 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
             self.commit_transaction()
         return connection, connection_error
 
+    def create_read_accessor(self):
+        """
+        Create and return a new accessor, with its own connection to the
+        database, that can be used to read data from another thread
+        concurrently with this accessor.
+        """
+        read_accessor = DatabaseAccessorSardesLite(self._database)
+        read_accessor.connect()
+        return read_accessor if read_accessor.is_connected() else None
+
     def close_connection(self):
         """
         Close the current connection with the database.
@@ -1272,8 +1386,50 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
             .filter(TimeSeriesData.datetime.in_(date_times))
             )
 
+    def _format_data_types(self, data_types=None):
+        """
+        Return a list of DataType from the given data types or the
+        default list of data types if data_types is None.
+        """
+        if isinstance(data_types, str) or isinstance(data_types, DataType):
+            data_types = [data_types, ]
+        if data_types is None:
+            return [DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC]
+        else:
+            return [
+                DataType[data_type] if isinstance(data_type, str) else
+                DataType(data_type) for data_type in data_types]
+
+    def _get_timeseries_chunk_start(self, sampling_feature_uuid,
+                                    data_types=None, end=None, size=10000):
+        """
+        Return the datetime of the size-th most recent reading for the given
+        data types and monitoring station that is older than end, or None
+        if there is less than size readings older than end.
+        """
+        obs_property_ids = [
+            self._get_observed_property_id(data_type) for
+            data_type in self._format_data_types(data_types)]
+        query = (
+            self._session.query(TimeSeriesData.datetime)
+            .filter(TimeSeriesChannel.obs_property_id.in_(obs_property_ids))
+            .filter(Observation.sampling_feature_uuid ==
+                    sampling_feature_uuid)
+            .filter(Observation.observation_id ==
+                    TimeSeriesChannel.observation_id)
+            .filter(TimeSeriesData.channel_id ==
+                    TimeSeriesChannel.channel_id)
+            )
+        if end is not None:
+            query = query.filter(
+                TimeSeriesData.datetime < pd.Timestamp(end).to_pydatetime())
+        result = (
+            query.order_by(TimeSeriesData.datetime.desc())
+            .offset(size - 1).limit(1).first())
+        return None if result is None else result[0]
+
     def _get_timeseries_for_obs_well(self, sampling_feature_uuid,
-                                     data_types=None):
+                                     data_types=None, start=None, end=None):
         """
         Return a pandas dataframe containing the readings for the given
         data types and monitoring station.
@@ -1281,38 +1437,273 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
         If no data type are specified, then return the entire dataset for
         the specified monitoring station.
         """
-        if isinstance(data_types, str) or isinstance(data_types, DataType):
-            data_types = [data_types, ]
-        if data_types is None:
-            data_types = [
-                DataType.WaterLevel,
-                DataType.WaterTemp,
-                DataType.WaterEC]
+        data_types = self._format_data_types(data_types)
+
+        tseries_data_list = []
+        for data_type in data_types:
+            query = self._query_timeseries_data(
+                sampling_feature_uuid, data_type, start, end,
+                TimeSeriesData.value,
+                TimeSeriesData.datetime,
+                Observation.observation_id.label('obs_id'))
+            tseries_data_list.append(pd.read_sql_query(
+                query.statement, self._session.connection(), coerce_float=True,
+                parse_dates={'datetime': TO_DATETIME_ARGS}
+                ))
+        return self._merge_timeseries_data(tseries_data_list, data_types)
+
+    def _get_aggregated_timeseries_for_obs_well(
+            self, sampling_feature_uuid, data_types=None, freq='D',
+            agg='mean', start=None, end=None):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring station aggregated by day or month.
+
+        The readings are aggregated in the database by bucketing their
+        datetime, so that only the aggregated values are loaded in memory.
+        When start and end fall on midnight, the values are aggregated
+        from the daily aggregates of the readings instead. In both cases,
+        the null values are ignored.
+        """
+        if freq not in AGGREGATION_FREQS:
+            raise ValueError(
+                "freq must be one of {}.".format(AGGREGATION_FREQS))
+        if agg not in AGGREGATION_FUNCS:
+            raise ValueError(
+                "agg must be one of {}.".format(AGGREGATION_FUNCS))
+        data_types = self._format_data_types(data_types)
+
+        if all(date is None or
+               pd.Timestamp(date) == pd.Timestamp(date).normalize()
+               for date in (start, end)):
+            return self._aggregate_timeseries_daily_aggregate(
+                sampling_feature_uuid, data_types, freq, agg, start, end)
+
+        bucket = func.strftime(
+            {'D': '%Y-%m-%d', 'M': '%Y-%m-01'}[freq], TimeSeriesData.datetime
+            ).label('bucket')
+        if agg == 'first':
+            # When a query contains a min() aggregate function, SQLite
+            # returns the values of the row with the minimum value for the
+            # columns that are not aggregated.
+            columns = [TimeSeriesData.value,
+                       func.min(TimeSeriesData.datetime).label('first')]
         else:
-            data_types = [
-                DataType[data_type] if isinstance(data_type, str) else
-                DataType(data_type) for data_type in data_types]
+            columns = [{'min': func.min,
+                        'max': func.max,
+                        'mean': func.avg}[agg](TimeSeriesData.value)
+                       .label('value')]
 
-        readings_data = None
-        added_data_types = []
+        tseries_data_list = []
         for data_type in data_types:
+            query = (
+                self._query_timeseries_data(
+                    sampling_feature_uuid, data_type, start, end,
+                    bucket, Observation.observation_id.label('obs_id'),
+                    *columns)
+                .filter(TimeSeriesData.value.isnot(None))
+                .group_by(Observation.observation_id, bucket)
+                )
+            tseries_data = pd.read_sql_query(
+                query.statement, self._session.connection(), coerce_float=True,
+                parse_dates={'bucket': {'format': '%Y-%m-%d'}}
+                )
+            tseries_data_list.append(
+                tseries_data
+                .drop(columns=['first'], errors='ignore')
+                .rename(columns={'bucket': 'datetime'}))
+        return self._merge_timeseries_data(tseries_data_list, data_types)
+
+    def _aggregate_timeseries_daily_aggregate(
+            self, sampling_feature_uuid, data_types, freq, agg, start, end):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring station aggregated by day or month from
+        the daily aggregates of the readings.
+        """
+        bucket = func.strftime(
+            {'D': '%Y-%m-%d', 'M': '%Y-%m-01'}[freq],
+            TimeSeriesDailyAggregate.date
+            ).label('bucket')
+        if agg == 'first':
+            # See the note about the min() aggregate function
+            # in '_get_aggregated_timeseries_for_obs_well'.
+            columns = [TimeSeriesDailyAggregate.first_value.label('value'),
+                       func.min(TimeSeriesDailyAggregate.date).label('first')]
+        elif agg == 'mean':
+            # The mean of each bucket is the mean of the daily means
+            # weighted by the number of readings of each day.
+            columns = [
+                (func.sum(TimeSeriesDailyAggregate.mean_value *
+                          TimeSeriesDailyAggregate.value_count) /
+                 func.sum(TimeSeriesDailyAggregate.value_count)
+                 ).label('value')]
+        else:
+            columns = [{'min': func.min(TimeSeriesDailyAggregate.min_value),
+                        'max': func.max(TimeSeriesDailyAggregate.max_value)
+                        }[agg].label('value')]
+
+        tseries_data_list = []
+        for data_type in data_types:
+            query = (
+                self._query_timeseries_daily_aggregate(
+                    sampling_feature_uuid, data_type, start, end,
+                    bucket, Observation.observation_id.label('obs_id'),
+                    *columns)
+                .group_by(Observation.observation_id, bucket)
+                )
+            tseries_data = pd.read_sql_query(
+                query.statement, self._session.connection(), coerce_float=True,
+                parse_dates={'bucket': {'format': '%Y-%m-%d'}}
+                )
+            tseries_data_list.append(
+                tseries_data
+                .drop(columns=['first'], errors='ignore')
+                .rename(columns={'bucket': 'datetime'}))
+        return self._merge_timeseries_data(tseries_data_list, data_types)
+
+    def _get_daily_timeseries_aggregates(self, sampling_feature_uuid,
+                                         data_types=None, start=None,
+                                         end=None):
+        """
+        Return a pandas dataframe containing the daily aggregates of the
+        readings for the given data types and monitoring station.
+
+        The aggregates are read from the table where they are maintained,
+        so that reading them for long periods requires reading many
+        times fewer rows than reading the readings themselves.
+        """
+        data_types = self._format_data_types(data_types)
+        start = None if start is None else pd.Timestamp(start).ceil('D')
+        end = None if end is None else pd.Timestamp(end).ceil('D')
+
+        aggregates_list = []
+        for data_type in data_types:
+            query = self._query_timeseries_daily_aggregate(
+                sampling_feature_uuid, data_type, start, end,
+                TimeSeriesDailyAggregate.date.label('datetime'),
+                Observation.observation_id.label('obs_id'),
+                TimeSeriesDailyAggregate.first_value.label('first'),
+                TimeSeriesDailyAggregate.mean_value.label('mean'),
+                TimeSeriesDailyAggregate.min_value.label('min'),
+                TimeSeriesDailyAggregate.max_value.label('max'),
+                TimeSeriesDailyAggregate.value_count.label('count')
+                ).order_by(Observation.observation_id,
+                           TimeSeriesDailyAggregate.date)
+            aggregates = pd.read_sql_query(
+                query.statement, self._session.connection(),
+                coerce_float=True,
+                parse_dates={'datetime': TO_DATETIME_ARGS})
+            aggregates.insert(2, 'data_type', data_type)
+            aggregates_list.append(aggregates)
+        return format_daily_aggregates(aggregates_list)
+
+    def _get_timeseries_data_versions(self, data_types=None):
+        """
+        Return a pandas dataframe indexed by monitoring station containing
+        the start of the last day with readings, the number of readings and
+        a digest of the daily aggregates of the readings for the given
+        data types.
+
+        These values are computed from the daily aggregates of the readings,
+        without reading the readings themselves.
+        """
+        aggregates_list = []
+        for data_type in self._format_data_types(data_types):
             obs_property_id = self._get_observed_property_id(data_type)
             query = (
-                self._session.query(TimeSeriesData.value,
-                                    TimeSeriesData.datetime,
-                                    Observation.observation_id.label('obs_id'))
+                self._session.query(
+                    Observation.sampling_feature_uuid.label(
+                        'sampling_feature_uuid'),
+                    TimeSeriesDailyAggregate.date.label('datetime'),
+                    Observation.observation_id.label('obs_id'),
+                    TimeSeriesDailyAggregate.first_value.label('first'),
+                    TimeSeriesDailyAggregate.mean_value.label('mean'),
+                    TimeSeriesDailyAggregate.min_value.label('min'),
+                    TimeSeriesDailyAggregate.max_value.label('max'),
+                    TimeSeriesDailyAggregate.value_count.label('count'))
                 .filter(TimeSeriesChannel.obs_property_id == obs_property_id)
-                .filter(Observation.sampling_feature_uuid ==
-                        sampling_feature_uuid)
                 .filter(Observation.observation_id ==
                         TimeSeriesChannel.observation_id)
-                .filter(TimeSeriesData.channel_id ==
+                .filter(TimeSeriesDailyAggregate.channel_id ==
                         TimeSeriesChannel.channel_id)
                 )
-            tseries_data = pd.read_sql_query(
-                query.statement, self._session.connection(), coerce_float=True,
-                parse_dates={'datetime': TO_DATETIME_ARGS}
-                )
+            aggregates = pd.read_sql_query(
+                query.statement, self._session.connection(),
+                coerce_float=True,
+                parse_dates={'datetime': TO_DATETIME_ARGS})
+            aggregates.insert(2, 'data_type', data_type)
+            aggregates_list.append(aggregates)
+        sampling_feature_uuids = pd.concat(
+            [aggregates['sampling_feature_uuid'] for
+             aggregates in aggregates_list],
+            ignore_index=True)
+        aggregates = format_daily_aggregates(aggregates_list)
+        aggregates['sampling_feature_uuid'] = sampling_feature_uuids
+        return compute_readings_versions(aggregates)
+
+    def _query_timeseries_daily_aggregate(
+            self, sampling_feature_uuid, data_type, start, end, *columns):
+        """
+        Return a query of the given columns for the daily aggregates of
+        the readings of the specified data type and monitoring station for
+        the days that start within the half-open interval [start, end).
+        """
+        obs_property_id = self._get_observed_property_id(data_type)
+        query = (
+            self._session.query(*columns)
+            .filter(TimeSeriesChannel.obs_property_id == obs_property_id)
+            .filter(Observation.sampling_feature_uuid ==
+                    sampling_feature_uuid)
+            .filter(Observation.observation_id ==
+                    TimeSeriesChannel.observation_id)
+            .filter(TimeSeriesDailyAggregate.channel_id ==
+                    TimeSeriesChannel.channel_id)
+            )
+        if start is not None:
+            query = query.filter(
+                TimeSeriesDailyAggregate.date >=
+                pd.Timestamp(start).to_pydatetime())
+        if end is not None:
+            query = query.filter(
+                TimeSeriesDailyAggregate.date <
+                pd.Timestamp(end).to_pydatetime())
+        return query
+
+    def _query_timeseries_data(self, sampling_feature_uuid, data_type,
+                               start, end, *columns):
+        """
+        Return a query of the given columns for the readings of the
+        specified data type and monitoring station that were taken within
+        the half-open interval [start, end).
+        """
+        obs_property_id = self._get_observed_property_id(data_type)
+        query = (
+            self._session.query(*columns)
+            .filter(TimeSeriesChannel.obs_property_id == obs_property_id)
+            .filter(Observation.sampling_feature_uuid ==
+                    sampling_feature_uuid)
+            .filter(Observation.observation_id ==
+                    TimeSeriesChannel.observation_id)
+            .filter(TimeSeriesData.channel_id ==
+                    TimeSeriesChannel.channel_id)
+            )
+        if start is not None:
+            query = query.filter(
+                TimeSeriesData.datetime >= pd.Timestamp(start).to_pydatetime())
+        if end is not None:
+            query = query.filter(
+                TimeSeriesData.datetime < pd.Timestamp(end).to_pydatetime())
+        return query
+
+    def _merge_timeseries_data(self, tseries_data_list, data_types):
+        """
+        Merge the readings of each data type in a single dataframe and
+        add the sonde serial number and installation depth.
+        """
+        readings_data = None
+        added_data_types = []
+        for data_type, tseries_data in zip(data_types, tseries_data_list):
             if tseries_data.empty:
                 # This means that there is no timeseries data saved in the
                 # database for this data type.
@@ -1361,6 +1752,97 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
 
         return readings_data
 
+    def _get_timeseries_for_obs_wells(self, sampling_feature_uuids,
+                                      data_types=None, start=None, end=None):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring stations in long format.
+
+        The readings of all the monitoring stations are fetched with a
+        single query, ordered by channel.
+        """
+        data_types = self._format_data_types(data_types)
+        data_types_by_id = {
+            self._get_observed_property_id(data_type): data_type for
+            data_type in data_types}
+
+        query = (
+            self._session.query(Observation.sampling_feature_uuid,
+                                TimeSeriesChannel.obs_property_id,
+                                TimeSeriesData.value,
+                                TimeSeriesData.datetime,
+                                Observation.observation_id.label('obs_id'))
+            .filter(TimeSeriesChannel.obs_property_id.in_(
+                list(data_types_by_id)))
+            .filter(Observation.sampling_feature_uuid.in_(
+                list(sampling_feature_uuids)))
+            .filter(Observation.observation_id ==
+                    TimeSeriesChannel.observation_id)
+            .filter(TimeSeriesData.channel_id ==
+                    TimeSeriesChannel.channel_id)
+            )
+        if start is not None:
+            query = query.filter(
+                TimeSeriesData.datetime >= pd.Timestamp(start).to_pydatetime())
+        if end is not None:
+            query = query.filter(
+                TimeSeriesData.datetime < pd.Timestamp(end).to_pydatetime())
+        query = query.order_by(TimeSeriesData.channel_id)
+        tseries_data = pd.read_sql_query(
+            query.statement, self._session.connection(), coerce_float=True,
+            parse_dates={'datetime': TO_DATETIME_ARGS}
+            )
+        if tseries_data.empty:
+            # This means there is no reading saved for these monitoring
+            # stations in the database.
+            readings_data = create_empty_readings(data_types)
+            readings_data.insert(0, 'sampling_feature_uuid', None)
+            return readings_data
+
+        # Put the values of each data type in its own column. Note that
+        # the readings are merged the same way as in
+        # '_merge_timeseries_data', so that readings sharing the same
+        # datetime, observation ID and data type are all kept.
+        tseries_data['obs_property_id'] = (
+            tseries_data['obs_property_id'].map(data_types_by_id))
+        on = ['sampling_feature_uuid', 'datetime', 'obs_id']
+        readings_data = None
+        added_data_types = []
+        for data_type in data_types:
+            data_type_readings = (
+                tseries_data
+                .loc[tseries_data['obs_property_id'] == data_type,
+                     on + ['value']]
+                .rename(columns={'value': data_type})
+                )
+            if data_type_readings.empty:
+                continue
+            added_data_types.append(data_type)
+            if readings_data is None:
+                readings_data = data_type_readings
+            else:
+                readings_data = readings_data.merge(
+                    data_type_readings, on=on, how='outer', sort=True)
+
+        # Add sonde serial number and installation depth to the dataframe.
+        obs_ids = readings_data['obs_id'].unique()
+        sonde_ids = {
+            obs_id: self._get_sonde_serial_no_from_obs_id(obs_id) for
+            obs_id in obs_ids}
+        install_depths = {
+            obs_id: self._get_sonde_install_depth_from_obs_id(obs_id) for
+            obs_id in obs_ids}
+        readings_data['sonde_id'] = readings_data['obs_id'].map(sonde_ids.get)
+        readings_data['install_depth'] = (
+            readings_data['obs_id'].map(install_depths.get))
+
+        readings_data = readings_data[
+            ['sampling_feature_uuid', 'datetime', 'sonde_id'] +
+            added_data_types +
+            ['install_depth', 'obs_id']]
+        readings_data.columns.name = None
+        return readings_data
+
     def _add_timeseries_data(self, tseries_data, sampling_feature_uuid,
                              install_uuid=None):
         """
@@ -1435,6 +1917,10 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
             params=tseries_data[columns].to_dict(orient='records'))
         self._session.flush()
 
+        # Add the daily aggregates of the readings of the new channels.
+        for channel_id in channel_ids:
+            self._refresh_timeseries_daily_aggregate(channel_id)
+
         # Update the data overview for the given sampling feature.
         self._refresh_sampling_feature_data_overview(
             sampling_feature_uuid, auto_commit=False)
@@ -1444,6 +1930,7 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
         Save in the database a set of edits that were made to to timeseries
         data that were already saved in the database.
         """
+        edited_dates = {}
         for (date_time, obs_id, data_type) in tseries_edits.index:
             # Fetch the timeseries data orm object.
             try:
@@ -1477,8 +1964,14 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
             # Save the edited value.
             tseries_data.value = tseries_edits.loc[
                 (date_time, obs_id, data_type), 'value']
+            edited_dates.setdefault(tseries_data.channel_id, set()).add(
+                pd.Timestamp(date_time).normalize())
         self._session.flush()
 
+        # Update the daily aggregates of the days that were edited.
+        for channel_id, dates in edited_dates.items():
+            self._refresh_timeseries_daily_aggregate(channel_id, dates)
+
         # Update the data overview for the sampling features whose
         # corresponding data were affected by this change.
         sampling_feature_uuids = list(set([
@@ -1518,8 +2011,9 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
                 # We need to format pandas datetime64 to strings in order to
                 # delete rows from the database directly with a SQL statement.
                 date_times = (
-                    sub_data[sub_data['data_type'] == data_type]
-                    ['datetime'].dt.strftime(DATE_FORMAT))
+                    sub_data[sub_data['data_type'] == data_type]['datetime'])
+                deleted_dates = date_times.dt.normalize().unique()
+                date_times = date_times.dt.strftime(DATE_FORMAT)
 
                 sql_statement = (
                     "DELETE FROM timeseries_data WHERE "
@@ -1531,6 +2025,11 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
                 self._session.execute(
                     sql_statement,
                     params=params)
+
+                # Update the daily aggregates of the days from which
+                # readings were deleted.
+                self._refresh_timeseries_daily_aggregate(
+                    channel_id, deleted_dates)
             self._session.flush()
 
             # Delete the Observation from database if it is now empty.
@@ -1978,6 +2477,67 @@ class DatabaseAccessorSardesLite(DatabaseAccessor):
             if auto_commit:
                 self._session.commit()
 
+    def _refresh_timeseries_daily_aggregate(self, channel_id, dates=None):
+        """
+        Refresh the daily aggregates of the readings of the given
+        timeseries channel.
+
+        If dates are provided, only the aggregates of these days are
+        updated, else the aggregates of all the days with readings for
+        that channel are updated.
+        """
+        if dates is None:
+            bounds = [{'channel_id': channel_id}]
+            where_clause = "channel_id = :channel_id"
+            delete_clause = where_clause
+        else:
+            # The aggregates are updated by runs of consecutive days, so
+            # that the aggregates of a long period can be updated with a
+            # single statement.
+            days = pd.DatetimeIndex(dates).values.astype('datetime64[D]')
+            bounds = [
+                {'channel_id': channel_id,
+                 'start': pd.Timestamp(first).strftime(DATE_FORMAT),
+                 'end': pd.Timestamp(last + 1).strftime(DATE_FORMAT)}
+                for first, last in intervals_extract(days)]
+            if not bounds:
+                return
+            where_clause = (
+                "channel_id = :channel_id AND "
+                "datetime >= :start AND datetime < :end")
+            delete_clause = (
+                "channel_id = :channel_id AND "
+                "date >= :start AND date < :end")
+
+        self._session.execute(
+            "DELETE FROM timeseries_daily_aggregate WHERE " + delete_clause,
+            params=bounds)
+
+        # The first value of each day is fetched by joining the
+        # datetime of the first non-null reading of each day back to
+        # the timeseries data.
+        self._session.execute(
+            "INSERT INTO timeseries_daily_aggregate "
+            "(channel_id, date, first_value, mean_value, min_value, "
+            "max_value, value_count) "
+            "SELECT daily.channel_id, daily.date, timeseries_data.value, "
+            "daily.mean_value, daily.min_value, daily.max_value, "
+            "daily.value_count "
+            "FROM ("
+            "SELECT channel_id, "
+            "substr(datetime, 1, 10) || ' 00:00:00.000000' AS date, "
+            "min(datetime) AS first_datetime, avg(value) AS mean_value, "
+            "min(value) AS min_value, max(value) AS max_value, "
+            "count(value) AS value_count "
+            "FROM timeseries_data "
+            "WHERE value IS NOT NULL AND " + where_clause + " "
+            "GROUP BY channel_id, date"
+            ") AS daily "
+            "JOIN timeseries_data ON "
+            "timeseries_data.channel_id = daily.channel_id AND "
+            "timeseries_data.datetime = daily.first_datetime",
+            params=bounds)
+
     def _get_generic_num_value(self, gen_num_value_uuid):
         """
         Return the sqlalchemy GenericNumericalData object corresponding
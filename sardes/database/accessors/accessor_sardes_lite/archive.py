@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Export and import of a Sardes Lite database to and from a columnar archive
+of Apache Parquet files.
+
+The archive is a directory with the following layout::
+
+    manifest.json
+    model/<name>.parquet
+    tables/<tablename>.parquet
+    readings/sampling_feature_uuid=<uuid>/year=<year>/part-0.parquet
+
+The 'model' directory contains the tables of the database conceptual
+model, as returned by the accessor, and is meant for analytics only.
+The 'tables' directory contains the content of every table of the
+Sardes Lite schema, except for the readings that are saved in the
+'readings' directory, partitioned by monitoring station and year
+with a Hive-style layout. Only the 'tables' and 'readings' directories
+are used to rebuild a database from an archive.
+
+Reading and writing Parquet files requires pyarrow.
+"""
+
+from __future__ import annotations
+
+# ---- Standard imports
+import datetime
+import glob
+import json
+import os
+import os.path as osp
+import uuid
+
+# ---- Third party imports
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import select, type_coerce
+from sqlalchemy.types import (
+    Boolean, DateTime, Float, Integer, LargeBinary, String)
+from sqlalchemy_utils import UUIDType
+
+# ---- Local imports
+from sardes import __version__
+from sardes.api.database_model import DATABASE_CONCEPTUAL_MODEL
+from sardes.database.accessors.accessor_errors import (
+    DatabaseVersionError, SardesVersionError)
+from sardes.database.accessors.accessor_sardes_lite.accessor import (
+    APPLICATION_ID, CURRENT_SCHEMA_VERSION, Base, Observation,
+    TimeSeriesChannel, TimeSeriesData)
+
+
+# The version of the layout of the archive.
+ARCHIVE_FORMAT_VERSION = 1
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# The oldest schema version of the archives that can be imported. Archives
+# with an older schema version than the current one are imported at their
+# own version and the database is then updated to the current version.
+# The schema of the databases older than version 4 cannot be rebuilt from
+# the current tables, so that these archives cannot be imported.
+MIN_ARCHIVE_SCHEMA_VERSION = 4
+
+# The slices of the 32 hexadecimal digits of a UUID that are separated
+# by hyphens in its canonical form.
+UUID_HEX_SLICES = ((0, 8), (8, 12), (12, 16), (16, 20), (20, 32))
+
+# The key under which the Sardes metadata are saved in the schema
+# metadata of the Parquet files.
+METADATA_KEY = b'sardes'
+
+
+def get_arrow_type(sqltype):
+    """
+    Return the Arrow data type corresponding to the given SQLAlchemy
+    column type.
+
+    UUIDs are stored as strings in their canonical hyphenated form.
+    """
+    if isinstance(sqltype, UUIDType):
+        return pa.string()
+    elif isinstance(sqltype, Boolean):
+        return pa.bool_()
+    elif isinstance(sqltype, Integer):
+        return pa.int64()
+    elif isinstance(sqltype, Float):
+        return pa.float64()
+    elif isinstance(sqltype, DateTime):
+        return pa.timestamp('us')
+    elif isinstance(sqltype, LargeBinary):
+        return pa.binary()
+    elif isinstance(sqltype, String):
+        return pa.string()
+    raise TypeError("Unsupported column type '{}'.".format(sqltype))
+
+
+def get_schema_metadata(name, uuid_columns=()):
+    """
+    Return the metadata to save in the schema of the Parquet file
+    containing the data of the table named name.
+    """
+    return {METADATA_KEY: json.dumps({
+        'table': name,
+        'uuid_columns': list(uuid_columns),
+        'application_id': APPLICATION_ID,
+        'schema_version': CURRENT_SCHEMA_VERSION,
+        'sardes_version': __version__
+        })}
+
+
+def get_table_schema(table, extra_fields=()):
+    """
+    Return the Arrow schema of the given SQLAlchemy table, with the Sardes
+    metadata of the table.
+    """
+    uuid_columns = [
+        column.name for column in table.columns if
+        isinstance(column.type, UUIDType)]
+    fields = [
+        pa.field(column.name, get_arrow_type(column.type)) for
+        column in table.columns]
+    return pa.schema(
+        fields + list(extra_fields),
+        metadata=get_schema_metadata(table.name, uuid_columns))
+
+
+def select_raw_columns(*columns):
+    """
+    Return a select construct for the given columns whose values are
+    returned as they are stored in the database.
+
+    Datetimes, UUIDs and booleans are returned as text and integers, so
+    that they can be converted to Arrow arrays in vectorized operations
+    instead of one Python object at a time.
+    """
+    raw_columns = []
+    for column in columns:
+        if isinstance(column.type, (UUIDType, DateTime)):
+            column = type_coerce(column, String).label(column.name)
+        elif isinstance(column.type, Boolean):
+            column = type_coerce(column, Integer).label(column.name)
+        raw_columns.append(column)
+    return select(*raw_columns)
+
+
+def rows_to_arrow(rows, schema):
+    """
+    Return an Arrow table with the given schema from a list of rows
+    fetched from the database with 'select_raw_columns'.
+    """
+    uuid_columns = json.loads(
+        schema.metadata[METADATA_KEY])['uuid_columns']
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if field.name in uuid_columns:
+            # UUIDs are stored as 32 hexadecimal digits in the database.
+            values = pa.array(values, type=pa.string())
+            array = pc.binary_join_element_wise(
+                *[pc.utf8_slice_codeunits(values, start, stop) for
+                  start, stop in UUID_HEX_SLICES],
+                '-')
+        elif pa.types.is_timestamp(field.type):
+            array = pc.cast(pa.array(values, type=pa.string()), field.type)
+        elif pa.types.is_boolean(field.type):
+            array = pc.cast(pa.array(values, type=pa.int64()), field.type)
+        else:
+            array = pa.array(values, type=field.type)
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def arrow_to_rows(table, uuid_columns):
+    """
+    Return a list of rows from an Arrow table or record batch, with
+    the values formatted as they are stored in the database.
+    """
+    values = []
+    for name, column in zip(table.schema.names, table.columns):
+        if name in uuid_columns:
+            column = pc.replace_substring(column, '-', '')
+        elif pa.types.is_timestamp(column.type):
+            # Note that Arrow formats the seconds of timestamps with their
+            # fractional part, so that this corresponds to DATE_FORMAT.
+            column = pc.strftime(
+                pc.cast(column, pa.timestamp('us')),
+                format='%Y-%m-%d %H:%M:%S')
+        values.append(column.to_pylist())
+    return list(zip(*values))
+
+
+def dataframe_to_arrow(data, name):
+    """
+    Return an Arrow table from a dataframe of the database conceptual
+    model, with the Sardes metadata of the table.
+    """
+    data = data.reset_index()
+    data.columns = [str(column) for column in data.columns]
+    uuid_columns = []
+    for column in data.columns:
+        if data[column].dtype != object:
+            continue
+        is_uuid = data[column].map(lambda value: isinstance(value, uuid.UUID))
+        if is_uuid.any():
+            uuid_columns.append(column)
+            data.loc[is_uuid, column] = data.loc[is_uuid, column].map(str)
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    return table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        **get_schema_metadata(name, uuid_columns)})
+
+
+# =============================================================================
+# ---- Export
+# =============================================================================
+def export_parquet_archive(accessor, dirname, chunksize=100000):
+    """
+    Export the content of the database of the given accessor to a
+    columnar archive in dirname.
+
+    The data are streamed from the database by chunks of chunksize rows,
+    so that the memory needed to export a database does not depend on the
+    number of readings it contains.
+
+    Returns
+    -------
+    manifest : dict
+        The manifest of the archive, which contains the versions of the
+        database and the number of rows saved for each table.
+    """
+    connection = accessor._session.connection()
+    for subdir in ('model', 'tables', 'readings'):
+        os.makedirs(osp.join(dirname, subdir), exist_ok=True)
+
+    manifest = {
+        'archive_format_version': ARCHIVE_FORMAT_VERSION,
+        'application_id': APPLICATION_ID,
+        'schema_version': CURRENT_SCHEMA_VERSION,
+        'sardes_version': __version__,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'model': {},
+        'tables': {},
+        'readings': {'nrows': 0, 'partitions': 0}
+        }
+
+    # Export the tables of the database conceptual model. These tables
+    # contain metadata only and are small enough to be loaded at once.
+    # Note that the tables that are not implemented in the accessor, such
+    # as the tables added to the model by plugins, are skipped.
+    for name in DATABASE_CONCEPTUAL_MODEL:
+        if not hasattr(accessor, '_get_' + name):
+            continue
+        table = dataframe_to_arrow(
+            getattr(accessor, '_get_' + name)(), name)
+        pq.write_table(table, osp.join(dirname, 'model', name + '.parquet'))
+        manifest['model'][name] = table.num_rows
+
+    # Export the tables of the Sardes Lite schema.
+    for table in Base.metadata.sorted_tables:
+        if table is TimeSeriesData.__table__:
+            continue
+        schema = get_table_schema(table)
+        result = connection.execute(select_raw_columns(*table.columns))
+        nrows = 0
+        with pq.ParquetWriter(osp.join(
+                dirname, 'tables', table.name + '.parquet'), schema) as writer:
+            while True:
+                rows = result.fetchmany(chunksize)
+                if not rows:
+                    break
+                writer.write_table(rows_to_arrow(rows, schema))
+                nrows += len(rows)
+        manifest['tables'][table.name] = nrows
+
+    # Export the readings, partitioned by monitoring station and year.
+    schema = get_table_schema(
+        TimeSeriesData.__table__,
+        extra_fields=[pa.field('obs_property_id', pa.int64())])
+    sampling_feature_uuids = connection.execute(
+        select(Observation.sampling_feature_uuid)
+        .where(Observation.observation_id ==
+               TimeSeriesChannel.observation_id)
+        .distinct()
+        ).scalars().all()
+    for sampling_feature_uuid in sampling_feature_uuids:
+        nrows, npartitions = _export_obs_well_readings(
+            connection, sampling_feature_uuid, dirname, schema, chunksize)
+        manifest['readings']['nrows'] += nrows
+        manifest['readings']['partitions'] += npartitions
+
+    with open(osp.join(dirname, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _export_obs_well_readings(connection, sampling_feature_uuid, dirname,
+                              schema, chunksize):
+    """
+    Save the readings of the given monitoring station in one Parquet file
+    per year.
+
+    Since the readings are fetched in chronological order, the files are
+    written one after the other and only one is open at a time.
+    """
+    result = connection.execute(
+        select_raw_columns(TimeSeriesData.datetime,
+                           TimeSeriesData.value,
+                           TimeSeriesData.channel_id,
+                           TimeSeriesChannel.obs_property_id)
+        .where(TimeSeriesData.channel_id == TimeSeriesChannel.channel_id)
+        .where(TimeSeriesChannel.observation_id ==
+               Observation.observation_id)
+        .where(Observation.sampling_feature_uuid == sampling_feature_uuid)
+        .order_by(TimeSeriesData.datetime, TimeSeriesData.channel_id)
+        )
+    writer = None
+    current_year = None
+    nrows = 0
+    npartitions = 0
+    try:
+        while True:
+            rows = result.fetchmany(chunksize)
+            if not rows:
+                break
+            table = rows_to_arrow(rows, schema)
+            nrows += len(rows)
+
+            years = pc.year(table.column('datetime')).to_numpy(
+                zero_copy_only=False)
+            bounds = np.flatnonzero(np.diff(years)) + 1
+            for start, stop in zip(np.r_[0, bounds],
+                                   np.r_[bounds, len(years)]):
+                if years[start] != current_year:
+                    if writer is not None:
+                        writer.close()
+                    current_year = years[start]
+                    partition_dirname = osp.join(
+                        dirname, 'readings',
+                        'sampling_feature_uuid={}'.format(
+                            sampling_feature_uuid),
+                        'year={}'.format(current_year))
+                    os.makedirs(partition_dirname, exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        osp.join(partition_dirname, 'part-0.parquet'),
+                        schema)
+                    npartitions += 1
+                writer.write_table(table.slice(start, stop - start))
+    finally:
+        if writer is not None:
+            writer.close()
+    return nrows, npartitions
+
+
+# =============================================================================
+# ---- Import
+# =============================================================================
+def read_archive_manifest(dirname):
+    """
+    Return the manifest of the archive saved in dirname.
+
+    Raise an error if the archive was not produced from a Sardes Lite
+    database or if its schema version is not supported by the current
+    version of Sardes.
+    """
+    with open(osp.join(dirname, MANIFEST_FILENAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('application_id') != APPLICATION_ID:
+        raise ValueError(
+            "'{}' is not a Sardes Lite database archive.".format(dirname))
+    if manifest['schema_version'] > CURRENT_SCHEMA_VERSION:
+        raise SardesVersionError(CURRENT_SCHEMA_VERSION)
+    if manifest['schema_version'] < MIN_ARCHIVE_SCHEMA_VERSION:
+        raise DatabaseVersionError(
+            manifest['schema_version'], MIN_ARCHIVE_SCHEMA_VERSION)
+    return manifest
+
+
+def import_parquet_archive(accessor, dirname, chunksize=100000):
+    """
+    Replace the content of the database of the given accessor with the
+    content of the columnar archive saved in dirname.
+
+    The Parquet files of the archive are read by batches of chunksize rows,
+    which are added to the database with bulk inserts.
+
+    The user version of the database is set to the schema version of the
+    archive, so that the database must be updated with 'update_database'
+    when the archive is older than the current schema version. The tables
+    that are not in the archive are left empty and the columns that are
+    not in the archive are left to their default values until then.
+
+    Returns
+    -------
+    manifest : dict
+        The manifest of the imported archive.
+    """
+    manifest = read_archive_manifest(dirname)
+    connection = accessor._session.connection()
+
+    # Create the tables that do not exist yet and clear the content of
+    # the others, including the default values added by 'init_database'.
+    for table in Base.metadata.sorted_tables:
+        table.create(connection, checkfirst=True)
+        connection.execute(table.delete())
+
+    for table in Base.metadata.sorted_tables:
+        if table is TimeSeriesData.__table__:
+            continue
+        filename = osp.join(dirname, 'tables', table.name + '.parquet')
+        if osp.exists(filename):
+            _import_table_data(connection, table, filename, chunksize)
+
+    for filename in sorted(glob.glob(osp.join(
+            dirname, 'readings', '*', '*', '*.parquet'))):
+        _import_table_data(
+            connection, TimeSeriesData.__table__, filename, chunksize)
+
+    accessor.execute(f"PRAGMA application_id = {APPLICATION_ID}")
+    accessor.execute(f"PRAGMA user_version = {manifest['schema_version']}")
+    return manifest
+
+
+def _import_table_data(connection, table, filename, chunksize):
+    """
+    Add the content of the given Parquet file to the table by batches of
+    chunksize rows.
+
+    The rows are inserted with the DBAPI directly, since the values are
+    already formatted as they are stored in the database.
+    """
+    parquet_file = pq.ParquetFile(filename)
+    names = [name for name in parquet_file.schema_arrow.names if
+             name in table.columns]
+    uuid_columns = [
+        name for name in names if
+        isinstance(table.columns[name].type, UUIDType)]
+    quote = connection.dialect.identifier_preparer.quote
+    sql_statement = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(table.name),
+        ', '.join(quote(name) for name in names),
+        ', '.join('?' * len(names)))
+    for batch in parquet_file.iter_batches(
+            batch_size=chunksize, columns=names):
+        connection.exec_driver_sql(
+            sql_statement, arrow_to_rows(batch, uuid_columns))
@@ -9,3 +9,4 @@
 
 from ._sardes_sqlite_v2_to_v3 import _update_v2_to_v3
 from ._sardes_sqlite_v3_to_v4 import _update_v3_to_v4
+from ._sardes_sqlite_v4_to_v5 import _update_v4_to_v5
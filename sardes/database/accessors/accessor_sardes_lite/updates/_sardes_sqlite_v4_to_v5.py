@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Scripts to update the Sardes SQLite database schema.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from sardes.database.accessors import DatabaseAccessorSardesLite
+
+
+def _update_v4_to_v5(accessor: DatabaseAccessorSardesLite):
+    """
+    Update Sardes SQLite database schema to version 5 from version 4.
+
+    Changelog:
+    - Add a new table named 'timeseries_daily_aggregate' to hold the
+    first, mean, min and max value and the number of readings of each day
+    for each timeseries channel.
+    """
+
+    # =========================================================================
+    # Add new table 'timeseries_daily_aggregate'.
+    # =========================================================================
+
+    accessor.execute("DROP TABLE IF EXISTS timeseries_daily_aggregate")
+    accessor.execute(
+        """
+        CREATE TABLE timeseries_daily_aggregate (
+            channel_id INTEGER NOT NULL,
+            date DATETIME NOT NULL,
+            first_value FLOAT,
+            mean_value FLOAT,
+            min_value FLOAT,
+            max_value FLOAT,
+            value_count INTEGER,
+            PRIMARY KEY (channel_id, date),
+            FOREIGN KEY(channel_id) REFERENCES timeseries_channel (channel_id)
+            )
+        """
+    )
+
+    # Populate the new table from the readings saved in the database.
+    accessor.execute(
+        """
+        INSERT INTO timeseries_daily_aggregate
+        (channel_id, date, first_value, mean_value, min_value, max_value,
+         value_count)
+        SELECT daily.channel_id, daily.date, timeseries_data.value,
+               daily.mean_value, daily.min_value, daily.max_value,
+               daily.value_count
+        FROM (
+            SELECT channel_id,
+                   substr(datetime, 1, 10) || ' 00:00:00.000000' AS date,
+                   min(datetime) AS first_datetime,
+                   avg(value) AS mean_value,
+                   min(value) AS min_value,
+                   max(value) AS max_value,
+                   count(value) AS value_count
+            FROM timeseries_data
+            WHERE value IS NOT NULL
+            GROUP BY channel_id, date
+            ) AS daily
+        JOIN timeseries_data ON
+            timeseries_data.channel_id = daily.channel_id AND
+            timeseries_data.datetime = daily.first_datetime
+        """
+    )
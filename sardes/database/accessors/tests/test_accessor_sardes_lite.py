@@ -17,6 +17,7 @@ module. Therefore, the tests must be run sequentially and in the right order.
 # ---- Standard imports
 import datetime
 import itertools
+import json
 import os
 import os.path as osp
 import shutil
@@ -39,13 +40,17 @@ from matplotlib.figure import Figure
 from sardes.utils.data_operations import are_values_equal
 from sardes.api.taskmanagers import TaskManagerBase, WorkerBase
 from sardes.api.timeseries import DataType
-from sardes.api.database_accessor import DatabaseAccessorError
+from sardes.api.database_accessor import (
+    DatabaseAccessorError, DatabaseAccessor)
+from sardes.database.accessors.accessor_errors import DatabaseVersionError
 from sardes.database.accessors.accessor_sardes_lite.accessor import (
     DatabaseAccessorSardesLite, CURRENT_SCHEMA_VERSION, DATE_FORMAT,
     SamplingFeature, Location, SamplingFeatureMetadata,
-    SamplingFeatureDataOverview, SamplingFeatureAttachment)
+    SamplingFeatureDataOverview, SamplingFeatureAttachment,
+    TimeSeriesChannel, TimeSeriesData)
 from sardes.database.accessors.accessor_helpers import (
-    init_tseries_edits, init_tseries_dels)
+    init_tseries_edits, init_tseries_dels, group_readings_by_obs_well,
+    compute_daily_aggregates, AGGREGATION_FUNCS)
 
 
 def assert_dataframe_equals(df1, df2, ignore_index=False):
@@ -1170,6 +1175,498 @@ def test_add_delete_large_timeseries_record(dbaccessor):
     assert len(wtemp_data) == 0
 
 
+def test_get_timeseries_by_chunks(dbaccessor):
+    """
+    Test that getting the readings of a monitoring station within a time
+    interval or by chunks, from the most recent to the oldest, is
+    working as expected.
+    """
+    sampling_feature_uuid = uuid.uuid4()
+
+    new_tseries_data = pd.DataFrame(
+        [], columns=['datetime', DataType.WaterLevel, DataType.WaterTemp])
+    new_tseries_data['datetime'] = pd.date_range(
+        start='1/1/2000', end='12/31/2000')
+    new_tseries_data[DataType.WaterLevel] = np.random.rand(
+        len(new_tseries_data))
+    new_tseries_data[DataType.WaterTemp] = np.random.rand(
+        len(new_tseries_data))
+    dbaccessor.add_timeseries_data(
+        new_tseries_data, sampling_feature_uuid, None)
+    data_types = [DataType.WaterLevel, DataType.WaterTemp]
+
+    # Get the readings within a time interval.
+    readings = dbaccessor.get_timeseries_for_obs_well(
+        sampling_feature_uuid, data_types,
+        start=datetime.datetime(2000, 2, 1),
+        end=datetime.datetime(2000, 3, 1))
+    assert len(readings) == 29
+    assert readings['datetime'].min() == datetime.datetime(2000, 2, 1)
+    assert readings['datetime'].max() == datetime.datetime(2000, 2, 29)
+
+    # Get the readings by chunks.
+    chunks = []
+    end = None
+    while True:
+        chunk = dbaccessor.get_timeseries_chunk_for_obs_well(
+            sampling_feature_uuid, data_types, end, size=100)
+        if chunk.empty:
+            break
+        chunks.append(chunk)
+        end = chunk['datetime'].min()
+
+    # Note that there is one row for every two readings, since there is
+    # a water level and a water temperature reading per datetime.
+    assert [len(chunk) for chunk in chunks] == [50] * 7 + [16]
+    assert chunks[0]['datetime'].max() == datetime.datetime(2000, 12, 31)
+    assert chunks[-1]['datetime'].min() == datetime.datetime(2000, 1, 1)
+
+    readings = pd.concat(chunks).sort_values('datetime')
+    assert len(readings) == 366
+    assert_dataframe_equals(
+        readings, dbaccessor.get_timeseries_for_obs_well(
+            sampling_feature_uuid, data_types),
+        ignore_index=True)
+
+
+def test_get_aggregated_timeseries(dbaccessor):
+    """
+    Test that getting the readings of a monitoring station aggregated by
+    day or month in the database is working as expected.
+    """
+    sampling_feature_uuid = uuid.uuid4()
+
+    new_tseries_data = pd.DataFrame(
+        [], columns=['datetime', DataType.WaterLevel, DataType.WaterTemp])
+    new_tseries_data['datetime'] = pd.date_range(
+        start='2000-01-30 00:15:00', end='2000-03-02 23:45:00', freq='3H')
+    new_tseries_data[DataType.WaterLevel] = np.random.rand(
+        len(new_tseries_data))
+    new_tseries_data[DataType.WaterTemp] = np.random.rand(
+        len(new_tseries_data))
+    new_tseries_data.loc[0:3, DataType.WaterLevel] = np.nan
+    dbaccessor.add_timeseries_data(
+        new_tseries_data, sampling_feature_uuid, None)
+    data_types = [DataType.WaterLevel, DataType.WaterTemp]
+
+    # Set a water level to null in the database.
+    tseries_edits = init_tseries_edits()
+    tseries_edits.loc[
+        (datetime.datetime(2000, 1, 30, 12, 15), 1, DataType.WaterLevel),
+        'value'] = np.nan
+    dbaccessor.save_timeseries_data_edits(tseries_edits)
+
+    readings = dbaccessor.get_timeseries_for_obs_well(
+        sampling_feature_uuid, data_types, freq='D', agg='mean')
+    assert len(readings) == 33
+    assert readings['datetime'].iloc[0] == datetime.datetime(2000, 1, 30)
+    assert readings['datetime'].iloc[-1] == datetime.datetime(2000, 3, 2)
+    assert list(readings.columns) == [
+        'datetime', 'sonde_id', DataType.WaterLevel, DataType.WaterTemp,
+        'install_depth', 'obs_id']
+
+    # Assert that the readings aggregated in the database are the same as
+    # those aggregated with pandas by the accessor base class. Note that
+    # the readings are aggregated from the daily aggregates when start and
+    # end fall on midnight and from the readings otherwise, and that the
+    # null values must be ignored in both cases.
+    for freq, agg in itertools.product(['D', 'M'], AGGREGATION_FUNCS):
+        for start, end in [(None, None),
+                           (datetime.datetime(2000, 1, 30, 1), None),
+                           (datetime.datetime(2000, 2, 1),
+                            datetime.datetime(2000, 3, 1, 12))]:
+            readings = dbaccessor.get_timeseries_for_obs_well(
+                sampling_feature_uuid, data_types, start, end,
+                freq=freq, agg=agg)
+            expected_readings = (
+                DatabaseAccessor._get_aggregated_timeseries_for_obs_well(
+                    dbaccessor, sampling_feature_uuid, data_types,
+                    freq, agg, start, end))
+            assert len(readings) == len(expected_readings)
+            assert (readings['datetime'].tolist() ==
+                    expected_readings['datetime'].tolist())
+            for data_type in data_types:
+                assert np.allclose(
+                    readings[data_type].values.astype(float),
+                    expected_readings[data_type].values.astype(float),
+                    equal_nan=True)
+
+    with pytest.raises(ValueError):
+        dbaccessor.get_timeseries_for_obs_well(
+            sampling_feature_uuid, data_types, freq='H')
+    with pytest.raises(ValueError):
+        dbaccessor.get_timeseries_for_obs_well(
+            sampling_feature_uuid, data_types, freq='D', agg='sum')
+
+
+def test_daily_timeseries_aggregates(dbaccessor):
+    """
+    Test that the daily aggregates of the readings are maintained as
+    expected in the database when readings are added, edited and deleted.
+    """
+    sampling_feature_uuid = uuid.uuid4()
+    data_types = [DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC]
+
+    def assert_aggregates_equal():
+        aggregates = dbaccessor.get_daily_timeseries_aggregates(
+            sampling_feature_uuid, data_types)
+        expected_aggregates = (
+            DatabaseAccessor._get_daily_timeseries_aggregates(
+                dbaccessor, sampling_feature_uuid, data_types))
+        pd.testing.assert_frame_equal(aggregates, expected_aggregates)
+        return aggregates
+
+    # Add readings taken every hour by two sondes.
+    for start, end in [('2000-01-01 00:30', '2000-01-03 23:30'),
+                       ('2000-01-03 12:00', '2000-01-05 11:00')]:
+        new_tseries_data = pd.DataFrame(
+            [], columns=['datetime', DataType.WaterLevel, DataType.WaterTemp])
+        new_tseries_data['datetime'] = pd.date_range(
+            start=start, end=end, freq='H')
+        new_tseries_data[DataType.WaterLevel] = np.random.rand(
+            len(new_tseries_data))
+        new_tseries_data[DataType.WaterTemp] = np.random.rand(
+            len(new_tseries_data))
+        dbaccessor.add_timeseries_data(
+            new_tseries_data, sampling_feature_uuid, None)
+    aggregates = assert_aggregates_equal()
+    assert len(aggregates) == 2 * (3 + 3)
+    assert aggregates['count'].sum() == 2 * (72 + 48)
+
+    # Edit a reading and add a reading of a new data type.
+    tseries_edits = init_tseries_edits()
+    tseries_edits.loc[
+        (datetime.datetime(2000, 1, 2, 0, 30), 1, DataType.WaterLevel),
+        'value'] = 1234.56
+    tseries_edits.loc[
+        (datetime.datetime(2000, 1, 2, 5), 1, DataType.WaterEC),
+        'value'] = 7.89
+    dbaccessor.save_timeseries_data_edits(tseries_edits)
+    aggregates = assert_aggregates_equal()
+    assert len(aggregates) == 2 * (3 + 3) + 1
+    assert aggregates['max'].max() == 1234.56
+    assert (aggregates['first'] == 1234.56).sum() == 1
+
+    # Delete all the water level readings of a day and some of another.
+    tseries_dels = init_tseries_dels()
+    tseries_dels['datetime'] = pd.date_range(
+        start='2000-01-02 00:30', end='2000-01-03 05:30', freq='H')
+    tseries_dels['obs_id'] = 1
+    tseries_dels['data_type'] = DataType.WaterLevel
+    dbaccessor.delete_timeseries_data(tseries_dels)
+    aggregates = assert_aggregates_equal()
+    assert len(aggregates) == 2 * (3 + 3)
+    assert aggregates['max'].max() < 1234.56
+
+    # Delete all the readings of the second sonde.
+    tseries_dels = init_tseries_dels()
+    for data_type in [DataType.WaterLevel, DataType.WaterTemp]:
+        tseries_dels = tseries_dels.append(pd.DataFrame({
+            'datetime': pd.date_range(
+                start='2000-01-03 12:00', end='2000-01-05 11:00', freq='H'),
+            'obs_id': 2,
+            'data_type': data_type}), ignore_index=True)
+    dbaccessor.delete_timeseries_data(tseries_dels)
+    aggregates = assert_aggregates_equal()
+    assert len(aggregates) == 2 + 3 + 1
+    assert (aggregates['obs_id'] == 1).all()
+
+    # Assert that the aggregates of the days that start within a given
+    # period are returned as expected.
+    aggregates = dbaccessor.get_daily_timeseries_aggregates(
+        sampling_feature_uuid, DataType.WaterTemp,
+        datetime.datetime(2000, 1, 1, 12), datetime.datetime(2000, 1, 3))
+    assert aggregates['datetime'].tolist() == [datetime.datetime(2000, 1, 2)]
+
+
+def test_get_timeseries_data_versions(dbaccessor, database_filler,
+                                      obswells_data):
+    """
+    Test that the versions of the readings of the monitoring stations are
+    computed from the daily aggregates as expected and that they change
+    when the readings are edited.
+    """
+    database_filler(dbaccessor)
+    data_types = [DataType.WaterLevel, DataType.WaterTemp]
+
+    def assert_versions_equal():
+        versions = dbaccessor.get_timeseries_data_versions(data_types)
+        expected_versions = DatabaseAccessor._get_timeseries_data_versions(
+            dbaccessor, data_types)
+        pd.testing.assert_frame_equal(
+            versions, expected_versions,
+            check_dtype=False, check_index_type=False)
+        return versions
+
+    # Four monitoring stations have 6 years of daily readings.
+    versions = assert_versions_equal()
+    assert len(versions) == 4
+    assert (versions['count'] == 2 * 2192).all()
+    assert (versions['last_date'] == datetime.datetime(2020, 12, 31)).all()
+
+    # Edit a reading of the first station.
+    obs_well_uuid = obswells_data.index[0]
+    readings = dbaccessor.get_timeseries_for_obs_well(obs_well_uuid)
+    tseries_edits = init_tseries_edits()
+    tseries_edits.loc[
+        (readings['datetime'].iloc[0], readings['obs_id'].iloc[0],
+         DataType.WaterLevel),
+        'value'] = 1234.56
+    dbaccessor.save_timeseries_data_edits(tseries_edits)
+    new_versions = assert_versions_equal()
+    assert new_versions.loc[obs_well_uuid, 'digest'] != (
+        versions.loc[obs_well_uuid, 'digest'])
+    assert new_versions.drop(obs_well_uuid).equals(
+        versions.drop(obs_well_uuid))
+
+    # Swap the water levels of two readings of the first station, which
+    # does not change the number nor the sum of its readings.
+    versions = new_versions
+    tseries_edits = init_tseries_edits()
+    for i, j in [(1, 2), (2, 1)]:
+        tseries_edits.loc[
+            (readings['datetime'].iloc[i], readings['obs_id'].iloc[i],
+             DataType.WaterLevel),
+            'value'] = readings[DataType.WaterLevel].iloc[j]
+    dbaccessor.save_timeseries_data_edits(tseries_edits)
+    new_versions = assert_versions_equal()
+    assert new_versions.loc[obs_well_uuid, 'count'] == (
+        versions.loc[obs_well_uuid, 'count'])
+    assert new_versions.loc[obs_well_uuid, 'digest'] != (
+        versions.loc[obs_well_uuid, 'digest'])
+
+    # Delete the last reading of the first station.
+    tseries_dels = init_tseries_dels()
+    tseries_dels.loc[0] = [
+        readings['obs_id'].iloc[-1], readings['datetime'].iloc[-1],
+        DataType.WaterLevel]
+    dbaccessor.delete_timeseries_data(tseries_dels)
+    new_versions = assert_versions_equal()
+    assert new_versions.loc[obs_well_uuid, 'count'] == 2 * 2192 - 1
+
+
+def test_get_timeseries_for_obs_wells(dbaccessor):
+    """
+    Test that getting the readings of many monitoring stations with a
+    single query is working as expected.
+    """
+    sampling_feature_uuids = [uuid.uuid4(), uuid.uuid4(), uuid.uuid4()]
+
+    new_tseries_data = pd.DataFrame(
+        [], columns=['datetime', DataType.WaterLevel, DataType.WaterTemp])
+    new_tseries_data['datetime'] = pd.date_range(
+        start='1/1/2000', end='12/31/2000')
+    new_tseries_data[DataType.WaterLevel] = np.random.rand(
+        len(new_tseries_data))
+    new_tseries_data[DataType.WaterTemp] = np.random.rand(
+        len(new_tseries_data))
+    new_tseries_data.loc[10:20, DataType.WaterTemp] = np.nan
+    dbaccessor.add_timeseries_data(
+        new_tseries_data, sampling_feature_uuids[0], None)
+
+    new_tseries_data = pd.DataFrame(
+        [], columns=['datetime', DataType.WaterEC])
+    new_tseries_data['datetime'] = pd.date_range(
+        start='1/1/2001', end='1/31/2001')
+    new_tseries_data[DataType.WaterEC] = np.random.rand(
+        len(new_tseries_data))
+    dbaccessor.add_timeseries_data(
+        new_tseries_data, sampling_feature_uuids[1], None)
+
+    # Add a second water level channel to the observation of the first
+    # monitoring station with a reading that shares the same datetime as
+    # an existing reading. Both readings must be returned.
+    channel = (
+        dbaccessor._session.query(TimeSeriesChannel)
+        .filter(TimeSeriesChannel.obs_property_id ==
+                dbaccessor._get_observed_property_id(DataType.WaterLevel))
+        .one())
+    dup_channel = TimeSeriesChannel(
+        observation_id=channel.observation_id,
+        obs_property_id=channel.obs_property_id)
+    dbaccessor._session.add(dup_channel)
+    dbaccessor._session.flush()
+    dbaccessor._session.add(TimeSeriesData(
+        datetime=datetime.datetime(2000, 1, 5), value=-999,
+        channel_id=dup_channel.channel_id))
+    dbaccessor._session.commit()
+
+    # Note that there is no readings for the third monitoring station.
+    readings = dbaccessor.get_timeseries_for_obs_wells(sampling_feature_uuids)
+    assert len(readings) == 366 + 31 + 1
+    dup_readings = readings[
+        readings['datetime'] == datetime.datetime(2000, 1, 5)]
+    assert len(dup_readings) == 2
+    assert -999 in dup_readings[DataType.WaterLevel].values
+    assert list(readings.columns) == [
+        'sampling_feature_uuid', 'datetime', 'sonde_id',
+        DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC,
+        'install_depth', 'obs_id']
+
+    grouped_readings = dict(group_readings_by_obs_well(readings))
+    assert set(grouped_readings) == set(sampling_feature_uuids[:2])
+    for sampling_feature_uuid, well_readings in grouped_readings.items():
+        expected_readings = dbaccessor.get_timeseries_for_obs_well(
+            sampling_feature_uuid)
+        assert list(well_readings.columns) == list(expected_readings.columns)
+        assert len(well_readings) == len(expected_readings)
+        assert_dataframe_equals(
+            well_readings, expected_readings, ignore_index=True)
+
+    # Assert that the default implementation of the accessor base class
+    # returns the same readings.
+    readings_base = DatabaseAccessor._get_timeseries_for_obs_wells(
+        dbaccessor, sampling_feature_uuids)
+    assert list(readings_base.columns) == list(readings.columns)
+    assert_dataframe_equals(
+        readings_base.sort_values(['sampling_feature_uuid', 'datetime']),
+        readings.sort_values(['sampling_feature_uuid', 'datetime']),
+        ignore_index=True)
+
+    # Get the readings within a time interval, grouped by station.
+    grouped_readings = dict(dbaccessor.get_timeseries_for_obs_wells(
+        sampling_feature_uuids,
+        start=datetime.datetime(2000, 12, 1),
+        end=datetime.datetime(2001, 1, 11),
+        grouped=True))
+    assert set(grouped_readings) == set(sampling_feature_uuids[:2])
+
+    readings = grouped_readings[sampling_feature_uuids[0]]
+    assert len(readings) == 31
+    assert readings['datetime'].min() == datetime.datetime(2000, 12, 1)
+    assert readings['datetime'].max() == datetime.datetime(2000, 12, 31)
+
+    readings = grouped_readings[sampling_feature_uuids[1]]
+    assert len(readings) == 10
+    assert readings['datetime'].min() == datetime.datetime(2001, 1, 1)
+    assert readings['datetime'].max() == datetime.datetime(2001, 1, 10)
+
+    # Assert that an empty dataframe is returned when there is no readings.
+    readings = dbaccessor.get_timeseries_for_obs_wells(
+        sampling_feature_uuids[2:])
+    assert readings.empty
+    assert 'sampling_feature_uuid' in readings.columns
+
+
+def test_parquet_archive(dbaccessor, database_filler, obswells_data,
+                         tmp_path):
+    """
+    Test that exporting the database to a columnar archive and rebuilding
+    a database from that archive is working as expected.
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+    database_filler(dbaccessor)
+
+    # Export the database with a chunksize that is smaller than the
+    # number of readings per year to test that the readings are correctly
+    # partitioned across chunks.
+    dirname = osp.join(tmp_path, 'archive')
+    manifest = dbaccessor.export_parquet_archive(dirname, chunksize=100)
+    assert not dbaccessor._session.in_transaction()
+    assert manifest['schema_version'] == CURRENT_SCHEMA_VERSION
+    assert manifest['tables']['sampling_feature'] == 5
+    assert manifest['tables']['sampling_feature_attachment'] == 4
+
+    # Four monitoring stations have 6 years of daily readings for
+    # three data types.
+    assert manifest['readings']['partitions'] == 4 * 6
+    assert manifest['readings']['nrows'] == 4 * 2192 * 3
+    obs_well_uuid = obswells_data.index[0]
+    partition = pq.read_table(osp.join(
+        dirname, 'readings', f'sampling_feature_uuid={obs_well_uuid}',
+        'year=2016', 'part-0.parquet'))
+    assert partition.num_rows == 366 * 3
+    assert json.loads(partition.schema.metadata[b'sardes'])['table'] == (
+        'timeseries_data')
+
+    obswells_table = pq.read_table(
+        osp.join(dirname, 'model', 'observation_wells_data.parquet'))
+    assert obswells_table.num_rows == 5
+    assert set(obswells_table.column('obs_well_id').to_pylist()) == set(
+        obswells_data['obs_well_id'])
+
+    # Rebuild a new database from the archive.
+    dbaccessor2 = DatabaseAccessorSardesLite(
+        osp.join(tmp_path, 'sqlite_database_from_archive.db'))
+    dbaccessor2.init_database()
+    dbaccessor2.import_parquet_archive(dirname, chunksize=1000)
+    dbaccessor2.connect()
+    assert dbaccessor2.is_connected()
+    assert dbaccessor2.version() == CURRENT_SCHEMA_VERSION
+
+    for name in manifest['model']:
+        data = dbaccessor.get(name)
+        data2 = dbaccessor2.get(name)
+        assert len(data2) == len(data) == manifest['model'][name]
+        if len(data):
+            assert_dataframe_equals(data2, data)
+
+    for obs_well_uuid in obswells_data.index:
+        readings = dbaccessor.get_timeseries_for_obs_well(obs_well_uuid)
+        readings2 = dbaccessor2.get_timeseries_for_obs_well(obs_well_uuid)
+        assert len(readings2) == len(readings)
+        assert_dataframe_equals(readings2, readings, ignore_index=True)
+        assert (dbaccessor2.get_attachment(obs_well_uuid, 1) ==
+                dbaccessor.get_attachment(obs_well_uuid, 1))
+    assert_dataframe_equals(
+        dbaccessor2.get('observation_wells_data_overview'),
+        dbaccessor.get('observation_wells_data_overview'))
+    pd.testing.assert_frame_equal(
+        dbaccessor2.get_daily_timeseries_aggregates(obs_well_uuid),
+        dbaccessor.get_daily_timeseries_aggregates(obs_well_uuid))
+
+    dbaccessor2.close_connection()
+
+
+def test_parquet_archive_from_older_version(dbaccessor, database_filler,
+                                            obswells_data, tmp_path):
+    """
+    Test that an archive produced from an older schema version is imported
+    at its own version and that the database is then updated to the
+    current version.
+    """
+    pytest.importorskip('pyarrow.parquet')
+    database_filler(dbaccessor)
+
+    # Produce an archive of a version 4 database, which did not have the
+    # table of the daily aggregates of the readings.
+    dirname = osp.join(tmp_path, 'archive')
+    dbaccessor.export_parquet_archive(dirname)
+    os.remove(osp.join(
+        dirname, 'tables', 'timeseries_daily_aggregate.parquet'))
+    with open(osp.join(dirname, 'manifest.json')) as f:
+        manifest = json.load(f)
+    manifest['schema_version'] = 4
+    del manifest['tables']['timeseries_daily_aggregate']
+    with open(osp.join(dirname, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+    dbaccessor2 = DatabaseAccessorSardesLite(
+        osp.join(tmp_path, 'sqlite_database_from_archive.db'))
+    dbaccessor2.init_database()
+    manifest2 = dbaccessor2.import_parquet_archive(dirname, chunksize=1000)
+    assert manifest2['schema_version'] == 4
+    assert dbaccessor2.version() == CURRENT_SCHEMA_VERSION
+
+    dbaccessor2.connect()
+    assert dbaccessor2.is_connected()
+    for obs_well_uuid in obswells_data.index:
+        readings = dbaccessor.get_timeseries_for_obs_well(obs_well_uuid)
+        readings2 = dbaccessor2.get_timeseries_for_obs_well(obs_well_uuid)
+        assert_dataframe_equals(readings2, readings, ignore_index=True)
+        pd.testing.assert_frame_equal(
+            dbaccessor2.get_daily_timeseries_aggregates(obs_well_uuid),
+            dbaccessor.get_daily_timeseries_aggregates(obs_well_uuid))
+    dbaccessor2.close_connection()
+
+    # Assert that archives that are too old cannot be imported.
+    manifest['schema_version'] = 3
+    with open(osp.join(dirname, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+    with pytest.raises(DatabaseVersionError):
+        dbaccessor2.import_parquet_archive(dirname)
+
+
 def test_concurrent_read_write_access(qtbot, dblocker, dbaccessor,
                                       obswells_data):
     """
@@ -1221,6 +1718,35 @@ def test_concurrent_read_write_access(qtbot, dblocker, dbaccessor,
     assert dbaccessor._begin_transaction_try_count == 2
 
 
+def test_concurrent_read_access(dbaccessor, obswells_data):
+    """
+    Test that read transactions made with a read accessor can be executed
+    concurrently with a read transaction made with the main accessor.
+    """
+    name = obswells_data.attrs['name']
+    _dict = obswells_data.to_dict('index')
+    dbaccessor.add(name=name, values=_dict.values(), indexes=_dict.keys())
+
+    read_accessor = dbaccessor.create_read_accessor()
+    assert read_accessor is not dbaccessor
+    assert read_accessor.is_connected()
+    assert read_accessor._database == dbaccessor._database
+
+    # Begin a read transaction with the main accessor.
+    dbaccessor.begin_transaction(exclusive=False)
+    assert dbaccessor._session.in_transaction()
+
+    # Assert that reading data with the read accessor is not blocked.
+    data = read_accessor.get(name)
+    assert len(data) == 5
+    assert read_accessor._begin_transaction_try_count == 1
+    assert not read_accessor._session.in_transaction()
+
+    dbaccessor.commit_transaction()
+    read_accessor.close_connection()
+    assert not read_accessor.is_connected()
+
+
 def test_update_database_from_v2(tmp_path):
     """
     Test that updating the database from schema version 2 is
@@ -1239,19 +1765,19 @@ def test_update_database_from_v2(tmp_path):
     assert not dbaccessor._session.in_transaction()
 
     assert from_version == 2
-    assert to_version == 4
+    assert to_version == 5
     assert error is None
-    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 4
+    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 5
 
     # Try updating the database again to make sure this doesn't cause any bug.
     assert not dbaccessor._session.in_transaction()
     from_version, to_version, error = dbaccessor.update_database()
     assert not dbaccessor._session.in_transaction()
 
-    assert from_version == 4
-    assert to_version == 4
+    assert from_version == 5
+    assert to_version == 5
     assert error is None
-    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 4
+    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 5
 
     # (V3) Assert that the water quality reports were removed from the
     # database as expected.
@@ -1293,9 +1819,9 @@ def test_update_database_from_v3(tmp_path):
     assert not dbaccessor._session.in_transaction()
 
     assert from_version == 3
-    assert to_version == 4
+    assert to_version == 5
     assert error is None
-    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 4
+    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 5
 
     # (V4) Assert that 'in_recharge_zone' and 'is_influenced' data were
     # correctly converted from strings to integers.
@@ -1320,6 +1846,72 @@ def test_update_database_from_v3(tmp_path):
     hg_values = dbaccessor.get('hg_param_values')
     assert list(hg_values.lab_id) == [1, 1, 2, pd.NA]
 
+    # (V5) Assert that the 'timeseries_daily_aggregate' table was created
+    # and populated from the readings as expected.
+    dbaccessor.connect()
+    for obs_well_uuid in station_data.index:
+        aggregates = dbaccessor.get_daily_timeseries_aggregates(
+            obs_well_uuid)
+        expected_aggregates = (
+            DatabaseAccessor._get_daily_timeseries_aggregates(
+                dbaccessor, obs_well_uuid))
+        pd.testing.assert_frame_equal(aggregates, expected_aggregates)
+    assert len(dbaccessor.get_daily_timeseries_aggregates(
+        station_data.index[0])) == 6576
+
+
+def test_update_database_from_v4(dbaccessor, database_filler,
+                                 obswells_data):
+    """
+    Test that updating the database from schema version 4 is
+    working as expected.
+    """
+    database_filler(dbaccessor)
+
+    # Set a water level to null in the database, since null values must
+    # be ignored when computing the daily aggregates.
+    obs_well_uuid = obswells_data.index[0]
+    readings = dbaccessor.get_timeseries_for_obs_well(obs_well_uuid)
+    tseries_edits = init_tseries_edits()
+    tseries_edits.loc[
+        (readings['datetime'].iloc[0], readings['obs_id'].iloc[0],
+         DataType.WaterLevel),
+        'value'] = np.nan
+    dbaccessor.save_timeseries_data_edits(tseries_edits)
+
+    # Revert the database to schema version 4, which did not have the
+    # table of the daily aggregates of the readings.
+    dbaccessor.begin_transaction()
+    dbaccessor.execute("DROP TABLE timeseries_daily_aggregate")
+    dbaccessor.execute("PRAGMA user_version = 4")
+    assert 'timeseries_daily_aggregate' not in dbaccessor._get_table_names()
+    dbaccessor.commit_transaction()
+
+    # Update the database to the latest version.
+    assert not dbaccessor._session.in_transaction()
+    from_version, to_version, error = dbaccessor.update_database()
+    assert not dbaccessor._session.in_transaction()
+
+    assert from_version == 4
+    assert to_version == 5
+    assert error is None
+    assert dbaccessor._engine.execute("PRAGMA user_version").first()[0] == 5
+
+    # (V5) Assert that the 'timeseries_daily_aggregate' table was created
+    # and populated from the readings as expected.
+    dbaccessor.connect()
+    for obs_well_uuid in obswells_data.index:
+        aggregates = dbaccessor.get_daily_timeseries_aggregates(
+            obs_well_uuid)
+        expected_aggregates = compute_daily_aggregates(
+            dbaccessor.get_timeseries_for_obs_well(obs_well_uuid))
+        pd.testing.assert_frame_equal(aggregates, expected_aggregates)
+
+    # There is no aggregate for the water levels of the day of the
+    # null value, since it was the only water level of that day.
+    assert len(dbaccessor.get_daily_timeseries_aggregates(
+        obswells_data.index[0])) == 3 * 2192 - 1
+
 
 if __name__ == "__main__":
     pytest.main(['-x', __file__, '-v', '-rw'])
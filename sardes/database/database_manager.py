@@ -13,57 +13,133 @@ from __future__ import annotations
 import datetime
 import os
 import os.path as osp
+import shutil
+import tempfile
 from typing import Any, Callable
 import urllib
+import zipfile
 
 # ---- Third party imports
 import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from qtpy.QtCore import Signal
+from qtpy.QtCore import Signal, Slot
 import simplekml
 
 # ---- Local imports
 from sardes.api.database_model import DATABASE_CONCEPTUAL_MODEL
 from sardes.api.timeseries import DataType
-from sardes.api.taskmanagers import WorkerBase, TaskManagerBase
+from sardes.api.taskmanagers import (
+    WorkerBase, TaskManagerBase, TaskPriority, WorkerProcessPool)
 from sardes.config.locale import _
 from sardes.config.ospath import get_documents_logo_filename
 from sardes.config.main import CONF
-from sardes.database.accessors.accessor_helpers import create_empty_readings
+from sardes.database.accessors.accessor_helpers import (
+    create_empty_readings, group_readings_by_obs_well)
 from sardes.database.accessors.accessor_errors import ImportHGSurveysError
-from sardes.tools.hydrographs import HydrographCanvas
-from sardes.tools.save2excel import _save_reading_data_to_xlsx
-from sardes.tools.waterquality import _save_hg_data_to_xlsx
-from sardes.utils.data_operations import format_reading_data
+from sardes.utils.data_operations import (
+    format_reading_data, format_water_quality_data)
+
+
+# The number of workers used to execute read tasks concurrently.
+READ_WORKERS_COUNT = 3
+
+# The number of readings in the first chunk when fetching the readings
+# of a monitoring station by chunks.
+READINGS_FIRST_CHUNK_SIZE = 5000
+
+# The number of processes used to generate the files attached to the
+# stations when publishing the piezometric network and to generate the
+# files when exporting the readings of many stations at once.
+PUBLISH_PROCESSES_COUNT = max(1, (os.cpu_count() or 1) - 1)
+
+# The number of stations whose readings are fetched at once when
+# publishing the piezometric network or exporting the readings of
+# many stations.
+PUBLISH_READINGS_BATCH_SIZE = 25
 
 
 class DatabaseConnectionWorker(WorkerBase):
     """
     A simple worker to create a new database session without blocking the gui.
-    """
-    sig_publish_progress = Signal(float)
 
-    def __init__(self):
+    When a main worker is provided, the worker is a read worker that executes
+    read tasks with its own connection to the database of the main worker,
+    concurrently with the other workers. The cache is shared between the
+    main worker and its read workers.
+    """
+    READ_TASKS = (
+        'get', 'get_timeseries_for_obs_well', 'get_timeseries_for_obs_wells',
+        'get_timeseries_for_obs_well_by_chunks', 'get_water_quality_data',
+        'get_sonde_installation_info', 'get_attachment',
+        'check_foreign_constraints', 'publish_to_kml', 'export_readings',
+        'classify_wlevels')
+
+    def __init__(self, main_worker=None):
         super().__init__()
         self.db_accessor = None
+        self._main_worker = main_worker
+        self._read_workers = []
 
-        # Setup a cache structure for the tables and libraries.
-        self._cache = {}
-        self._stop_kml_publishing = False
+        if main_worker is None:
+            # Setup a cache structure for the tables and libraries.
+            self._cache = {}
+        else:
+            self._cache = main_worker._cache
 
     def clear_cache(self):
         """
         Clear the cache for the tables and libraries data.
         """
         print("Cleared the database worker cache.")
-        self._cache = {}
+        self._cache.clear()
+
+    def create_read_worker(self):
+        """
+        Create and return a new worker that executes read tasks with its
+        own connection to the database.
+        """
+        read_worker = DatabaseConnectionWorker(main_worker=self)
+        self._read_workers.append(read_worker)
+        return read_worker
+
+    @Slot()
+    def run_tasks(self):
+        """Execute the tasks that were added to the stack."""
+        if self._main_worker is not None:
+            self._update_read_accessor()
+        super().run_tasks()
 
     # ---- Worker connection state
     def is_connected(self):
         """Return whether a connection to a database is currently active."""
         return self.db_accessor is not None and self.db_accessor.is_connected()
 
+    def _update_read_accessor(self):
+        """
+        Make sure the database accessor of this read worker is connected
+        to the same database as that of the main worker.
+        """
+        main_accessor = self._main_worker.db_accessor
+        if main_accessor is None or not main_accessor.is_connected():
+            self._close_read_accessor()
+        elif self.db_accessor is None:
+            # If the accessor of the main worker does not support concurrent
+            # reads, we fall back to using it, in which case the reads are
+            # executed serially.
+            self.db_accessor = (
+                main_accessor.create_read_accessor() or main_accessor)
+
+    def _close_read_accessor(self):
+        """
+        Close the connection of the database accessor of this read worker.
+        """
+        if self.db_accessor is None:
+            return
+        if self.db_accessor is not self._main_worker.db_accessor:
+            self.db_accessor.close_connection()
+        self.db_accessor = None
+
     # ---- Task definition
     def _update_database(self, db_accessor):
         """Try to update the database schema to the latest version."""
@@ -77,6 +153,8 @@ class DatabaseConnectionWorker(WorkerBase):
 
     def _connect_to_db(self, db_accessor):
         """Try to create a new connection with the database"""
+        for read_worker in self._read_workers:
+            read_worker._close_read_accessor()
         self.db_accessor = db_accessor
         print("Connecting to database with {}...".format(
             type(self.db_accessor).__name__))
@@ -92,6 +170,8 @@ class DatabaseConnectionWorker(WorkerBase):
         """Close the connection with the database"""
         print("Closing connection with database...")
         self.clear_cache()
+        for read_worker in self._read_workers:
+            read_worker._close_read_accessor()
         if self.db_accessor is not None:
             self.db_accessor.close_connection()
         print("Connection with database closed.")
@@ -223,7 +303,8 @@ class DatabaseConnectionWorker(WorkerBase):
         return self._get_timeseries_for_obs_well(station_id)[0],
 
     def _get_timeseries_for_obs_well(self, sampling_feature_uuid,
-                                     data_types=None):
+                                     data_types=None, start=None, end=None,
+                                     freq=None, agg='mean'):
         """
         Return a pandas dataframe containing the readings for the given
         data types and monitoring station.
@@ -231,13 +312,7 @@ class DatabaseConnectionWorker(WorkerBase):
         If no data type are specified, then return the entire dataset for
         the specified monitoring station.
         """
-        # We do this like this to avoid unecessary prints in the console.
-        if 'observation_wells_data' in self._cache:
-            obs_well_data = self._cache['observation_wells_data']
-        else:
-            obs_well_data = self._get('observation_wells_data')[0]
-        obs_well_data = obs_well_data.loc[sampling_feature_uuid]
-
+        obs_well_data = self._get_obs_well_data(sampling_feature_uuid)
         if data_types is None:
             data_types = [
                 DataType.WaterLevel,
@@ -249,7 +324,7 @@ class DatabaseConnectionWorker(WorkerBase):
               .format(obs_well_id))
         try:
             readings = self.db_accessor.get_timeseries_for_obs_well(
-                sampling_feature_uuid, data_types)
+                sampling_feature_uuid, data_types, start, end, freq, agg)
         except Exception as error:
             print(("Failed to fetch readings data for observation well {} "
                    "because of the following error:").format(obs_well_id))
@@ -274,6 +349,128 @@ class DatabaseConnectionWorker(WorkerBase):
 
         return readings,
 
+    def _get_timeseries_for_obs_well_by_chunks(
+            self, sampling_feature_uuid, data_types=None,
+            chunk_size=READINGS_FIRST_CHUNK_SIZE):
+        """
+        Fetch the readings for the given data types and monitoring station
+        by chunks, from the most recent to the oldest, and send each chunk
+        as a partial result of the task as soon as it is fetched.
+
+        The size of the chunks is doubled each time, so that the most
+        recent readings are available quickly, while the total time
+        required to fetch the readings of stations with a large number
+        of readings remains close to that of a single query.
+
+        Each chunk is sent along with a flag indicating whether it is the
+        first chunk. At least one chunk, that may be empty, is always sent.
+        Note that the index of the chunks are unique among the chunks.
+
+        Returns
+        -------
+        nbr_readings : int
+            The number of readings that were sent in the chunks.
+        error : str
+            A description of the error that occurred while fetching a chunk,
+            in which case the readings that were sent are incomplete, or
+            None if all the chunks were fetched successfully.
+        """
+        obs_well_data = self._get_obs_well_data(sampling_feature_uuid)
+        if data_types is None:
+            data_types = [
+                DataType.WaterLevel,
+                DataType.WaterTemp,
+                DataType.WaterEC]
+
+        obs_well_id = obs_well_data['obs_well_id']
+        print("Fetching readings data for observation well {} by chunks..."
+              .format(obs_well_id))
+        end = None
+        nbr_readings = 0
+        fetch_error = None
+        while not self.is_current_task_cancelled():
+            try:
+                readings = self.db_accessor.get_timeseries_chunk_for_obs_well(
+                    sampling_feature_uuid, data_types, end, chunk_size)
+            except Exception as error:
+                print(("Failed to fetch readings data for observation well {} "
+                       "because of the following error:").format(obs_well_id))
+                print(type(error).__name__, end=': ')
+                print(error)
+                fetch_error = '{}: {}'.format(type(error).__name__, error)
+                if end is not None:
+                    break
+                # We still send an empty first chunk, so that the readings
+                # of a previous fetch are cleared.
+                readings = create_empty_readings(data_types)
+            if readings.empty and end is not None:
+                break
+
+            readings.index = pd.RangeIndex(
+                nbr_readings, nbr_readings + len(readings))
+            readings._metadata = ['sampling_feature_data']
+            readings.sampling_feature_data = obs_well_data
+            self.emit_partial_result(readings, end is None)
+            if readings.empty:
+                break
+
+            nbr_readings += len(readings)
+            end = readings['datetime'].min()
+            chunk_size *= 2
+        else:
+            print("Fetching readings data for observation well {} "
+                  "was cancelled.".format(obs_well_id))
+            return nbr_readings, None
+
+        if fetch_error is not None:
+            print("Fetching readings data for observation well {} failed "
+                  "after {} readings.".format(obs_well_id, nbr_readings))
+            return nbr_readings, fetch_error
+
+        print("Successfully fetched {} readings for observation well {}."
+              .format(nbr_readings, obs_well_id))
+        return nbr_readings, None
+
+    def _get_timeseries_for_obs_wells(self, sampling_feature_uuids,
+                                      data_types=None, start=None, end=None):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring stations in long format.
+        """
+        if data_types is None:
+            data_types = [
+                DataType.WaterLevel,
+                DataType.WaterTemp,
+                DataType.WaterEC]
+
+        print("Fetching readings data for {} observation wells..."
+              .format(len(sampling_feature_uuids)))
+        try:
+            readings = self.db_accessor.get_timeseries_for_obs_wells(
+                sampling_feature_uuids, data_types, start, end)
+        except Exception as error:
+            print("Failed to fetch readings data because of the "
+                  "following error:")
+            print(type(error).__name__, end=': ')
+            print(error)
+            readings = create_empty_readings(data_types)
+            readings.insert(0, 'sampling_feature_uuid', None)
+        else:
+            print("Successfully fetched readings data for {} "
+                  "observation wells.".format(len(sampling_feature_uuids)))
+        return readings,
+
+    def _get_obs_well_data(self, sampling_feature_uuid):
+        """
+        Return the data of the given monitoring station.
+        """
+        # We do this like this to avoid unecessary prints in the console.
+        if 'observation_wells_data' in self._cache:
+            obs_well_data = self._cache['observation_wells_data']
+        else:
+            obs_well_data = self._get('observation_wells_data')[0]
+        return obs_well_data.loc[sampling_feature_uuid]
+
     def _save_timeseries_data_edits(self, tseries_edits, auto_commit=True):
         """
         Save in the database a set of edits that were made to to timeseries
@@ -368,36 +565,13 @@ class DatabaseConnectionWorker(WorkerBase):
             [repere_data['sampling_feature_uuid'] == station_id]
             .copy())
 
-        for hg_survey_id, hg_survey_data in sta_hg_surveys.iterrows():
-            hg_survey_date = hg_survey_data['hg_survey_datetime']
-
-            _to_merge = hg_param_values.loc[
-                hg_param_values['hg_survey_id'] == hg_survey_id
-                ]
-            if _to_merge.empty:
-                continue
-
-            _to_merge = _to_merge[
-                ['hg_param_id', 'hg_param_value', 'meas_units_id']
-                ].copy()
-            _to_merge['hg_param_id'] = (
-                _to_merge['hg_param_id']
-                .map(hg_params['hg_param_name'].to_dict().get)
-                )
-            _to_merge['meas_units_id'] = (
-                _to_merge['meas_units_id']
-                .map(measurement_units['meas_units_abb'].to_dict().get)
-                )
-            _to_merge = _to_merge.set_index('hg_param_id')
-            _to_merge.columns = pd.MultiIndex.from_tuples(
-                [(hg_survey_date, col) for col in _to_merge.columns]
-                )
-
-            if water_quality_data.empty:
-                water_quality_data = _to_merge
-            else:
-                water_quality_data = water_quality_data.merge(
-                    _to_merge, how='outer', left_index=True, right_index=True)
+        water_quality_data = format_water_quality_data(
+            sta_hg_surveys,
+            hg_param_values[
+                hg_param_values['hg_survey_id'].isin(sta_hg_surveys.index)],
+            hg_params['hg_param_name'].to_dict(),
+            measurement_units['meas_units_abb'].to_dict())
+        water_quality_data.attrs['station_id'] = station_id
         water_quality_data.attrs['station_data'] = station_data
         water_quality_data.attrs['station_repere_data'] = station_repere_data
 
@@ -463,6 +637,9 @@ class DatabaseConnectionWorker(WorkerBase):
         """
         Publish the piezometric network data to the specified kml filename.
 
+        The progress of the publishing, in percent, is sent as partial
+        results of the task.
+
         Parameters
         ----------
         kml_filename : str
@@ -484,9 +661,15 @@ class DatabaseConnectionWorker(WorkerBase):
         -------
         results : bool
             Whether the publishing of the piezometric network was successful.
+        nbr_skipped : int
+            The number of attached files that were not generated again
+            because their inputs did not change since the last time the
+            network was published to the specified kml filename.
         """
-        from sardes.plugins.network.base import format_kml_station_info
-        self._stop_kml_publishing = False
+        from sardes.plugins.network.base import (
+            format_kml_station_info, generate_station_files,
+            StationPublishItem, load_publish_manifest, save_publish_manifest,
+            create_network_publish_plan)
 
         # Create the files and folder architecture.
         files_dirname = osp.join(
@@ -506,6 +689,15 @@ class DatabaseConnectionWorker(WorkerBase):
         if not osp.exists(quality_dirname):
             os.makedirs(quality_dirname)
 
+        # The fingerprints of the inputs of the attached files that were
+        # generated the last time the network was published are saved
+        # in a manifest next to the kml file, so that only the files
+        # whose inputs changed are generated again.
+        manifest_filename = (
+            osp.splitext(kml_filename)[0] + '_manifest.json')
+        manifest = load_publish_manifest(manifest_filename)
+        nbr_skipped = 0
+
         # Initialize a new KML document.
         kml = simplekml.Kml()
         fol = simplekml.Folder()
@@ -519,179 +711,553 @@ class DatabaseConnectionWorker(WorkerBase):
         pnt_style.labelstyle.color = 'bfffffff'
         pnt_style.labelstyle.scale = 0.8
 
-        repere_data, = self._get('repere_data')
-        stations_data_overview, = self._get('observation_wells_data_overview')
-        stations_data, = self._get('observation_wells_data')
-        stations_data['locations'] = list(zip(
-            stations_data['longitude'].astype(float).round(decimals=4),
-            stations_data['latitude'].astype(float).round(decimals=4)
-            ))
-        unique_locations = (
-            stations_data[['locations']]
-            .drop_duplicates(['locations'])
-            .values.flatten().tolist()
-            )
+        # The readings of the stations are published for these data types.
+        readings_data_types = [
+            DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC]
+
+        # Group by station the data needed to publish the network, so that
+        # the data of each station can be looked up in dictionaries.
+        plan = create_network_publish_plan(
+            self._get('observation_wells_data')[0],
+            self._get('observation_wells_data_overview')[0],
+            self.db_accessor.get_timeseries_data_versions(
+                readings_data_types),
+            self._get('repere_data')[0],
+            self._get('sonde_installations')[0],
+            self._get('sondes_data')[0],
+            self._get('hg_surveys')[0],
+            self._get('hg_param_values')[0],
+            self._get('hg_params')[0],
+            self._get('measurement_units')[0],
+            get_documents_logo_filename())
+        stations_data = plan.stations_data
+
+        authors_name = CONF.get('documents_settings', 'authors_name', '')
+        site_url = CONF.get('documents_settings', 'site_url', '')
+        xlsx_font = CONF.get('documents_settings', 'xlsx_font')
+        graph_font = CONF.get('documents_settings', 'graph_font')
+
+        # Create the items of the stations from the data of the plan and
+        # find the stations whose readings data file or graph must be
+        # generated again, so that the readings of the other stations
+        # are not fetched from the database.
+        items = {}
+        readings_uuids = []
+        for loc, loc_stations_uuids in plan.locations:
+            for station_uuid in loc_stations_uuids:
+                station_data = stations_data.loc[station_uuid]
 
-        progress = 0
-        progress_total = len(stations_data)
-        for loc in unique_locations:
-            if self._stop_kml_publishing:
-                return False,
+                station_repere_data = plan.repere_data.get(
+                    station_uuid, pd.Series([], dtype=object))
+                last_repere_data = station_repere_data.iloc[-1]
 
-            pnt = fol.newpoint(coords=[loc])
-            pnt.style = pnt_style
+                item = StationPublishItem(
+                    station_data,
+                    ground_altitude=(
+                        last_repere_data['top_casing_alt'] -
+                        last_repere_data['casing_length']),
+                    is_alt_geodesic=last_repere_data['is_alt_geodesic'],
+                    readings_version=plan.get_readings_version(station_uuid),
+                    logo_filename=plan.logo_filename,
+                    authors_name=authors_name,
+                    site_url=site_url,
+                    xlsx_font=xlsx_font,
+                    graph_font=graph_font)
+                if item.readings_version is not None:
+                    if iri_data is not None:
+                        item.xlsx_savepath = osp.join(
+                            data_dirname, _('readings_{}.xlsx').format(
+                                station_data['obs_well_id']))
+                    if iri_graphs is not None:
+                        item.graph_savepath = osp.join(
+                            graphs_dirname, _('graph_{}.pdf').format(
+                                station_data['obs_well_id']))
+                    if self._get_outdated_station_files(
+                            item, manifest, files_dirname, plan.logo_data):
+                        readings_uuids.append(station_uuid)
+                items[station_uuid] = item
+
+        # The readings of the stations are fetched by batches.
+        stations_readings = self._iter_timeseries_for_obs_wells(
+            readings_uuids, readings_data_types)
+        readings_uuids = set(readings_uuids)
+
+        # The files attached to the stations are generated in separate
+        # processes, while the data needed to generate them are fetched
+        # from the database in this thread.
+        pool = WorkerProcessPool(
+            self,
+            lambda fingerprints, future: self._check_station_files_generated(
+                fingerprints, future, manifest),
+            PUBLISH_PROCESSES_COUNT, len(stations_data))
+        try:
+            for loc, loc_stations_uuids in plan.locations:
+                if self.is_current_task_cancelled():
+                    return False, nbr_skipped
 
-            loc_stations_data = (
-                stations_data[stations_data['locations'] == loc]
-                .sort_values(['obs_well_id'], ascending=True))
+                pnt = fol.newpoint(coords=[loc])
+                pnt.style = pnt_style
 
-            municipality = loc_stations_data['municipality'].values[0]
-            pnt.name = municipality
+                municipality = (
+                    stations_data.at[loc_stations_uuids[0], 'municipality'])
+                pnt.name = municipality
 
-            pnt_desc = '<![CDATA['
-            for station_uuid, station_data in loc_stations_data.iterrows():
-                progress += 1
-                station_data = stations_data.loc[station_uuid]
+                pnt_desc = '<![CDATA['
+                for station_uuid in loc_stations_uuids:
+                    item = items.pop(station_uuid)
+                    station_data = item.station_data
 
-                station_repere_data = (
-                    repere_data
-                    [repere_data['sampling_feature_uuid'] == station_uuid]
-                    .copy())
-                if not station_repere_data.empty:
-                    station_repere_data = (
-                        station_repere_data
-                        .sort_values(by=['end_date'], ascending=[True]))
+                    last_reading = plan.last_readings.get(station_uuid)
+
+                    # Format the info for the current station.
+                    pnt_desc += format_kml_station_info(
+                        station_data, item.ground_altitude,
+                        item.is_alt_geodesic, last_reading
+                        )
+
+                    # Fetch the data needed to generate the attached files
+                    # of the station and add the urls.
+                    files_urls = ''
+                    if station_uuid in readings_uuids:
+                        item.formatted_data = format_reading_data(
+                            next(stations_readings),
+                            plan.repere_data[station_uuid])
+                    if item.xlsx_savepath is not None:
+                        url = urllib.parse.quote(
+                            iri_data + '/' + osp.basename(item.xlsx_savepath),
+                            safe='/:')
+                        files_urls += '<a href="{}">{}</a><br/>'.format(
+                            url, _("Data"))  # Données
+                    if iri_logs is not None:
+                        log_data, log_fame = (
+                            self.db_accessor.get_attachment(station_uuid, 1))
+                    if iri_logs is not None and log_data is not None:
+                        root, ext = osp.splitext(log_fame)
+                        log_filename = _('diagram_{}{}').format(
+                            station_data['obs_well_id'], ext)
+                        item.log_data = log_data
+                        item.log_savepath = osp.join(
+                            logs_dirname, log_filename)
+
+                        url = urllib.parse.quote(
+                            iri_logs + '/' + log_filename, safe='/:')
+                        files_urls += '<a href="{}">{}</a><br/>'.format(
+                            url, _("Diagram"))
+                    if item.graph_savepath is not None:
+                        url = urllib.parse.quote(
+                            iri_graphs + '/' +
+                            osp.basename(item.graph_savepath),
+                            safe='/:')
+                        files_urls += '<a href="{}">{}</a><br/>'.format(
+                            url, _("Graph"))
+                    if iri_quality is not None:
+                        quality_data = plan.get_water_quality_data(
+                            station_uuid)
+                    if iri_quality is not None and not quality_data.empty:
+                        quality_filename = _(
+                            "water_quality_{}.xlsx"
+                            ).format(station_data['obs_well_id'])
+                        item.quality_data = quality_data
+                        item.quality_station_data = station_data
+                        item.quality_savepath = osp.join(
+                            quality_dirname, quality_filename)
+
+                        url = urllib.parse.quote(
+                            iri_quality + '/' + quality_filename, safe='/:')
+                        files_urls += '<a href="{}">{}</a><br/>'.format(
+                            url, _("Water Quality"))
+                    if files_urls:
+                        pnt_desc += '<br/>' + files_urls
+
+                    if station_uuid != loc_stations_uuids[-1]:
+                        pnt_desc += '--<br/>'
+
+                    # Skip the files whose inputs did not change since
+                    # the last time the network was published.
+                    fingerprints = self._get_outdated_station_files(
+                        item, manifest, files_dirname, plan.logo_data)
+                    for field in ('xlsx_savepath', 'log_savepath',
+                                  'graph_savepath', 'quality_savepath'):
+                        savepath = getattr(item, field)
+                        if savepath is None:
+                            continue
+                        if savepath in fingerprints:
+                            manifest.pop(fingerprints[savepath][0], None)
+                        else:
+                            setattr(item, field, None)
+                            nbr_skipped += 1
+
+                    if fingerprints:
+                        pool.submit(
+                            fingerprints, generate_station_files, item)
+                    else:
+                        pool.skip()
+                pnt_desc += '<br/>]]>'
+                pnt.description = pnt_desc
+
+            # Wait for the remaining files to be generated.
+            if not pool.join():
+                return False, nbr_skipped
+        finally:
+            pool.shutdown()
+            save_publish_manifest(manifest_filename, manifest)
+
+        kml.save(kml_filename)
+        print("{} attached files were skipped because their inputs did not "
+              "change since the last publishing.".format(nbr_skipped))
+        return True, nbr_skipped
+
+    def _iter_timeseries_for_obs_wells(self, sampling_feature_uuids,
+                                       data_types):
+        """
+        Yield the readings of the given monitoring stations, in the same
+        order, fetching the readings of many stations at once.
+        """
+        for i in range(0, len(sampling_feature_uuids),
+                       PUBLISH_READINGS_BATCH_SIZE):
+            batch_uuids = sampling_feature_uuids[
+                i:i + PUBLISH_READINGS_BATCH_SIZE]
+            readings = dict(group_readings_by_obs_well(
+                self._get_timeseries_for_obs_wells(
+                    batch_uuids, data_types)[0]))
+            for sampling_feature_uuid in batch_uuids:
+                if sampling_feature_uuid in readings:
+                    yield readings.pop(sampling_feature_uuid)
                 else:
-                    station_repere_data = pd.Series([], dtype=object)
-                last_repere_data = station_repere_data.iloc[-1]
+                    yield create_empty_readings(data_types)
+
+    def _get_outdated_station_files(self, item, manifest, files_dirname,
+                                    logo_data=None):
+        """
+        Return a dictionary containing the key in the manifest and the
+        fingerprint of the files of the given item that must be generated
+        again, using the save paths as keys.
+
+        A file must be generated again if it does not exist or if its
+        inputs changed since the last time the network was published.
+        """
+        outdated_files = {}
+        fingerprints = item.get_files_fingerprints(logo_data)
+        for savepath, fingerprint in fingerprints.items():
+            key = osp.relpath(savepath, files_dirname).replace(os.sep, '/')
+            if not (osp.exists(savepath) and
+                    manifest.get(key) == fingerprint):
+                outdated_files[savepath] = (key, fingerprint)
+        return outdated_files
+
+    def _check_station_files_generated(self, fingerprints, future,
+                                       manifest):
+        """
+        Add the fingerprints of the files attached to a station that were
+        generated successfully by the given done future to the manifest,
+        or print the error that occured while generating them.
+        """
+        error = future.exception()
+        if error is not None:
+            print("Failed to generate the files of a station because "
+                  "of the following error:")
+            print(type(error).__name__, end=': ')
+            print(error)
+            return
+        for savepath in future.result():
+            key, fingerprint = fingerprints[savepath]
+            manifest[key] = fingerprint
+
+    def _export_readings(self, sampling_feature_uuids, dest, file_format):
+        """
+        Export the formatted readings data of the given monitoring stations
+        to files of the given format.
 
-                ground_altitude = (
-                    last_repere_data['top_casing_alt'] -
-                    last_repere_data['casing_length'])
-                is_alt_geodesic = last_repere_data['is_alt_geodesic']
+        The files are saved in the dest directory, or in a zip archive if
+        dest ends with '.zip'. A summary of the export is saved along with
+        the files in a CSV file.
 
-                if station_uuid in stations_data_overview.index:
-                    last_reading = (stations_data_overview
-                                    .loc[station_uuid]['last_date'])
+        The readings are fetched from the database by batches in this
+        thread, while they are formatted and saved to files in separate
+        processes. The progress of the export, in percent, is sent as
+        partial results of the task.
+
+        Returns
+        -------
+        summary : DataFrame
+            A dataframe indexed by monitoring station containing the ID of
+            each station, the name of the file in which its readings were
+            exported, the number of daily values that were exported and
+            the error that occured, if any. The name of the file is None
+            for the stations without readings. Return None if the export
+            failed or was cancelled.
+        """
+        from sardes.tools.batchexport import (
+            export_station_readings, get_readings_export_filename)
+
+        stations_data = self._get('observation_wells_data')[0]
+        sampling_feature_uuids = [
+            uuid for uuid in sampling_feature_uuids if
+            uuid in stations_data.index]
+        repere_data = dict(list(
+            self._get('repere_data')[0]
+            .sort_values(by=['end_date'], ascending=[True])
+            .groupby('sampling_feature_uuid', sort=False)))
+
+        # When exporting to a zip archive, the files are generated in a
+        # temporary directory and moved to the archive one at a time. The
+        # archive is written to a temporary file that replaces dest only
+        # once the export is completed, so that an existing archive is
+        # never altered if the export fails or is cancelled.
+        is_zip = dest.lower().endswith('.zip')
+        zip_filename = None
+        try:
+            if is_zip:
+                files_dirname = tempfile.mkdtemp()
+                fd, zip_filename = tempfile.mkstemp(
+                    suffix='.zip', dir=osp.dirname(dest))
+                os.close(fd)
+                zfile = zipfile.ZipFile(
+                    zip_filename, 'w', zipfile.ZIP_DEFLATED)
+            else:
+                files_dirname = dest
+                zfile = None
+                os.makedirs(dest, exist_ok=True)
+        except OSError as error:
+            print("Failed to export readings data because of the "
+                  "following error:")
+            print(type(error).__name__, end=': ')
+            print(error)
+            if zip_filename is not None:
+                shutil.rmtree(files_dirname, ignore_errors=True)
+                self._remove_export_file(zip_filename)
+            return None,
+
+        print("Exporting readings data for {} observation wells..."
+              .format(len(sampling_feature_uuids)))
+        stations_readings = self._iter_timeseries_for_obs_wells(
+            sampling_feature_uuids,
+            [DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC])
+        logo_filename = get_documents_logo_filename()
+        xlsx_font = CONF.get('documents_settings', 'xlsx_font')
+
+        summary = {}
+        cancelled = False
+        pool = WorkerProcessPool(
+            self,
+            lambda context, future: self._check_readings_exported(
+                context, future, summary, files_dirname, zfile),
+            PUBLISH_PROCESSES_COUNT, len(sampling_feature_uuids))
+        try:
+            for station_uuid in sampling_feature_uuids:
+                if self.is_current_task_cancelled():
+                    cancelled = True
+                    break
+
+                station_data = stations_data.loc[station_uuid]
+                summary[station_uuid] = {
+                    'obs_well_id': station_data['obs_well_id'],
+                    'filename': None,
+                    'nbr_values': 0,
+                    'error': None}
+
+                readings = next(stations_readings)
+                if readings.empty:
+                    pool.skip()
+                    continue
+
+                station_repere_data = repere_data.get(
+                    station_uuid, pd.DataFrame([]))
+                if station_repere_data.empty:
+                    ground_altitude = None
+                    is_alt_geodesic = False
                 else:
-                    last_reading = None
-
-                # Format the info for the current station.
-                pnt_desc += format_kml_station_info(
-                    station_data, ground_altitude, is_alt_geodesic,
-                    last_reading
-                    )
-
-                # Fetch data from the database.
-                if iri_data is not None or iri_graphs is not None:
-                    readings, = self._get_timeseries_for_obs_well(
-                        station_uuid,
-                        data_types=[DataType.WaterLevel,
-                                    DataType.WaterTemp,
-                                    DataType.WaterEC])
-                    formatted_data = format_reading_data(
-                        readings, station_repere_data)
-                if iri_logs is not None:
-                    log_data, log_fame = (
-                        self.db_accessor.get_attachment(station_uuid, 1))
-                if iri_quality is not None:
-                    quality_data, = self._get_water_quality_data(station_uuid)
-
-                # Generate the attached files and add the urls.
-                files_urls = ''
-                if iri_data is not None and not readings.empty:
-                    xlsx_filename = _('readings_{}.xlsx').format(
-                        station_data['obs_well_id'])
-                    xlsx_savepath = osp.join(data_dirname, xlsx_filename)
-                    try:
-                        _save_reading_data_to_xlsx(
-                            xlsx_savepath,
-                            _('Piezometry'),
-                            formatted_data,
-                            station_data,
-                            ground_altitude,
-                            is_alt_geodesic,
-                            logo_filename=get_documents_logo_filename(),
-                            font_name=CONF.get(
-                                'documents_settings', 'xlsx_font')
-                            )
-                    except PermissionError as e:
-                        print(e)
-
-                    url = urllib.parse.quote(
-                        iri_data + '/' + xlsx_filename, safe='/:')
-                    files_urls += '<a href="{}">{}</a><br/>'.format(
-                        url, _("Data"))  # Données
-                if iri_logs is not None and log_data is not None:
-                    root, ext = osp.splitext(log_fame)
-                    log_filename = _('diagram_{}{}').format(
-                        station_data['obs_well_id'], ext)
-                    log_savepath = osp.join(logs_dirname, log_filename)
-                    try:
-                        with open(log_savepath, 'wb') as f:
-                            f.write(log_data)
-                    except PermissionError as e:
-                        print(e)
-
-                    url = urllib.parse.quote(
-                        iri_logs + '/' + log_filename, safe='/:')
-                    files_urls += '<a href="{}">{}</a><br/>'.format(
-                        url, _("Diagram"))
-                if iri_graphs is not None and not readings.empty:
-                    graph_filename = _('graph_{}.pdf').format(
-                        station_data['obs_well_id'])
-                    graph_savepath = osp.join(graphs_dirname, graph_filename)
-                    hydrograph = HydrographCanvas(
-                        formatted_data,
-                        station_data,
-                        ground_altitude,
-                        is_alt_geodesic,
-                        fontname=CONF.get('documents_settings', 'graph_font')
-                        )
-                    try:
-                        hydrograph.figure.savefig(graph_savepath, dpi=300)
-                    except PermissionError as e:
-                        print(e)
-
-                    url = urllib.parse.quote(
-                        iri_graphs + '/' + graph_filename, safe='/:')
-                    files_urls += '<a href="{}">{}</a><br/>'.format(
-                        url, _("Graph"))
-                if iri_quality is not None and not quality_data.empty:
-                    quality_filename = _(
-                        "water_quality_{}.xlsx"
-                        ).format(station_data['obs_well_id'])
-                    quality_savepath = osp.join(
-                        quality_dirname, quality_filename)
-                    try:
-                        _save_hg_data_to_xlsx(
-                            quality_savepath,
-                            _('Water Quality'),
-                            quality_data,
-                            quality_data.attrs['station_data'],
-                            ground_altitude,
-                            is_alt_geodesic,
-                            logo_filename=get_documents_logo_filename(),
-                            font_name=CONF.get(
-                                'documents_settings', 'xlsx_font')
-                            )
-                    except PermissionError as e:
-                        print(e)
-
-                    url = urllib.parse.quote(
-                        iri_quality + '/' + quality_filename, safe='/:')
-                    files_urls += '<a href="{}">{}</a><br/>'.format(
-                        url, _("Water Quality"))
-                if files_urls:
-                    pnt_desc += '<br/>' + files_urls
-
-                if station_uuid != loc_stations_data.index[-1]:
-                    pnt_desc += '--<br/>'
-                self.sig_publish_progress.emit(progress / progress_total * 100)
-            pnt_desc += '<br/>]]>'
-            pnt.description = pnt_desc
-        kml.save(kml_filename)
-        return True,
+                    last_repere_data = station_repere_data.iloc[-1]
+                    ground_altitude = (
+                        last_repere_data['top_casing_alt'] -
+                        last_repere_data['casing_length'])
+                    is_alt_geodesic = last_repere_data['is_alt_geodesic']
+
+                filename = get_readings_export_filename(
+                    station_data['obs_well_id'], file_format)
+                pool.submit(
+                    (station_uuid, filename), export_station_readings,
+                    osp.join(files_dirname, filename), file_format,
+                    readings, station_repere_data, station_data,
+                    ground_altitude, is_alt_geodesic,
+                    logo_filename=logo_filename, font_name=xlsx_font)
+
+            # Wait for the remaining files to be generated.
+            if not cancelled:
+                cancelled = not pool.join()
+
+            if not cancelled:
+                summary = pd.DataFrame.from_dict(
+                    summary, orient='index',
+                    columns=['obs_well_id', 'filename', 'nbr_values',
+                             'error'])
+                summary_filename = _('readings_export_summary.csv')
+                summary.to_csv(
+                    osp.join(files_dirname, summary_filename),
+                    index=False, encoding='utf-8-sig')
+                if zfile is not None:
+                    zfile.write(
+                        osp.join(files_dirname, summary_filename),
+                        summary_filename)
+                    zfile.close()
+                    os.replace(zip_filename, dest)
+                    zip_filename = None
+        finally:
+            pool.shutdown()
+            if zfile is not None:
+                zfile.close()
+                shutil.rmtree(files_dirname, ignore_errors=True)
+                if zip_filename is not None:
+                    self._remove_export_file(zip_filename)
+
+        if cancelled:
+            print("Exporting readings data was cancelled.")
+            return None,
+
+        print("Successfully exported readings data for {} observation wells."
+              .format(summary['filename'].notnull().sum()))
+        return summary,
+
+    def _remove_export_file(self, filename):
+        """
+        Remove the given temporary file created when exporting the
+        readings data, ignoring the errors that may occur.
+        """
+        try:
+            os.remove(filename)
+        except OSError as error:
+            print("Failed to remove '{}' because of the following error:"
+                  .format(filename))
+            print(type(error).__name__, end=': ')
+            print(error)
+
+    def _check_readings_exported(self, context, future, summary,
+                                 files_dirname, zfile=None):
+        """
+        Update the summary of the export with the result of the given done
+        future and move the exported file to the zip archive, if any.
+        """
+        station_uuid, filename = context
+        error = future.exception()
+        if error is not None:
+            print("Failed to export the readings data of a station "
+                  "because of the following error:")
+            print(type(error).__name__, end=': ')
+            print(error)
+            summary[station_uuid]['error'] = '{}: {}'.format(
+                type(error).__name__, error)
+            return
+        summary[station_uuid]['filename'] = filename
+        summary[station_uuid]['nbr_values'] = future.result()
+        if zfile is not None:
+            savepath = osp.join(files_dirname, filename)
+            zfile.write(savepath, filename)
+            os.remove(savepath)
+
+    def _get_daily_wlevels_for_month(self, sampling_feature_uuid, month):
+        """
+        Return the daily water levels of the given monitoring station for
+        the given month of all the years with readings, as returned by the
+        accessor when aggregating the readings by day with 'first'.
+
+        The months with readings are fetched first, so that the daily
+        water levels are only fetched for those months.
+        """
+        data_types = [DataType.WaterLevel]
+        try:
+            monthly_readings = self.db_accessor.get_timeseries_for_obs_well(
+                sampling_feature_uuid, data_types, freq='M', agg='first')
+            daily_readings = []
+            for start in monthly_readings['datetime'].drop_duplicates():
+                if start.month != month:
+                    continue
+                daily_readings.append(
+                    self.db_accessor.get_timeseries_for_obs_well(
+                        sampling_feature_uuid, data_types,
+                        start, start + pd.offsets.MonthBegin(),
+                        freq='D', agg='first'))
+        except Exception as error:
+            print(("Failed to fetch readings data for observation well {} "
+                   "because of the following error:"
+                   ).format(sampling_feature_uuid))
+            print(type(error).__name__, end=': ')
+            print(error)
+            return create_empty_readings(data_types)
+        if not daily_readings:
+            return create_empty_readings(data_types)
+        return pd.concat(daily_readings, ignore_index=True)
+
+    def _classify_wlevels(self, year, month, pool):
+        """
+        Classify the water level of all the active monitoring stations for
+        the given year and month in the percentile classes of the historical
+        water levels of that month.
+
+        Only the daily water levels of the given month are fetched from the
+        database for each station and the percentiles of all the stations
+        are computed at once. The progress of the classification, in
+        percent, is sent as partial results of the task.
+
+        Returns
+        -------
+        classes : DataFrame
+            A dataframe indexed by the active monitoring stations containing
+            the ID, municipality and coordinates of each station, along with
+            the results of 'classify_monthly_wlevels'. The percentile class
+            is None for the stations without water level data for the given
+            year and month or without repere data. Return None if the
+            classification was cancelled.
+        """
+        from sardes.tools.hydrostats import classify_monthly_wlevels
+
+        stations_data = self._get('observation_wells_data')[0]
+        stations_data = stations_data[
+            stations_data['is_station_active'].fillna(False).astype(bool)]
+        sampling_feature_uuids = stations_data.index.tolist()
+        repere_data = dict(list(
+            self._get('repere_data')[0]
+            .sort_values(by=['end_date'], ascending=[True])
+            .groupby('sampling_feature_uuid', sort=False)))
+
+        print("Classifying the water levels of {} observation wells..."
+              .format(len(sampling_feature_uuids)))
+        wlevels = []
+        for i, station_uuid in enumerate(sampling_feature_uuids):
+            if self.is_current_task_cancelled():
+                print("Classifying the water levels was cancelled.")
+                return None,
+            # The water levels of the stations without repere data cannot
+            # be converted to altitudes, so they cannot be classified.
+            if station_uuid in repere_data:
+                readings = self._get_daily_wlevels_for_month(
+                    station_uuid, month)
+                # Since the readings are aggregated by day, the repere data
+                # are applied to the whole day, from the start of the day.
+                formatted_data = format_reading_data(
+                    readings, repere_data[station_uuid])
+                wlevels.append(pd.DataFrame({
+                    'sampling_feature_uuid': station_uuid,
+                    'datetime': formatted_data['datetime'].values,
+                    DataType.WaterLevel: formatted_data[DataType.WaterLevel]
+                    .values}))
+            self.emit_partial_result(
+                (i + 1) / len(sampling_feature_uuids) * 100)
+
+        if wlevels:
+            wlevels = pd.concat(wlevels, ignore_index=True)
+        else:
+            wlevels = pd.DataFrame(
+                [], columns=['sampling_feature_uuid', 'datetime',
+                             DataType.WaterLevel])
+        classes = classify_monthly_wlevels(wlevels, year, month, pool)
+        classes = pd.concat(
+            [stations_data[['obs_well_id', 'municipality',
+                            'latitude', 'longitude']],
+             classes.reindex(stations_data.index)],
+            axis=1)
+        print("Successfully classified the water levels of {} observation "
+              "wells.".format(classes['percentile_class'].notnull().sum()))
+        return classes,
 
     def _add_hg_survey_data(self, imported_survey_data: dict(dict)):
         """
@@ -791,10 +1357,11 @@ class DatabaseConnectionManager(TaskManagerBase):
 
     sig_database_data_changed = Signal(list)
     sig_tseries_data_changed = Signal(list)
-    sig_publish_progress = Signal(float)
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, nbr_read_workers=READ_WORKERS_COUNT):
+        super().__init__(
+            nbr_read_workers,
+            slow_task_threshold=CONF.get('database', 'slow_task_threshold'))
         self._is_connecting = False
         self._is_updating = False
         self._data_changed = set()
@@ -803,8 +1370,6 @@ class DatabaseConnectionManager(TaskManagerBase):
 
         self.set_worker(DatabaseConnectionWorker())
         self.sig_run_tasks_finished.connect(self._handle_run_tasks_finished)
-        self.worker().sig_publish_progress.connect(
-            self.sig_publish_progress.emit)
 
     def is_connected(self):
         """Return whether a connection to a database is currently active."""
@@ -846,11 +1411,12 @@ class DatabaseConnectionManager(TaskManagerBase):
         if not postpone_exec:
             self.run_tasks()
 
-    def get(self, *args, callback=None, postpone_exec=False):
+    def get(self, *args, callback=None, postpone_exec=False,
+            priority=TaskPriority.Normal, key=None):
         """
         Get the data related to name from the database.
         """
-        self.add_task('get', callback, *args)
+        self.add_task('get', callback, *args, priority=priority, key=key)
         if not postpone_exec:
             self.run_tasks()
 
@@ -893,8 +1459,8 @@ class DatabaseConnectionManager(TaskManagerBase):
 
     def close(self, callback=None):
         """Close the database connection manager."""
-        self.add_task('disconnect_from_db', callback)
-        self.run_tasks()
+        self.add_task('disconnect_from_db', None)
+        self.run_tasks(self._handle_closed, callback)
 
     def update_database(self, db_accessor):
         self._is_updating = True
@@ -930,28 +1496,88 @@ class DatabaseConnectionManager(TaskManagerBase):
     # ---- Timeseries
     def get_timeseries_for_obs_well(
             self, obs_well_id, data_types=None,
-            callback=None, postpone_exec=False, main_thread=False):
+            callback=None, postpone_exec=False, main_thread=False,
+            priority=TaskPriority.Normal, key=None,
+            start=None, end=None, freq=None, agg='mean'):
         """
         Return a pandas dataframe containing the readings for the given
         data types and monitoring station.
 
         If no data type are specified, then return the entire dataset for
         the specified monitoring station.
+
+        If start or end are specified, only the readings whose datetime
+        is within the half-open interval [start, end) are returned. If freq
+        is specified, the readings are aggregated in the database by
+        day ('D') or by month ('M') with the aggregation function agg, which
+        can be 'min', 'max', 'mean' or 'first'.
+
+        A key can be provided to cancel any previous request made with the
+        same key that is not completed yet, for example when the user
+        quickly switches from one monitoring station to another.
         """
         if main_thread is False:
             self.add_task('get_timeseries_for_obs_well', callback,
-                          obs_well_id, data_types)
+                          obs_well_id, data_types, start, end, freq, agg,
+                          priority=priority, key=key)
             if not postpone_exec:
                 self.run_tasks()
         else:
             tseries_groups = (
                 self.worker()._get_timeseries_for_obs_well(
-                    obs_well_id, data_types)
+                    obs_well_id, data_types, start, end, freq, agg)
                 )[0]
             if callback is not None:
                 callback(tseries_groups)
             return tseries_groups
 
+    def get_timeseries_for_obs_wells(
+            self, obs_well_ids, data_types=None, start=None, end=None,
+            callback=None, postpone_exec=False,
+            priority=TaskPriority.Normal, key=None):
+        """
+        Return a pandas dataframe containing the readings for the given
+        data types and monitoring stations in long format, where the
+        monitoring station of each reading is stored in a column named
+        'sampling_feature_uuid'.
+
+        The readings of all the monitoring stations are fetched at once,
+        which is more efficient than fetching them one station at a time.
+        The readings can be split by monitoring station with
+        `group_readings_by_obs_well` from the accessor helpers.
+        """
+        self.add_task('get_timeseries_for_obs_wells', callback,
+                      list(obs_well_ids), data_types, start, end,
+                      priority=priority, key=key)
+        if not postpone_exec:
+            self.run_tasks()
+
+    def get_timeseries_for_obs_well_by_chunks(
+            self, obs_well_id, data_types=None, chunk_callback=None,
+            callback=None, postpone_exec=False,
+            priority=TaskPriority.Normal, key=None):
+        """
+        Fetch the readings for the given data types and monitoring station
+        by chunks, from the most recent to the oldest.
+
+        The chunk_callback is called with each chunk of readings as soon as
+        it is fetched, along with a flag indicating whether it is the first
+        chunk, so that the readings can be shown progressively. The
+        callback is called with the total number of readings once all the
+        chunks were fetched, and with a description of the error that
+        occurred if a chunk could not be fetched, or None otherwise.
+
+        A key can be provided to cancel any previous request made with the
+        same key that is not completed yet. The chunks of a cancelled
+        request are not sent to the chunk_callback anymore.
+        """
+        self.add_task('get_timeseries_for_obs_well_by_chunks', callback,
+                      obs_well_id, data_types,
+                      priority=priority, key=key,
+                      partial_callback=chunk_callback)
+        if not postpone_exec:
+            self.run_tasks()
+
     def save_timeseries_data_edits(self, tseries_edits, obs_well_id,
                                    callback=None, postpone_exec=False):
         """
@@ -1084,6 +1710,15 @@ class DatabaseConnectionManager(TaskManagerBase):
         self.sig_database_disconnected.emit()
         self.sig_database_connection_changed.emit(self.is_connected())
 
+    def _handle_closed(self, callback):
+        """
+        Handle when the connection with the database was closed as part of
+        closing this manager.
+        """
+        self.stop()
+        if callback is not None:
+            callback()
+
     def _handle_run_tasks_finished(self):
         """
         Handle when all tasks that needed to be run by the worker are
@@ -1098,14 +1733,88 @@ class DatabaseConnectionManager(TaskManagerBase):
             self._tseries_data_changed = set()
 
     # ---- Other
+    def cancel_publish_to_kml(self, callback=None):
+        """
+        Cancel the publishing of the piezometric network that is currently
+        in progress, if any.
+
+        The callback is called once the publishing has actually stopped.
+        """
+        self.cancel_tasks('publish_to_kml', callback)
+
     def publish_to_kml(self, filename, iri_data=None, iri_logs=None,
                        iri_graphs=None, iri_quality=None, callback=None,
-                       postpone_exec=False):
+                       progress_callback=None, postpone_exec=False):
         """
         Publish the piezometric network data to the specified kml filename.
+
+        The progress_callback is called with the progress of the publishing,
+        in percent, while the callback is called with the results of the
+        publishing once it is completed. Starting a new publishing cancels
+        the one in progress, if any.
         """
         self.add_task('publish_to_kml', callback, filename,
-                      iri_data, iri_logs, iri_graphs, iri_quality)
+                      iri_data, iri_logs, iri_graphs, iri_quality,
+                      priority=TaskPriority.Background,
+                      key='publish_to_kml',
+                      partial_callback=progress_callback)
+        if not postpone_exec:
+            self.run_tasks()
+
+    def cancel_export_readings(self, callback=None):
+        """
+        Cancel the export of the readings data that is currently in
+        progress, if any.
+
+        The callback is called once the export has actually stopped.
+        """
+        self.cancel_tasks('export_readings', callback)
+
+    def export_readings(self, obs_well_ids, dest, file_format,
+                        callback=None, progress_callback=None,
+                        postpone_exec=False):
+        """
+        Export the formatted readings data of the given monitoring stations
+        to files of the given format ('xlsx', 'csv' or 'parquet'), saved
+        in the dest directory or zip archive.
+
+        The progress_callback is called with the progress of the export,
+        in percent, while the callback is called with a summary of the
+        export once it is completed. Starting a new export cancels the
+        one in progress, if any.
+        """
+        self.add_task('export_readings', callback,
+                      list(obs_well_ids), dest, file_format,
+                      priority=TaskPriority.Background,
+                      key='export_readings',
+                      partial_callback=progress_callback)
+        if not postpone_exec:
+            self.run_tasks()
+
+    def cancel_classify_wlevels(self):
+        """
+        Cancel the classification of the water levels that is currently
+        in progress, if any.
+        """
+        self.cancel_tasks('classify_wlevels')
+
+    def classify_wlevels(self, year, month, pool='min_max_median',
+                         callback=None, progress_callback=None,
+                         postpone_exec=False):
+        """
+        Classify the water level of all the active monitoring stations for
+        the given year and month in the percentile classes of the historical
+        water levels of that month.
+
+        The progress_callback is called with the progress of the
+        classification, in percent, while the callback is called with the
+        classes of the stations once it is completed. Starting a new
+        classification cancels the one in progress, if any.
+        """
+        self.add_task('classify_wlevels', callback, year, month, pool,
+                      priority=TaskPriority.Background,
+                      key='classify_wlevels',
+                      partial_callback=progress_callback)
         if not postpone_exec:
             self.run_tasks()
 
@@ -12,6 +12,7 @@ Tests for the DatabaseConnectionManager class.
 """
 
 # ---- Standard imports
+import threading
 from time import sleep
 
 # ---- Third party imports
@@ -36,7 +37,7 @@ def dbmanager(qtbot, mocker):
     dbmanager = DatabaseConnectionManager()
     yield dbmanager
 
-    qtbot.waitUntil(lambda: not dbmanager._thread.isRunning())
+    dbmanager.stop()
 
 
 @pytest.fixture
@@ -55,7 +56,7 @@ def dbaccessor(qtbot, mocker, DATAF):
             # This accessor does not support journal logging.
             pass
 
-        def begin_transaction(self):
+        def begin_transaction(self, exclusive=True):
             # This accessor does not support journal logging.
             pass
 
@@ -130,11 +131,14 @@ def test_get_and_set_in_database(dbmanager, dbaccessor, qtbot):
     assert returned_values == []
 
     # We ask the manager to execute the queued tasks in a single run.
+    # The first two 'get' tasks are executed concurrently by the read workers,
+    # while the 'set' task and the last 'get' task must wait for them to
+    # be completed.
     with qtbot.waitSignal(dbmanager.sig_run_tasks_finished, timeout=5000):
         dbmanager.run_tasks()
         assert len(dbmanager._queued_tasks) == 0
-        assert len(dbmanager._pending_tasks) == 0
-        assert len(dbmanager._running_tasks) == 4
+        assert len(dbmanager._pending_tasks) == 2
+        assert len(dbmanager._running_tasks) == 2
 
     assert len(dbmanager._running_tasks) == 0
     assert len(returned_values) == 3
@@ -143,5 +147,66 @@ def test_get_and_set_in_database(dbmanager, dbaccessor, qtbot):
     assert returned_values[2]['values'].values.tolist() == [1, 2, -19.5, 4]
 
 
+def test_tasks_executed_in_worker_threads(dbmanager, dbaccessor, qtbot,
+                                          DATAF):
+    """
+    Test that the tasks are executed in the threads of the workers and
+    not in the main thread.
+    """
+    with qtbot.waitSignal(dbmanager.sig_database_connection_changed,
+                          timeout=1500):
+        dbmanager.connect_to_db(dbaccessor)
+
+    threads = []
+
+    def _get_something():
+        threads.append(threading.current_thread())
+        return DATAF.copy()
+    dbaccessor._get_something = _get_something
+
+    def _set_something(index, value):
+        threads.append(threading.current_thread())
+    dbaccessor._set_something = _set_something
+
+    # The 'get' task is executed by a read worker, while the 'set' task
+    # is executed by the main worker.
+    with qtbot.waitSignal(dbmanager.sig_run_tasks_finished, timeout=5000):
+        dbmanager.get('something', postpone_exec=True)
+        dbmanager.set('something', 2, -19.5, postpone_exec=True)
+        dbmanager.run_tasks()
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_get_timeseries_for_obs_wells(dbmanager, dbaccessor, qtbot):
+    """
+    Test that fetching the readings of many monitoring stations at once
+    with the database manager is working as expected.
+    """
+    with qtbot.waitSignal(dbmanager.sig_database_connection_changed,
+                          timeout=1500):
+        dbmanager.connect_to_db(dbaccessor)
+
+    readings = pd.DataFrame(
+        [['well_1', '2010-01-01', 1.1], ['well_2', '2010-01-01', 2.1]],
+        columns=['sampling_feature_uuid', 'datetime', 'value'])
+    calls = []
+
+    def _get_timeseries_for_obs_wells(obs_well_ids, data_types, start, end):
+        calls.append((obs_well_ids, data_types, start, end))
+        return readings.copy()
+    dbaccessor._get_timeseries_for_obs_wells = _get_timeseries_for_obs_wells
+
+    returned_values = []
+    with qtbot.waitSignal(dbmanager.sig_run_tasks_finished, timeout=5000):
+        dbmanager.get_timeseries_for_obs_wells(
+            ('well_1', 'well_2'), ['WaterLevel'], start='2010-01-01',
+            callback=lambda readings: returned_values.append(readings))
+    assert calls == [
+        (['well_1', 'well_2'], ['WaterLevel'], '2010-01-01', None)]
+    assert len(returned_values) == 1
+    assert returned_values[0].equals(readings)
+
+
 if __name__ == "__main__":
     pytest.main(['-x', __file__, '-v', '-rw'])
@@ -525,9 +525,10 @@ def test_duplicates_with_multiple_sondes(
                  DataType.WaterEC, 'sonde_id'])
     merged_data['datetime'] = pd.to_datetime(
         merged_data['datetime'], format="%Y-%m-%d %H:%M:%S")
-    mocker.patch.object(dbmanager._worker,
-                        '_get_timeseries_for_obs_well',
-                        return_value=(merged_data,))
+    for worker in [dbmanager.worker()] + dbmanager.read_workers():
+        mocker.patch.object(worker,
+                            '_get_timeseries_for_obs_well',
+                            return_value=(merged_data,))
 
     sonde_installation = pd.Series(
         {'sampling_feature_uuid': 0,
@@ -539,9 +540,10 @@ def test_duplicates_with_multiple_sondes(
          'sonde_brand_model': 'Solinst LTC M100 Edge',
          'well_common_name': 'Saint-Paul',
          'well_name': '03037041'})
-    mocker.patch.object(dbmanager._worker,
-                        '_get_sonde_installation_info',
-                        return_value=(sonde_installation,))
+    for worker in [dbmanager.worker()] + dbmanager.read_workers():
+        mocker.patch.object(worker,
+                            '_get_sonde_installation_info',
+                            return_value=(sonde_installation,))
 
     # We select an input data files associated with sonde 1073744
     # and assert that the duplicated values are flagged as expected.
@@ -34,6 +34,7 @@ from sardes.config.gui import get_iconsize, RED, YELLOWLIGHT
 from sardes.config.locale import _
 from sardes.api.panes import SardesPaneWidget
 from sardes.api.tablemodels import SardesTableModel, SardesTableColumn
+from sardes.api.taskmanagers import TaskPriority
 from sardes.api.timeseries import DataType
 from sardes.utils.qthelpers import create_toolbutton
 from sardes.widgets.tableviews import SardesTableWidget
@@ -620,7 +621,9 @@ class DataImportWizard(SardesPaneWidget):
                 self.db_connection_manager.is_connected()):
             self.db_connection_manager.get_timeseries_for_obs_well(
                 self._obs_well_uuid, [DataType.WaterLevel],
-                self._set_previous_data)
+                self._set_previous_data,
+                priority=TaskPriority.Interactive,
+                key='dataimportwizard_previous_data')
         else:
             self._set_previous_data(None)
 
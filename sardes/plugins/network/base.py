@@ -9,14 +9,340 @@
 
 
 # ---- Standard imports
+from dataclasses import dataclass
 import datetime as dtm
+import hashlib
+import json
 import os.path as osp
 
 # ---- Third party imports
 import pandas as pd
 
 # ---- Local imports
-from sardes.config.locale import _
+from sardes import __version__
+from sardes.config.locale import _, get_lang_conf
+from sardes.tools.hydrographs import get_hydrograph_canvas
+from sardes.tools.save2excel import _save_reading_data_to_xlsx
+from sardes.tools.waterquality import _save_hg_data_to_xlsx
+from sardes.utils.data_operations import format_water_quality_data
+
+
+@dataclass
+class NetworkPublishPlan:
+    """
+    The data needed to publish the piezometric network, grouped by station
+    beforehand, so that the data of each station can be looked up in
+    dictionaries when publishing the network.
+    """
+    stations_data: pd.DataFrame
+    locations: list
+    repere_data: dict
+    last_readings: dict
+    readings_versions: dict
+    sonde_installations: dict
+    hg_surveys: dict
+    hg_param_values: dict
+    hg_param_names: dict
+    meas_units_abb: dict
+    logo_filename: str = None
+    logo_data: bytes = None
+
+    def get_water_quality_data(self, station_uuid) -> pd.DataFrame:
+        """
+        Return the formatted hydrogeochemical data of the given station.
+        """
+        return format_water_quality_data(
+            self.hg_surveys.get(station_uuid, pd.DataFrame()),
+            self.hg_param_values.get(station_uuid, pd.DataFrame()),
+            self.hg_param_names,
+            self.meas_units_abb)
+
+    def get_readings_version(self, station_uuid) -> str:
+        """
+        Return a version of the formatted readings data of the given
+        station, or None if the station has no readings.
+
+        The version changes whenever the readings, repere data or sonde
+        installations of the station change, so that it can be used in
+        place of the formatted readings data to know whether the files
+        that are drawn from them must be generated again, without fetching
+        the readings from the database.
+        """
+        readings_version = self.readings_versions.get(station_uuid)
+        if readings_version is None:
+            return None
+        return get_publish_fingerprint(
+            readings_version,
+            self.repere_data.get(station_uuid, pd.DataFrame()),
+            self.sonde_installations.get(station_uuid, pd.DataFrame()))
+
+
+def create_network_publish_plan(
+        stations_data: pd.DataFrame, stations_data_overview: pd.DataFrame,
+        readings_versions: pd.DataFrame, repere_data: pd.DataFrame,
+        sonde_installations: pd.DataFrame, sondes_data: pd.DataFrame,
+        hg_surveys: pd.DataFrame, hg_param_values: pd.DataFrame,
+        hg_params: pd.DataFrame, measurement_units: pd.DataFrame,
+        logo_filename: str = None) -> NetworkPublishPlan:
+    """
+    Group by station the data needed to publish the piezometric network.
+
+    The stations are grouped by location, using their coordinates rounded
+    to 4 decimals, and sorted by ID within each location.
+
+    The readings_versions are those returned by the database accessor
+    with 'get_timeseries_data_versions' for the data types that are
+    published. The serial numbers of the sondes are added to the sonde
+    installations, since they are shown in the readings data files.
+
+    The content of the logo file is read once here, so that it can be used
+    to compute the fingerprints of the files of all the stations.
+    """
+    logo_data = None
+    if logo_filename is not None and osp.exists(logo_filename):
+        with open(logo_filename, 'rb') as f:
+            logo_data = f.read()
+
+    sonde_installations = sonde_installations.assign(
+        sonde_serial_no=sonde_installations['sonde_uuid'].map(
+            sondes_data['sonde_serial_no']))
+    stations_locations = pd.Series(
+        list(zip(
+            stations_data['longitude'].astype(float).round(decimals=4),
+            stations_data['latitude'].astype(float).round(decimals=4))),
+        index=stations_data.index)
+    locations = [
+        (loc, (stations_data.loc[loc_stations.index]
+               .sort_values(['obs_well_id'], ascending=True)
+               .index.tolist()))
+        for loc, loc_stations in stations_locations.groupby(
+            stations_locations, sort=False)
+        ]
+
+    survey_stations = hg_surveys['sampling_feature_uuid']
+    return NetworkPublishPlan(
+        stations_data=stations_data,
+        locations=locations,
+        repere_data=dict(list(
+            repere_data
+            .sort_values(by=['end_date'], ascending=[True])
+            .groupby('sampling_feature_uuid', sort=False))),
+        last_readings=stations_data_overview['last_date'].to_dict(),
+        readings_versions=dict(zip(
+            readings_versions.index,
+            readings_versions[['last_date', 'count', 'digest']].itertuples(
+                index=False, name=None))),
+        sonde_installations=dict(list(
+            sonde_installations
+            .sort_values(by=['start_date'], ascending=[True])
+            .groupby('sampling_feature_uuid', sort=False))),
+        hg_surveys=dict(list(
+            hg_surveys.groupby('sampling_feature_uuid', sort=False))),
+        hg_param_values=dict(list(
+            hg_param_values.groupby(
+                hg_param_values['hg_survey_id'].map(survey_stations),
+                sort=False))),
+        hg_param_names=hg_params['hg_param_name'].to_dict(),
+        meas_units_abb=measurement_units['meas_units_abb'].to_dict(),
+        logo_filename=logo_filename,
+        logo_data=logo_data
+        )
+
+
+@dataclass
+class StationPublishItem:
+    """
+    The data needed to generate the files that are attached to a station
+    in the KML file of the piezometric network.
+
+    The data of the items are fetched from the database in the thread of
+    the database worker, while the files are generated in separate
+    processes, so the items must remain picklable.
+    """
+    station_data: pd.Series
+    ground_altitude: float
+    is_alt_geodesic: bool
+    formatted_data: pd.DataFrame = None
+    xlsx_savepath: str = None
+    graph_savepath: str = None
+    log_data: bytes = None
+    log_savepath: str = None
+    quality_data: pd.DataFrame = None
+    quality_station_data: pd.Series = None
+    quality_savepath: str = None
+    readings_version: str = None
+    logo_filename: str = None
+    authors_name: str = ''
+    site_url: str = ''
+    xlsx_font: str = 'Calibri'
+    graph_font: str = 'Arial'
+
+    def get_files_fingerprints(self, logo_data: bytes = None) -> dict:
+        """
+        Return a dictionary containing the fingerprint of the inputs
+        of each file for which a save path is defined in this item,
+        using the save paths as keys.
+
+        The version of the readings is used in place of the formatted
+        readings data, so that the fingerprints can be computed before
+        the readings are fetched from the database. The content of the
+        logo file of the item must be provided in logo_data, so that it
+        is not read again for each station.
+        """
+        header_inputs = (
+            self.station_data, self.ground_altitude, self.is_alt_geodesic)
+
+        fingerprints = {}
+        if self.xlsx_savepath is not None:
+            fingerprints[self.xlsx_savepath] = get_publish_fingerprint(
+                'xlsx', *header_inputs, self.readings_version,
+                logo_data, self.xlsx_font)
+        if self.log_savepath is not None:
+            fingerprints[self.log_savepath] = get_publish_fingerprint(
+                'log', self.log_data)
+        if self.graph_savepath is not None:
+            fingerprints[self.graph_savepath] = get_publish_fingerprint(
+                'graph', *header_inputs, self.readings_version,
+                logo_data, self.authors_name, self.site_url,
+                self.graph_font)
+        if self.quality_savepath is not None:
+            fingerprints[self.quality_savepath] = get_publish_fingerprint(
+                'quality', *header_inputs, self.quality_data,
+                self.quality_station_data, logo_data, self.xlsx_font)
+        return fingerprints
+
+
+def get_publish_fingerprint(*inputs) -> str:
+    """
+    Return a fingerprint of the given inputs that are used to generate
+    a file attached to a station in the KML file of the piezometric network.
+    """
+    hasher = hashlib.sha1()
+    for value in inputs:
+        if isinstance(value, pd.Series):
+            # This is the metadata of a station, which may contain values
+            # that pandas cannot hash, like tuples.
+            hasher.update(repr(value.to_dict()).encode('utf-8'))
+        elif isinstance(value, pd.DataFrame):
+            hasher.update(repr(value.columns.tolist()).encode('utf-8'))
+            value = value.copy()
+            value.columns = range(len(value.columns))
+            for column in value.columns:
+                if value[column].dtype == object:
+                    value[column] = value[column].map(repr)
+            hasher.update(
+                pd.util.hash_pandas_object(value, index=True).values)
+        elif isinstance(value, bytes):
+            hasher.update(value)
+        else:
+            hasher.update(repr(value).encode('utf-8'))
+        hasher.update(b'|')
+    return hasher.hexdigest()
+
+
+def load_publish_manifest(filename: str) -> dict:
+    """
+    Return the fingerprints of the files that were generated the last time
+    the piezometric network was published, using the paths of the files
+    relative to the manifest as keys.
+
+    An empty dictionary is returned if the manifest does not exist, cannot
+    be read, or was written by another version of Sardes or in another
+    language.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (manifest.get('version') != __version__ or
+            manifest.get('language') != get_lang_conf()):
+        return {}
+    return manifest.get('files', {})
+
+
+def save_publish_manifest(filename: str, files_fingerprints: dict) -> None:
+    """
+    Save to the specified filename the fingerprints of the files that were
+    generated when publishing the piezometric network.
+    """
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'version': __version__,
+                       'language': get_lang_conf(),
+                       'files': files_fingerprints},
+                      f, indent=2, sort_keys=True)
+    except PermissionError as e:
+        print(e)
+
+
+def generate_station_files(item: StationPublishItem) -> list:
+    """
+    Generate the files that are attached to a station in the KML file of
+    the piezometric network from the data of the given item and return
+    the list of the files that were successfully generated.
+
+    Only the files for which a save path is defined in the item
+    are generated.
+    """
+    generated = []
+    if item.xlsx_savepath is not None:
+        try:
+            _save_reading_data_to_xlsx(
+                item.xlsx_savepath,
+                _('Piezometry'),
+                item.formatted_data,
+                item.station_data,
+                item.ground_altitude,
+                item.is_alt_geodesic,
+                logo_filename=item.logo_filename,
+                font_name=item.xlsx_font
+                )
+        except PermissionError as e:
+            print(e)
+        else:
+            generated.append(item.xlsx_savepath)
+    if item.log_savepath is not None:
+        try:
+            with open(item.log_savepath, 'wb') as f:
+                f.write(item.log_data)
+        except PermissionError as e:
+            print(e)
+        else:
+            generated.append(item.log_savepath)
+    if item.graph_savepath is not None:
+        # The same hydrograph figure is reused for all the stations that
+        # are published by the current process.
+        hydrograph = get_hydrograph_canvas(item.graph_font)
+        hydrograph.set_data(
+            item.formatted_data,
+            item.station_data,
+            item.ground_altitude,
+            item.is_alt_geodesic
+            )
+        try:
+            hydrograph.figure.savefig(item.graph_savepath, dpi=300)
+        except PermissionError as e:
+            print(e)
+        else:
+            generated.append(item.graph_savepath)
+    if item.quality_savepath is not None:
+        try:
+            _save_hg_data_to_xlsx(
+                item.quality_savepath,
+                _('Water Quality'),
+                item.quality_data,
+                item.quality_station_data,
+                item.ground_altitude,
+                item.is_alt_geodesic,
+                logo_filename=item.logo_filename,
+                font_name=item.xlsx_font
+                )
+        except PermissionError as e:
+            print(e)
+        else:
+            generated.append(item.quality_savepath)
+    return generated
 
 
 def format_kml_station_info(
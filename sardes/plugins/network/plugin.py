@@ -56,13 +56,6 @@ class PiezometricNetwork(SardesPlugin):
         self.publish_dialog.sig_cancel_publish_network_request.connect(
             self._cancel_publishing_network)
 
-        self.main.db_connection_manager.sig_publish_progress.connect(
-            lambda progress_percent:
-                self.publish_dialog.status_bar.set_label(
-                    _("Publishing piezometric network data...") +
-                    ' {:0.1f}%'.format(progress_percent))
-            )
-
     def create_mainwindow_toolbars(self):
         toolbar = create_mainwindow_toolbar("Publish toolbar")
 
@@ -106,11 +99,16 @@ class PiezometricNetwork(SardesPlugin):
 
     # ---- Publish Network
     def _cancel_publishing_network(self):
-        self.main.db_connection_manager.worker()._stop_kml_publishing = True
+        # The publishing is stopped only once the cancelled task has
+        # actually ended, so that two publishings never write the same
+        # files at the same time.
+        self.main.db_connection_manager.cancel_publish_to_kml(
+            callback=lambda: self._stop_publishing_network(False))
 
     def _start_publishing_network(self, filename):
         args = {'filename': filename,
-                'callback': self._stop_publishing_network}
+                'callback': self._stop_publishing_network,
+                'progress_callback': self._update_publishing_progress}
         if self.publish_dialog.is_iri_data():
             args['iri_data'] = self.publish_dialog.iri_data()
         if self.publish_dialog.is_iri_logs():
@@ -122,6 +120,11 @@ class PiezometricNetwork(SardesPlugin):
 
         self.main.db_connection_manager.publish_to_kml(**args)
 
-    def _stop_publishing_network(self, result):
-        self.publish_dialog.stop_publishing(result)
+    def _update_publishing_progress(self, progress_percent):
+        self.publish_dialog.status_bar.set_label(
+            _("Publishing piezometric network data...") +
+            ' {:0.1f}%'.format(progress_percent))
+
+    def _stop_publishing_network(self, result, nbr_skipped=0):
+        self.publish_dialog.stop_publishing(result, nbr_skipped)
         self.sig_network_published.emit()
@@ -15,6 +15,7 @@ Tests for the Publish plugin.
 import re
 import os
 import os.path as osp
+from uuid import UUID
 os.environ['SARDES_PYTEST'] = 'True'
 
 # ---- Third party imports
@@ -23,7 +24,11 @@ from qtpy.QtCore import Qt
 from qtpy.QtWidgets import QFileDialog
 
 # ---- Local imports
+from sardes.api.timeseries import DataType
 from sardes.app.mainwindow import MainWindowBase
+from sardes.config.main import CONF
+from sardes.database.accessors.accessor_helpers import init_tseries_edits
+from sardes.database.database_manager import DatabaseConnectionWorker
 from sardes.plugins.network import SARDES_PLUGIN_CLASS
 
 
@@ -171,6 +176,151 @@ def test_publish_to_kml(mainwindow, qtbot, mocker, tmp_path):
     assert len(re.findall(">Water Quality</a>", content)) == 1
 
 
+def test_cancel_publish_to_kml(mainwindow, qtbot, mocker, tmp_path):
+    """
+    Test that cancelling the publishing of the piezometric network to KML
+    while the attached files are generated is working as expected.
+    """
+    publish_dialog = mainwindow.plugin.publish_dialog
+    publish_dialog.iri_data_chbox.setChecked(True)
+    publish_dialog.iri_graphs_chbox.setChecked(True)
+    publish_dialog.iri_data_ledit.setText('http://www.tests_iri_data.ca')
+    publish_dialog.iri_graphs_ledit.setText('http://www.tests_iri_graphs.ca')
+
+    kmlfilename = osp.join(tmp_path, 'test_piezo_network.kml')
+    dbconnmanager = mainwindow.db_connection_manager
+    progress_spy = mocker.spy(
+        mainwindow.plugin, '_update_publishing_progress')
+    mainwindow.plugin._start_publishing_network(kmlfilename)
+    qtbot.waitUntil(lambda: progress_spy.call_count > 0, timeout=50000)
+
+    # The publishing is cancelled through the task manager, so that the
+    # worker stops at the next station and the callback of the task
+    # is never called. The publishing is stopped only once the task
+    # has actually ended.
+    mocker.patch.object(publish_dialog, 'stop_publishing')
+    with qtbot.waitSignal(dbconnmanager.sig_run_tasks_finished,
+                          timeout=50000):
+        with qtbot.waitSignal(mainwindow.plugin.sig_network_published,
+                              timeout=50000):
+            mainwindow.plugin._cancel_publishing_network()
+            publish_dialog.stop_publishing.assert_not_called()
+    publish_dialog.stop_publishing.assert_called_once()
+    assert publish_dialog.stop_publishing.call_args[0][0] is False
+    assert not osp.exists(kmlfilename)
+
+
+def test_publish_to_kml_incremental(mainwindow, qtbot, mocker, tmp_path,
+                                    dbaccessor):
+    """
+    Test that only the attached files whose inputs changed since the last
+    publishing are generated again when publishing the piezometric network.
+    """
+    publish_dialog = mainwindow.plugin.publish_dialog
+    publish_dialog.iri_data_chbox.setChecked(True)
+    publish_dialog.iri_logs_chbox.setChecked(True)
+    publish_dialog.iri_graphs_chbox.setChecked(True)
+    publish_dialog.iri_quality_chbox.setChecked(True)
+    publish_dialog.iri_data_ledit.setText('http://www.tests_iri_data.ca')
+    publish_dialog.iri_logs_ledit.setText('http://www.tests_iri_logs.ca')
+    publish_dialog.iri_graphs_ledit.setText('http://www.tests_iri_graphs.ca')
+    publish_dialog.iri_quality_ledit.setText('http://www.tests_iri_quality.ca')
+    mocker.patch.object(publish_dialog, 'stop_publishing')
+
+    kmlfilename = osp.join(tmp_path, 'test_piezo_network.kml')
+    files_dirname = osp.join(tmp_path, 'test_piezo_network_files')
+    xlsx_filename = osp.join(files_dirname, 'data', 'readings_03037041.xlsx')
+    log_filename = osp.join(files_dirname, 'diagrams', 'diagram_03037041.pdf')
+    graph_filename = osp.join(files_dirname, 'graphs', 'graph_03037041.pdf')
+    other_filename = osp.join(files_dirname, 'graphs', 'graph_02200001.pdf')
+
+    def publish():
+        with qtbot.waitSignal(
+                mainwindow.plugin.sig_network_published, timeout=50000):
+            mainwindow.plugin._start_publishing_network(kmlfilename)
+        return publish_dialog.stop_publishing.call_args[0]
+
+    def get_mtimes():
+        return [os.stat(f).st_mtime_ns for f in
+                (xlsx_filename, log_filename, graph_filename, other_filename)]
+
+    # All the attached files are generated the first time the network is
+    # published.
+    assert publish() == (True, 0)
+    assert osp.exists(osp.join(tmp_path, 'test_piezo_network_manifest.json'))
+    mtimes = get_mtimes()
+
+    # All the attached files are skipped when nothing changed and the
+    # readings are not fetched from the database.
+    get_timeseries = mocker.spy(
+        DatabaseConnectionWorker, '_get_timeseries_for_obs_wells')
+    assert publish() == (True, 13)
+    assert get_mtimes() == mtimes
+    assert get_timeseries.call_count == 0
+
+    # Only the files that depends on the metadata of a station are
+    # generated again after these were changed.
+    dbconnmanager = mainwindow.db_connection_manager
+    with qtbot.waitSignal(dbconnmanager.sig_run_tasks_finished, timeout=5000):
+        dbconnmanager.set(
+            'observation_wells_data',
+            UUID('3c6d0e15-6775-4304-964a-5db89e463c55'),
+            {'common_name': 'New common name'})
+
+    result, nbr_skipped = publish()
+    assert result is True
+    assert nbr_skipped < 13
+    new_mtimes = get_mtimes()
+    assert new_mtimes[0] != mtimes[0]
+    assert new_mtimes[1] == mtimes[1]
+    assert new_mtimes[2] != mtimes[2]
+    assert new_mtimes[3] == mtimes[3]
+
+    # Deleted files are generated again.
+    os.remove(other_filename)
+    assert publish() == (True, 12)
+    assert osp.exists(other_filename)
+
+    # Only the readings data file and the graph of a station are generated
+    # again after its readings were edited, and only the readings of
+    # that station are fetched from the database.
+    obs_well_uuid = UUID('3c6d0e15-6775-4304-964a-5db89e463c55')
+    readings = dbaccessor.get_timeseries_for_obs_well(obs_well_uuid)
+    tseries_edits = init_tseries_edits()
+    tseries_edits.loc[
+        (readings['datetime'].iloc[0], readings['obs_id'].iloc[0],
+         DataType.WaterLevel),
+        'value'] = 103.25
+    with qtbot.waitSignal(dbconnmanager.sig_tseries_data_changed):
+        dbconnmanager.save_timeseries_data_edits(tseries_edits, obs_well_uuid)
+
+    mtimes = get_mtimes()
+    get_timeseries.reset_mock()
+    assert publish() == (True, 11)
+    new_mtimes = get_mtimes()
+    assert new_mtimes[0] != mtimes[0]
+    assert new_mtimes[1] == mtimes[1]
+    assert new_mtimes[2] != mtimes[2]
+    assert new_mtimes[3] == mtimes[3]
+    assert get_timeseries.call_count == 1
+    assert get_timeseries.call_args[0][1] == [obs_well_uuid]
+
+    # Only the graphs are generated again after the name of the authors,
+    # which is drawn on the graphs, was changed.
+    nbr_graphs = len(os.listdir(osp.join(files_dirname, 'graphs')))
+    mtimes = get_mtimes()
+    CONF.set('documents_settings', 'authors_name', 'New authors name')
+    try:
+        assert publish() == (True, 13 - nbr_graphs)
+    finally:
+        CONF.set('documents_settings', 'authors_name', '')
+    new_mtimes = get_mtimes()
+    assert new_mtimes[0] == mtimes[0]
+    assert new_mtimes[1] == mtimes[1]
+    assert new_mtimes[2] != mtimes[2]
+    assert new_mtimes[3] != mtimes[3]
+
+
 def test_station_info(mainwindow, qtbot, mocker, tmp_path):
     """
     Test that station info are formatted as expected in the KML file.
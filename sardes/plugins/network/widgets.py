@@ -46,6 +46,7 @@ class PublishNetworkDialog(QDialog):
         self.setWindowModality(Qt.ApplicationModal)
 
         self._publishing_in_progress = False
+        self._publishing_cancelled = False
         self._setup(is_iri_data, iri_data, is_iri_logs, iri_logs,
                     is_iri_graphs, iri_graphs, is_iri_quality, iri_quality)
 
@@ -205,21 +206,46 @@ class PublishNetworkDialog(QDialog):
         Start the publishing of the piezometric network.
         """
         self._publishing_in_progress = True
+        self._publishing_cancelled = False
         self.publish_button.setEnabled(False)
         self.iri_groupbox.setEnabled(False)
         self.status_bar.show(_("Publishing piezometric network data..."))
         self.sig_start_publish_network_request.emit(filename)
 
-    def stop_publishing(self, result):
+    def cancel_publishing(self):
+        """
+        Cancel the publishing of the piezometric network.
+
+        The publishing is stopped only once the publishing task has
+        actually ended, so that a new publishing cannot be started
+        in the meantime.
+        """
+        if not self._publishing_in_progress or self._publishing_cancelled:
+            return
+        self._publishing_cancelled = True
+        self.status_bar.show(
+            _("Cancelling the publishing of the piezometric network..."))
+        self.sig_cancel_publish_network_request.emit()
+
+    def stop_publishing(self, result, nbr_skipped=0):
         """
         Stop the publishing of the piezometric network.
         """
         self._publishing_in_progress = False
         self.publish_button.setEnabled(True)
         self.iri_groupbox.setEnabled(True)
-        if result is True:
-            self.status_bar.show_sucess_icon(
-                message=_("Piezometric network data published successfully."))
+        if self._publishing_cancelled:
+            self._publishing_cancelled = False
+            self.status_bar.show_fail_icon(
+                message=_("The publishing of the piezometric network "
+                          "was cancelled."))
+        elif result is True:
+            message = _("Piezometric network data published successfully.")
+            if nbr_skipped:
+                message += ' ' + _(
+                    "{} attached files were already up to date."
+                    ).format(nbr_skipped)
+            self.status_bar.show_sucess_icon(message=message)
         else:
             self.status_bar.show_fail_icon(
                 message=_("Failed to publish piezometric network data."))
@@ -229,7 +255,7 @@ class PublishNetworkDialog(QDialog):
         Override Qt method to prevent closing this dialog when the piezometric
         network is being published.
         """
-        if self._publishing_in_progress:
+        if self._publishing_in_progress and not self._publishing_cancelled:
             # Ask the user if he wants to cancel the publishing process.
             answer = QMessageBox.question(
                 self, _("Cancel Publishing"),
@@ -237,7 +263,7 @@ class PublishNetworkDialog(QDialog):
                   "Do you want to continue?"),
                 QMessageBox.Yes | QMessageBox.No)
             if answer == QMessageBox.Yes:
-                self.sig_cancel_publish_network_request.emit()
+                self.cancel_publishing()
 
                 event.accept()
                 self.sig_closed.emit()
@@ -13,10 +13,11 @@ from sardes.config.locale import _
 
 # ---- Third party imports
 import pandas as pd
-from qtpy.QtCore import Qt, Slot
+from qtpy.QtCore import QModelIndex, Qt, Slot
 
 # ---- Local imports
 from sardes.api.tablemodels import SardesTableColumn
+from sardes.api.taskmanagers import TaskPriority
 from sardes.api.timeseries import DataType
 from sardes.config.icons import get_icon
 from sardes.config.gui import get_iconsize
@@ -52,6 +53,12 @@ class ReadingsTableModel(SardesTableModel):
         self._manual_measurements = pd.DataFrame(
             [], columns=['datetime', 'value'])
 
+        # The readings sorted by datetime and the formatted readings, which
+        # are shared by the plot viewer and the tools of the table until
+        # the data are changed.
+        self._sorted_dataf = None
+        self._formatted_dataf = None
+
     def set_database_connection_manager(self, dbconnmanager):
         """Set the namespace for Sardes database connection manager."""
         self.dbconnmanager = dbconnmanager
@@ -83,6 +90,39 @@ class ReadingsTableModel(SardesTableModel):
                 .sort_values(by=['end_date'], ascending=[True]))
         else:
             self._repere_data = pd.Series([], dtype=object)
+        self._formatted_dataf = None
+
+    @property
+    def dataf(self):
+        """
+        Return the readings data sorted by datetime.
+
+        The readings are not necessarily stored chronologically in the
+        table data, since they are fetched by chunks from the most recent
+        to the oldest.
+
+        The sorted readings are computed only once after the data changed
+        and are shared by all the consumers of the readings of this model,
+        so they must not be modified.
+        """
+        if self._sorted_dataf is None:
+            self._sorted_dataf = self._datat.view().sort_values(
+                'datetime', kind='mergesort')
+        return self._sorted_dataf
+
+    @property
+    def formatted_dataf(self):
+        """
+        Return the readings data formatted for publication.
+
+        The formatted readings are computed only once after the readings
+        or the repere data changed and are shared by all the tools of the
+        table, so they must not be modified.
+        """
+        if self._formatted_dataf is None:
+            self._formatted_dataf = format_reading_data(
+                self.dataf, self._repere_data)
+        return self._formatted_dataf
 
     def set_model_data(self, dataf):
         """
@@ -90,6 +130,52 @@ class ReadingsTableModel(SardesTableModel):
         set the content of this table model data.
         """
         self.sig_data_about_to_be_updated.emit()
+        super().set_model_data(dataf, self._create_columns(dataf.columns))
+        self.sig_data_updated.emit()
+
+    def add_model_data_chunk(self, dataf, reset=False):
+        """
+        Add a chunk of readings at the end of the data of this table model.
+
+        This is used to show the readings progressively while they are
+        fetched from the database by chunks. If reset is True, the chunk
+        replaces the data of this table model instead.
+
+        Note that sig_data_updated is not emitted by this method and must
+        be emitted once all the chunks were added.
+        """
+        if not reset:
+            new_data_types = [
+                dtype for dtype in DataType if
+                dtype in dataf.columns and dtype not in self.column_names()]
+            if len(new_data_types):
+                # The columns of the table need to be updated, so we need
+                # to reset the table with the data of all chunks.
+                dataf = pd.concat([self._datat.view(), dataf])
+                reset = True
+        if reset:
+            SardesTableModel.set_model_data(
+                self, dataf, self._create_columns(dataf.columns))
+            return
+        if dataf.empty:
+            return
+
+        dataf = dataf.reindex(columns=self.column_names())
+        first_row = len(self._datat)
+        last_row = first_row + len(dataf) - 1
+        self.beginInsertRows(QModelIndex(), first_row, last_row)
+        self._datat.append(dataf)
+        self._update_visual_data()
+        self.endInsertRows()
+        self.dataChanged.emit(
+            self.index(first_row, 0),
+            self.index(last_row, self.columnCount() - 1))
+
+    def _create_columns(self, data_columns):
+        """
+        Return the list of table columns needed to show readings data
+        with the given data columns.
+        """
         columns = [
             SardesTableColumn(
                 'datetime', _('Datetime'), 'datetime64[ns]',
@@ -99,7 +185,7 @@ class ReadingsTableModel(SardesTableModel):
                 delegate=NotEditableDelegate, editable=False)
             ]
         for dtype in DataType:
-            if dtype in dataf.columns:
+            if dtype in data_columns:
                 columns.append(SardesTableColumn(
                     dtype, dtype.label, 'float64',
                     delegate=NumEditDelegate,
@@ -115,10 +201,22 @@ class ReadingsTableModel(SardesTableModel):
                 'obs_id', _('Observation ID'), 'str',
                 delegate=NotEditableDelegate, editable=False)
             ])
-        super().set_model_data(dataf, columns)
-        self.sig_data_updated.emit()
+        return columns
 
     # ---- SardesTableModel API
+    def _update_visual_data(self):
+        """
+        Override SardesTableModel method to use the table data as the
+        visual data instead of a copy.
+
+        The readings are displayed as is in the table, so the visual data
+        do not need to be transformed. The sorted and formatted readings
+        are also cleared, since this is called each time the data change.
+        """
+        self.visual_dataf = self._datat.view()
+        self._sorted_dataf = None
+        self._formatted_dataf = None
+
     def check_data_edits(self, callback):
         """
         Check that there is no issues with the data edits of this model.
@@ -198,6 +296,10 @@ class ReadingsTableWidget(SardesTableWidget):
         self._parent = parent
         self.plot_viewer = None
 
+        # Since the readings are fetched by chunks from the most recent to
+        # the oldest, we sort them by datetime by default.
+        self.tableview.sort_by_column(0, Qt.AscendingOrder)
+
     @property
     def station_uuid(self):
         """
@@ -210,7 +312,6 @@ class ReadingsTableWidget(SardesTableWidget):
         Update the data of this table's model by using the provided
         database manager.
         """
-        self.model().sig_data_about_to_be_updated.emit()
         dbmanager.get(
             'manual_measurements',
             callback=self.set_manual_measurements,
@@ -219,12 +320,45 @@ class ReadingsTableWidget(SardesTableWidget):
             'repere_data',
             callback=self.set_repere_data,
             postpone_exec=True)
-        dbmanager.get_timeseries_for_obs_well(
+        self.update_readings(dbmanager, postpone_exec=True)
+        dbmanager.run_tasks()
+
+    def update_readings(self, dbmanager, postpone_exec=False):
+        """
+        Update the readings of this table's model by using the provided
+        database manager.
+
+        The readings are fetched by chunks, from the most recent to the
+        oldest, and are shown in the table as soon as they are fetched.
+        """
+        self.model().sig_data_about_to_be_updated.emit()
+        dbmanager.get_timeseries_for_obs_well_by_chunks(
             self.station_uuid,
             [DataType.WaterLevel, DataType.WaterTemp, DataType.WaterEC],
-            callback=self.model().set_model_data,
-            postpone_exec=True)
-        dbmanager.run_tasks()
+            chunk_callback=self.model().add_model_data_chunk,
+            callback=self._handle_readings_fetched,
+            postpone_exec=postpone_exec,
+            priority=TaskPriority.Interactive,
+            key=('readings', self.station_uuid))
+
+    def _handle_readings_fetched(self, nbr_readings, error=None):
+        """
+        Handle when all the chunks of readings were fetched, or when
+        fetching a chunk failed.
+        """
+        if error is None:
+            self.model().sig_data_updated.emit()
+            return
+
+        # The readings shown in the table are incomplete, so we keep the
+        # table disabled to prevent these from being edited and saved.
+        self.progressbar.hide()
+        self.tableview.show_message(
+            _("Readings Error"),
+            _("Failed to fetch the readings data of this monitoring "
+              "station because of the following error:"
+              "<br><br>{}").format(error),
+            'critical')
 
     def set_obs_well_data(self, obs_well_data):
         """Set the observation well data of the model and plot viewer."""
@@ -275,9 +409,13 @@ class ReadingsTableWidget(SardesTableWidget):
         super()._handle_data_updated()
 
     def get_formatted_data(self):
-        """Return a dataframe contraining formatted readings data."""
-        return format_reading_data(
-            self.model().dataf, self.model()._repere_data)
+        """
+        Return a dataframe contraining formatted readings data.
+
+        The returned dataframe is shared by the tools of this table, so it
+        must not be modified.
+        """
+        return self.model().formatted_dataf
 
     def plot_readings(self):
         """
@@ -420,6 +558,10 @@ class Readings(SardesPlugin):
         """
         Handle when a timeseries data table is destroyed.
         """
+        # Cancel the fetching of the readings of the table if it is
+        # still in progress.
+        self.main.db_connection_manager.cancel_tasks(
+            ('readings', obs_well_uuid))
         self.main.unregister_table(
             self._tseries_table_widgets[obs_well_uuid].tableview)
         del self._tseries_table_widgets[obs_well_uuid]
@@ -571,14 +713,8 @@ class Readings(SardesPlugin):
                 continue
 
             run_tasks = True
-            datatypes = [DataType.WaterLevel,
-                         DataType.WaterTemp,
-                         DataType.WaterEC]
-            self.main.db_connection_manager.get_timeseries_for_obs_well(
-                obs_well_uuid,
-                datatypes,
-                callback=table_widget.model().set_model_data,
-                postpone_exec=True)
+            table_widget.update_readings(
+                self.main.db_connection_manager, postpone_exec=True)
 
         if run_tasks is True:
             self.main.db_connection_manager.run_tasks()
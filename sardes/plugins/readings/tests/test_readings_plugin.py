@@ -17,6 +17,7 @@ import os.path as osp
 os.environ['SARDES_PYTEST'] = 'True'
 
 # ---- Third party imports
+import numpy as np
 import pytest
 
 # ---- Local imports
@@ -84,6 +85,10 @@ def mainwindow(qtbot, mocker, dbconnmanager, dbaccessor, obswell_uuid,
     table = mainwindow.plugin._tseries_table_widgets[obswell_uuid]
     qtbot.waitUntil(lambda: table.tableview.row_count() == len(readings_data))
     assert table.isVisible()
+
+    # Since the readings are shown in the table as soon as they are
+    # fetched, we need to wait for the loading to be completed.
+    qtbot.waitUntil(lambda: table.tableview.isEnabled())
     assert not table.model()._repere_data.empty
     assert (table.model().manual_measurements()['value'].values.tolist() ==
             [5.23, 4.36, 4.91])
@@ -136,6 +141,45 @@ def test_plot_viewer(mainwindow, qtbot, obswell_uuid, readings_data):
             readings_data[DataType.WaterLevel].values.tolist())
 
 
+def test_shared_readings(mainwindow, qtbot, obswell_uuid):
+    """
+    Test that the readings are shared without being copied by the table,
+    the plot viewer and the tools until they are edited.
+    """
+    table = mainwindow.plugin._tseries_table_widgets[obswell_uuid]
+    model = table.model()
+
+    # The visual data of the table are the data of the table.
+    assert model.visual_dataf is model.tabledata().view()
+
+    # The sorted and formatted readings are computed only once.
+    dataf = model.dataf
+    assert model.dataf is dataf
+    formatted_data = table.get_formatted_data()
+    assert table.get_formatted_data() is formatted_data
+
+    # The plot viewer timeseries are views of the sorted readings.
+    table.plot_readings()
+    qtbot.waitExposed(table.plot_viewer)
+    ax_wlvl = table.plot_viewer.canvas.figure.tseries_axes_list[0]
+    tseries = list(ax_wlvl.tseries_group)[0]
+    assert np.shares_memory(
+        tseries.data.values, dataf[DataType.WaterLevel].values)
+
+    # The timeseries copies its data before they are changed.
+    expected_values = dataf[DataType.WaterLevel].values.tolist()
+    tseries.delete_waterlevels_at([0])
+    assert np.isnan(tseries.data.iloc[0])
+    assert dataf[DataType.WaterLevel].values.tolist() == expected_values
+
+    # The sorted and formatted readings are updated after an edit.
+    model.set_data_edit_at(model.index(0, 2), 999.99)
+    assert model.dataf is not dataf
+    assert 999.99 in model.dataf[DataType.WaterLevel].values
+    assert table.get_formatted_data() is not formatted_data
+    assert dataf[DataType.WaterLevel].values.tolist() == expected_values
+
+
 def test_plot_viewer_update(mainwindow, qtbot, obswell_uuid):
     """
     Test that the plot viewer is updated as expected when the monitoring data
@@ -175,16 +219,16 @@ def test_plot_viewer_update(mainwindow, qtbot, obswell_uuid):
 
     # Test that a change in the readings data is reflected as
     # expected in the plot viewer.
-    with qtbot.waitSignal(dbconnmanager.sig_tseries_data_changed):
-        tseries_edits = init_tseries_edits()
-        tseries_edits.loc[
-            (table.model().dataf['datetime'].iloc[0],
-             table.model().dataf['obs_id'].iloc[0],
-             DataType.WaterLevel),
-            'value'] = 103.25
-        dbconnmanager.save_timeseries_data_edits(
-            tseries_edits, obswell_uuid)
-    qtbot.wait(300)
+    with qtbot.waitSignal(table.model().sig_data_updated, timeout=5000):
+        with qtbot.waitSignal(dbconnmanager.sig_tseries_data_changed):
+            tseries_edits = init_tseries_edits()
+            tseries_edits.loc[
+                (table.model().dataf['datetime'].iloc[0],
+                 table.model().dataf['obs_id'].iloc[0],
+                 DataType.WaterLevel),
+                'value'] = 103.25
+            dbconnmanager.save_timeseries_data_edits(
+                tseries_edits, obswell_uuid)
 
     obs_id = table.model().dataf['obs_id'].unique()[0]
     ax_wlvl = table.plot_viewer.canvas.figure.tseries_axes_list[0]
@@ -197,6 +241,33 @@ def test_plot_viewer_update(mainwindow, qtbot, obswell_uuid):
     assert (list(artist_measurements_.get_ydata()) == [1.5678, 4.36, 4.91])
 
 
+def test_readings_fetch_error(mainwindow, qtbot, mocker, obswell_uuid):
+    """
+    Test that the table is kept disabled and that the error is shown when
+    fetching a chunk of readings fails after the first chunk.
+    """
+    table = mainwindow.plugin._tseries_table_widgets[obswell_uuid]
+
+    get_chunk = DatabaseAccessorSardesLite.get_timeseries_chunk_for_obs_well
+
+    def get_chunk_failing(self, obs_well_id, data_types=None, end=None,
+                          size=10000):
+        if end is not None:
+            raise ValueError("Test error.")
+        return get_chunk(self, obs_well_id, data_types, end, 1)
+
+    mocker.patch.object(
+        DatabaseAccessorSardesLite, 'get_timeseries_chunk_for_obs_well',
+        get_chunk_failing)
+    qmsgbox_patcher = mocker.patch.object(QMessageBox, 'critical')
+
+    table.update_readings(mainwindow.db_connection_manager)
+    qtbot.waitUntil(lambda: qmsgbox_patcher.call_count == 1)
+    assert "Test error." in qmsgbox_patcher.call_args[0][2]
+    assert table.tableview.row_count() == 1
+    assert not table.tableview.isEnabled()
+
+
 def test_delete_timeseries_data(mainwindow, qtbot, mocker, obswell_uuid,
                                 readings_data):
     """
@@ -29,6 +29,8 @@ from sardes.tables.delegates import (
     TriStateEditDelegate)
 from sardes.tables.errors import ForeignReadingsConstraintError
 from sardes.tools.waterquality import WaterQualityReportTool
+from sardes.tools.batchexport import BatchReadingsExportTool
+from sardes.tools.wlevelclasses import WlevelClassesTool
 
 
 class ObsWellsTableModel(StandardSardesTableModel):
@@ -163,6 +165,12 @@ class ObsWellsTableWidget(SardesTableWidget):
         self.water_quality_report_tool = WaterQualityReportTool(self)
         self.install_tool(self.water_quality_report_tool)
 
+        self.batch_export_readings_tool = BatchReadingsExportTool(self)
+        self.install_tool(self.batch_export_readings_tool)
+
+        self.wlevel_classes_tool = WlevelClassesTool(self)
+        self.install_tool(self.wlevel_classes_tool)
+
     # ---- SardesPaneWidget public API
     def register_to_plugin(self, plugin):
         """Register this table with the given plugin."""
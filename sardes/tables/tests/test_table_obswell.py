@@ -13,6 +13,8 @@ Tests for the Observation Wells table.
 
 # ---- Standard imports
 import os
+import os.path as osp
+import zipfile
 os.environ['SARDES_PYTEST'] = 'True'
 
 # ---- Third party imports
@@ -435,5 +437,138 @@ def test_unique_constraint(tablewidget, qtbot, mocker, dbaccessor):
     assert qmsgbox_patcher.call_count == 1
 
 
+def test_batch_export_readings_tool(tablewidget, qtbot, mocker, tmp_path):
+    """
+    Test that the tool to export the readings data of the selected
+    monitoring stations at once is working as expected.
+    """
+    tool = tablewidget.batch_export_readings_tool
+
+    # Select all the monitoring stations and show the export dialog.
+    tablewidget.tableview.select_all()
+    tool.trigger()
+    dialog = tool.toolwidget()
+    qtbot.waitExposed(dialog)
+    assert len(tool.get_selected_stations()) == 5
+    assert dialog.export_btn.isEnabled()
+
+    # Export the readings data to CSV files in a directory.
+    export_dirname = osp.join(tmp_path, 'readings_export')
+    mocker.patch.object(
+        QFileDialog, 'getExistingDirectory', return_value=export_dirname)
+    dialog.set_file_format('csv')
+    with qtbot.waitSignal(tool.sig_readings_exported,
+                          timeout=50000) as blocker:
+        dialog.export_btn.click()
+    summary = blocker.args[0]
+
+    assert len(summary) == 5
+    assert summary['error'].isnull().all()
+    assert summary['filename'].notnull().sum() == 4
+    assert (summary['nbr_values'] > 0).sum() == 4
+    assert summary.loc[
+        summary['obs_well_id'] == '09000001', 'filename'].isnull().all()
+    assert sorted(os.listdir(export_dirname)) == [
+        'readings_02167001.csv', 'readings_02200001.csv',
+        'readings_03037041.csv', 'readings_03040002.csv',
+        'readings_export_summary.csv']
+    csv_data = pd.read_csv(
+        osp.join(export_dirname, 'readings_02200001.csv'),
+        encoding='utf-8-sig')
+    assert list(csv_data.columns) == [
+        'Date of reading', 'Water level altitude (m MSL)',
+        'Water temperature (°C)', 'Water electrical conductivity (µS/cm)']
+    assert len(csv_data) == summary['nbr_values'].max()
+    assert dialog.export_btn.isEnabled()
+    assert not dialog.cancel_btn.isEnabled()
+
+    # Export the readings data to xlsx files in a zip archive.
+    zip_filename = osp.join(tmp_path, 'readings_export.zip')
+    mocker.patch.object(
+        QFileDialog, 'getSaveFileName', return_value=(zip_filename, None))
+    dialog.set_file_format('xlsx')
+    dialog.zip_checkbox.setChecked(True)
+    with qtbot.waitSignal(tool.sig_readings_exported, timeout=50000):
+        dialog.export_btn.click()
+    with zipfile.ZipFile(zip_filename) as zfile:
+        assert sorted(zfile.namelist()) == [
+            'readings_02167001.xlsx', 'readings_02200001.xlsx',
+            'readings_03037041.xlsx', 'readings_03040002.xlsx',
+            'readings_export_summary.csv']
+
+    # Cancel an export to the same zip archive and assert that the dialog
+    # is enabled only once the export has stopped, that the existing archive
+    # is left untouched and that no temporary archive is left behind.
+    dialog.export_btn.click()
+    dialog.cancel_btn.click()
+    qtbot.waitUntil(dialog.export_btn.isEnabled, timeout=50000)
+    assert not dialog.cancel_btn.isEnabled()
+    assert [f for f in os.listdir(tmp_path) if f.endswith('.zip')] == [
+        'readings_export.zip']
+    with zipfile.ZipFile(zip_filename) as zfile:
+        assert len(zfile.namelist()) == 5
+
+
+def test_wlevel_classes_tool(tablewidget, qtbot, mocker, tmp_path):
+    """
+    Test that the tool to classify the water level of all the active
+    monitoring stations in percentile classes is working as expected.
+    """
+    tool = tablewidget.wlevel_classes_tool
+    tool.trigger()
+    dialog = tool.toolwidget()
+    qtbot.waitExposed(dialog)
+    assert dialog.classify_btn.isEnabled()
+    assert not dialog.cancel_btn.isEnabled()
+
+    dialog.year_spinbox.setValue(2018)
+    dialog.month_combobox.setCurrentIndex(6)
+    assert dialog.year() == 2018
+    assert dialog.month() == 7
+    assert dialog.pool() == 'min_max_median'
+
+    # Save the water level classes to a CSV file.
+    csv_filename = osp.join(tmp_path, 'wlevel_classes.csv')
+    mocker.patch.object(
+        QFileDialog, 'getSaveFileName', return_value=(csv_filename, None))
+    dialog.set_file_format('csv')
+    with qtbot.waitSignal(tool.sig_wlevels_classified,
+                          timeout=50000) as blocker:
+        dialog.classify_btn.click()
+    classes = blocker.args[0]
+
+    # The inactive station '09000001' must not be classified.
+    assert len(classes) == 4
+    assert sorted(classes['obs_well_id']) == [
+        '02167001', '02200001', '03037041', '03040002']
+    assert classes['percentile_class'].notnull().all()
+    assert (classes['nyear'] == 6).all()
+    assert ((classes['wlevel'] >= classes['p0']) &
+            (classes['wlevel'] <= classes['p100'])).all()
+    assert dialog.classify_btn.isEnabled()
+    assert not dialog.cancel_btn.isEnabled()
+
+    csv_data = pd.read_csv(csv_filename, encoding='utf-8-sig', dtype='str')
+    assert len(csv_data) == 4
+    assert list(csv_data.columns[:7]) == [
+        'Well ID', 'Municipality', 'Latitude', 'Longitude',
+        'Water level altitude (m MSL)', 'Percentile class',
+        'Number of years']
+    assert sorted(csv_data['Well ID']) == sorted(classes['obs_well_id'])
+
+    # Save the water level classes to a KML file.
+    kml_filename = osp.join(tmp_path, 'wlevel_classes.kml')
+    mocker.patch.object(
+        QFileDialog, 'getSaveFileName', return_value=(kml_filename, None))
+    dialog.set_file_format('kml')
+    with qtbot.waitSignal(tool.sig_wlevels_classified, timeout=50000):
+        dialog.classify_btn.click()
+    with open(kml_filename, encoding='utf-8') as f:
+        kml_content = f.read()
+    assert kml_content.count('<Placemark') == 4
+    for obs_well_id in classes['obs_well_id']:
+        assert '<name>{}</name>'.format(obs_well_id) in kml_content
+
+
 if __name__ == "__main__":
     pytest.main(['-x', __file__, '-v', '-rw'])
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+A tool to export the formatted readings data of many monitoring stations
+at once.
+"""
+
+from __future__ import annotations
+
+# ---- Standard library imports
+import datetime
+import importlib.util
+import os.path as osp
+
+# ---- Third party imports
+from qtpy.QtCore import Signal
+from qtpy.QtWidgets import (
+    QCheckBox, QComboBox, QFileDialog, QGridLayout, QLabel, QWidget)
+
+# ---- Local imports
+from sardes.api.tools import SardesTool
+from sardes.config.icons import get_icon
+from sardes.config.locale import _
+from sardes.config.ospath import (
+    get_select_file_dialog_dir, set_select_file_dialog_dir)
+from sardes.tools.save2excel import (
+    _save_reading_data_to_xlsx, get_reading_data_columns)
+from sardes.utils.data_operations import format_reading_data
+from sardes.widgets.dialogs import UserMessageDialogBase
+from sardes.widgets.statusbar import ProcessStatusBar
+
+
+# The formats in which the readings data can be exported, with the name
+# filters used in the file dialogs.
+READINGS_EXPORT_FORMATS = {
+    'xlsx': "Excel Workbook (*.xlsx)",
+    'csv': "Comma-Separated Values (*.csv)",
+    'parquet': "Apache Parquet (*.parquet)"
+    }
+
+
+def is_parquet_supported():
+    """
+    Return whether one of the engines needed by pandas to write
+    Parquet files is installed.
+    """
+    return any(importlib.util.find_spec(engine) is not None for
+               engine in ('pyarrow', 'fastparquet'))
+
+
+def get_readings_export_filename(obs_well_id, file_format):
+    """
+    Return the name of the file in which the readings data of the
+    given monitoring station are exported.
+    """
+    return _('readings_{}.{}').format(obs_well_id, file_format)
+
+
+def export_station_readings(savepath, file_format, readings, repere_data,
+                            station_data, ground_altitude, is_alt_geodesic,
+                            logo_filename=None, font_name='Calibri'):
+    """
+    Format the readings data of a monitoring station and save them in
+    the given file format to savepath.
+
+    This is executed in separate processes when exporting the readings of
+    many stations at once, so all arguments must remain picklable.
+
+    Returns
+    -------
+    nbr_values : int
+        The number of daily values that were saved to the file.
+    """
+    formatted_data = format_reading_data(readings, repere_data)
+    if file_format == 'xlsx':
+        _save_reading_data_to_xlsx(
+            savepath, _('Piezometry'), formatted_data, station_data,
+            ground_altitude, is_alt_geodesic,
+            logo_filename=logo_filename, font_name=font_name)
+    else:
+        data_columns, formatted_data_columns = get_reading_data_columns(
+            formatted_data)
+        formatted_data = formatted_data[['datetime'] + data_columns]
+        formatted_data.columns = formatted_data_columns
+        if file_format == 'csv':
+            formatted_data.to_csv(
+                savepath, index=False, encoding='utf-8-sig',
+                date_format='%Y-%m-%d', float_format='%0.2f')
+        elif file_format == 'parquet':
+            formatted_data.to_parquet(savepath, index=False)
+        else:
+            raise ValueError(
+                "'{}' is not a supported file format.".format(file_format))
+    return len(formatted_data)
+
+
+class BatchReadingsExportTool(SardesTool):
+    """
+    A tool to export the formatted readings data of the monitoring
+    stations selected in a table, at once.
+
+    This tool is meant to be installed in the 'ObsWellsTableWidget'.
+    """
+    sig_readings_exported = Signal(object)
+
+    def __init__(self, table):
+        super().__init__(
+            table,
+            name='batch_export_readings_tool',
+            text=_("Export Readings"),
+            icon='file_excel',
+            tip=_("Export the daily readings data of the selected "
+                  "monitoring stations in Excel, CSV or Parquet files.")
+            )
+
+    # ---- SardesTool API
+    def __update_toolwidget__(self, toolwidget):
+        toolwidget.set_station_count(len(self.get_selected_stations()))
+
+    def __on_current_changed__(self, current_index):
+        if self.toolwidget() is not None:
+            self.update()
+
+    def __create_toolwidget__(self):
+        export_dialog = BatchReadingsExportDialog(parent=self.table)
+        export_dialog.sig_start_export_request.connect(self._export_readings)
+        export_dialog.sig_cancel_export_request.connect(
+            self._cancel_export_readings)
+        return export_dialog
+
+    # ---- Public API
+    def get_selected_stations(self):
+        """
+        Return the IDs of the monitoring stations that are selected
+        in the table, excluding the new rows that are not saved in the
+        database yet.
+        """
+        tableview = self.table.tableview
+        proxy_model = tableview.model()
+        stations = []
+        for row in sorted(tableview.get_rows_intersecting_selection()):
+            index = proxy_model.index(row, 0)
+            if not proxy_model.is_new_row_at(index):
+                stations.append(proxy_model.dataf_index_at(index))
+        return stations
+
+    # ---- Handlers
+    def _export_readings(self, dest, file_format):
+        """
+        Export the readings data of the selected monitoring stations to
+        the given destination directory or zip archive.
+        """
+        dbmanager = self.table.model().db_connection_manager
+        stations = self.get_selected_stations()
+        if dbmanager is None or not stations:
+            self.toolwidget().stop_exporting(None)
+            return
+        dbmanager.export_readings(
+            stations, dest, file_format,
+            callback=self._handle_readings_exported,
+            progress_callback=self.toolwidget().set_progress)
+
+    def _cancel_export_readings(self):
+        """
+        Cancel the export of the readings data that is in progress, if any.
+        """
+        dbmanager = self.table.model().db_connection_manager
+        if dbmanager is None:
+            self.toolwidget().stop_exporting(None)
+            return
+        # The export is stopped only once the cancelled task has actually
+        # ended, so that two exports never write to the same destination
+        # at the same time.
+        dbmanager.cancel_export_readings(
+            callback=lambda: self.toolwidget().stop_exporting(None))
+
+    def _handle_readings_exported(self, summary):
+        """
+        Handle when the readings data of the selected monitoring stations
+        were exported.
+        """
+        self.toolwidget().stop_exporting(summary)
+        self.sig_readings_exported.emit(summary)
+
+
+class BatchReadingsExportDialog(UserMessageDialogBase):
+    """
+    A dialog window to export the readings data of many monitoring
+    stations at once.
+    """
+    sig_start_export_request = Signal(str, str)
+    sig_cancel_export_request = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(_("Export Readings"))
+        self.setWindowIcon(get_icon('file_excel'))
+        self.setModal(False)
+
+        self._export_in_progress = False
+        self._export_cancelled = False
+
+        # Setup the export options.
+        self.stations_label = QLabel()
+
+        self.format_combobox = QComboBox()
+        for file_format, namefilter in READINGS_EXPORT_FORMATS.items():
+            self.format_combobox.addItem(namefilter, file_format)
+        if not is_parquet_supported():
+            # We disable the Parquet format if no engine is available to
+            # write Parquet files with pandas.
+            index = self.format_combobox.findData('parquet')
+            self.format_combobox.model().item(index).setEnabled(False)
+
+        self.zip_checkbox = QCheckBox(_("Save the files in a zip archive"))
+
+        self.options_widget = QWidget()
+        options_layout = QGridLayout(self.options_widget)
+        options_layout.setContentsMargins(0, 0, 0, 0)
+        options_layout.addWidget(QLabel(_("File format:")), 0, 0)
+        options_layout.addWidget(self.format_combobox, 0, 1)
+        options_layout.addWidget(self.zip_checkbox, 1, 0, 1, 2)
+        options_layout.setColumnStretch(1, 1)
+
+        # Setup the status bar.
+        self.status_bar = ProcessStatusBar()
+        self.status_bar.hide()
+
+        # Setup the dialog button box.
+        self.export_btn = self.create_button(
+            _('Export'), enabled=False, default=True,
+            triggered=self._select_export_dest)
+        self.cancel_btn = self.create_button(
+            _('Cancel'), enabled=False, default=False,
+            triggered=self.cancel_exporting)
+        self.close_btn = self.create_button(
+            _('Close'), enabled=True, default=False,
+            triggered=self.close)
+        self.add_button(self.export_btn)
+        self.add_button(self.cancel_btn)
+        self.add_button(self.close_btn)
+
+        # Setup the main widget.
+        self.central_layout.addWidget(self.stations_label)
+        self.central_layout.addWidget(self.options_widget)
+        self.central_layout.addWidget(self.status_bar)
+        self.central_layout.addStretch(1)
+
+    # ---- Public Interface
+    def file_format(self):
+        """Return the file format in which to export the readings data."""
+        return self.format_combobox.currentData()
+
+    def set_file_format(self, file_format):
+        """Set the file format in which to export the readings data."""
+        self.format_combobox.setCurrentIndex(
+            self.format_combobox.findData(file_format))
+
+    def is_zip(self):
+        """Return whether to save the exported files in a zip archive."""
+        return self.zip_checkbox.isChecked()
+
+    def set_station_count(self, count: int):
+        """Set the number of monitoring stations that will be exported."""
+        self.stations_label.setText(_(
+            "The readings data of the {} monitoring stations selected "
+            "in the table will be exported."
+            ).format(count))
+        self.export_btn.setEnabled(count > 0 and not self._export_in_progress)
+
+    def set_progress(self, progress: float):
+        """Set the progress of the export, in percent."""
+        self.status_bar.set_label(
+            _("Exporting readings data...") + ' {:0.1f}%'.format(progress))
+
+    def start_exporting(self, dest: str):
+        """
+        Start the export of the readings data to the given destination.
+        """
+        self._export_in_progress = True
+        self._export_cancelled = False
+        self.options_widget.setEnabled(False)
+        self.export_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.status_bar.show(_("Exporting readings data..."))
+        self.sig_start_export_request.emit(dest, self.file_format())
+
+    def cancel_exporting(self):
+        """
+        Cancel the export of the readings data that is in progress.
+
+        The export is stopped only once the export task has actually
+        ended, so that a new export cannot be started in the meantime.
+        """
+        if not self._export_in_progress or self._export_cancelled:
+            return
+        self._export_cancelled = True
+        self.cancel_btn.setEnabled(False)
+        self.status_bar.show(
+            _("Cancelling the export of the readings data..."))
+        self.sig_cancel_export_request.emit()
+
+    def stop_exporting(self, summary):
+        """
+        Stop the export of the readings data and show a summary of
+        the results.
+        """
+        self._export_in_progress = False
+        self.options_widget.setEnabled(True)
+        self.export_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        if self._export_cancelled:
+            self._export_cancelled = False
+            self.status_bar.show_fail_icon(
+                _("The export of the readings data was cancelled."))
+            return
+        if summary is None:
+            self.status_bar.show_fail_icon(
+                _("Failed to export readings data."))
+            return
+
+        nbr_exported = summary['filename'].notnull().sum()
+        nbr_failed = summary['error'].notnull().sum()
+        nbr_empty = len(summary) - nbr_exported - nbr_failed
+        message = _(
+            "The readings data of {} monitoring stations were exported."
+            ).format(nbr_exported)
+        if nbr_empty:
+            message += ' ' + _(
+                "{} monitoring stations had no readings data."
+                ).format(nbr_empty)
+        if nbr_failed:
+            message += ' ' + _(
+                "The export failed for {} monitoring stations."
+                ).format(nbr_failed)
+            self.status_bar.show_fail_icon(message)
+        else:
+            self.status_bar.show_sucess_icon(message)
+
+    # ---- Handlers
+    def _select_export_dest(self):
+        """
+        Open a dialog that allows the user to select the directory or zip
+        archive where to export the readings data.
+        """
+        dirname = get_select_file_dialog_dir()
+        if self.is_zip():
+            filename = _('readings_{}.zip').format(
+                datetime.datetime.now().strftime('%Y-%m-%d'))
+            dest, filefilter = QFileDialog.getSaveFileName(
+                self, _('Export As'), osp.join(dirname, filename),
+                'Zip Archive (*.zip)')
+            if dest and not dest.endswith('.zip'):
+                dest += '.zip'
+        else:
+            dest = QFileDialog.getExistingDirectory(
+                self, _('Select Existing Directory'), dirname,
+                options=QFileDialog.ShowDirsOnly)
+        if dest:
+            dest = osp.abspath(dest)
+            set_select_file_dialog_dir(
+                osp.dirname(dest) if self.is_zip() else dest)
+            self.start_exporting(dest)
+
+    def closeEvent(self, event):
+        """
+        Override Qt method to cancel the export of the readings data in
+        progress, if any, when this dialog is closed.
+        """
+        if self._export_in_progress:
+            self.cancel_exporting()
+        super().closeEvent(event)
+
+
+if __name__ == '__main__':
+    import sys
+    from qtpy.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    dialog = BatchReadingsExportDialog()
+    dialog.set_station_count(12)
+    dialog.show()
+    sys.exit(app.exec_())
@@ -11,12 +11,15 @@
 import os.path as osp
 import datetime
 from math import floor, ceil
+from time import perf_counter
 
 # ---- Third party library imports
+import numpy as np
 import matplotlib.dates as mdates
 from matplotlib.transforms import ScaledTranslation
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
 from matplotlib.patches import Rectangle
 from matplotlib.ticker import MultipleLocator
 from PIL import Image
@@ -124,41 +127,188 @@ class HydrographTool(SardesTool):
             QApplication.processEvents()
 
 
+def insert_gap_breaks(datetimes, values, max_gap):
+    """
+    Insert a break in the given data wherever the time between two
+    consecutive readings is greater than max_gap.
+
+    A break is a NaN value added at the date of the reading that precedes
+    the gap, so that the data can be drawn as a single line that is
+    interrupted at each gap, instead of drawing one line per segment of
+    continuous data.
+
+    Parameters
+    ----------
+    datetimes : array-like
+        The sorted datetimes of the readings.
+    values : array-like
+        The values of the readings.
+    max_gap : datetime.timedelta
+        The maximum time between two consecutive readings for them to
+        be joined by the line.
+
+    Returns
+    -------
+    datetimes : np.ndarray
+        The datetimes of the readings, including the breaks.
+    values : np.ndarray
+        The values of the readings, with NaN at the breaks.
+    """
+    datetimes = np.asarray(datetimes, dtype='datetime64[ns]')
+    values = np.asarray(values, dtype=float)
+    gaps = np.flatnonzero(
+        np.diff(datetimes) > np.timedelta64(max_gap)) + 1
+    return (np.insert(datetimes, gaps, datetimes[gaps - 1]),
+            np.insert(values, gaps, np.nan))
+
+
 class HydrographCanvas(FigureCanvasAgg):
-    def __init__(self, data, obs_well_data, ground_altitude, is_alt_geodesic,
-                 fontname='Arial'):
-        fwidth = 11
-        fheight = 8.5
-        margin_width = 0.5
-        fig = Figure(figsize=(fwidth, fheight), facecolor='white', dpi=300)
-        super().__init__(fig)
+    """
+    A canvas to plot publication ready hydrographs of the water level data
+    of monitoring stations.
 
-        # data = data.set_index('datetime', drop=True)
+    The skeleton of the figure (axes, labels, logo, footer) is built only
+    once, so that the same canvas can be reused to plot the hydrographs
+    of many stations by calling 'set_data' for each of them.
+    """
+    FWIDTH = 11
+    FHEIGHT = 8.5
+    MARGIN_WIDTH = 0.5
+    LINE_COLOR = '#1f77b4'
+    GRID_COLOR = '0.65'
+
+    def __init__(self, data=None, obs_well_data=None, ground_altitude=None,
+                 is_alt_geodesic=None, fontname='Arial'):
+        fig = Figure(figsize=(self.FWIDTH, self.FHEIGHT), facecolor='white',
+                     dpi=300)
+        super().__init__(fig)
+        self.fontname = fontname
+        self._setup_figure()
+        if data is not None:
+            self.set_data(data, obs_well_data, ground_altitude,
+                          is_alt_geodesic)
 
-        line_color = '#1f77b4'
-        grid_color = '0.65'
+    def _setup_figure(self):
+        """
+        Setup the elements of the figure that are the same for
+        every hydrograph.
+        """
+        fig = self.figure
+        fontname = self.fontname
+        margin_width = self.MARGIN_WIDTH
+        grid_color = self.GRID_COLOR
 
-        ax = self.figure.add_axes([0, 0, 1, 1], frameon=True)
+        ax = self.ax = fig.add_axes([0, 0, 1, 1], frameon=True)
         ax.set_ylabel(
             _("Water level altitude (m MSL)"), fontsize=23, labelpad=20,
             fontname=fontname)
         ax.grid(axis='both', ls='-', color=grid_color, which='major')
         ax.tick_params(axis='both', direction='out', length=5,
-                       pad=10, color=grid_color)
+                       pad=10, color=grid_color, labelsize=16)
         ax.tick_params(axis='both', direction='out', color=grid_color,
                        which='minor')
         for spine in ax.spines.values():
             spine.set_edgecolor(grid_color)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+
+        # Setup one line for the data acquired with an automated logger,
+        # and one line for the data for which we do not have a sonde id
+        # that were acquired before and after 2000.
+        self._lines = [
+            ax.plot([], [], color=self.LINE_COLOR)[0] for i in range(3)]
+
+        # Add the figure title.
+        offset = ScaledTranslation(0, -margin_width, fig.dpi_scale_trans)
+        self._fig_title = ax.text(
+            0.5, 1, '', ha='center', va='top', fontsize=20,
+            fontweight='bold', fontname=fontname, linespacing=1.5,
+            transform=fig.transFigure + offset)
+
+        # Add the company logo.
+        renderer = self.get_renderer()
+        self._logo_height = logo_height = int(0.7 * fig.dpi)
+        logo_y0 = margin_width * fig.dpi
+
+        logo_filename = get_documents_logo_filename()
+        if logo_filename is not None:
+            img = Image.open(logo_filename)
+            img_width, img_height = img.size
+            logo_width = int(img_width / img_height * logo_height)
+            img = img.resize((logo_width, logo_height), Image.LANCZOS)
+
+            logo_x0 = fig.bbox.width - margin_width * fig.dpi - logo_width
+            fig.figimage(img, logo_x0, logo_y0, alpha=1, zorder=0,
+                         url='http://www.environnement.gouv.qc.ca/')
+        else:
+            logo_width = 0
+            logo_x0 = fig.bbox.width - margin_width * fig.dpi
+
+        # Add a blue delimitation line.
+        rect1_height = 6 / 72 * fig.dpi / fig.bbox.height
+        rect1_y0 = (logo_height + logo_y0) / fig.bbox.height - rect1_height
+        rect1_x0 = margin_width / self.FWIDTH
+        if logo_filename is not None:
+            rect1_width = (
+                (logo_x0 - 12/72 * fig.dpi) / fig.bbox.width - rect1_x0)
+        else:
+            rect1_width = (logo_x0 / fig.bbox.width) - rect1_x0
+        rect1 = Rectangle(
+            (rect1_x0, rect1_y0), rect1_width, rect1_height,
+            fc=self.LINE_COLOR, ec=self.LINE_COLOR, clip_on=False, zorder=0,
+            transform=fig.transFigure)
+        ax.add_patch(rect1)
+
+        # Add the creation date., copyright notice and url.
+        now = datetime.datetime.now()
+        offset = ScaledTranslation(0, -8/72, fig.dpi_scale_trans)
+        created_on_text = ax.text(
+            margin_width / self.FWIDTH,
+            rect1.get_window_extent(renderer).y0 / fig.bbox.height,
+            _("Created on {}").format(now.strftime('%Y-%m-%d')),
+            va='top', fontname=fontname, transform=fig.transFigure + offset
+            )
+        next_ypos = created_on_text.get_window_extent(renderer).y0
+
+        # Add the author's name.
+        authors_name = CONF.get('documents_settings', 'authors_name', '')
+        if authors_name:
+            offset = ScaledTranslation(0/72, -4/72, fig.dpi_scale_trans)
+            authors_name_text = ax.text(
+                margin_width / self.FWIDTH, next_ypos / fig.bbox.height,
+                authors_name, va='top', fontname=fontname,
+                transform=fig.transFigure+offset
+                )
+            next_ypos = authors_name_text.get_window_extent(renderer).y0
+
+        # Add the site url.
+        site_url = CONF.get('documents_settings', 'site_url', '')
+        if site_url:
+            offset = ScaledTranslation(0/72, -4/72, fig.dpi_scale_trans)
+            ax.text(
+                margin_width / self.FWIDTH, next_ypos / fig.bbox.height,
+                site_url, url=site_url, fontname=fontname, fontstyle='italic',
+                va='top', color='blue', transform=fig.transFigure+offset)
+
+        # Add altitude information.
+        offset = ScaledTranslation(0, -8/72, fig.dpi_scale_trans)
+        self._alt_text = ax.text(
+            0, 0, '', ha='left', va='top', fontsize=10, fontname=fontname,
+            transform=fig.transFigure + offset)
+
+    def set_data(self, data, obs_well_data, ground_altitude,
+                 is_alt_geodesic):
+        """
+        Plot the hydrograph of the given formatted readings data and
+        station in this canvas.
+        """
+        ax = self.ax
 
         # Plot data acquired with an automated logger.
-        data_sonde_id = data[data['sonde_id'].notnull()].copy()
-        data_sonde_id['timediff'] = (
-            data_sonde_id['datetime'].diff() > datetime.timedelta(1))
-        data_sonde_id['timediff'] = data_sonde_id['timediff'].cumsum()
-        for group in data_sonde_id.groupby('timediff'):
-            ax.plot(group[1]['datetime'],
-                    group[1][DataType.WaterLevel],
-                    color=line_color)
+        data_sonde_id = data[data['sonde_id'].notnull()]
+        self._lines[0].set_data(*insert_gap_breaks(
+            data_sonde_id['datetime'].values,
+            data_sonde_id[DataType.WaterLevel].values,
+            max_gap=datetime.timedelta(1)))
 
         # Plot data for which we do not have a sonde id.
 
@@ -166,31 +316,21 @@ class HydrographCanvas(FigureCanvasAgg):
         # before 2000 then after. Data acquired after 2000 were most likely
         # acquired with a logger, but the information was not entered
         # in the database.
-        data_nosonde_id = data[data['sonde_id'].isnull()].copy()
-
-        data_av_2000 = (
-            data_nosonde_id
-            [data_nosonde_id['datetime'] < datetime.datetime(2000, 1, 1)]
-            .copy())
-        data_av_2000['timediff'] = (
-            data_av_2000['datetime'].diff() > datetime.timedelta(365))
-        data_av_2000['timediff'] = data_av_2000['timediff'].cumsum()
-        for group in data_av_2000.groupby('timediff'):
-            ax.plot(group[1]['datetime'],
-                    group[1][DataType.WaterLevel],
-                    color=line_color)
-
-        data_af_2000 = (
-            data_nosonde_id
-            [data_nosonde_id['datetime'] >= datetime.datetime(2000, 1, 1)]
-            .copy())
-        data_af_2000['timediff'] = (
-            data_af_2000['datetime'].diff() > datetime.timedelta(1))
-        data_af_2000['timediff'] = data_af_2000['timediff'].cumsum()
-        for group in data_af_2000.groupby('timediff'):
-            ax.plot(group[1]['datetime'],
-                    group[1][DataType.WaterLevel],
-                    color=line_color)
+        data_nosonde_id = data[data['sonde_id'].isnull()]
+
+        data_av_2000 = data_nosonde_id[
+            data_nosonde_id['datetime'] < datetime.datetime(2000, 1, 1)]
+        self._lines[1].set_data(*insert_gap_breaks(
+            data_av_2000['datetime'].values,
+            data_av_2000[DataType.WaterLevel].values,
+            max_gap=datetime.timedelta(365)))
+
+        data_af_2000 = data_nosonde_id[
+            data_nosonde_id['datetime'] >= datetime.datetime(2000, 1, 1)]
+        self._lines[2].set_data(*insert_gap_breaks(
+            data_af_2000['datetime'].values,
+            data_af_2000[DataType.WaterLevel].values,
+            max_gap=datetime.timedelta(1)))
 
         # Setup the the range and ticks of the xaxis.
         if not data.empty:
@@ -241,147 +381,142 @@ class HydrographCanvas(FigureCanvasAgg):
             ax.xaxis.set_minor_locator(mdates.YearLocator())
             xmin = datetime.datetime(5 * floor(year_min / 5), 1, 1)
             xmax = datetime.datetime(5 * ceil(year_max / 5), 1, 1)
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
         ax.axis(ymax=ymax, ymin=ymin, xmin=xmin, xmax=xmax)
-        self.draw()
 
-        # Set the tick labels font properties.
-
-        # Note that 'ticklabels' cannot be set without setting 'ticks' first
-        # or else a warning is shown every time. See cgq-qgc/sardes#556.
+        # Fix the major ticks to the values returned by the locators. Note
+        # that this expands the range of the axes to include all of them.
         ax.set_xticks(ax.get_xticks())
-        ax.set_xticklabels(
-            ax.get_xticklabels(), fontname=fontname, fontsize=16)
-
         ax.set_yticks(ax.get_yticks())
-        ax.set_yticklabels(
-            ax.get_yticklabels(), fontname=fontname, fontsize=16)
+
+        # Set the tick labels font properties. Note that the ticks that are
+        # added later copy the properties of the existing ones.
+        for label in ax.get_xticklabels() + ax.get_yticklabels():
+            label.set_fontname(self.fontname)
+
+        # Set the header and altitude information.
+        self._fig_title.set_text(
+            _('Municipality: {}\nStation: {}').format(
+                obs_well_data['municipality'], obs_well_data['obs_well_id']))
+        geodesic_text = (
+            _('Geodesic') if is_alt_geodesic else _('Approximate'))
+        self._alt_text.set_text(
+            _("Ground altitude: {:0.2f} m MSL ({})").format(
+                ground_altitude, geodesic_text))
+
+        self._setup_margins()
+
+    def _setup_margins(self):
+        """
+        Setup the margins of the axes so that the tick labels, axis label
+        and header of the hydrograph fit in the figure.
+        """
+        fig = self.figure
+        ax = self.ax
+        margin_width = self.MARGIN_WIDTH
 
         # Setup the left and right margins.
-        self.draw()
+
+        # Note that the layout is computed without drawing the figure. The
+        # position of the axis label, which depends on the extents of the
+        # tick labels, is updated when getting the tight bbox of the axis.
+        ax.set_position([0, 0, 1, 1])
         renderer = self.get_renderer()
+        ax.yaxis.get_tightbbox(renderer)
         bbox_xaxis_bottom = ax.xaxis.get_ticklabel_extents(renderer)[0]
         bbox_yaxis_label = ax.yaxis.label.get_window_extent(renderer)
         left_margin = (
-            margin_width / fwidth +
+            margin_width / self.FWIDTH +
             (ax.bbox.x0 - bbox_yaxis_label.x0) / fig.bbox.width)
         right_margin = (
-            margin_width / fwidth +
+            margin_width / self.FWIDTH +
             max(((bbox_xaxis_bottom.x1 - ax.bbox.x1) / fig.bbox.width), 0)
             )
         ax.set_position([left_margin, 0, 1 - left_margin - right_margin, 1])
 
-        # Add the figure title.
-        self.draw()
-        offset = ScaledTranslation(0, -margin_width, fig.dpi_scale_trans)
-        fig_title = ax.text(
-            0.5, 1,
-            _('Municipality: {}\nStation: {}').format(
-                obs_well_data['municipality'], obs_well_data['obs_well_id']),
-            ha='center', va='top', fontsize=20,
-            fontweight='bold', fontname=fontname, linespacing=1.5,
-            transform=fig.transFigure + offset)
-
-        # Add the company logo.
-        logo_height = int(0.7 * fig.dpi)
-        logo_y0 = margin_width * fig.dpi
-
-        logo_filename = get_documents_logo_filename()
-        bbox_xaxis_bottom = ax.xaxis.get_ticklabel_extents(renderer)[0]
-        if logo_filename is not None:
-            img = Image.open(logo_filename)
-            img_width, img_height = img.size
-            logo_width = int(img_width / img_height * logo_height)
-            img = img.resize((logo_width, logo_height), Image.LANCZOS)
-
-            logo_x0 = fig.bbox.width - margin_width * fig.dpi - logo_width
-            fig.figimage(img, logo_x0, logo_y0, alpha=1, zorder=0,
-                         url='http://www.environnement.gouv.qc.ca/')
-        else:
-            logo_width = 0
-            logo_x0 = fig.bbox.width - margin_width * fig.dpi
-
-        # Add a blue delimitation line.
-        rect1_height = 6 / 72 * fig.dpi / fig.bbox.height
-        rect1_y0 = (logo_height + logo_y0) / fig.bbox.height - rect1_height
-        rect1_x0 = margin_width / fwidth
-        if logo_filename is not None:
-            rect1_width = (
-                (logo_x0 - 12/72 * fig.dpi) / fig.bbox.width - rect1_x0)
-        else:
-            rect1_width = (logo_x0 / fig.bbox.width) - rect1_x0
-        rect1 = Rectangle(
-            (rect1_x0, rect1_y0), rect1_width, rect1_height, fc=line_color,
-            ec=line_color, clip_on=False, zorder=0, transform=fig.transFigure)
-        ax.add_patch(rect1)
-
-        # Add the creation date., copyright notice and url.
-        now = datetime.datetime.now()
-        offset = ScaledTranslation(0, -8/72, fig.dpi_scale_trans)
-        created_on_text = ax.text(
-            margin_width / fwidth,
-            rect1.get_window_extent(renderer).y0 / fig.bbox.height,
-            _("Created on {}").format(now.strftime('%Y-%m-%d')),
-            va='top', fontname=fontname, transform=fig.transFigure + offset
-            )
-        next_ypos = created_on_text.get_window_extent(renderer).y0
-
-        # Add the author's name.
-        authors_name = CONF.get('documents_settings', 'authors_name', '')
-        if authors_name:
-            offset = ScaledTranslation(0/72, -4/72, fig.dpi_scale_trans)
-            authors_name_text = ax.text(
-                margin_width / fwidth, next_ypos / fig.bbox.height,
-                authors_name, va='top', fontname=fontname,
-                transform=fig.transFigure+offset
-                )
-            next_ypos = authors_name_text.get_window_extent(renderer).y0
-
-        # Add the site url.
-        site_url = CONF.get('documents_settings', 'site_url', '')
-        if site_url:
-            offset = ScaledTranslation(0/72, -4/72, fig.dpi_scale_trans)
-            site_url_text = ax.text(
-                margin_width / fwidth, next_ypos / fig.bbox.height,
-                site_url, url=site_url, fontname=fontname, fontstyle='italic',
-                va='top', color='blue', transform=fig.transFigure+offset)
-
         # Setup the top and bottom margin.
-        self.draw()
-        bbox_title = fig_title.get_window_extent(renderer)
+        bbox_title = self._fig_title.get_window_extent(renderer)
         bbox_xaxis_bottom = ax.xaxis.get_ticklabel_extents(renderer)[0]
 
         title_pad = 18/72 * fig.dpi
         logo_pad = 36/72 * fig.dpi
         top_margin = (
-            margin_width / fheight +
+            margin_width / self.FHEIGHT +
             (bbox_title.height + title_pad) / fig.bbox.height
             )
         bottom_margin = (
-            margin_width / fheight +
-            (logo_height + logo_pad) / fig.bbox.height +
+            margin_width / self.FHEIGHT +
+            (self._logo_height + logo_pad) / fig.bbox.height +
             (ax.bbox.y0 - bbox_xaxis_bottom.y0) / fig.bbox.height
             )
         ax.set_position([left_margin, bottom_margin,
                          1 - left_margin - right_margin,
                          1 - bottom_margin - top_margin])
 
-        # Add altitude information.
+        # Position the altitude information below the bottom left corner
+        # of the tick labels.
         bbox_xaxis_bottom = ax.xaxis.get_ticklabel_extents(renderer)[0]
         bbox_yaxis_left = ax.yaxis.get_ticklabel_extents(renderer)[0]
-        geodesic_text = (
-            _('Geodesic') if is_alt_geodesic else _('Approximate'))
-        alt_text = _("Ground altitude: {:0.2f} m MSL ({})").format(
-            ground_altitude, geodesic_text)
-        alt_text_y0 = bbox_xaxis_bottom.y0 / fig.bbox.height
-        alt_text_x0 = bbox_yaxis_left.x0 / fig.bbox.width
-        offset = ScaledTranslation(0, -8/72, fig.dpi_scale_trans)
-        ax.text(
-            alt_text_x0, alt_text_y0, alt_text, ha='left', va='top',
-            fontsize=10, fontname=fontname,
-            transform=fig.transFigure + offset)
+        self._alt_text.set_position((
+            bbox_yaxis_left.x0 / fig.bbox.width,
+            bbox_xaxis_bottom.y0 / fig.bbox.height))
+
 
-        self.draw()
+# The hydrograph canvas that is reused by 'get_hydrograph_canvas' to plot
+# the hydrographs of many stations in the current process.
+_HYDROGRAPH_CANVAS = {'key': None, 'canvas': None}
+
+
+def get_hydrograph_canvas(fontname='Arial'):
+    """
+    Return a hydrograph canvas that can be reused to plot the hydrographs
+    of many stations in the current process.
+
+    A new canvas is only created when the font or the content of the
+    figure skeleton changed since the last call.
+    """
+    key = (fontname,
+           get_documents_logo_filename(),
+           CONF.get('documents_settings', 'authors_name', ''),
+           CONF.get('documents_settings', 'site_url', ''),
+           datetime.date.today())
+    if _HYDROGRAPH_CANVAS['key'] != key:
+        _HYDROGRAPH_CANVAS['canvas'] = HydrographCanvas(fontname=fontname)
+        _HYDROGRAPH_CANVAS['key'] = key
+    return _HYDROGRAPH_CANVAS['canvas']
+
+
+def save_hydrographs_to_pdf(filename, hydrographs_data, fontname='Arial'):
+    """
+    Plot the hydrographs of many stations and save them in a multipage
+    PDF file, reusing the same figure for every page.
+
+    Parameters
+    ----------
+    filename : str
+        The absolute path of the PDF file where to save the hydrographs.
+    hydrographs_data : iterable
+        An iterable of (data, obs_well_data, ground_altitude,
+        is_alt_geodesic) tuples, one for each page of the PDF file.
+    fontname : str
+        The name of the font to use in the hydrographs.
+
+    Returns
+    -------
+    render_times : list
+        The time taken to plot and save each page of the PDF file,
+        in seconds.
+    """
+    hydrograph = HydrographCanvas(fontname=fontname)
+    render_times = []
+    with PdfPages(filename) as pdf:
+        for data, obs_well_data, ground_altitude, is_alt_geodesic in (
+                hydrographs_data):
+            ts = perf_counter()
+            hydrograph.set_data(
+                data, obs_well_data, ground_altitude, is_alt_geodesic)
+            pdf.savefig(hydrograph.figure)
+            render_times.append(perf_counter() - ts)
+    return render_times
 
 
 # %%
@@ -389,7 +524,6 @@ class HydrographCanvas(FigureCanvasAgg):
 if __name__ == '__main__':
     from sardes.database.accessors import DatabaseAccessorSardesLite
     from sardes.utils.data_operations import format_reading_data
-    from matplotlib.backends.backend_pdf import PdfPages
 
     dbaccessor = DatabaseAccessorSardesLite(
         'D:/Desktop/rsesq_prod_21072020_v1.db')
@@ -397,29 +531,28 @@ if __name__ == '__main__':
     obs_wells_data = dbaccessor.get('observation_wells_data')
     repere_data = dbaccessor.get('repere_data')
 
-    with PdfPages('D:/hydrographs_example.pdf') as pdf:
-        count = 0
-        for sampling_feature_uuid in obs_wells_data.index:
-            readings = dbaccessor.get_timeseries_for_obs_well(
-                sampling_feature_uuid, DataType.WaterLevel)
+    # Fetch the readings of all the wells at once.
+    readings_by_well = dict(dbaccessor.get_timeseries_for_obs_wells(
+        obs_wells_data.index, DataType.WaterLevel, grouped=True))
+
+    def iter_hydrographs_data():
+        for sampling_feature_uuid, readings in readings_by_well.items():
             repere_data_for_well = (
                 repere_data
                 [repere_data['sampling_feature_uuid'] ==
                  sampling_feature_uuid]
-                .iloc[0])
-            obswell_data = obs_wells_data.loc[sampling_feature_uuid]
-            print(obswell_data['obs_well_id'],
-                  '- {} of {}'.format(count + 1, len(obs_wells_data)))
-            if readings.empty:
-                continue
-
-            hydrograph = HydrographCanvas(
-                format_reading_data(
-                    readings, repere_data_for_well['top_casing_alt']),
-                obswell_data,
-                repere_data_for_well)
-            pdf.savefig(hydrograph.figure)
-            count += 1
+                .sort_values(by=['end_date'], ascending=[True]))
+            last_repere_data = repere_data_for_well.iloc[-1]
+            yield (format_reading_data(readings, repere_data_for_well),
+                   obs_wells_data.loc[sampling_feature_uuid],
+                   last_repere_data['top_casing_alt'] -
+                   last_repere_data['casing_length'],
+                   last_repere_data['is_alt_geodesic'])
+
+    render_times = save_hydrographs_to_pdf(
+        'D:/hydrographs_example.pdf', iter_hydrographs_data())
+    print('{} pages rendered in {:0.1f} sec'.format(
+        len(render_times), sum(render_times)))
 
 # # Add the piezometer information.
 # fig.canvas.draw()
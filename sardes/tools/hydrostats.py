@@ -8,11 +8,16 @@
 # -----------------------------------------------------------------------------
 
 # ---- Standard library imports
+from collections import OrderedDict
 from datetime import datetime
 from calendar import monthrange
 import datetime as dt
+import hashlib
 import io
+import os
 import os.path as osp
+import shutil
+import tempfile
 
 # ---- Third party imports
 import matplotlib as mpl
@@ -21,10 +26,12 @@ import matplotlib.transforms as transforms
 from matplotlib.transforms import ScaledTranslation
 import numpy as np
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
 from matplotlib.figure import Figure
-from qtpy.QtCore import Qt
+from pypdf import PdfWriter
+from qtpy.QtCore import Qt, Signal
 from qtpy.QtGui import QImage
 from qtpy.QtWidgets import (
     QApplication, QComboBox, QGridLayout, QLabel, QMainWindow, QWidget,
@@ -32,6 +39,8 @@ from qtpy.QtWidgets import (
 
 # ---- Local imports
 from sardes.config.gui import get_iconsize
+from sardes.api.taskmanagers import (
+    WorkerBase, TaskManagerBase, WorkerProcessPool)
 from sardes.api.timeseries import DataType
 from sardes.config.locale import _
 from sardes.config.ospath import (
@@ -39,11 +48,50 @@ from sardes.config.ospath import (
 from sardes.api.tools import SardesTool
 from sardes.utils.qthelpers import (
     create_toolbutton, create_mainwindow_toolbar)
+from sardes.widgets.statusbar import ProcessStatusBar
 
 MONTHS = np.array([
     _('Jan'), _('Feb'), _('Mar'), _('Apr'), _('May'), _('Jun'),
     _('Jul'), _('Aug'), _('Sep'), _('Oct'), _('Nov'), _('Dec')])
 
+# The methods available to pool the data when computing the monthly
+# percentiles of the statistical hydrographs.
+POOLS = ('all', 'min_max_median', 'median', 'mean')
+
+# The pairs of percentiles delimiting the bars of the statistical
+# hydrographs, with their label and color, and the percentiles that need
+# to be computed to plot them.
+PERCENTILE_QPAIRS = [(100, 90), (90, 75), (75, 25), (25, 10), (10, 0)]
+PERCENTILE_LABELS = {
+    (100, 90): '>90',
+    (90, 75): '76-90',
+    (75, 25): '25-75',
+    (25, 10): '10-24',
+    (10, 0): '<10'}
+PERCENTILE_RGB = {
+    (100, 90): "#ccebc5",
+    (90, 75): "#a8ddb5",
+    (75, 25): "#7bccc4",
+    (25, 10): "#4eb3d3",
+    (10, 0): "#2b8cbe"}
+PERCENTILES_Q = sorted(set(
+    [50] + [q for qpair in PERCENTILE_QPAIRS for q in qpair]))
+
+# The number of processes used to render the pages of the multipage pdf
+# file of the statistical hydrographs and the number of pages rendered
+# at once by each process.
+MULTIPDF_PROCESSES_COUNT = max(1, (os.cpu_count() or 1) - 1)
+MULTIPDF_PAGES_PER_CHUNK = 5
+
+# The monthly percentiles computed for the last few time series that were
+# plotted in a statistical hydrograph, keyed by time series fingerprint.
+MONTHLY_PERCENTILES_CACHE_SIZE = 8
+_MONTHLY_PERCENTILES_CACHE = OrderedDict()
+
+# The figure that is reused by each process to render the pages of the
+# multipage pdf file of the statistical hydrographs.
+_RENDER_FIGURE = {'key': None, 'figure': None}
+
 
 class SatisticalHydrographTool(SardesTool):
     """
@@ -78,14 +126,29 @@ class SatisticalHydrographTool(SardesTool):
 
 
 class SatisticalHydrographWidget(QMainWindow):
+    sig_multipdf_statistical_graphs_saved = Signal(object)
+
     def __init__(self, parent=None):
         super().__init__()
         self.obs_well_id = None
+        self._multipdf_in_progress = False
+        self._multipdf_cancelled = False
         self.canvas = SatisticalHydrographCanvas()
         self.setContextMenuPolicy(Qt.NoContextMenu)
         self.setCentralWidget(self.canvas)
         self.setup_toolbar()
 
+        # Setup the status bar that shows the progress of the creation
+        # of the multipage pdf files.
+        self.multipdf_status_bar = ProcessStatusBar()
+        self.statusBar().addWidget(self.multipdf_status_bar, 1)
+        self.statusBar().hide()
+
+        # Setup the manager that creates the multipage pdf files in a
+        # background thread.
+        self.task_manager = TaskManagerBase()
+        self.task_manager.set_worker(SatisticalHydrographWorker())
+
     def year(self):
         """
         Return the year for which the statistical hydrograph
@@ -191,6 +254,16 @@ class SatisticalHydrographWidget(QMainWindow):
             iconsize=get_iconsize())
         toolbar.addWidget(self.save_multipdf_statistical_graphs_btn)
 
+        self.cancel_multipdf_statistical_graphs_btn = create_toolbutton(
+            self, icon='close',
+            text=_("Cancel Multi Pages PDF"),
+            tip=_("Cancel the creation of the multi-page pdf file that "
+                  "is in progress."),
+            triggered=self.cancel_multipdf_statistical_graphs,
+            iconsize=get_iconsize())
+        self.cancel_multipdf_statistical_graphs_btn.setEnabled(False)
+        toolbar.addWidget(self.cancel_multipdf_statistical_graphs_btn)
+
         # Add navigation and animation tools
         toolbar.addSeparator()
 
@@ -248,7 +321,8 @@ class SatisticalHydrographWidget(QMainWindow):
         month_index = self.month_cbox.currentIndex()
         month_count = self.month_cbox.count()
         if year_count and month_count:
-            self.save_multipdf_statistical_graphs_btn.setEnabled(True)
+            self.save_multipdf_statistical_graphs_btn.setEnabled(
+                not self._multipdf_in_progress)
             self.move_forward_btn.setEnabled(True)
             self.move_backward_btn.setEnabled(True)
             if month_index == month_count - 1 and year_index == year_count - 1:
@@ -279,10 +353,90 @@ class SatisticalHydrographWidget(QMainWindow):
                 filename += '.pdf'
             filename = osp.abspath(filename)
             set_select_file_dialog_dir(osp.dirname(filename))
+            self.save_multipdf_statistical_graphs(filename)
+
+    def save_multipdf_statistical_graphs(self, filename):
+        """
+        Create in the background a multipage pdf file containing the
+        statistical hydrographs (one per page) for each year where data
+        are available.
+        """
+        if self.canvas.wlevels is None or self.canvas.wlevels.empty:
+            return
+        self._multipdf_in_progress = True
+        self.save_multipdf_statistical_graphs_btn.setEnabled(False)
+        self.cancel_multipdf_statistical_graphs_btn.setEnabled(True)
+        self.statusBar().show()
+        self.multipdf_status_bar.show(_("Creating multi-page pdf file..."))
+        self.task_manager.add_task(
+            'save_multipdf_statistical_graphs',
+            self._handle_multipdf_statistical_graphs_saved,
+            filename, self.canvas.wlevels, self.canvas.pool,
+            tuple(self.canvas.figure.get_size_inches()),
+            self.canvas.figure.dpi,
+            key='save_multipdf_statistical_graphs',
+            partial_callback=self._handle_multipdf_statistical_graphs_progress)
+        self.task_manager.run_tasks()
+
+    def cancel_multipdf_statistical_graphs(self):
+        """
+        Cancel the creation of the multipage pdf file that is in progress,
+        if any.
+
+        The creation is stopped only once the worker has actually stopped,
+        so that a new multipage pdf file cannot be created in the meantime.
+        """
+        if not self._multipdf_in_progress or self._multipdf_cancelled:
+            return
+        self._multipdf_cancelled = True
+        self.cancel_multipdf_statistical_graphs_btn.setEnabled(False)
+        self.multipdf_status_bar.show(
+            _("Cancelling the creation of the multi-page pdf file..."))
+        self.task_manager.cancel_tasks(
+            'save_multipdf_statistical_graphs',
+            self._handle_multipdf_statistical_graphs_cancelled)
+
+    def _stop_multipdf_statistical_graphs(self):
+        """
+        Update the gui when the creation of the multipage pdf file is
+        completed or cancelled.
+        """
+        self._multipdf_in_progress = False
+        self._multipdf_cancelled = False
+        self.cancel_multipdf_statistical_graphs_btn.setEnabled(False)
+        self._update_buttons_state()
+
+    def _handle_multipdf_statistical_graphs_progress(self, progress):
+        """
+        Handle when the progress of the creation of the multipage pdf file
+        is updated.
+        """
+        self.multipdf_status_bar.set_label(
+            _("Creating multi-page pdf file...") +
+            ' {:0.1f}%'.format(progress))
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            self.canvas.save_multipdf_statistical_graphs(filename)
-            QApplication.restoreOverrideCursor()
+    def _handle_multipdf_statistical_graphs_cancelled(self):
+        """
+        Handle when the creation of the multipage pdf file was cancelled
+        and the worker has stopped.
+        """
+        self._stop_multipdf_statistical_graphs()
+        self.multipdf_status_bar.show_fail_icon(
+            _("The creation of the multi-page pdf file was cancelled."))
+
+    def _handle_multipdf_statistical_graphs_saved(self, filename):
+        """
+        Handle when the multipage pdf file containing the statistical
+        hydrographs was created.
+        """
+        self._stop_multipdf_statistical_graphs()
+        if filename is None:
+            self.multipdf_status_bar.show_fail_icon(
+                _("Failed to create the multi-page pdf file."))
+        else:
+            self.multipdf_status_bar.show_sucess_icon(
+                _("The multi-page pdf file was created successfully."))
+        self.sig_multipdf_statistical_graphs_saved.emit(filename)
 
     def _handle_current_yearmonth_changed(self):
         """
@@ -351,6 +505,74 @@ class SatisticalHydrographWidget(QMainWindow):
 
         self._handle_current_yearmonth_changed()
 
+    def closeEvent(self, event):
+        """
+        Override Qt method to cancel the creation of the multipage pdf
+        file in progress, if any, when this widget is closed.
+        """
+        self.cancel_multipdf_statistical_graphs()
+        super().closeEvent(event)
+
+
+class SatisticalHydrographWorker(WorkerBase):
+    """
+    A worker to create the multipage pdf files containing the statistical
+    hydrographs without blocking the gui.
+    """
+
+    def _save_multipdf_statistical_graphs(self, filename, wlevels, pool,
+                                          figsize, dpi):
+        """
+        Create a multipage pdf file containing the statistical hydrographs
+        (one per page) for each year where data are available.
+
+        The monthly percentiles are computed once here and shared with
+        processes that render the pages by chunks of consecutive years.
+        The chunks are then assembled in order in the multipage pdf file.
+        """
+        wlevels = wlevels.dropna()
+        years = np.unique(wlevels.index.year).tolist()
+        chunks = [years[i:i + MULTIPDF_PAGES_PER_CHUNK] for
+                  i in range(0, len(years), MULTIPDF_PAGES_PER_CHUNK)]
+        monthly_percentiles = compute_monthly_percentiles_for_pools(
+            wlevels, PERCENTILES_Q)
+
+        print("Creating a multipage pdf file of the statistical "
+              "hydrographs for {} years...".format(len(years)))
+        tempdir = tempfile.mkdtemp()
+        process_pool = WorkerProcessPool(
+            self, lambda context, future: future.result(),
+            max(1, min(MULTIPDF_PROCESSES_COUNT, len(chunks))), len(chunks))
+        try:
+            chunk_filenames = [
+                osp.join(tempdir, 'pages_{}.pdf'.format(i)) for
+                i in range(len(chunks))]
+            for chunk_filename, chunk in zip(chunk_filenames, chunks):
+                process_pool.submit(
+                    None, render_statistical_hydrographs, chunk_filename,
+                    wlevels, chunk, pool, monthly_percentiles, figsize, dpi)
+            if not process_pool.join():
+                print("Creating the multipage pdf file was cancelled.")
+                return None,
+
+            writer = PdfWriter()
+            for chunk_filename in chunk_filenames:
+                writer.append(chunk_filename)
+            with open(filename, 'wb') as f:
+                writer.write(f)
+        except Exception as error:
+            print("Failed to create the multipage pdf file because of the "
+                  "following error:")
+            print(type(error).__name__, end=': ')
+            print(error)
+            return None,
+        finally:
+            process_pool.shutdown()
+            shutil.rmtree(tempdir, ignore_errors=True)
+
+        print("Multipage pdf file created successfully.")
+        return filename,
+
 
 class SatisticalHydrographCanvas(FigureCanvasQTAgg):
     """
@@ -390,21 +612,6 @@ class SatisticalHydrographCanvas(FigureCanvasQTAgg):
         percentiles[_('nyears')] = self.figure._nyear.astype(str)
         percentiles.to_clipboard(excel=True)
 
-    def save_multipdf_statistical_graphs(self, filename):
-        """
-        Create a multipage pdf file containing the statistical hydrographs
-        (one per page) for each year where data are available.
-        """
-        years = np.unique(self.wlevels.index.year).tolist()
-        with PdfPages(filename) as pdf:
-            for year in years:
-                self.figure.plot_statistical_hydrograph(
-                    self.wlevels, year, 12, self.pool)
-                pdf.savefig(self.figure)
-
-        # Restore figure initial state.
-        self._update_figure()
-
     def set_pool(self, pool):
         """
         Set the pooling mode to use when calculating monthly
@@ -463,20 +670,9 @@ class SatisticalHydrographFigure(Figure):
         self.leghandles = []
         self.leglabels = []
         self.percentile_bars = {}
-        self.percentile_qpairs = [
-            (100, 90), (90, 75), (75, 25), (25, 10), (10, 0)]
-        self.percentile_labels = {
-            (100, 90): '>90',
-            (90, 75): '76-90',
-            (75, 25): '25-75',
-            (25, 10): '10-24',
-            (10, 0): '<10'}
-        self.percentile_rbg = {
-            (100, 90): "#ccebc5",
-            (90, 75): "#a8ddb5",
-            (75, 25): "#7bccc4",
-            (25, 10): "#4eb3d3",
-            (10, 0): "#2b8cbe"}
+        self.percentile_qpairs = PERCENTILE_QPAIRS
+        self.percentile_labels = PERCENTILE_LABELS
+        self.percentile_rbg = PERCENTILE_RGB
 
         self._percentiles = None
         self._nyear = None
@@ -654,13 +850,8 @@ class SatisticalHydrographFigure(Figure):
                 monthrange(curyear, mth_idx[-1] + 1)[-1])
 
         # Generate the percentiles.
-        q = list(set(
-            [50] +
-            [item for sublist in self.percentile_qpairs for item in sublist]
-            ))
-
-        percentiles, nyear = compute_monthly_percentiles(
-            wlevels, q, pool=pool)
+        percentiles, nyear = get_monthly_percentiles(
+            wlevels, PERCENTILES_Q, pool=pool)
         self._percentiles = percentiles.iloc[mth_idx]
         self._nyear = nyear[mth_idx]
         self._mth_idx = mth_idx
@@ -813,6 +1004,41 @@ def compute_monthly_percentiles(tseries, q, pool='all'):
         of year of data used to compute each monthly value is also provided
         in the column named 'nyear'
     """
+    return compute_monthly_percentiles_for_pools(tseries, q, [pool])[pool]
+
+
+def compute_monthly_percentiles_for_pools(tseries, q, pools=POOLS):
+    """
+    Compute the monthly percentiles of a time series for each of the
+    given pooling methods at once.
+
+    The data are grouped by year and month only once and the percentiles
+    of all months are computed in a single grouped quantile operation for
+    each pooling method.
+
+    Parameters
+    ----------
+    tseries: array_like
+        Pandas time series.
+    q: array_like
+        Percentile or sequence of percentiles to compute, which must
+        be between 0 and 100 inclusive.
+    pools: list of str
+        The methods used to compute the monthly percentiles, which must
+        be in POOLS.
+
+    Returns
+    -------
+    monthly_percentiles : dict
+        A dictionary containing, for each pooling method, the dataframe
+        of the computed monthly percentiles and the number of year of data
+        used to compute each monthly value, as returned by
+        compute_monthly_percentiles.
+    """
+    for pool in pools:
+        if pool not in POOLS:
+            raise ValueError("'{}' is not a valid pool.".format(pool))
+    q = list(q)
     nyear = np.array([0] * 12)
     percentiles = pd.DataFrame(
         data=np.nan,
@@ -820,47 +1046,338 @@ def compute_monthly_percentiles(tseries, q, pool='all'):
         columns=q)
     percentiles.index.name = 'month'
     if tseries.empty:
-        return percentiles, nyear
-
-    # Pool the data for each month separately.
-    monthly_data_pools = [[]] * 12
-    if pool == 'all':
-        # When pool is 'all', we use all the data available to compute the
-        # monthly statistics.
-        for i in range(12):
-            data = tseries.loc[tseries.index.month == i + 1]
-            if not data.empty:
-                monthly_data_pools[i] = data.values
-                nyear[i] = len(np.unique(data.index.year))
-    else:
-        group = tseries.groupby([tseries.index.year, tseries.index.month])
-        if pool == 'min_max_median':
-            # When pool is 'min_max_median', we compute the montly
-            # statistics from the minimum, maximum and median value of
-            # of each month of each year.
-            monthly_stats = pd.concat(
-                [group.min(), group.median(), group.max()], axis=1)
+        return {pool: (percentiles.copy(), nyear.copy()) for pool in pools}
+    if isinstance(tseries, pd.DataFrame):
+        tseries = tseries.iloc[:, 0]
+
+    # The values are sorted only once here, so that they only need to be
+    # sorted by group afterwards.
+    values = tseries.values.astype(float)
+    order = np.argsort(values)
+    order = order[~np.isnan(values[order])]
+    values = values[order]
+    years = tseries.index.year.values[order]
+    months = tseries.index.month.values[order] - 1
+    qs = np.array(q) / 100
+
+    pooled_percentiles, nyear[:] = _compute_pooled_percentiles(
+        months, years - years.min(), values, 12, qs, pools)
+    monthly_percentiles = {}
+    for pool in pools:
+        pool_percentiles = percentiles.copy()
+        pool_percentiles.iloc[:, :] = pooled_percentiles[pool]
+        monthly_percentiles[pool] = (
+            pool_percentiles.round(5), nyear.copy())
+
+    return monthly_percentiles
+
+
+def classify_monthly_wlevels(wlevels, year, month, pool='min_max_median'):
+    """
+    Classify the water level of many monitoring stations for the given
+    year and month in the percentile classes of the historical water
+    levels of that month, as shown in the statistical hydrographs.
+
+    The percentiles of all the stations are computed at once and the
+    water level of a station for the given year and month is the mean
+    of its values for that month.
+
+    Parameters
+    ----------
+    wlevels : DataFrame
+        A pandas dataframe in long format, with the columns
+        'sampling_feature_uuid', 'datetime' and DataType.WaterLevel,
+        containing the formatted water level data of the stations.
+    year : int
+        The year for which the water levels are classified.
+    month : int
+        The month for which the water levels are classified, where 1
+        corresponds to January and 12 to december.
+    pool: str
+        The method used to compute the monthly percentiles.
+
+    Returns
+    -------
+    classes : DataFrame
+        A pandas dataframe indexed by the sampling feature uuid of the
+        stations with the water level of the stations for the given year
+        and month in column 'wlevel', the number of year of data used to
+        compute the percentiles in column 'nyear', the percentiles in
+        columns 'p0' to 'p100' and the percentile class of the water
+        level in column 'percentile_class'.
+    """
+    if pool not in POOLS:
+        raise ValueError("'{}' is not a valid pool.".format(pool))
+    columns = (['wlevel', 'nyear'] +
+               ['p{}'.format(q) for q in PERCENTILES_Q] +
+               ['percentile_class'])
+
+    datetimes = pd.DatetimeIndex(wlevels['datetime'])
+    is_month = (
+        (datetimes.month == month) &
+        wlevels[DataType.WaterLevel].notnull().values)
+    values = wlevels[DataType.WaterLevel].values[is_month].astype(float)
+    codes, stations = pd.factorize(
+        wlevels['sampling_feature_uuid'].values[is_month])
+    years = datetimes.year.values[is_month]
+    if len(values) == 0:
+        return pd.DataFrame([], columns=columns)
+
+    # The values are sorted only once here, so that they only need to be
+    # sorted by group afterwards.
+    order = np.argsort(values)
+    values, codes, years = values[order], codes[order], years[order]
+
+    pooled_percentiles, nyear = _compute_pooled_percentiles(
+        codes, years - years.min(), values, len(stations),
+        np.array(PERCENTILES_Q) / 100, [pool])
+    percentiles = pooled_percentiles[pool].round(5)
+
+    # Compute the mean water level of the stations for the given year.
+    is_year = years == year
+    counts = np.bincount(codes[is_year], minlength=len(stations))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        current = np.bincount(
+            codes[is_year], weights=values[is_year],
+            minlength=len(stations)) / counts
+
+    classes = pd.DataFrame(
+        percentiles, index=stations,
+        columns=['p{}'.format(q) for q in PERCENTILES_Q])
+    classes.insert(0, 'wlevel', current)
+    classes.insert(1, 'nyear', nyear)
+    classes['percentile_class'] = np.select(
+        [current < classes['p10'], current < classes['p25'],
+         current <= classes['p75'], current <= classes['p90'],
+         current > classes['p90']],
+        [PERCENTILE_LABELS[(10, 0)], PERCENTILE_LABELS[(25, 10)],
+         PERCENTILE_LABELS[(75, 25)], PERCENTILE_LABELS[(90, 75)],
+         PERCENTILE_LABELS[(100, 90)]],
+        default=None)
+    classes.index.name = 'sampling_feature_uuid'
+    return classes
+
+
+def _compute_pooled_percentiles(codes, periods, values, ngroups, qs,
+                                pools=POOLS):
+    """
+    Compute the percentiles of the values of each group for the given
+    pooling methods, where the values of each group are first pooled by
+    period when the pooling method is not 'all'.
+
+    Parameters
+    ----------
+    codes : ndarray
+        The integer code of the group of each value, between 0 and
+        ngroups - 1, for example the month of the values.
+    periods : ndarray
+        The integer index of the period of each value, starting at 0,
+        for example the year of the values.
+    values : ndarray
+        The values for which to compute the percentiles, sorted in
+        ascending order.
+    ngroups : int
+        The number of groups.
+    qs : array_like
+        The quantiles to compute, between 0 and 1 inclusive.
+    pools: list of str
+        The methods used to pool the values of each period.
+
+    Returns
+    -------
+    percentiles : dict
+        A dictionary containing, for each pooling method, a 2D array of
+        shape (ngroups, len(qs)) with the percentiles of each group.
+    nperiods : ndarray
+        The number of periods with data in each group.
+    """
+    # Group the data by period and compute, in a single pass, the minimum,
+    # median, maximum and mean value of each group of each period.
+    period_codes = periods * ngroups + codes
+    period_counts = np.bincount(period_codes)
+    period_has_data = period_counts > 0
+    period_groups = (
+        np.arange(len(period_counts)) % ngroups)[period_has_data]
+    period_stats = _compute_grouped_percentiles(
+        period_codes, values, len(period_counts), [0, 0.5, 1],
+        is_sorted=True)[period_has_data]
+    period_means = (
+        np.bincount(period_codes, weights=values)[period_has_data] /
+        period_counts[period_has_data])
+
+    percentiles = {}
+    for pool in pools:
+        if pool == 'all':
+            # When pool is 'all', we use all the data available to compute
+            # the statistics.
+            pool_codes, pool_values = codes, values
+        elif pool == 'min_max_median':
+            # When pool is 'min_max_median', we compute the statistics
+            # from the minimum, maximum and median value of each period.
+            pool_codes = np.repeat(period_groups, 3)
+            pool_values = period_stats.flatten()
         elif pool == 'median':
-            # When pool is 'median', we compute the montly statistics
-            # from the median value of each month of each year.
-            monthly_stats = group.median()
+            # When pool is 'median', we compute the statistics from the
+            # median value of each period.
+            pool_codes, pool_values = period_groups, period_stats[:, 1]
         elif pool == 'mean':
-            # When pool is 'mean', we compute the montly statistics
-            # from the mean value of each month of each year.
-            monthly_stats = group.mean()
-        for i in range(12):
-            data = (monthly_stats
-                    [monthly_stats.index.get_level_values(1) == i + 1])
-            monthly_data_pools[i] = data.values.flatten()
-            nyear[i] = len(data)
+            # When pool is 'mean', we compute the statistics from the
+            # mean value of each period.
+            pool_codes, pool_values = period_groups, period_means
+        percentiles[pool] = _compute_grouped_percentiles(
+            pool_codes, pool_values, ngroups, qs, is_sorted=(pool == 'all'))
+    return percentiles, np.bincount(period_groups, minlength=ngroups)
+
+
+def _compute_grouped_percentiles(codes, values, ngroups, qs,
+                                 is_sorted=False):
+    """
+    Compute the given quantiles of the values of each group at once.
 
-    for i in range(12):
-        month = i + 1
-        if len(monthly_data_pools[i]):
-            percentiles.loc[month] = np.percentile(monthly_data_pools[i], q)
-    percentiles = percentiles.round(5)
+    The values are sorted by group and by value once and the quantiles are
+    interpolated linearly, exactly as numpy.percentile does.
 
-    return percentiles, nyear
+    Parameters
+    ----------
+    codes : ndarray
+        The integer code of the group of each value, between 0 and
+        ngroups - 1.
+    values : ndarray
+        The values for which to compute the quantiles.
+    ngroups : int
+        The number of groups.
+    qs : array_like
+        The quantiles to compute, between 0 and 1 inclusive.
+    is_sorted : bool
+        Whether the values are already sorted in ascending order, in which
+        case they only need to be sorted by group.
+
+    Returns
+    -------
+    quantiles : ndarray
+        A 2D array of shape (ngroups, len(qs)) with the quantiles of each
+        group, which are NaN for the groups without any value.
+    """
+    qs = np.asarray(qs, dtype=float)
+    quantiles = np.full((ngroups, len(qs)), np.nan)
+    if len(values) == 0:
+        return quantiles
+
+    if not is_sorted:
+        order = np.argsort(values)
+        codes, values = codes[order], values[order]
+    # A stable sort by group code keeps the values of each group sorted.
+    # Numpy uses a much faster radix sort for the small integer types.
+    if ngroups <= np.iinfo(np.int16).max:
+        codes = codes.astype(np.int16)
+    sorted_values = values[np.argsort(codes, kind='stable')]
+    counts = np.bincount(codes, minlength=ngroups)
+    starts = np.cumsum(counts) - counts
+    has_data = counts > 0
+    counts = counts[has_data, None]
+    starts = starts[has_data, None]
+
+    virtual_indexes = qs[None, :] * (counts - 1)
+    previous_indexes = np.floor(virtual_indexes).astype(int)
+    next_indexes = np.minimum(previous_indexes + 1, counts - 1)
+    gamma = virtual_indexes - previous_indexes
+    previous = sorted_values[starts + previous_indexes]
+    following = sorted_values[starts + next_indexes]
+    diff = following - previous
+    quantiles[has_data] = np.where(
+        gamma >= 0.5,
+        following - diff * (1 - gamma),
+        previous + diff * gamma)
+    return quantiles
+
+
+def get_tseries_fingerprint(tseries):
+    """
+    Return a fingerprint of the values and index of a time series that
+    can be used to memoize the results of computations on this time series.
+    """
+    fingerprint = hashlib.sha1()
+    fingerprint.update(tseries.index.values.tobytes())
+    fingerprint.update(np.ascontiguousarray(tseries.values).tobytes())
+    return (tseries.shape, fingerprint.hexdigest())
+
+
+def get_monthly_percentiles(tseries, q, pool='all'):
+    """
+    Return the monthly percentiles of a time series for the given pooling
+    method, as returned by compute_monthly_percentiles.
+
+    The percentiles are computed for all the pooling methods at once and
+    memoized per time series fingerprint, so that changing the year, the
+    month or the pooling method of a statistical hydrograph does not
+    require to compute them again.
+    """
+    key = (get_tseries_fingerprint(tseries), tuple(q))
+    try:
+        monthly_percentiles = _MONTHLY_PERCENTILES_CACHE[key]
+    except KeyError:
+        monthly_percentiles = cache_monthly_percentiles(
+            tseries, q, compute_monthly_percentiles_for_pools(tseries, q))
+    else:
+        _MONTHLY_PERCENTILES_CACHE.move_to_end(key)
+    percentiles, nyear = monthly_percentiles[pool]
+    return percentiles.copy(), nyear.copy()
+
+
+def cache_monthly_percentiles(tseries, q, monthly_percentiles):
+    """
+    Add to the cache of get_monthly_percentiles the monthly percentiles
+    of a time series, as returned by compute_monthly_percentiles_for_pools,
+    and return them.
+    """
+    key = (get_tseries_fingerprint(tseries), tuple(q))
+    _MONTHLY_PERCENTILES_CACHE[key] = monthly_percentiles
+    while len(_MONTHLY_PERCENTILES_CACHE) > MONTHLY_PERCENTILES_CACHE_SIZE:
+        _MONTHLY_PERCENTILES_CACHE.popitem(last=False)
+    return monthly_percentiles
+
+
+def get_render_figure(figsize, dpi):
+    """
+    Return a statistical hydrograph figure of the given size and
+    resolution that is not attached to a gui canvas.
+
+    The figure is created only once per process and is reused afterwards,
+    so that its artists are not setup again for each page rendered.
+    """
+    key = (tuple(figsize), dpi)
+    if _RENDER_FIGURE['key'] != key:
+        figure = SatisticalHydrographFigure(
+            figsize=figsize, dpi=dpi, facecolor='white')
+        FigureCanvasAgg(figure)
+        _RENDER_FIGURE['key'] = key
+        _RENDER_FIGURE['figure'] = figure
+    return _RENDER_FIGURE['figure']
+
+
+def render_statistical_hydrographs(filename, wlevels, years, pool,
+                                   monthly_percentiles, figsize, dpi):
+    """
+    Render the statistical hydrographs of the given years in a multipage
+    pdf file, one per page.
+
+    This is executed in separate processes when creating the multipage
+    pdf file of a statistical hydrograph, so all arguments must remain
+    picklable.
+
+    Returns
+    -------
+    nbr_pages : int
+        The number of pages that were rendered in the pdf file.
+    """
+    figure = get_render_figure(figsize, dpi)
+    cache_monthly_percentiles(
+        wlevels.dropna(), PERCENTILES_Q, monthly_percentiles)
+    with PdfPages(filename) as pdf:
+        for year in years:
+            figure.plot_statistical_hydrograph(wlevels, year, 12, pool)
+            pdf.savefig(figure)
+    return len(years)
 
 
 if __name__ == "__main__":
@@ -876,8 +1393,9 @@ if __name__ == "__main__":
 
     sampling_feature_uuid = (
         accessor._get_sampling_feature_uuid_from_name('01070001'))
+    # Only the daily readings are needed to compute the percentiles.
     readings_data = accessor.get_timeseries_for_obs_well(
-        sampling_feature_uuid, [DataType.WaterLevel])
+        sampling_feature_uuid, [DataType.WaterLevel], freq='D', agg='first')
 
     repere_data = accessor.get('repere_data')
     repere_data = (
@@ -18,11 +18,13 @@ import os.path as osp
 from io import BytesIO
 
 # ---- Third party imports
+import numpy as np
 import pandas as pd
 from PIL import Image
 from qtpy.QtCore import Qt
 from qtpy.QtWidgets import QApplication, QFileDialog, QMessageBox
 from xlsxwriter.exceptions import FileCreateError
+import xlsxwriter
 
 # ---- Local imports
 from sardes.api.timeseries import DataType
@@ -135,32 +137,16 @@ def _save_reading_data_to_xlsx(filename, sheetname, formatted_data,
     if not filename.endswith('.xlsx'):
         filename += '.xlsx'
 
-    data_columns = []
-    formatted_data_columns = [_("Date of reading")]
-    if DataType.WaterLevel in formatted_data.columns:
-        data_columns.append(DataType.WaterLevel)
-        formatted_data_columns.append(_("Water level altitude (m MSL)"))
-    if DataType.WaterTemp in formatted_data.columns:
-        data_columns.append(DataType.WaterTemp)
-        formatted_data_columns.append(_("Water temperature (°C)"))
-    if DataType.WaterEC in formatted_data.columns:
-        data_columns.append(DataType.WaterEC)
-        formatted_data_columns.append(
-            _("Water electrical conductivity (µS/cm)"))
-
-    formatted_datetimes = formatted_data['datetime'].dt.to_pydatetime()
-    formatted_data = formatted_data[data_columns]
-
-    # Write the numerical data to the file with pandas.
-    writer = pd.ExcelWriter(filename, engine='xlsxwriter')
-    formatted_data.to_excel(
-        writer, sheet_name=sheetname, startrow=7, startcol=1,
-        header=False, index=False)
+    data_columns, formatted_data_columns = get_reading_data_columns(
+        formatted_data)
 
-    workbook = writer.book
-    worksheet = writer.sheets[sheetname]
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+    worksheet = workbook.add_worksheet(sheetname)
 
     # Setup the columns format and width.
+    #
+    # Note that this must be done before writing any data, since the
+    # format of the columns is applied to the cells when they are written.
     date_format = workbook.add_format({
         'num_format': 'yyyy-mm-dd', 'font_name': font_name})
     num_format = workbook.add_format({
@@ -169,21 +155,6 @@ def _save_reading_data_to_xlsx(filename, sheetname, formatted_data,
     for i in range(max(len(data_columns), 2)):
         worksheet.set_column(i+1, i+1, 36.75, num_format)
 
-    # Write the datetime data.
-    #
-    # We do not use pandas to write the dates to Excel because it is impossible
-    # to set both the format of the dates and the desired cell formatting
-    # with this method.
-    for row, date_time in enumerate(formatted_datetimes):
-        worksheet.write_datetime(row + 7, 0, date_time)
-
-    # Write the data header.
-    data_header_style = workbook.add_format({
-        'font_name': font_name, 'font_size': 11,
-        'align': 'right', 'valign': 'bottom'})
-    for i, column in enumerate(formatted_data_columns):
-        worksheet.write(6, i, column, data_header_style)
-
     # Setup the height of the rows.
     worksheet.set_default_row(15)
     header_row_height = 22
@@ -270,6 +241,13 @@ def _save_reading_data_to_xlsx(filename, sheetname, formatted_data,
                              'bold': True, 'bottom': 6, 'right': 6,
                              'align': 'center', 'valign': 'vcenter'}))
 
+    # Write the data header.
+    data_header_style = workbook.add_format({
+        'font_name': font_name, 'font_size': 11,
+        'align': 'right', 'valign': 'bottom'})
+    for i, column in enumerate(formatted_data_columns):
+        worksheet.write(6, i, column, data_header_style)
+
     # Add the logo.
     if logo_filename is not None:
         img = Image.open(logo_filename)
@@ -294,7 +272,61 @@ def _save_reading_data_to_xlsx(filename, sheetname, formatted_data,
                      'x_offset': 3, 'y_offset': 3}
             )
 
+    # Write the data.
+    #
+    # In constant memory mode, the rows are flushed to the file as soon as
+    # a subsequent row is written, so the data must be written row by row
+    # after everything else.
+    data_rows = iter_xlsx_reading_rows(formatted_data, data_columns)
+    for row, row_values in enumerate(data_rows, start=7):
+        worksheet.write_row(row, 0, row_values)
+
     try:
-        writer.save()
+        workbook.close()
     except FileCreateError:
         raise PermissionError
+
+
+def get_reading_data_columns(formatted_data):
+    """
+    Return the data type columns of formatted_data that are published and
+    the labels of the published columns, including that of the
+    datetime column.
+    """
+    data_columns = []
+    formatted_data_columns = [_("Date of reading")]
+    if DataType.WaterLevel in formatted_data.columns:
+        data_columns.append(DataType.WaterLevel)
+        formatted_data_columns.append(_("Water level altitude (m MSL)"))
+    if DataType.WaterTemp in formatted_data.columns:
+        data_columns.append(DataType.WaterTemp)
+        formatted_data_columns.append(_("Water temperature (°C)"))
+    if DataType.WaterEC in formatted_data.columns:
+        data_columns.append(DataType.WaterEC)
+        formatted_data_columns.append(
+            _("Water electrical conductivity (µS/cm)"))
+    return data_columns, formatted_data_columns
+
+
+def iter_xlsx_reading_rows(formatted_data, data_columns, chunksize=10000):
+    """
+    Yield the datetimes and the values of the specified data columns of
+    formatted_data as rows that can be written directly to an
+    Excel worksheet.
+
+    The datetimes are converted to Excel serial dates, in days since
+    1899-12-30, and missing values are converted to None, so that no cell
+    is written for them. The rows are prepared by chunks, so that the
+    whole dataset is never held in memory as Python objects at once.
+    """
+    excel_dates = (
+        (formatted_data['datetime'].values - np.datetime64('1899-12-30')) /
+        np.timedelta64(1, 'D'))
+    values = np.column_stack(
+        [excel_dates] +
+        [formatted_data[column].values.astype(float) for
+         column in data_columns])
+    for i in range(0, len(values), chunksize):
+        chunk = values[i:i + chunksize].astype(object)
+        chunk[pd.isnull(chunk)] = None
+        yield from chunk.tolist()
@@ -7,4 +7,59 @@
 # Licensed under the terms of the GNU General Public License.
 # -----------------------------------------------------------------------------
 
+# ---- Standard imports
+from datetime import datetime
+
+# ---- Third party imports
+from numpy import nan
+import pytest
+import pandas as pd
+
+# ---- Local imports
+from sardes.api.timeseries import DataType
 from sardes.database.accessors.tests.conftest import *
+
+
+# =============================================================================
+# ---- Fixtures
+# =============================================================================
+@pytest.fixture
+def readings_source_data():
+    readings_source_data = pd.DataFrame(
+        data=[
+            ['2005-11-01 01:00:00', '64640', 1.1, -1.1,   nan,  3.16, 1],
+            ['2005-11-01 13:00:00', '64640', 1.2, -1.2,   nan,  3.16, 1],
+            ['2005-11-03 01:00:00', '64640', nan, -2.1,   nan,  3.16, 1],
+            ['2005-11-03 13:00:00', '64640', nan,  nan,   nan,  3.16, 1],
+            ['2005-11-04 01:00:00', '64640', 5.1, -5.1, 100.9,  3.16, 4],
+            ['2005-11-04 13:00:00', '64640', 5.2, -5.2, 100.10, 3.16, 5],
+
+            ['2005-11-03 00:30:00', '20640', 3.1, -3.1, 100.5,  9.25, 2],
+            ['2005-11-03 12:30:00', '20640', 3.2, -3.2, 100.6,  9.25, 2],
+
+            ['2005-11-03 01:00:00', '78901', 4.1,  nan, 100.7,  7.16, 3],
+            ['2005-11-03 13:00:00', '78901', 4.2, -4.2, 100.8,  7.16, 3]],
+        columns=[
+            'datetime', 'sonde_id', DataType.WaterLevel,
+            DataType.WaterTemp, DataType.WaterEC, 'install_depth', 'obs_id'])
+    readings_source_data['datetime'] = pd.to_datetime(
+        readings_source_data['datetime'], format="%Y-%m-%d %H:%M:%S")
+    return readings_source_data
+
+
+@pytest.fixture
+def readings_repere_data():
+    return pd.DataFrame(
+        [[105, 5, True, datetime(2005, 11, 1, 1), None]],
+        columns=['top_casing_alt', 'casing_length', 'is_alt_geodesic',
+                 'start_date', 'end_date']
+        )
+
+
+@pytest.fixture
+def readings_obs_well_data():
+    return pd.Series(
+        {'municipality': 'municipality_test',
+         'obs_well_id': '0123456',
+         'latitude': 45,
+         'longitude': -73.34679})
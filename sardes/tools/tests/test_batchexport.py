@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Tests for the BatchReadingsExportTool.
+"""
+
+# ---- Standard imports
+import os
+import os.path as osp
+os.environ['SARDES_PYTEST'] = 'True'
+
+# ---- Third party imports
+import pytest
+import pandas as pd
+
+# ---- Local imports
+from sardes.tools.batchexport import (
+    export_station_readings, is_parquet_supported)
+
+
+# =============================================================================
+# ---- Tests
+# =============================================================================
+@pytest.mark.parametrize('file_format', ['xlsx', 'csv', 'parquet'])
+def test_export_station_readings(tmp_path, readings_source_data,
+                                 readings_repere_data, readings_obs_well_data,
+                                 file_format):
+    """
+    Test that exporting the readings data of a monitoring station is
+    working as expected for all the supported file formats.
+    """
+    if file_format == 'parquet' and not is_parquet_supported():
+        pytest.skip("No engine is available to write Parquet files.")
+
+    savepath = osp.join(tmp_path, 'readings_0123456.' + file_format)
+    nbr_values = export_station_readings(
+        savepath, file_format, readings_source_data, readings_repere_data,
+        readings_obs_well_data, ground_altitude=100, is_alt_geodesic=True)
+    assert nbr_values == 3
+    assert osp.exists(savepath)
+
+    if file_format == 'xlsx':
+        exported_data = pd.read_excel(savepath, dtype='str', header=None)
+        assert exported_data.iat[6, 0] == 'Date of reading'
+        assert exported_data.iat[9, 0] == '2005-11-04 00:00:00'
+        assert exported_data.iat[9, 1] == '99.9'
+        return
+
+    if file_format == 'csv':
+        exported_data = pd.read_csv(savepath, encoding='utf-8-sig')
+        assert exported_data.iat[2, 0] == '2005-11-04'
+    else:
+        exported_data = pd.read_parquet(savepath)
+        assert exported_data.iat[2, 0] == pd.Timestamp('2005-11-04')
+    assert list(exported_data.columns) == [
+        'Date of reading', 'Water level altitude (m MSL)',
+        'Water temperature (°C)', 'Water electrical conductivity (µS/cm)']
+    assert len(exported_data) == 3
+    assert exported_data.iat[2, 1] == pytest.approx(99.9)
+    assert exported_data.iat[2, 2] == pytest.approx(-5.1)
+    assert exported_data.iat[2, 3] == pytest.approx(100.9)
+
+
+def test_export_station_readings_bad_format(
+        tmp_path, readings_source_data, readings_repere_data,
+        readings_obs_well_data):
+    """
+    Test that exporting readings data to an unsupported file format
+    raises an error.
+    """
+    with pytest.raises(ValueError):
+        export_station_readings(
+            osp.join(tmp_path, 'readings_0123456.txt'), 'txt',
+            readings_source_data, readings_repere_data, readings_obs_well_data,
+            ground_altitude=100, is_alt_geodesic=True)
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', __file__, '-v', '-rw'])
@@ -12,14 +12,17 @@ Tests for the HydrographTool.
 """
 
 # ---- Standard imports
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import os.path as osp
+import re
 from unittest.mock import Mock
 os.environ['SARDES_PYTEST'] = 'True'
 
 # ---- Third party imports
+import numpy as np
 from numpy import nan
+from numpy.testing import assert_array_equal
 import pytest
 import pandas as pd
 from qtpy.QtWidgets import QToolBar
@@ -29,7 +32,8 @@ from sardes import __rootdir__
 from sardes.api.timeseries import DataType
 from sardes.database.accessors.accessor_helpers import create_empty_readings
 from sardes.tools.hydrographs import (
-    HydrographTool, HydrographCanvas, QFileDialog)
+    HydrographTool, HydrographCanvas, QFileDialog, insert_gap_breaks,
+    get_hydrograph_canvas, save_hydrographs_to_pdf)
 from sardes.utils.tests.test_data_operations import format_reading_data
 
 
@@ -120,12 +124,20 @@ def test_create_hydrograph(tmp_path, source_data, repere_data, obs_well_data,
     # Test that it is working when no corporate logo is available.
     mocker.patch('sardes.config.ospath.get_documents_logo_filename',
                  return_value=None)
-    HydrographCanvas(
+    hydrograph = HydrographCanvas(
         format_reading_data(source_data, repere_data),
         obs_well_data,
         ground_altitude,
         is_alt_geodesic)
 
+    # Assert that a single line is drawn for each category of data.
+    # All readings have a sonde id, so that the first line contains
+    # them all, with a break at each of the 3 gaps of more than one day.
+    lines = hydrograph.figure.axes[0].lines
+    assert len(lines) == 3
+    assert np.isnan(lines[0].get_ydata()).sum() == 3
+    assert len(lines[1].get_ydata()) == len(lines[2].get_ydata()) == 0
+
     # Test that it is working when a corporate logo is available.
     company_logo_filename = osp.join(
         __rootdir__, 'ressources', 'icons', 'sardes.png')
@@ -138,6 +150,92 @@ def test_create_hydrograph(tmp_path, source_data, repere_data, obs_well_data,
         is_alt_geodesic)
 
 
+def test_insert_gap_breaks():
+    """
+    Test that breaks are inserted as expected in the data where the time
+    between consecutive readings is greater than the maximum gap.
+    """
+    datetimes = pd.to_datetime([
+        '2005-11-01', '2005-11-02', '2005-11-04', '2005-11-05',
+        '2005-11-06', '2005-11-08']).values
+    values = [1, 2, 3, 4, 5, 6]
+
+    new_datetimes, new_values = insert_gap_breaks(
+        datetimes, values, max_gap=timedelta(1))
+    assert list(new_datetimes) == list(pd.to_datetime([
+        '2005-11-01', '2005-11-02', '2005-11-02', '2005-11-04',
+        '2005-11-05', '2005-11-06', '2005-11-06', '2005-11-08']).values)
+    assert_array_equal(new_values, [1, 2, nan, 3, 4, 5, nan, 6])
+
+    # Assert that no break is inserted when the gaps are not greater
+    # than the maximum gap.
+    new_datetimes, new_values = insert_gap_breaks(
+        datetimes, values, max_gap=timedelta(2))
+    assert list(new_datetimes) == list(datetimes)
+    assert_array_equal(new_values, values)
+
+    # Assert that it is working with empty data.
+    new_datetimes, new_values = insert_gap_breaks(
+        [], [], max_gap=timedelta(1))
+    assert len(new_datetimes) == len(new_values) == 0
+
+
+def test_reuse_hydrograph_canvas(source_data, repere_data, obs_well_data):
+    """
+    Test that plotting the hydrographs of many stations with the same
+    canvas gives the same results as using a new canvas for each station.
+    """
+    formatted_data = format_reading_data(source_data, repere_data)
+    other_data = formatted_data[formatted_data['datetime'] >= '2005-01-01']
+    other_well_data = pd.Series(
+        {'municipality': 'other_municipality', 'obs_well_id': '0654321'})
+
+    hydrograph = HydrographCanvas(
+        formatted_data, obs_well_data, 100, True)
+    hydrograph.set_data(other_data, other_well_data, 50.123, False)
+
+    expected = HydrographCanvas(other_data, other_well_data, 50.123, False)
+    for canvas in (hydrograph, expected):
+        canvas.draw()
+    ax, expected_ax = hydrograph.ax, expected.ax
+    assert ax.get_xlim() == expected_ax.get_xlim()
+    assert ax.get_ylim() == expected_ax.get_ylim()
+    assert list(ax.get_xticks()) == list(expected_ax.get_xticks())
+    assert list(ax.get_yticks()) == list(expected_ax.get_yticks())
+    assert_array_equal(
+        ax.get_position().bounds, expected_ax.get_position().bounds)
+    for line, expected_line in zip(ax.lines, expected_ax.lines):
+        assert_array_equal(line.get_ydata(), expected_line.get_ydata())
+    assert ([text.get_text() for text in ax.texts] ==
+            [text.get_text() for text in expected_ax.texts])
+    assert 'Station: 0654321' in ax.texts[0].get_text()
+
+    # Assert that the canvas returned by 'get_hydrograph_canvas' is
+    # only created again when the font changes.
+    canvas = get_hydrograph_canvas('Arial')
+    assert get_hydrograph_canvas('Arial') is canvas
+    assert get_hydrograph_canvas('Calibri') is not canvas
+
+
+def test_save_hydrographs_to_pdf(tmp_path, source_data, repere_data,
+                                 obs_well_data):
+    """
+    Test that saving the hydrographs of many stations in a multipage
+    pdf file is working as expected.
+    """
+    formatted_data = format_reading_data(source_data, repere_data)
+    empty_data = format_reading_data(
+        create_empty_readings([DataType.WaterLevel]), repere_data)
+    filename = osp.join(tmp_path, 'hydrographs.pdf')
+    render_times = save_hydrographs_to_pdf(filename, [
+        (formatted_data, obs_well_data, 100, True),
+        (empty_data, obs_well_data, 100, True),
+        (formatted_data.iloc[:2], obs_well_data, 100, False)])
+    assert len(render_times) == 3
+    with open(filename, 'rb') as f:
+        assert len(re.findall(rb'/Type /Page\b(?!s)', f.read())) == 3
+
+
 def test_save_hydrograph(tmp_path, hydrograph_tool, mocker):
     """
     Test that creating an saving and hydrogaph figure with the tool is working
@@ -15,13 +15,16 @@ Tests for the SaveReadingsToExcelTool.
 from datetime import datetime
 import os
 import os.path as osp
+import re
 from unittest.mock import Mock
 os.environ['SARDES_PYTEST'] = 'True'
 
 # ---- Third party imports
 import numpy as np
+from numpy.testing import assert_array_almost_equal
 import pytest
 import pandas as pd
+from pypdf import PdfReader
 from qtpy.QtCore import Qt
 from qtpy.QtWidgets import (
     QApplication, QToolBar, QFileDialog, QMessageBox, QWidget)
@@ -29,8 +32,11 @@ from qtpy.QtWidgets import (
 
 # ---- Local imports
 from sardes.api.timeseries import DataType
+import sardes.tools.hydrostats
 from sardes.tools.hydrostats import (
-    SatisticalHydrographTool, compute_monthly_percentiles, MONTHS)
+    SatisticalHydrographTool, compute_monthly_percentiles,
+    compute_monthly_percentiles_for_pools, get_monthly_percentiles,
+    classify_monthly_wlevels, MONTHS, POOLS)
 
 
 # =============================================================================
@@ -141,6 +147,126 @@ def test_compute_monthly_percentiles_if_empty(pool):
                 np.nan_to_num(expected_percentiles).tolist())
 
 
+def test_compute_monthly_percentiles_for_pools():
+    """
+    Test that computing the montly percentiles for all pooling methods at
+    once gives the same results as numpy for each pooling method.
+    """
+    random = np.random.RandomState(0)
+    index = pd.date_range('2000-01-01', '2009-12-31', freq='6H')
+    index = index[random.rand(len(index)) > 0.3]
+    tseries = pd.Series(random.rand(len(index)) * 10, index=index)
+    tseries[tseries.index.year == 2003] = np.nan
+    q = [100, 90, 75, 50, 25, 10, 0]
+
+    monthly_percentiles = compute_monthly_percentiles_for_pools(tseries, q)
+    assert list(monthly_percentiles) == list(POOLS)
+
+    tseries = tseries.dropna()
+    group = tseries.groupby([tseries.index.year, tseries.index.month])
+    expected_pools = {
+        'all': tseries,
+        'min_max_median': pd.concat(
+            [group.min(), group.median(), group.max()], axis=1),
+        'median': group.median(),
+        'mean': group.mean()
+        }
+    for pool, (percentiles, nyear) in monthly_percentiles.items():
+        assert nyear.tolist() == [9] * 12
+        expected_pool = expected_pools[pool]
+        for month in range(1, 13):
+            if pool == 'all':
+                values = expected_pool[expected_pool.index.month == month]
+            else:
+                values = expected_pool[
+                    expected_pool.index.get_level_values(1) == month]
+            assert_array_almost_equal(
+                percentiles.loc[month].values,
+                np.percentile(values.values, q), decimal=5)
+
+
+def test_get_monthly_percentiles(dataset, mocker):
+    """
+    Test that the monthly percentiles of a time series are memoized
+    for all pooling methods.
+    """
+    dataset = dataset.set_index('datetime', drop=True)
+    q = [100, 90, 75, 50, 25, 10, 0]
+    sardes.tools.hydrostats._MONTHLY_PERCENTILES_CACHE.clear()
+    compute_percentiles = mocker.spy(
+        sardes.tools.hydrostats, 'compute_monthly_percentiles_for_pools')
+
+    for pool in POOLS:
+        percentiles, nyear = get_monthly_percentiles(dataset, q, pool)
+        expected_percentiles, expected_nyear = compute_monthly_percentiles(
+            dataset, q, pool)
+        assert percentiles.equals(expected_percentiles)
+        assert nyear.tolist() == expected_nyear.tolist()
+    assert compute_percentiles.call_count == 1 + len(POOLS)
+
+    # Assert that the percentiles are computed again when the time
+    # series changes.
+    dataset.iloc[0, 0] = 1000
+    get_monthly_percentiles(dataset, q, 'all')
+    assert compute_percentiles.call_count == 2 + len(POOLS)
+
+
+@pytest.mark.parametrize('pool', ['all', 'min_max_median', 'median', 'mean'])
+def test_classify_monthly_wlevels(pool):
+    """
+    Test that classifying the water levels of many stations in the
+    percentile classes of their month is working as expected.
+    """
+    wlevels = []
+    for year in range(2000, 2011):
+        # The water levels of the first station rise from one year to the
+        # next, while those of the second station go down. The third
+        # station has no data after 2000.
+        datetimes = pd.date_range(
+            '{}-07-01'.format(year), '{}-07-31'.format(year), freq='D')
+        for station, value in [('station_1', year - 2000),
+                               ('station_2', 2010 - year),
+                               ('station_3', 5 if year == 2000 else None)]:
+            if value is None:
+                continue
+            wlevels.append(pd.DataFrame({
+                'sampling_feature_uuid': station,
+                'datetime': datetimes,
+                DataType.WaterLevel: float(value)}))
+            # The data of the other months must not be used.
+            wlevels.append(pd.DataFrame({
+                'sampling_feature_uuid': station,
+                'datetime': datetimes + pd.Timedelta(days=31),
+                DataType.WaterLevel: 100}))
+    wlevels = pd.concat(wlevels, ignore_index=True)
+
+    classes = classify_monthly_wlevels(wlevels, 2001, 7, pool)
+    assert classes.index.tolist() == ['station_1', 'station_2', 'station_3']
+    assert classes['nyear'].tolist() == [11, 11, 1]
+    assert classes['wlevel'].tolist()[:2] == [1, 9]
+    assert np.isnan(classes.at['station_3', 'wlevel'])
+    for station, station_wlevels in wlevels.groupby(
+            'sampling_feature_uuid'):
+        percentiles, nyear = compute_monthly_percentiles(
+            station_wlevels.set_index('datetime')[DataType.WaterLevel],
+            [0, 10, 25, 50, 75, 90, 100], pool)
+        assert classes.at[station, 'nyear'] == nyear[6]
+        assert_array_almost_equal(
+            classes.loc[station, ['p0', 'p10', 'p25', 'p50', 'p75', 'p90',
+                                  'p100']].values.astype(float),
+            percentiles.loc[7].values)
+    assert classes['percentile_class'].tolist() == ['10-24', '76-90', None]
+
+    classes = classify_monthly_wlevels(wlevels, 2010, 7, pool)
+    assert classes['percentile_class'].tolist() == ['>90', '<10', None]
+
+    # Assert that an empty dataframe is returned when there is no
+    # data for the month.
+    classes = classify_monthly_wlevels(wlevels, 2010, 1, pool)
+    assert classes.empty
+    assert 'percentile_class' in classes.columns
+
+
 def test_plot_statistical_hydrograph_if_empy(qtbot, hydrostats_tool):
     """
     Test that no bug occur when trying to plot the statistical.
@@ -300,7 +426,7 @@ def test_move_backward(qtbot, hydrostats_tool):
     assert toolwidget.move_backward_btn.isEnabled() is False
 
 
-def test_move_forward(qtbot, hydrostats_tool):
+def test_move_forward(qtbot, hydrostats_tool, mocker):
     """
     Test that using the buttons to move the statistical hydrograph one
     month forward is working as expected.
@@ -319,12 +445,16 @@ def test_move_forward(qtbot, hydrostats_tool):
     assert toolwidget.month() == canvas.month == 12
 
     # Move one month backward until we are at the start of the series.
+    # Assert that the monthly percentiles are not computed again.
+    compute_percentiles = mocker.spy(
+        sardes.tools.hydrostats, 'compute_monthly_percentiles_for_pools')
     assert toolwidget.move_forward_btn.isEnabled() is True
     for month in range(1, 13):
         qtbot.mouseClick(toolwidget.move_forward_btn, Qt.LeftButton)
         assert toolwidget.year() == canvas.year == 2015
         assert toolwidget.month() == canvas.month == month
     assert toolwidget.move_forward_btn.isEnabled() is False
+    assert compute_percentiles.call_count == 0
 
 
 def test_save_stat_hydrograph(hydrostats_tool, mocker, tmp_path, qtbot):
@@ -362,11 +492,56 @@ def test_multipage_pdf_creation(qtbot, hydrostats_tool, mocker, tmp_path):
     mocker.patch.object(QFileDialog, 'getSaveFileName',
                         return_value=(selectedfilename, selectedfilter))
 
+    toolwidget = hydrostats_tool.toolwidget()
     assert osp.exists(selectedfilename) is False
-    qtbot.mouseClick(
-        hydrostats_tool.toolwidget().save_multipdf_statistical_graphs_btn,
-        Qt.LeftButton)
+    with qtbot.waitSignal(toolwidget.sig_multipdf_statistical_graphs_saved,
+                          timeout=60000) as blocker:
+        qtbot.mouseClick(
+            toolwidget.save_multipdf_statistical_graphs_btn, Qt.LeftButton)
+        assert toolwidget.save_multipdf_statistical_graphs_btn.isEnabled() \
+            is False
+        assert toolwidget.cancel_multipdf_statistical_graphs_btn.isEnabled()
+    assert blocker.args == [selectedfilename]
     assert osp.exists(selectedfilename) is True
+    assert toolwidget.save_multipdf_statistical_graphs_btn.isEnabled()
+    assert not toolwidget.cancel_multipdf_statistical_graphs_btn.isEnabled()
+
+    # Assert that the pages were assembled in order, one per year.
+    reader = PdfReader(selectedfilename)
+    years = [int(re.search(r'Year (\d{4})', page.extract_text()).group(1))
+             for page in reader.pages]
+    assert years == list(range(2010, 2016))
+
+
+def test_cancel_multipage_pdf_creation(qtbot, hydrostats_tool, tmp_path):
+    """
+    Test that cancelling the creation of a multipage pdf file is working
+    as expected.
+    """
+    hydrostats_tool.trigger()
+    qtbot.waitExposed(hydrostats_tool._toolwidget)
+    toolwidget = hydrostats_tool.toolwidget()
+
+    filename = osp.join(tmp_path, 'test_multipage_hydrograph.pdf')
+    toolwidget.save_multipdf_statistical_graphs(filename)
+    assert toolwidget.cancel_multipdf_statistical_graphs_btn.isEnabled()
+
+    # Assert that a new file cannot be created until the worker has
+    # actually stopped.
+    qtbot.mouseClick(
+        toolwidget.cancel_multipdf_statistical_graphs_btn, Qt.LeftButton)
+    assert not toolwidget.cancel_multipdf_statistical_graphs_btn.isEnabled()
+    if toolwidget.task_manager._running_tasks:
+        assert not toolwidget.save_multipdf_statistical_graphs_btn.isEnabled()
+
+    # Wait for the worker to stop and assert that no file was created.
+    qtbot.waitUntil(
+        lambda: not toolwidget.task_manager._running_tasks, timeout=60000)
+    assert toolwidget.save_multipdf_statistical_graphs_btn.isEnabled()
+    assert not toolwidget.cancel_multipdf_statistical_graphs_btn.isEnabled()
+    assert toolwidget.multipdf_status_bar.status == (
+        toolwidget.multipdf_status_bar.PROCESS_FAILED)
+    assert not osp.exists(filename)
 
 
 def test_copy_data(hydrostats_tool, mocker, tmp_path, qtbot):
@@ -12,7 +12,6 @@ Tests for the SaveReadingsToExcelTool.
 """
 
 # ---- Standard imports
-from datetime import datetime
 import os
 import os.path as osp
 from unittest.mock import Mock
@@ -37,57 +36,16 @@ from sardes.utils.tests.test_data_operations import format_reading_data
 # ---- Fixtures
 # =============================================================================
 @pytest.fixture
-def source_data():
-    source_data = pd.DataFrame(
-        data=[
-            ['2005-11-01 01:00:00', '64640', 1.1, -1.1,   nan,  3.16, 1],
-            ['2005-11-01 13:00:00', '64640', 1.2, -1.2,   nan,  3.16, 1],
-            ['2005-11-03 01:00:00', '64640', nan, -2.1,   nan,  3.16, 1],
-            ['2005-11-03 13:00:00', '64640', nan,  nan,   nan,  3.16, 1],
-            ['2005-11-04 01:00:00', '64640', 5.1, -5.1, 100.9,  3.16, 4],
-            ['2005-11-04 13:00:00', '64640', 5.2, -5.2, 100.10, 3.16, 5],
-
-            ['2005-11-03 00:30:00', '20640', 3.1, -3.1, 100.5,  9.25, 2],
-            ['2005-11-03 12:30:00', '20640', 3.2, -3.2, 100.6,  9.25, 2],
-
-            ['2005-11-03 01:00:00', '78901', 4.1,  nan, 100.7,  7.16, 3],
-            ['2005-11-03 13:00:00', '78901', 4.2, -4.2, 100.8,  7.16, 3]],
-        columns=[
-            'datetime', 'sonde_id', DataType.WaterLevel,
-            DataType.WaterTemp, DataType.WaterEC, 'install_depth', 'obs_id'])
-    source_data['datetime'] = pd.to_datetime(
-        source_data['datetime'], format="%Y-%m-%d %H:%M:%S")
-    return source_data
-
-
-@pytest.fixture
-def repere_data():
-    return pd.DataFrame(
-        [[105, 5, True, datetime(2005, 11, 1, 1), None]],
-        columns=['top_casing_alt', 'casing_length', 'is_alt_geodesic',
-                 'start_date', 'end_date']
-        )
-
-
-@pytest.fixture
-def obs_well_data():
-    return pd.Series(
-        {'municipality': 'municipality_test',
-         'obs_well_id': '0123456',
-         'latitude': 45,
-         'longitude': -73.34679})
-
-
-@pytest.fixture
-def save_to_excel_tool(qtbot, source_data, repere_data, obs_well_data):
+def save_to_excel_tool(qtbot, readings_source_data, readings_repere_data,
+                       readings_obs_well_data):
 
     class ParentToolbar(QToolBar):
         def __init__(self):
             super().__init__()
             self._model = Mock()
-            self._model._obs_well_data = obs_well_data
-            self._model._repere_data = repere_data
-            self._model.dataf = source_data
+            self._model._obs_well_data = readings_obs_well_data
+            self._model._repere_data = readings_repere_data
+            self._model.dataf = readings_source_data
 
         def model(self):
             return self._model
@@ -108,22 +66,26 @@ def save_to_excel_tool(qtbot, source_data, repere_data, obs_well_data):
 # =============================================================================
 # ---- Tests
 # =============================================================================
-def test_save_reading_data_to_xlsx(tmp_path, source_data, repere_data,
-                                   obs_well_data):
+def test_save_reading_data_to_xlsx(tmp_path, readings_source_data,
+                                   readings_repere_data,
+                                   readings_obs_well_data):
     """
     Test that publishing daily readings data to Excel is working as
     expected.
     """
     filename = osp.join(tmp_path, 'test_save_readings_to_excel')
     sheetname = 'test_sheet1'
-    formatted_data = format_reading_data(source_data, repere_data)
+    formatted_data = format_reading_data(
+        readings_source_data, readings_repere_data)
     last_repere_data = (
-        repere_data.sort_values(by=['end_date'], ascending=[True]).iloc[-1])
+        readings_repere_data
+        .sort_values(by=['end_date'], ascending=[True])
+        .iloc[-1])
     ground_altitude = (
         last_repere_data['top_casing_alt'] - last_repere_data['casing_length'])
     is_alt_geodesic = last_repere_data['is_alt_geodesic']
     _save_reading_data_to_xlsx(
-        filename, sheetname, formatted_data, obs_well_data,
+        filename, sheetname, formatted_data, readings_obs_well_data,
         ground_altitude, is_alt_geodesic, logo_filename=None)
     assert osp.exists(filename + '.xlsx')
 
@@ -150,13 +112,14 @@ def test_save_reading_data_to_xlsx(tmp_path, source_data, repere_data,
 
 @pytest.mark.parametrize("value", [None, nan, '', 'test'])
 def test_save_readings_to_xlsx_when_bad_coord(
-        tmp_path, source_data, repere_data, obs_well_data, value):
+        tmp_path, readings_source_data, readings_repere_data,
+        readings_obs_well_data, value):
     """
     Test that publishing daily readings data to Excel is working as
     expected when the lat/lon coordinates for the monitoring station are
     not valid.
     """
-    obs_well_data = {
+    readings_obs_well_data = {
         'municipality': 'municipality_test',
         'obs_well_id': '0123456',
         'latitude': value,
@@ -164,8 +127,9 @@ def test_save_readings_to_xlsx_when_bad_coord(
 
     filename = osp.join(tmp_path, 'test_save_readings_to_excel.xlsx')
     _save_reading_data_to_xlsx(
-        filename, 'test_sheet1', format_reading_data(source_data, repere_data),
-        obs_well_data, ground_altitude=100, is_alt_geodesic=True)
+        filename, 'test_sheet1',
+        format_reading_data(readings_source_data, readings_repere_data),
+        readings_obs_well_data, ground_altitude=100, is_alt_geodesic=True)
 
     exported_data = pd.read_excel(filename, dtype='str', header=None)
     assert pd.isnull(exported_data.iat[2, 2])
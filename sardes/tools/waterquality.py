@@ -170,41 +170,9 @@ def _save_hg_data_to_xlsx(
 
     hg_datetimes = water_quality_data.columns.get_level_values(0)
 
-    # workbook = writer.book
-    workbook = xlsxwriter.Workbook(filename)
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
     worksheet = workbook.add_worksheet(sheetname)
 
-    # Write the numerical data to the file.
-    water_quality_data = water_quality_data.reset_index()
-    water_quality_data = water_quality_data.fillna(value=' ')
-
-    values = water_quality_data.values
-    nrow, ncol = values.shape
-    for row in range(nrow):
-        fmt_kwargs = {
-            'font_name': font_name, 'font_size': 11, 'valign': 'bottom'}
-
-        if row == nrow - 1:
-            fmt_kwargs['bottom'] = 1
-
-        for col in range(ncol):
-            if col == 0:
-                fmt_kwargs['align'] = 'left'
-                fmt_kwargs['left'] = 1
-                fmt_kwargs['right'] = 1
-            elif col % 2 == 1:
-                fmt_kwargs['align'] = 'right'
-                fmt_kwargs['left'] = 1
-                fmt_kwargs['right'] = 0
-            else:
-                fmt_kwargs['align'] = 'left'
-                fmt_kwargs['left'] = 0
-                fmt_kwargs['right'] = 1
-            worksheet.write(
-                startrow + 8 + row, startcol + col, values[row, col],
-                workbook.add_format(fmt_kwargs)
-                )
-
     # Setup the columns format and width.
     values_format = workbook.add_format({
         'font_name': font_name, 'align': 'right'})
@@ -220,51 +188,6 @@ def _save_hg_data_to_xlsx(
         worksheet.set_column(
             startcol + i + 1, startcol + i + 1, 16.5, column_format)
 
-    # Write the data header.
-    worksheet.write(
-        startrow + 6, startcol,
-        _('Sampling Date'),
-        workbook.add_format({
-            'font_name': font_name, 'font_size': 11,
-            'align': 'center', 'valign': 'bottom', 'bold': True,
-            'top': 1, 'left': 1, 'right': 1})
-        )
-    worksheet.write(
-        startrow + 7, startcol,
-        _('Parameter'),
-        workbook.add_format({
-            'font_name': font_name, 'font_size': 11,
-            'align': 'center', 'valign': 'bottom', 'bold': True,
-            'bottom': 1, 'left': 1, 'right': 1})
-        )
-    for i, val in enumerate(hg_datetimes):
-        if i % 2 == 0:
-            worksheet.merge_range(
-                startrow + 6, startcol + i + 1, startrow + 6, startcol + i + 2,
-                val,
-                workbook.add_format({
-                    'num_format': 'yyyy-mm-dd', 'font_name': font_name,
-                    'font_size': 11, 'align': 'center', 'valign': 'bottom',
-                    'bold': True, 'top': 1, 'left': 1, 'right': 1})
-                )
-            worksheet.write(
-                startrow + 7, startcol + i + 1,
-                _('Value'),
-                workbook.add_format({
-                    'font_name': font_name, 'font_size': 11,
-                    'align': 'center', 'valign': 'bottom', 'bold': True,
-                    'bottom': 1, 'left': 1})
-                )
-        else:
-            worksheet.write(
-                startrow + 7, startcol + i + 1,
-                _('Units'),
-                workbook.add_format({
-                    'font_name': font_name, 'font_size': 11,
-                    'align': 'center', 'valign': 'bottom', 'bold': True,
-                    'bottom': 1, 'right': 1})
-                )
-
     # Setup the height of the rows.
     worksheet.set_default_row(15)
     header_row_height = 22
@@ -362,6 +285,56 @@ def _save_hg_data_to_xlsx(
                              'bold': True, 'bottom': 6, 'right': 6,
                              'align': 'center', 'valign': 'vcenter'}))
 
+    # Write the data header.
+    #
+    # Note that the header is written one row after the other, as required
+    # in constant memory mode.
+    worksheet.write(
+        startrow + 6, startcol,
+        _('Sampling Date'),
+        workbook.add_format({
+            'font_name': font_name, 'font_size': 11,
+            'align': 'center', 'valign': 'bottom', 'bold': True,
+            'top': 1, 'left': 1, 'right': 1})
+        )
+    for i, val in enumerate(hg_datetimes):
+        if i % 2 == 0:
+            worksheet.merge_range(
+                startrow + 6, startcol + i + 1, startrow + 6, startcol + i + 2,
+                val,
+                workbook.add_format({
+                    'num_format': 'yyyy-mm-dd', 'font_name': font_name,
+                    'font_size': 11, 'align': 'center', 'valign': 'bottom',
+                    'bold': True, 'top': 1, 'left': 1, 'right': 1})
+                )
+    worksheet.write(
+        startrow + 7, startcol,
+        _('Parameter'),
+        workbook.add_format({
+            'font_name': font_name, 'font_size': 11,
+            'align': 'center', 'valign': 'bottom', 'bold': True,
+            'bottom': 1, 'left': 1, 'right': 1})
+        )
+    for i, val in enumerate(hg_datetimes):
+        if i % 2 == 0:
+            worksheet.write(
+                startrow + 7, startcol + i + 1,
+                _('Value'),
+                workbook.add_format({
+                    'font_name': font_name, 'font_size': 11,
+                    'align': 'center', 'valign': 'bottom', 'bold': True,
+                    'bottom': 1, 'left': 1})
+                )
+        else:
+            worksheet.write(
+                startrow + 7, startcol + i + 1,
+                _('Units'),
+                workbook.add_format({
+                    'font_name': font_name, 'font_size': 11,
+                    'align': 'center', 'valign': 'bottom', 'bold': True,
+                    'bottom': 1, 'right': 1})
+                )
+
     # ---- Add the logo.
     if logo_filename is not None:
         img = Image.open(logo_filename)
@@ -386,7 +359,56 @@ def _save_hg_data_to_xlsx(
                      'x_offset': 10, 'y_offset': 3}
             )
 
+    # Write the numerical data to the file.
+    #
+    # In constant memory mode, the rows are flushed to the file as soon as
+    # a subsequent row is written, so the data must be written row by row
+    # after everything else.
+    water_quality_data = water_quality_data.reset_index()
+    water_quality_data = water_quality_data.fillna(value=' ')
+
+    values = water_quality_data.values
+    nrow, ncol = values.shape
+    cell_formats = _get_hg_data_cell_formats(workbook, font_name, ncol)
+    for row, row_values in enumerate(values.tolist()):
+        row_formats = cell_formats[int(row == nrow - 1)]
+        for col, value in enumerate(row_values):
+            worksheet.write(
+                startrow + 8 + row, startcol + col, value, row_formats[col])
+
     try:
         workbook.close()
     except FileCreateError:
         raise PermissionError
+
+
+def _get_hg_data_cell_formats(workbook, font_name: str, ncol: int):
+    """
+    Return the formats of the cells of a row of hydrogeochemical data for
+    a regular row and for the last row of the table, which has a bottom
+    border.
+    """
+    cell_formats = []
+    for is_last_row in (False, True):
+        fmt_kwargs = {
+            'font_name': font_name, 'font_size': 11, 'valign': 'bottom'}
+        if is_last_row:
+            fmt_kwargs['bottom'] = 1
+
+        row_formats = []
+        for col in range(ncol):
+            if col == 0:
+                fmt_kwargs['align'] = 'left'
+                fmt_kwargs['left'] = 1
+                fmt_kwargs['right'] = 1
+            elif col % 2 == 1:
+                fmt_kwargs['align'] = 'right'
+                fmt_kwargs['left'] = 1
+                fmt_kwargs['right'] = 0
+            else:
+                fmt_kwargs['align'] = 'left'
+                fmt_kwargs['left'] = 0
+                fmt_kwargs['right'] = 1
+            row_formats.append(workbook.add_format(fmt_kwargs))
+        cell_formats.append(row_formats)
+    return cell_formats
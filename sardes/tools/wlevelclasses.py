@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+A tool to classify the water level of all the active monitoring stations
+of the network for a given month in the percentile classes of the
+statistical hydrographs.
+"""
+
+from __future__ import annotations
+
+# ---- Standard library imports
+import datetime
+import os.path as osp
+
+# ---- Third party imports
+import pandas as pd
+from qtpy.QtCore import Signal
+from qtpy.QtWidgets import (
+    QComboBox, QFileDialog, QGridLayout, QLabel, QSpinBox, QWidget)
+import simplekml
+
+# ---- Local imports
+from sardes.api.tools import SardesTool
+from sardes.config.icons import get_icon
+from sardes.config.locale import _
+from sardes.config.ospath import (
+    get_select_file_dialog_dir, set_select_file_dialog_dir)
+from sardes.tools.hydrostats import (
+    MONTHS, PERCENTILE_QPAIRS, PERCENTILE_LABELS, PERCENTILE_RGB,
+    PERCENTILES_Q)
+from sardes.widgets.dialogs import UserMessageDialogBase
+from sardes.widgets.statusbar import ProcessStatusBar
+
+
+# The formats in which the water level classes can be saved, with the name
+# filters used in the file dialogs.
+WLEVEL_CLASSES_FORMATS = {
+    'csv': "Comma-Separated Values (*.csv)",
+    'kml': "Keyhole Markup Language (*.kml)"
+    }
+
+# The methods available to pool the data when computing the percentiles,
+# with the labels used in the gui.
+WLEVEL_CLASSES_POOLS = {
+    'min_max_median': _("Monthly minimum, median and maximum"),
+    'median': _("Monthly median"),
+    'mean': _("Monthly mean"),
+    'all': _("All daily values")
+    }
+
+# The color of the placemarks of the stations whose water level could not
+# be classified.
+UNCLASSIFIED_RGB = "#bdbdbd"
+
+
+def get_wlevel_classes_columns():
+    """
+    Return a dictionary mapping the columns of the water level classes
+    returned by 'classify_monthly_wlevels' to their label.
+    """
+    columns = {
+        'obs_well_id': _('Well ID'),
+        'municipality': _('Municipality'),
+        'latitude': _('Latitude'),
+        'longitude': _('Longitude'),
+        'wlevel': _('Water level altitude (m MSL)'),
+        'percentile_class': _('Percentile class'),
+        'nyear': _('Number of years')
+        }
+    for q in PERCENTILES_Q:
+        columns['p{}'.format(q)] = _('Percentile {}').format(q)
+    return columns
+
+
+def save_wlevel_classes(filename, classes, year, month):
+    """
+    Save the water level classes of the monitoring stations to a CSV table
+    or to a KML layer, according to the extension of filename.
+    """
+    root, ext = osp.splitext(filename)
+    if ext.lower() == '.csv':
+        columns = get_wlevel_classes_columns()
+        classes = classes[list(columns)].rename(columns=columns)
+        classes.to_csv(filename, index=False, encoding='utf-8-sig',
+                       float_format='%0.2f')
+    elif ext.lower() == '.kml':
+        _save_wlevel_classes_to_kml(filename, classes, year, month)
+    else:
+        raise ValueError(
+            "'{}' is not a supported file format.".format(ext))
+
+
+def _save_wlevel_classes_to_kml(filename, classes, year, month):
+    """
+    Save the water level classes of the monitoring stations to a KML layer
+    where each station is shown with the color of its percentile class.
+    """
+    kml = simplekml.Kml()
+    fol = kml.newfolder(name=_("Water level percentile classes {} {}").format(
+        MONTHS[month - 1], year))
+
+    styles = {}
+    for qpair in PERCENTILE_QPAIRS + [None]:
+        rgb = UNCLASSIFIED_RGB if qpair is None else PERCENTILE_RGB[qpair]
+        style = simplekml.Style()
+        style.iconstyle.icon.href = (
+            'http://maps.google.com/mapfiles/kml/shapes/'
+            'placemark_circle.png')
+        style.iconstyle.color = simplekml.Color.rgb(
+            int(rgb[1:3], 16), int(rgb[3:5], 16), int(rgb[5:7], 16))
+        style.labelstyle.scale = 0.8
+        label = None if qpair is None else PERCENTILE_LABELS[qpair]
+        styles[label] = style
+
+    for station_uuid, station_classes in classes.iterrows():
+        if (pd.isnull(station_classes['latitude']) or
+                pd.isnull(station_classes['longitude'])):
+            continue
+        pnt = fol.newpoint(
+            name=station_classes['obs_well_id'],
+            coords=[(station_classes['longitude'],
+                     station_classes['latitude'])])
+        percentile_class = station_classes['percentile_class']
+        if pd.isnull(percentile_class):
+            percentile_class = None
+        pnt.style = styles[percentile_class]
+
+        desc = '{} = {}<br/>'.format(
+            _('Station'), station_classes['obs_well_id'])
+        desc += '{} = {}<br/>'.format(
+            _('Municipality'), station_classes['municipality'])
+        if percentile_class is None:
+            desc += _('Not classified') + '<br/>'
+        else:
+            desc += '{} = {:0.2f} {}<br/>'.format(
+                _('Water level'), station_classes['wlevel'], _('m MSL'))
+            desc += '{} = {}<br/>'.format(
+                _('Percentile class'), percentile_class)
+            desc += '{} = {:d}<br/>'.format(
+                _('Number of years'), int(station_classes['nyear']))
+        pnt.description = desc
+    kml.save(filename)
+
+
+class WlevelClassesTool(SardesTool):
+    """
+    A tool to classify the water level of all the active monitoring
+    stations of the network for a given month in the percentile classes
+    of the statistical hydrographs.
+
+    This tool is meant to be installed in the 'ObsWellsTableWidget'.
+    """
+    sig_wlevels_classified = Signal(object)
+
+    def __init__(self, table):
+        super().__init__(
+            table,
+            name='wlevel_classes_tool',
+            text=_("Water Level Percentile Classes"),
+            icon='show_barplot',
+            tip=_("Classify the water level of all the active monitoring "
+                  "stations for a given month in the percentile classes "
+                  "of the statistical hydrographs.")
+            )
+
+    # ---- SardesTool API
+    def __create_toolwidget__(self):
+        dialog = WlevelClassesDialog(parent=self.table)
+        dialog.sig_start_classify_request.connect(self._classify_wlevels)
+        dialog.sig_cancel_classify_request.connect(
+            self._cancel_classify_wlevels)
+        return dialog
+
+    def __update_toolwidget__(self, toolwidget):
+        pass
+
+    # ---- Handlers
+    def _classify_wlevels(self, filename, year, month, pool):
+        """
+        Classify the water level of all the active monitoring stations
+        and save the results to the given filename.
+        """
+        dbmanager = self.table.model().db_connection_manager
+        if dbmanager is None:
+            self.toolwidget().stop_classifying(None)
+            return
+        dbmanager.classify_wlevels(
+            year, month, pool,
+            callback=lambda classes: self._handle_wlevels_classified(
+                classes, filename, year, month),
+            progress_callback=self.toolwidget().set_progress)
+
+    def _cancel_classify_wlevels(self):
+        """
+        Cancel the classification of the water levels that is in
+        progress, if any.
+        """
+        dbmanager = self.table.model().db_connection_manager
+        if dbmanager is not None:
+            dbmanager.cancel_classify_wlevels()
+
+    def _handle_wlevels_classified(self, classes, filename, year, month):
+        """
+        Handle when the water level of the active monitoring stations
+        were classified.
+        """
+        if classes is not None:
+            try:
+                save_wlevel_classes(filename, classes, year, month)
+            except (OSError, ValueError) as error:
+                print("Failed to save the water level classes because of "
+                      "the following error:")
+                print(type(error).__name__, end=': ')
+                print(error)
+                classes = None
+        self.toolwidget().stop_classifying(classes)
+        self.sig_wlevels_classified.emit(classes)
+
+
+class WlevelClassesDialog(UserMessageDialogBase):
+    """
+    A dialog window to classify the water level of all the active
+    monitoring stations for a given month.
+    """
+    sig_start_classify_request = Signal(str, int, int, str)
+    sig_cancel_classify_request = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(_("Water Level Percentile Classes"))
+        self.setWindowIcon(get_icon('show_barplot'))
+        self.setModal(False)
+
+        self._classify_in_progress = False
+
+        # Setup the classification options.
+        now = datetime.datetime.now()
+        self.year_spinbox = QSpinBox()
+        self.year_spinbox.setRange(1900, 2100)
+        self.year_spinbox.setValue(now.year)
+
+        self.month_combobox = QComboBox()
+        self.month_combobox.addItems(MONTHS.tolist())
+        self.month_combobox.setCurrentIndex(now.month - 1)
+
+        self.pool_combobox = QComboBox()
+        for pool, label in WLEVEL_CLASSES_POOLS.items():
+            self.pool_combobox.addItem(label, pool)
+
+        self.format_combobox = QComboBox()
+        for file_format, namefilter in WLEVEL_CLASSES_FORMATS.items():
+            self.format_combobox.addItem(namefilter, file_format)
+
+        self.options_widget = QWidget()
+        options_layout = QGridLayout(self.options_widget)
+        options_layout.setContentsMargins(0, 0, 0, 0)
+        options_layout.addWidget(QLabel(_("Year:")), 0, 0)
+        options_layout.addWidget(self.year_spinbox, 0, 1)
+        options_layout.addWidget(QLabel(_("Month:")), 1, 0)
+        options_layout.addWidget(self.month_combobox, 1, 1)
+        options_layout.addWidget(QLabel(_("Percentiles from:")), 2, 0)
+        options_layout.addWidget(self.pool_combobox, 2, 1)
+        options_layout.addWidget(QLabel(_("File format:")), 3, 0)
+        options_layout.addWidget(self.format_combobox, 3, 1)
+        options_layout.setColumnStretch(1, 1)
+
+        # Setup the status bar.
+        self.status_bar = ProcessStatusBar()
+        self.status_bar.hide()
+
+        # Setup the dialog button box.
+        self.classify_btn = self.create_button(
+            _('Classify'), enabled=True, default=True,
+            triggered=self._select_classify_dest)
+        self.cancel_btn = self.create_button(
+            _('Cancel'), enabled=False, default=False,
+            triggered=self.cancel_classifying)
+        self.close_btn = self.create_button(
+            _('Close'), enabled=True, default=False,
+            triggered=self.close)
+        self.add_button(self.classify_btn)
+        self.add_button(self.cancel_btn)
+        self.add_button(self.close_btn)
+
+        # Setup the main widget.
+        self.central_layout.addWidget(self.options_widget)
+        self.central_layout.addWidget(self.status_bar)
+        self.central_layout.addStretch(1)
+
+    # ---- Public Interface
+    def year(self):
+        """Return the year for which to classify the water levels."""
+        return self.year_spinbox.value()
+
+    def month(self):
+        """Return the month for which to classify the water levels."""
+        return self.month_combobox.currentIndex() + 1
+
+    def pool(self):
+        """Return the method used to pool the data."""
+        return self.pool_combobox.currentData()
+
+    def file_format(self):
+        """Return the file format in which to save the water level classes."""
+        return self.format_combobox.currentData()
+
+    def set_file_format(self, file_format):
+        """Set the file format in which to save the water level classes."""
+        self.format_combobox.setCurrentIndex(
+            self.format_combobox.findData(file_format))
+
+    def set_progress(self, progress: float):
+        """Set the progress of the classification, in percent."""
+        self.status_bar.set_label(
+            _("Classifying water levels...") + ' {:0.1f}%'.format(progress))
+
+    def start_classifying(self, filename: str):
+        """
+        Start the classification of the water levels and save the results
+        to the given filename.
+        """
+        self._classify_in_progress = True
+        self.options_widget.setEnabled(False)
+        self.classify_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.status_bar.show(_("Classifying water levels..."))
+        self.sig_start_classify_request.emit(
+            filename, self.year(), self.month(), self.pool())
+
+    def cancel_classifying(self):
+        """
+        Cancel the classification of the water levels that is in progress.
+        """
+        self._classify_in_progress = False
+        self.options_widget.setEnabled(True)
+        self.classify_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.status_bar.show_fail_icon(
+            _("The classification of the water levels was cancelled."))
+        self.sig_cancel_classify_request.emit()
+
+    def stop_classifying(self, classes):
+        """
+        Stop the classification of the water levels and show the number
+        of monitoring stations in each percentile class.
+        """
+        self._classify_in_progress = False
+        self.options_widget.setEnabled(True)
+        self.classify_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        if classes is None:
+            self.status_bar.show_fail_icon(
+                _("Failed to classify the water levels."))
+            return
+
+        counts = classes['percentile_class'].value_counts()
+        message = _(
+            "The water levels of {} of the {} active monitoring stations "
+            "were classified:"
+            ).format(counts.sum(), len(classes))
+        message += '<br/>' + ', '.join(
+            '{}: {}'.format(PERCENTILE_LABELS[qpair],
+                            counts.get(PERCENTILE_LABELS[qpair], 0))
+            for qpair in reversed(PERCENTILE_QPAIRS))
+        self.status_bar.show_sucess_icon(message)
+
+    # ---- Handlers
+    def _select_classify_dest(self):
+        """
+        Open a dialog that allows the user to select the file where to
+        save the water level classes.
+        """
+        file_format = self.file_format()
+        filename = _('wlevel_classes_{}-{:02d}.{}').format(
+            self.year(), self.month(), file_format)
+        filename, filefilter = QFileDialog.getSaveFileName(
+            self, _('Save As'),
+            osp.join(get_select_file_dialog_dir(), filename),
+            WLEVEL_CLASSES_FORMATS[file_format])
+        if filename:
+            if not filename.endswith('.' + file_format):
+                filename += '.' + file_format
+            filename = osp.abspath(filename)
+            set_select_file_dialog_dir(osp.dirname(filename))
+            self.start_classifying(filename)
+
+    def closeEvent(self, event):
+        """
+        Override Qt method to cancel the classification of the water levels
+        in progress, if any, when this dialog is closed.
+        """
+        if self._classify_in_progress:
+            self.cancel_classifying()
+        super().closeEvent(event)
+
+
+if __name__ == '__main__':
+    import sys
+    from qtpy.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    dialog = WlevelClassesDialog()
+    dialog.show()
+    sys.exit(app.exec_())
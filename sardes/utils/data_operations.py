@@ -11,11 +11,13 @@
 import itertools
 
 # ---- Third party imports
+import numpy as np
 from numpy import nan
 import pandas as pd
 
 # ---- Local imports
 from sardes.api.timeseries import DataType
+from sardes.utils.resampling import ReadingsBuckets
 
 
 def are_values_equal(x1, x2):
@@ -53,10 +55,19 @@ def intervals_extract(iterable):
 def format_reading_data(data, repere_data):
     """
     Format readings data for publication.
+
+    The water levels are converted to altitudes with the repere data and
+    the readings are resampled on a daily basis. For each day, the first
+    non-null value of each column measured after midnight is kept and,
+    when readings were acquired for more than one observation on the same
+    day, only those measured closest to the surface are kept.
     """
     if data.empty:
         return data
 
+    datetimes = data['datetime'].values
+    wlevels = data[DataType.WaterLevel].values.astype(float)
+
     # Convert water level in altitude (above see level).
     if not repere_data.empty:
         for i in range(len(repere_data)):
@@ -64,29 +75,107 @@ def format_reading_data(data, repere_data):
             reference_altitude = repere_iloc['top_casing_alt']
             start_date = repere_iloc['start_date']
             end_date = repere_iloc['end_date']
-            if pd.isnull(end_date):
-                indexes = data.index[data['datetime'] >= start_date]
-            else:
-                indexes = data.index[
-                    (data['datetime'] >= start_date) &
-                    (data['datetime'] < end_date)]
-            data.loc[indexes, DataType.WaterLevel] = (
-                reference_altitude - data.loc[indexes, DataType.WaterLevel])
-
-    # Resample data on a daily basis and remove duplicate values if any.
-    data = (
-        data
-        .dropna(subset=[DataType.WaterLevel])
-        # We keep the readings closest to midnight.
-        .groupby('obs_id').resample('D', on='datetime').first()
-        .dropna(subset=[DataType.WaterLevel])
-        .droplevel(0, axis=0).drop('datetime', axis=1)
-        .reset_index(drop=False)
-        .sort_values(by=['datetime', 'install_depth'],
-                     ascending=[True, True])
-        # We keep the reading measured closest to the surface.
-        .drop_duplicates(subset='datetime', keep='first')
-        .reset_index(drop=True)
-        )
-
-    return data
+            indexes = datetimes >= pd.Timestamp(start_date).to_datetime64()
+            if not pd.isnull(end_date):
+                indexes &= datetimes < pd.Timestamp(end_date).to_datetime64()
+            np.subtract(
+                reference_altitude, wlevels, out=wlevels, where=indexes)
+
+    # Split the readings in daily buckets for each observation.
+    buckets = ReadingsBuckets(
+        datetimes, 'D', groups=data['obs_id'].values,
+        mask=~np.isnan(wlevels))
+    if len(buckets) == 0:
+        return pd.DataFrame(columns=data.columns)
+
+    # Resampling the readings of an observation with missing days would
+    # upcast its integer and boolean columns to float, so we do the same
+    # to keep the dtypes consistent.
+    has_missing_days = buckets.has_missing_periods()
+
+    # We keep the first non-null value of each column in each bucket,
+    # which corresponds to the reading closest to midnight.
+    daily_data = {'datetime': buckets.periods}
+    for column in data.columns:
+        if column == 'datetime':
+            continue
+        column_values = data[column].values
+        values = buckets.first(
+            wlevels if column == DataType.WaterLevel else column_values)
+        if isinstance(column_values, pd.api.extensions.ExtensionArray):
+            # The extension dtypes, such as the nullable integer dtype of
+            # the observation IDs, are kept as pandas resampling did.
+            values = pd.array(values, dtype=column_values.dtype)
+        elif has_missing_days and values.dtype.kind in 'iub':
+            values = values.astype(float)
+        daily_data[column] = values
+
+    # We keep the reading measured closest to the surface when there is
+    # readings for more than one observation on the same day.
+    if buckets.group_count() > 1:
+        indexes = buckets.select_by_priority(daily_data['install_depth'])
+        daily_data = {
+            column: values[indexes] for column, values in daily_data.items()}
+
+    return pd.DataFrame(daily_data)
+
+
+def format_water_quality_data(hg_surveys, hg_param_values,
+                              hg_param_names, meas_units_abb):
+    """
+    Format the hydrogeochemical data of a monitoring station for publication.
+
+    Parameters
+    ----------
+    hg_surveys : DataFrame
+        The hydrogeochemical surveys of the monitoring station.
+    hg_param_values : DataFrame
+        The hydrogeochemical parameter values measured during the surveys
+        of the monitoring station.
+    hg_param_names : dict
+        A dictionary mapping the IDs of the hydrogeochemical parameters
+        to their name.
+    meas_units_abb : dict
+        A dictionary mapping the IDs of the measurement units to
+        their abbreviation.
+
+    Returns
+    -------
+    water_quality_data : DataFrame
+        A dataframe containing the value and units of each hydrogeochemical
+        parameter, with one pair of columns per survey.
+    """
+    water_quality_data = pd.DataFrame()
+    if hg_surveys.empty or hg_param_values.empty:
+        return water_quality_data
+
+    hg_param_values = hg_param_values[
+        ['hg_survey_id', 'hg_param_id', 'hg_param_value', 'meas_units_id']
+        ].copy()
+    hg_param_values['hg_param_id'] = (
+        hg_param_values['hg_param_id'].map(hg_param_names.get))
+    hg_param_values['meas_units_id'] = (
+        hg_param_values['meas_units_id'].map(meas_units_abb.get))
+    hg_param_values_by_survey = dict(list(
+        hg_param_values.groupby('hg_survey_id', sort=False)))
+
+    for hg_survey_id, hg_survey_date in (
+            hg_surveys['hg_survey_datetime'].items()):
+        if hg_survey_id not in hg_param_values_by_survey:
+            continue
+
+        _to_merge = (
+            hg_param_values_by_survey[hg_survey_id]
+            .drop(columns=['hg_survey_id'])
+            .set_index('hg_param_id'))
+        _to_merge.columns = pd.MultiIndex.from_tuples(
+            [(hg_survey_date, col) for col in _to_merge.columns]
+            )
+
+        if water_quality_data.empty:
+            water_quality_data = _to_merge
+        else:
+            water_quality_data = water_quality_data.merge(
+                _to_merge, how='outer', left_index=True, right_index=True)
+
+    return water_quality_data
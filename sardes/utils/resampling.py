@@ -0,0 +1,580 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Functions and classes to resample and aggregate readings data on a
+regular frequency.
+
+The readings are split in buckets, one for each period of the frequency
+and, optionally, for each group of readings (for example, each
+observation or each sonde). The buckets are computed once with numpy
+and reused to aggregate the values of every column.
+
+This module also provides a min/max pyramid to decimate long series of
+readings to the resolution at which they are displayed.
+"""
+
+# ---- Third party imports
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+
+# The aggregations that are available to resample the readings.
+AGGREGATIONS = (
+    'first', 'last', 'mean', 'min', 'max', 'sum', 'count', 'completeness')
+
+# The reduction factor of the number of points between two consecutive
+# levels of a min/max pyramid.
+PYRAMID_FACTOR = 4
+
+# The frequencies that are not of a fixed duration and that are supported
+# to resample the readings, with the numpy unit of their periods.
+CALENDAR_FREQS = {'M': 'M', 'MS': 'M', 'A': 'Y', 'AS': 'Y', 'Y': 'Y'}
+
+
+def get_period_starts(datetimes, freq):
+    """
+    Return the start of the period of the given frequency containing
+    each of the given datetimes.
+
+    Parameters
+    ----------
+    datetimes : array-like of datetime64
+        The datetimes for which to return the start of their period.
+    freq : str
+        The frequency of the periods. This can be a monthly ('M') or
+        yearly ('Y') frequency or any frequency of a fixed duration, such
+        as '15min', 'H' or 'D'. The periods of a fixed duration are
+        aligned on midnight, January 1, 1970.
+
+    Returns
+    -------
+    period_starts : ndarray of datetime64[ns]
+        The start of the period containing each datetime.
+    """
+    datetimes = np.asarray(datetimes, dtype='datetime64[ns]')
+    if freq in CALENDAR_FREQS:
+        return datetimes.astype(
+            'datetime64[{}]'.format(CALENDAR_FREQS[freq])
+            ).astype('datetime64[ns]')
+    nanos = get_freq_nanos(freq)
+    return (datetimes.view('int64') // nanos * nanos).view('datetime64[ns]')
+
+
+def get_period_ends(period_starts, freq):
+    """
+    Return the end, exclusively, of the periods of the given frequency
+    starting at the given datetimes.
+    """
+    period_starts = np.asarray(period_starts, dtype='datetime64[ns]')
+    if freq in CALENDAR_FREQS:
+        unit = CALENDAR_FREQS[freq]
+        return (period_starts.astype('datetime64[{}]'.format(unit)) +
+                np.timedelta64(1, unit)).astype('datetime64[ns]')
+    return period_starts + np.timedelta64(get_freq_nanos(freq), 'ns')
+
+
+def get_freq_nanos(freq):
+    """
+    Return the duration in nanoseconds of the given frequency, which must
+    be of a fixed duration.
+    """
+    try:
+        offset = to_offset(freq)
+    except ValueError:
+        offset = None
+    if not isinstance(offset, Tick):
+        raise ValueError(
+            "'{}' is not a supported resampling frequency.".format(freq))
+    return offset.nanos
+
+
+class ReadingsBuckets(object):
+    """
+    The readings of a time series split in buckets, one for each period
+    of a regular frequency and for each group of readings.
+
+    Parameters
+    ----------
+    datetimes : array-like of datetime64
+        The datetimes of the readings.
+    freq : str
+        The frequency of the periods in which the readings are split.
+        See 'get_period_starts' for the supported frequencies.
+    groups : array-like, optional
+        The group of each reading, for example the ID of the observation
+        or of the sonde with which the readings were acquired. The
+        readings of different groups are put in different buckets.
+        Readings without a group are ignored.
+    mask : array-like of bool, optional
+        Whether each reading must be put in a bucket or ignored, for
+        example because its value is missing.
+
+    Attributes
+    ----------
+    order : ndarray of int
+        The positional indexes of the readings put in a bucket, sorted by
+        group and datetime.
+    starts : ndarray of int
+        The position in 'order' of the first reading of each bucket.
+    sizes : ndarray of int
+        The number of readings in each bucket.
+    periods : ndarray of datetime64[ns]
+        The start of the period of each bucket.
+    groups : ndarray
+        The group of each bucket. This is None if no groups were
+        provided.
+    """
+
+    def __init__(self, datetimes, freq, groups=None, mask=None):
+        self.freq = freq
+
+        datetimes = np.asarray(datetimes, dtype='datetime64[ns]')
+        isvalid = ~np.isnat(datetimes)
+        if mask is not None:
+            isvalid &= np.asarray(mask, dtype=bool)
+        if groups is None:
+            group_codes = np.zeros(len(datetimes), dtype=int)
+        else:
+            groups = np.asarray(groups)
+            if groups.dtype.kind in 'iu':
+                group_codes = groups
+            else:
+                group_codes = pd.factorize(groups, sort=True)[0]
+                isvalid &= (group_codes != -1)
+
+        # Sort the valid readings by group and datetime.
+        if isvalid.all():
+            order = np.arange(len(isvalid))
+        else:
+            order = np.flatnonzero(isvalid)
+            group_codes = group_codes[order]
+            datetimes = datetimes[order]
+        is_sorted = (
+            np.all(group_codes[1:] >= group_codes[:-1]) and
+            (np.all(datetimes[1:] >= datetimes[:-1]) or np.all(
+                (group_codes[1:] > group_codes[:-1]) |
+                (datetimes[1:] >= datetimes[:-1]))))
+        if not is_sorted:
+            sorted_indexes = np.lexsort((datetimes, group_codes))
+            order = order[sorted_indexes]
+            group_codes = group_codes[sorted_indexes]
+            datetimes = datetimes[sorted_indexes]
+        period_starts = get_period_starts(datetimes, freq)
+
+        # Split the readings in buckets.
+        is_bucket_start = np.empty(len(order), dtype=bool)
+        is_bucket_start[:1] = True
+        is_bucket_start[1:] = (
+            (group_codes[1:] != group_codes[:-1]) |
+            (period_starts[1:] != period_starts[:-1]))
+
+        self.order = order
+        self._datetimes = datetimes
+        self._reading_group_codes = group_codes
+        self.starts = np.flatnonzero(is_bucket_start)
+        self.sizes = np.diff(np.append(self.starts, len(order)))
+        self.periods = period_starts[self.starts]
+        self._group_codes = group_codes[self.starts]
+        self.groups = (
+            None if groups is None else groups[order[self.starts]])
+
+    def __len__(self):
+        """Return the number of buckets."""
+        return len(self.starts)
+
+    @property
+    def first_rows(self):
+        """
+        Return the positional index of the first reading of each bucket.
+        """
+        return self.order[self.starts]
+
+    @property
+    def last_rows(self):
+        """
+        Return the positional index of the last reading of each bucket.
+        """
+        return self.order[self.starts + self.sizes - 1]
+
+    def group_count(self):
+        """Return the number of groups with at least one bucket."""
+        return len(np.unique(self._group_codes))
+
+    def has_missing_periods(self):
+        """
+        Return whether there is at least one period without readings
+        between the first and last buckets of a group.
+        """
+        if len(self) < 2:
+            return False
+        is_same_group = self._group_codes[1:] == self._group_codes[:-1]
+        period_ends = get_period_ends(self.periods[:-1], self.freq)
+        return bool(np.any(is_same_group & (self.periods[1:] > period_ends)))
+
+    # ---- Aggregations
+    def aggregate(self, values, how):
+        """
+        Aggregate the values of the readings in each bucket.
+
+        Parameters
+        ----------
+        values : array-like
+            The values of the readings, in the same order as the datetimes
+            used to create the buckets.
+        how : str
+            The aggregation to use, which must be one of 'AGGREGATIONS'.
+
+        Returns
+        -------
+        aggregated : ndarray
+            The aggregated values of each bucket.
+        """
+        if how not in AGGREGATIONS:
+            raise ValueError(
+                "'{}' is not a supported aggregation.".format(how))
+        return getattr(self, how)(values)
+
+    def first(self, values):
+        """
+        Return the first non-null value of each bucket, which corresponds
+        to the value of the reading closest to the start of the period,
+        for example to midnight for daily buckets.
+        """
+        return self._take_notnull(np.asarray(values), last=False)
+
+    def last(self, values):
+        """Return the last non-null value of each bucket."""
+        return self._take_notnull(np.asarray(values), last=True)
+
+    def count(self, values):
+        """Return the number of non-null values in each bucket."""
+        notnull = ~pd.isnull(np.asarray(values)[self.order])
+        if len(self) == 0:
+            return np.array([], dtype=np.int64)
+        return np.add.reduceat(notnull, self.starts, dtype=np.int64)
+
+    def sum(self, values):
+        """
+        Return the sum of the non-null values of each bucket or NaN if
+        there is no value in a bucket.
+        """
+        values = np.asarray(values, dtype=float)[self.order]
+        isnull = np.isnan(values)
+        if len(self) == 0:
+            return np.array([], dtype=float)
+        sums = np.add.reduceat(np.where(isnull, 0, values), self.starts)
+        counts = np.add.reduceat(~isnull, self.starts, dtype=np.int64)
+        sums[counts == 0] = np.nan
+        return sums
+
+    def mean(self, values):
+        """
+        Return the mean of the non-null values of each bucket or NaN if
+        there is no value in a bucket.
+        """
+        values = np.asarray(values, dtype=float)[self.order]
+        isnull = np.isnan(values)
+        if len(self) == 0:
+            return np.array([], dtype=float)
+        sums = np.add.reduceat(np.where(isnull, 0, values), self.starts)
+        counts = np.add.reduceat(~isnull, self.starts, dtype=np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / counts
+
+    def min(self, values):
+        """Return the minimum non-null value of each bucket."""
+        values = np.asarray(values)[self.order]
+        if len(self) == 0:
+            return values[:0]
+        return np.fmin.reduceat(values, self.starts)
+
+    def max(self, values):
+        """Return the maximum non-null value of each bucket."""
+        values = np.asarray(values)[self.order]
+        if len(self) == 0:
+            return values[:0]
+        return np.fmax.reduceat(values, self.starts)
+
+    def completeness(self, values, step=None):
+        """
+        Return the ratio of the number of non-null values of each bucket
+        over the number of readings expected in the period of the bucket.
+
+        Parameters
+        ----------
+        values : array-like
+            The values of the readings.
+        step : timedelta-like, optional
+            The time expected between two consecutive readings. By
+            default, this is the median time between the consecutive
+            readings of the groups.
+        """
+        counts = self.count(values)
+        if len(self) == 0:
+            return counts.astype(float)
+        if step is None:
+            step = self.get_median_step()
+        step = pd.Timedelta(step).value
+        durations = (
+            get_period_ends(self.periods, self.freq) - self.periods
+            ).astype('int64')
+        expected_counts = np.maximum(durations // max(step, 1), 1)
+        return np.minimum(counts / expected_counts, 1)
+
+    def get_median_step(self):
+        """
+        Return the median time, in nanoseconds, between the consecutive
+        readings of the groups.
+        """
+        is_same_group = (
+            self._reading_group_codes[1:] == self._reading_group_codes[:-1])
+        steps = np.diff(self._datetimes.view('int64'))[is_same_group]
+        steps = steps[steps > 0]
+        return int(np.median(steps)) if len(steps) else 0
+
+    # ---- Selection
+    def select_by_priority(self, ranks):
+        """
+        Return the indexes of the buckets to keep for each period, so that
+        only the bucket of the group with the highest priority is kept
+        when there is more than one group with readings in a period.
+
+        Parameters
+        ----------
+        ranks : array-like
+            The priority rank of each bucket, where the bucket with the
+            lowest rank has the highest priority. Buckets with a null rank
+            have the lowest priority. Buckets with the same rank are
+            prioritized in the order of their group.
+
+        Returns
+        -------
+        indexes : ndarray of int
+            The indexes of the buckets to keep, sorted by period.
+        """
+        ranks = np.asarray(ranks, dtype=float)
+        indexes = np.lexsort((ranks, self.periods))
+        if len(indexes) == 0:
+            return indexes
+        periods = self.periods[indexes]
+        is_first = np.empty(len(indexes), dtype=bool)
+        is_first[0] = True
+        is_first[1:] = periods[1:] != periods[:-1]
+        return indexes[is_first]
+
+    def get_group_ranks(self, priority):
+        """
+        Return the priority rank of each bucket from a dictionary mapping
+        groups to their rank. The buckets of the groups that are not in
+        the dictionary have the lowest priority.
+        """
+        return pd.Series(self.groups).map(priority).values.astype(float)
+
+    # ---- Private API
+    def _take_notnull(self, values, last=False):
+        """
+        Return the first or last non-null value of each bucket.
+        """
+        rows = self.last_rows if last else self.first_rows
+        taken_values = values[rows]
+        isnull = pd.isnull(taken_values)
+        if not isnull.any():
+            return taken_values
+
+        # Search the first or last non-null value of the buckets for
+        # which the value of the first or last reading is null.
+        null_buckets = np.flatnonzero(isnull)
+        sizes = self.sizes[null_buckets]
+        offsets = np.cumsum(sizes) - sizes
+        null_rows_buckets = np.repeat(null_buckets, sizes)
+        null_rows = self.order[
+            np.arange(offsets[-1] + sizes[-1]) +
+            np.repeat(self.starts[null_buckets] - offsets, sizes)]
+        notnull = ~pd.isnull(values[null_rows])
+        null_rows = null_rows[notnull]
+        null_rows_buckets = null_rows_buckets[notnull]
+        is_taken = np.empty(len(null_rows), dtype=bool)
+        if last:
+            is_taken[-1:] = True
+            is_taken[:-1] = null_rows_buckets[1:] != null_rows_buckets[:-1]
+        else:
+            is_taken[:1] = True
+            is_taken[1:] = null_rows_buckets[1:] != null_rows_buckets[:-1]
+        indexes = np.where(isnull, -1, rows)
+        indexes[null_rows_buckets[is_taken]] = null_rows[is_taken]
+        return pd.api.extensions.take(values, indexes, allow_fill=True)
+
+
+def resample_readings(data, freq='D', how='first', by=None, priority=None,
+                      dropna=None):
+    """
+    Resample readings data on a regular frequency.
+
+    Parameters
+    ----------
+    data : DataFrame
+        A dataframe containing the readings data, with the datetime of
+        the readings in column 'datetime'.
+    freq : str, optional
+        The frequency on which to resample the readings data, for example
+        'H' for hourly, 'D' for daily or 'M' for monthly values. See
+        'get_period_starts' for the supported frequencies.
+    how : str or dict, optional
+        The aggregation used to resample the readings, which must be one
+        of 'AGGREGATIONS', or a dictionary mapping the columns of data to
+        their aggregation. Columns that are not in the dictionary are not
+        included in the resampled data. By default, the first non-null
+        value of each period is kept, which corresponds to the reading
+        closest to midnight for daily values.
+    by : str, optional
+        The column of data used to group the readings, for example
+        'obs_id' or 'sonde_id'. The readings of each group are resampled
+        separately.
+    priority : str or dict, optional
+        The rule used to select which group to keep when the readings of
+        more than one group are available for the same period. This can
+        either be the column of data holding the priority rank of the
+        readings, where the group of the first reading of the period with
+        the lowest rank is kept (for example 'install_depth' to keep the
+        readings measured closest to the surface), or a dictionary
+        mapping the groups to their priority rank (for example to
+        prioritize the readings of a given sonde). If this is None, the
+        resampled readings of all groups are returned.
+    dropna : list, optional
+        The columns of data that must not be null for a reading to be
+        resampled.
+
+    Returns
+    -------
+    resampled_data : DataFrame
+        A dataframe containing the resampled readings data, with the start
+        of the period of the values in column 'datetime', sorted by group
+        and period.
+    """
+    if isinstance(how, str):
+        how = {column: how for column in data.columns if column != 'datetime'}
+    mask = None if dropna is None else data[dropna].notnull().all(axis=1)
+    buckets = ReadingsBuckets(
+        data['datetime'].values, freq,
+        groups=None if by is None else data[by].values,
+        mask=mask)
+
+    resampled_data = {'datetime': buckets.periods}
+    for column, column_how in how.items():
+        resampled_data[column] = buckets.aggregate(
+            data[column].values, column_how)
+
+    if by is not None and priority is not None:
+        if isinstance(priority, dict):
+            ranks = buckets.get_group_ranks(priority)
+        else:
+            ranks = buckets.first(data[priority].values)
+        indexes = buckets.select_by_priority(ranks)
+        resampled_data = {
+            column: values[indexes] for
+            column, values in resampled_data.items()}
+
+    return pd.DataFrame(resampled_data, columns=['datetime'] + list(how))
+
+
+def decimate_minmax(x, y, size):
+    """
+    Decimate a series of values by keeping the minimum and the maximum
+    value of each bucket of size consecutive points.
+
+    The minimum and maximum of each bucket are returned in the order in
+    which they appear in the series. Buckets containing only nan values
+    are kept as nan values, so that the gaps in the series are preserved.
+
+    Parameters
+    ----------
+    x : ndarray
+        The sorted x coordinates of the values.
+    y : ndarray of float
+        The values to decimate.
+    size : int
+        The number of consecutive points in each bucket.
+
+    Returns
+    -------
+    x, y : ndarray
+        The x coordinates and values of the minimum and maximum of each
+        bucket.
+    """
+    nbuckets = -(-len(y) // size)
+    buckets = np.full(nbuckets * size, np.nan)
+    buckets[:len(y)] = y
+    buckets = buckets.reshape(nbuckets, size)
+    isnull = np.isnan(buckets)
+
+    offsets = np.arange(nbuckets) * size
+    imin = np.where(isnull, np.inf, buckets).argmin(axis=1) + offsets
+    imax = np.where(isnull, -np.inf, buckets).argmax(axis=1) + offsets
+    indexes = np.column_stack(
+        (np.minimum(imin, imax), np.maximum(imin, imax))).ravel()
+    return x[indexes], y[indexes]
+
+
+class MinMaxPyramid(object):
+    """
+    A level-of-detail pyramid of the minimum and maximum values of a
+    series of values.
+
+    The first level of the pyramid contains all the points of the series.
+    Each following level is obtained by keeping the minimum and the maximum
+    value of each bucket of 2 * PYRAMID_FACTOR points of the previous level,
+    so that it has PYRAMID_FACTOR times fewer points, but the same envelope
+    of values. The pyramid is built once and can then be used to get the
+    points of a series to draw at any zoom level in a time that does not
+    depend on the length of the series.
+
+    Parameters
+    ----------
+    x : array-like
+        The sorted x coordinates of the values, for example the datetimes
+        of the readings.
+    y : array-like of float
+        The values of the series.
+    min_size : int
+        The number of points below which no more level is added to
+        the pyramid.
+    """
+
+    def __init__(self, x, y, min_size=1000):
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        self.levels = [(x, y)]
+        while len(y) > max(min_size, 2 * PYRAMID_FACTOR):
+            x, y = decimate_minmax(x, y, 2 * PYRAMID_FACTOR)
+            self.levels.append((x, y))
+
+    def __len__(self):
+        return len(self.levels[0][1])
+
+    def get_data(self, xmin=None, xmax=None, max_size=10000):
+        """
+        Return the x coordinates and values of the finest level of the
+        pyramid that has at most max_size points between xmin and xmax.
+
+        The point before xmin and the point after xmax are also returned,
+        so that a line drawn with these points extends to the edges of the
+        interval. If no level is coarse enough, the points of the coarsest
+        level are returned.
+        """
+        for x, y in self.levels:
+            start = 0 if xmin is None else max(
+                np.searchsorted(x, xmin, side='left') - 1, 0)
+            end = len(x) if xmax is None else min(
+                np.searchsorted(x, xmax, side='right') + 1, len(x))
+            if end - start <= max_size:
+                break
+        return x[start:end], y[start:end]
@@ -22,7 +22,8 @@ import pytest
 
 # ---- Local imports
 from sardes.api.timeseries import DataType
-from sardes.utils.data_operations import intervals_extract, format_reading_data
+from sardes.utils.data_operations import (
+    intervals_extract, format_reading_data, format_water_quality_data)
 
 
 # =============================================================================
@@ -89,6 +90,54 @@ def test_format_reading_data(source_data, repere_data):
     assert formatted_data.equals(expected_data)
 
 
+def test_format_reading_data_unsorted(source_data, repere_data):
+    """
+    Test that formating reading data that are not sorted and that have
+    missing days is working as expected and that the source data are not
+    modified.
+    """
+    source_data = pd.concat([
+        source_data,
+        pd.DataFrame(
+            [['2005-11-10 02:00:00', '64640', 6.1, nan, 3.16, 4],
+             ['2005-11-10 01:00:00', None, nan, -6.2, 3.16, 4],
+             ['2005-11-10 03:00:00', '64640', 6.3, -6.3, 3.16, 4]],
+            columns=source_data.columns)
+        ], ignore_index=True)
+    source_data['datetime'] = pd.to_datetime(
+        source_data['datetime'], format="%Y-%m-%d %H:%M:%S")
+    source_data = source_data.sample(frac=1, random_state=0)
+    source_data_copy = source_data.copy()
+
+    expected_data = pd.DataFrame(
+        data=[
+            ['1970-05-01', '64640', 105 - 0.1, nan, nan, 0],
+            ['2005-11-01', '64640', 104.5 - 1.1, -1.1, 3.16, 1],
+            ['2005-11-03', '64640', 104.5 - 4.1, -4.2, 7.16, 3],
+            ['2005-11-04', '64640', 104.5 - 5.1, -5.1, 3.16, 4],
+            ['2005-11-10', '64640', 104.5 - 6.1, -6.3, 3.16, 4]],
+        columns=[
+            'datetime', 'sonde_id', DataType.WaterLevel, DataType.WaterTemp,
+            'install_depth', 'obs_id'])
+    expected_data['datetime'] = pd.to_datetime(
+        expected_data['datetime'], format="%Y-%m-%d")
+    # The observation IDs are converted to float because of the missing
+    # days in the readings of the fourth observation.
+    expected_data['obs_id'] = expected_data['obs_id'].astype(float)
+
+    formatted_data = format_reading_data(source_data, repere_data)
+    assert formatted_data.equals(expected_data)
+    assert source_data.equals(source_data_copy)
+
+    # The nullable integer dtype of the observation IDs returned by the
+    # database accessors must be kept, even with missing days.
+    source_data['obs_id'] = source_data['obs_id'].astype('Int64')
+    expected_data['obs_id'] = expected_data['obs_id'].astype('Int64')
+
+    formatted_data = format_reading_data(source_data, repere_data)
+    assert formatted_data.equals(expected_data)
+
+
 def test_intervals_extract():
     """Test that the function intervals_extract is working as expected."""
     sequence = [2, 3, 4, 5, 7, 8, 9, 11, 15, 16]
@@ -96,5 +145,46 @@ def test_intervals_extract():
     assert list(intervals_extract(sequence)) == expected_result
 
 
+def test_format_water_quality_data():
+    """
+    Test that the function format_water_quality_data is working as expected.
+    """
+    hg_surveys = pd.DataFrame(
+        [[datetime(2011, 8, 2)], [datetime(2012, 9, 3)],
+         [datetime(2013, 10, 4)]],
+        index=[1, 2, 3],
+        columns=['hg_survey_datetime'])
+    hg_param_values = pd.DataFrame(
+        [[1, 1, 0.1, 1],
+         [2, 1, 0.2, 1],
+         [2, 2, 7.1, 2],
+         [4, 2, 9.9, 2]],
+        columns=['hg_survey_id', 'hg_param_id', 'hg_param_value',
+                 'meas_units_id'])
+    hg_param_names = {1: 'Fe', 2: 'pH'}
+    meas_units_abb = {1: 'mg/L', 2: ''}
+
+    water_quality_data = format_water_quality_data(
+        hg_surveys, hg_param_values, hg_param_names, meas_units_abb)
+
+    # Note that the third survey has no parameter value and that the
+    # value of the fourth survey is not for this station.
+    assert water_quality_data.index.tolist() == ['Fe', 'pH']
+    assert water_quality_data.columns.tolist() == [
+        (datetime(2011, 8, 2), 'hg_param_value'),
+        (datetime(2011, 8, 2), 'meas_units_id'),
+        (datetime(2012, 9, 3), 'hg_param_value'),
+        (datetime(2012, 9, 3), 'meas_units_id')]
+    assert water_quality_data.iloc[0, 0] == 0.1
+    assert pd.isnull(water_quality_data.iloc[1, 0])
+    assert water_quality_data.iloc[:, 2].tolist() == [0.2, 7.1]
+    assert water_quality_data.iloc[:, 3].tolist() == ['mg/L', '']
+
+    # Assert that an empty dataframe is returned when there is no survey.
+    assert format_water_quality_data(
+        hg_surveys.iloc[:0], hg_param_values,
+        hg_param_names, meas_units_abb).empty
+
+
 if __name__ == "__main__":
     pytest.main(['-x', __file__, '-v', '-rw', '-s'])
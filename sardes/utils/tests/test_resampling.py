@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © SARDES Project Contributors
+# https://github.com/cgq-qgc/sardes
+#
+# This file is part of SARDES.
+# Licensed under the terms of the GNU General Public License.
+# -----------------------------------------------------------------------------
+
+"""
+Tests for the resampling functions.
+"""
+
+# ---- Third party imports
+import numpy as np
+from numpy import nan
+import pandas as pd
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+# ---- Local imports
+from sardes.utils.resampling import (
+    AGGREGATIONS, PYRAMID_FACTOR, MinMaxPyramid, ReadingsBuckets,
+    decimate_minmax, get_period_starts, resample_readings)
+
+
+# =============================================================================
+# ---- Fixtures
+# =============================================================================
+@pytest.fixture
+def readings_data():
+    readings_data = pd.DataFrame(
+        [['2005-11-01 13:00:00', 'sonde_1', 1.2, 3.16, 1],
+         ['2005-11-01 01:00:00', 'sonde_1', 1.1, 3.16, 1],
+         ['2005-11-02 01:00:00', 'sonde_1', nan, 3.16, 1],
+         ['2005-11-02 13:00:00', 'sonde_1', 2.2, 3.16, 1],
+         ['2005-11-02 00:30:00', 'sonde_2', 3.1, 9.25, 2],
+         ['2005-11-02 12:30:00', 'sonde_2', 3.2, 9.25, 2],
+         ['2005-11-04 01:00:00', 'sonde_2', 4.1, 9.25, 2],
+         ['2005-12-01 01:00:00', 'sonde_2', 5.1, 9.25, 2]],
+        columns=['datetime', 'sonde_id', 'wlevel', 'install_depth',
+                 'obs_id']
+        )
+    readings_data['datetime'] = pd.to_datetime(
+        readings_data['datetime'], format="%Y-%m-%d %H:%M:%S")
+    return readings_data
+
+
+# =============================================================================
+# ---- Tests
+# =============================================================================
+def test_get_period_starts():
+    """
+    Test that getting the start of the periods of a given frequency is
+    working as expected.
+    """
+    datetimes = pd.to_datetime(
+        ['1969-12-31 23:10:00', '2005-11-01 13:20:00']).values
+    assert_array_equal(
+        get_period_starts(datetimes, 'H'),
+        pd.to_datetime(['1969-12-31 23:00:00', '2005-11-01 13:00:00']))
+    assert_array_equal(
+        get_period_starts(datetimes, 'D'),
+        pd.to_datetime(['1969-12-31', '2005-11-01']))
+    assert_array_equal(
+        get_period_starts(datetimes, 'M'),
+        pd.to_datetime(['1969-12-01', '2005-11-01']))
+
+    with pytest.raises(ValueError):
+        get_period_starts(datetimes, 'W')
+
+
+@pytest.mark.parametrize('freq', ['H', 'D', 'M'])
+def test_readings_buckets_aggregations(freq):
+    """
+    Test that the aggregations of the readings buckets give the same
+    results as resampling with pandas.
+    """
+    random = np.random.RandomState(0)
+    datetimes = pd.Timestamp('2000-01-01') + pd.to_timedelta(
+        random.randint(0, 10**8, 5000), unit='s')
+    values = np.where(random.rand(5000) < 0.2, nan, random.rand(5000))
+    resampler = pd.Series(values, index=datetimes).sort_index().resample(
+        'MS' if freq == 'M' else freq)
+    isnotnull = (resampler.count() > 0).values
+
+    buckets = ReadingsBuckets(datetimes.values, freq)
+    counts = buckets.count(values)
+    for how in AGGREGATIONS:
+        if how == 'completeness':
+            continue
+        if how == 'sum':
+            expected = resampler.sum(min_count=1)[isnotnull]
+        else:
+            expected = getattr(resampler, how)()[isnotnull]
+        assert_array_equal(buckets.periods[counts > 0], expected.index)
+        assert_array_almost_equal(
+            buckets.aggregate(values, how)[counts > 0], expected.values)
+
+    with pytest.raises(ValueError):
+        buckets.aggregate(values, 'median')
+
+
+def test_readings_buckets_completeness():
+    """
+    Test that computing the completeness of the readings in each bucket
+    is working as expected.
+    """
+    datetimes = pd.date_range('2005-11-01', '2005-11-03 23:00', freq='H')
+    datetimes = datetimes[(datetimes.day != 2) | (datetimes.hour < 6)]
+    values = np.ones(len(datetimes))
+    values[-12:] = nan
+
+    buckets = ReadingsBuckets(datetimes.values, 'D')
+    assert buckets.get_median_step() == 3600 * 10**9
+    assert_array_equal(buckets.completeness(values), [1, 6 / 24, 12 / 24])
+    assert_array_equal(
+        buckets.completeness(values, step='2H'), [1, 6 / 12, 12 / 12])
+    assert not buckets.has_missing_periods()
+
+    buckets = ReadingsBuckets(datetimes.values, 'H')
+    assert buckets.has_missing_periods()
+
+
+def test_resample_readings(readings_data):
+    """
+    Test that resampling readings data is working as expected.
+    """
+    # Resample the readings of all groups together.
+    resampled_data = resample_readings(
+        readings_data, 'D', how={'wlevel': 'mean', 'sonde_id': 'count'})
+    assert list(resampled_data.columns) == ['datetime', 'wlevel', 'sonde_id']
+    assert_array_equal(
+        resampled_data['datetime'],
+        pd.to_datetime(['2005-11-01', '2005-11-02', '2005-11-04',
+                        '2005-12-01']))
+    assert_array_almost_equal(
+        resampled_data['wlevel'], [1.15, (2.2 + 3.1 + 3.2) / 3, 4.1, 5.1])
+    assert resampled_data['sonde_id'].tolist() == [2, 4, 1, 1]
+
+    # Resample the readings of each group separately.
+    resampled_data = resample_readings(
+        readings_data, 'M', how='max', by='obs_id')
+    assert resampled_data['obs_id'].tolist() == [1, 2, 2]
+    assert_array_equal(
+        resampled_data['datetime'],
+        pd.to_datetime(['2005-11-01', '2005-11-01', '2005-12-01']))
+    assert resampled_data['wlevel'].tolist() == [2.2, 4.1, 5.1]
+
+
+def test_resample_readings_with_priority(readings_data):
+    """
+    Test that resampling readings data with priority rules between the
+    groups of readings is working as expected.
+    """
+    # Keep the first reading after midnight of the sonde installed closest
+    # to the surface.
+    resampled_data = resample_readings(
+        readings_data, 'D', by='sonde_id', priority='install_depth',
+        dropna=['wlevel'])
+    assert_array_equal(
+        resampled_data['datetime'],
+        pd.to_datetime(['2005-11-01', '2005-11-02', '2005-11-04',
+                        '2005-12-01']))
+    assert resampled_data['sonde_id'].tolist() == [
+        'sonde_1', 'sonde_1', 'sonde_2', 'sonde_2']
+    assert resampled_data['wlevel'].tolist() == [1.1, 2.2, 4.1, 5.1]
+
+    # Give the priority to the readings of the second sonde.
+    resampled_data = resample_readings(
+        readings_data, 'D', by='sonde_id', priority={'sonde_2': 0},
+        dropna=['wlevel'])
+    assert resampled_data['sonde_id'].tolist() == [
+        'sonde_1', 'sonde_2', 'sonde_2', 'sonde_2']
+    assert resampled_data['wlevel'].tolist() == [1.1, 3.1, 4.1, 5.1]
+
+
+def test_decimate_minmax():
+    """
+    Test that decimating a series of values by keeping the minimum and
+    maximum value of each bucket is working as expected.
+    """
+    x = np.arange(11)
+    y = np.array([3, 1, 2, 5, nan, nan, nan, nan, 4, nan, 9], dtype=float)
+    xdec, ydec = decimate_minmax(x, y, 4)
+    assert_array_equal(xdec, [1, 3, 4, 4, 8, 10])
+    assert_array_equal(ydec, [1, 5, nan, nan, 4, 9])
+
+
+def test_minmax_pyramid():
+    """
+    Test that getting the data of a series at different levels of detail
+    from its min/max pyramid is working as expected.
+    """
+    random = np.random.RandomState(0)
+    x = pd.date_range('2000-01-01', periods=100000, freq='15min').values
+    y = random.rand(100000)
+    y[50000:60000] = nan
+
+    pyramid = MinMaxPyramid(x, y, min_size=1000)
+    assert len(pyramid) == 100000
+    assert [len(level[1]) for level in pyramid.levels] == [
+        100000, 25000, 6250, 1564, 392]
+    for xlevel, ylevel in pyramid.levels:
+        # The envelope and the gap of the values are preserved at every
+        # level of the pyramid.
+        assert np.nanmin(ylevel) == np.nanmin(y)
+        assert np.nanmax(ylevel) == np.nanmax(y)
+        ingap = (xlevel > x[50010]) & (xlevel < x[59990])
+        assert np.isnan(ylevel[ingap]).all()
+        assert (np.diff(xlevel) >= np.timedelta64(0)).all()
+
+    # The whole series is decimated to the finest level with at most
+    # max_size points.
+    xdata, ydata = pyramid.get_data(max_size=10000)
+    assert len(ydata) == 6250
+
+    # The data of a short period are returned at full resolution,
+    # including the points before and after the period.
+    xdata, ydata = pyramid.get_data(x[1000] + 1, x[2000] - 1, max_size=10000)
+    assert_array_equal(xdata, x[1000:2001])
+    assert_array_equal(ydata, y[1000:2001])
+
+    # The coarsest level is returned when no level is coarse enough.
+    xdata, ydata = pyramid.get_data(max_size=10)
+    assert len(ydata) == 392
+    assert len(ydata) * PYRAMID_FACTOR >= 1000
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', __file__, '-v', '-rw'])
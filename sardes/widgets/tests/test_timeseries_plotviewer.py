@@ -12,15 +12,21 @@ Tests for the TimeSeriesPlotViewer.
 """
 
 # ---- Standard imports
+import datetime
 import os.path as osp
 
 # ---- Third party imports
+from matplotlib.dates import date2num
+import numpy as np
+import pandas as pd
 import pytest
 from qtpy.QtCore import Qt
 from qtpy.QtWidgets import QApplication, QMessageBox
 
 # ---- Local imports
-from sardes.widgets.timeseries import TimeSeriesPlotViewer
+from sardes.widgets.timeseries import (
+    TimeSeries, TimeSeriesGroup, TimeSeriesPlotViewer, LOD_MIN_SIZE,
+    LOD_POINTS_PER_PIXEL)
 from sardes.api.timeseries import DataType
 from sardes.database.database_manager import DatabaseConnectionManager
 from sardes.database.accessors import DatabaseAccessorSardesLite
@@ -72,6 +78,80 @@ def tseriesviewer(qtbot, dbconnmanager, obs_well_uuid):
 # =============================================================================
 # ---- Tests for the TimeSeriesPlotViewer
 # =============================================================================
+def test_tseries_select_and_undo():
+    """
+    Test that selecting, deleting and restoring the data of a timeseries
+    is working as expected.
+    """
+    index = pd.date_range('2000-01-01', periods=10, freq='D')
+    tseries = TimeSeries(
+        pd.Series(np.arange(10, dtype=float), index=index), tseries_id=1)
+
+    # Select data in a period and in a range of values.
+    selected = tseries.select_data(
+        xrange=(datetime.datetime(2000, 1, 2), datetime.datetime(2000, 1, 4)))
+    assert list(selected) == list(index[1:4])
+    selected = tseries.select_data(yrange=(3, 5))
+    assert list(selected) == list(index[3:6])
+    selected = tseries.select_data(
+        xrange=(datetime.datetime(2000, 1, 8, 12),
+                datetime.datetime(2001, 1, 1)),
+        yrange=(0, 8))
+    assert list(selected) == list(index[8:9])
+
+    # Data that were selected more than once are returned only once.
+    assert tseries.get_selected_data().tolist() == [1, 2, 3, 4, 5, 8]
+
+    # Select data in a timeseries whose indexes are not sorted.
+    unsorted = TimeSeries(
+        pd.Series(np.arange(10, dtype=float), index=index[::-1]),
+        tseries_id=2)
+    unsorted.select_data(
+        xrange=(datetime.datetime(2000, 1, 2), datetime.datetime(2000, 1, 4)))
+    assert unsorted.get_selected_data().tolist() == [6, 7, 8]
+
+    # Delete the selected data and undo the changes.
+    tseries.delete_waterlevels_at(tseries._selected_data_mask)
+    tseries.delete_waterlevels_at([0])
+    assert tseries.data.isnull().sum() == 7
+    positions, values = tseries._undo_stack[0]
+    assert positions.dtype == np.int32
+    assert values.tolist() == [1, 2, 3, 4, 5, 8]
+
+    tseries.undo()
+    assert tseries.data.isnull().sum() == 6
+    tseries.clear_all_changes()
+    assert tseries.data.tolist() == list(range(10))
+    assert not tseries.has_uncommited_changes
+
+    tseries.clear_selected_data()
+    assert len(tseries.get_selected_data()) == 0
+
+
+def test_tseries_group_merged_timeseries():
+    """
+    Test that merging the timeseries of a timeseries group is working as
+    expected.
+    """
+    tseries_group = TimeSeriesGroup(DataType.WaterLevel)
+    assert tseries_group.get_merged_timeseries().empty
+    for obs_id, sonde_id in [(1, 'sonde_1'), (2, 'sonde_2')]:
+        tseries_group.add_timeseries(TimeSeries(
+            pd.Series([obs_id, obs_id + 0.5], index=pd.date_range(
+                '2000-01-0{}'.format(obs_id), periods=2, freq='D')),
+            tseries_id=obs_id, sonde_id=sonde_id))
+
+    merged_tseries = tseries_group.get_merged_timeseries()
+    assert list(merged_tseries.columns) == [
+        DataType.WaterLevel, 'obs_id', 'sonde_id', 'datetime']
+    assert merged_tseries[DataType.WaterLevel].tolist() == [1, 1.5, 2, 2.5]
+    assert merged_tseries['obs_id'].tolist() == [1, 1, 2, 2]
+    assert merged_tseries['sonde_id'].tolist() == [
+        'sonde_1', 'sonde_1', 'sonde_2', 'sonde_2']
+    assert merged_tseries['datetime'].tolist() == list(pd.to_datetime(
+        ['2000-01-01', '2000-01-02', '2000-01-02', '2000-01-03']))
+
+
 def test_tseriesviewer_init(tseriesviewer):
     """Test that the timeseries plot viewer is initialized correctly."""
     assert tseriesviewer
@@ -215,6 +295,82 @@ def test_linewidth_markersize_option(tseriesviewer):
         assert artist.get_markersize() == 2
 
 
+def test_tseriesviewer_level_of_detail(qtbot):
+    """
+    Test that the timeseries with many readings are decimated to the
+    resolution of the axe and shown at full resolution when zooming in.
+    """
+    viewer = TimeSeriesPlotViewer()
+    qtbot.addWidget(viewer)
+    viewer.show()
+
+    nreadings = 200000
+    tseries_data = pd.DataFrame({
+        'datetime': pd.date_range(
+            '2000-01-01', periods=nreadings, freq='15min'),
+        DataType.WaterLevel: np.random.rand(nreadings),
+        'obs_id': 1,
+        'sonde_id': '1234567',
+        'install_depth': 10})
+    tseries_data.loc[1000, DataType.WaterLevel] = 5
+    viewer.set_data(tseries_data)
+    viewer.canvas.draw()
+
+    axe = viewer.current_axe()
+    artist = axe._mpl_artist_handles['data'][1]
+    assert len(artist.get_ydata()) <= max(
+        LOD_MIN_SIZE, LOD_POINTS_PER_PIXEL * axe.bbox.width)
+    assert np.nanmax(artist.get_ydata()) == 5
+
+    # Zoom in on a period of one day.
+    axe.set_xlim(date2num(datetime.datetime(2000, 2, 1)),
+                 date2num(datetime.datetime(2000, 2, 2)))
+    viewer.canvas.draw()
+    assert len(artist.get_ydata()) == 24 * 4 + 3
+    assert (artist.get_ydata() ==
+            tseries_data[DataType.WaterLevel].values[2975:3074]).all()
+
+    # Assert that the data are selected in the full resolution data.
+    tseries = list(axe.tseries_group)[0]
+    tseries.select_data(xrange=(datetime.datetime(2000, 1, 1),
+                                datetime.datetime(2000, 1, 31)))
+    assert len(tseries.get_selected_data()) == 30 * 24 * 4 + 1
+
+
+def test_tseriesviewer_coalesced_draws_and_blits(tseriesviewer, qtbot,
+                                                 mocker):
+    """
+    Test that the draws requested by a burst of zoom events are coalesced
+    into a single full draw of the canvas and that the selected data are
+    blitted without drawing the canvas fully.
+    """
+    canvas = tseriesviewer.canvas
+    canvas.draw()
+    draw_events = []
+    canvas.mpl_connect('draw_event', draw_events.append)
+
+    # Zoom in several times in a row.
+    for i in range(5):
+        canvas.zoom_in()
+    assert len(draw_events) == 0
+    qtbot.waitUntil(lambda: len(draw_events) == 1)
+    qtbot.wait(100)
+    assert len(draw_events) == 1
+
+    # Select data with an horizontal span.
+    blit = mocker.spy(canvas, 'blit')
+    axe = tseriesviewer.current_axe()
+    tseries = list(axe.tseries_group)[0]
+    xmin, xmax = date2num(tseries.data.index[[1, 3]].to_pydatetime())
+    axe._handle_hspan_select_data(xmin, xmax)
+    qtbot.waitUntil(lambda: blit.call_count == 1)
+    assert len(draw_events) == 1
+
+    handle = axe._mpl_artist_handles['selected_data'][tseries.id]
+    assert handle.get_animated()
+    assert (handle.get_ydata() == tseries.data.values[1:4]).all()
+
+
 def test_save_tseries_plot(tseriesviewer, mocker, tmp_path, qtbot):
     """
     Test that saving plots to different file formats is working as
@@ -35,6 +35,7 @@ from pandas.plotting import register_matplotlib_converters
 from sardes.api.timeseries import DataType
 from sardes.config.locale import _
 from sardes.config.gui import get_iconsize
+from sardes.utils.resampling import MinMaxPyramid
 from sardes.utils.qthelpers import (
     center_widget_to_another, create_mainwindow_toolbar, create_toolbutton,
     format_tooltip, create_toolbar_stretcher)
@@ -46,6 +47,11 @@ from sardes.widgets.spinboxes import IconSpinBox
 register_matplotlib_converters()
 MSEC_MIN_OVERLAY_MSG_DISPLAY = 2000
 
+# The minimum interval between two full draws of the canvas that are
+# scheduled in response to a burst of scroll or zoom events, which
+# corresponds to about one draw per frame at 60 Hz.
+MSEC_MIN_REDRAW_INTERVAL = 16
+
 rcParams = mpl.rcParams
 YTICKS_LENGTH = rcParams["ytick.major.size"]
 YTICKS_PAD = rcParams['ytick.major.pad']
@@ -53,6 +59,14 @@ AXIS_LABEL_FS = 12
 YAXIS_LABEL_PAD = 10
 FIG_PAD = 20
 
+# The number of points of a timeseries that are drawn at full resolution
+# and the number of points per pixel of the axes width above which the
+# timeseries are decimated with their min/max pyramid.
+LOD_MIN_SIZE = 10000
+LOD_POINTS_PER_PIXEL = 4
+LOD_DATE_RANGE = date2num(
+    [datetime.datetime(1700, 1, 1), datetime.datetime(2200, 1, 1)])
+
 
 # ---- Data containers
 class TimeSeriesGroup(Mapping):
@@ -116,32 +130,19 @@ class TimeSeriesGroup(Mapping):
         Return a pandas dataframe containing the data from all the timeseries
         that were added to this group.
         """
-        if len(self.timeseries) >= 1:
-            merged_tseries = self.timeseries[0]._data.to_frame()
-            merged_tseries.columns = [self.data_type]
-            # Add series ID to the dataframe.
-            merged_tseries['obs_id'] = self.timeseries[0].id
-            # Add sonde ID to the dataframe.
-            merged_tseries['sonde_id'] = self.timeseries[0].sonde_id
-            # Add datetime to the dataframe.
-            merged_tseries['datetime'] = merged_tseries.index
-            # Reset index, but preserve the datetime data.
-            merged_tseries.reset_index(drop=True, inplace=True)
-
-            # Append or merge the remaining timeseries with the first one.
-            for tseries in self.timeseries[1:]:
-                tseries_to_append = tseries._data.to_frame()
-                tseries_to_append.columns = [self.data_type]
-                tseries_to_append['obs_id'] = tseries.id
-                tseries_to_append['sonde_id'] = tseries.sonde_id
-                tseries_to_append['datetime'] = tseries_to_append.index
-                tseries_to_append.reset_index(drop=True, inplace=True)
-                merged_tseries = merged_tseries.append(
-                    tseries_to_append, ignore_index=True,
-                    verify_integrity=True, sort=True)
-        elif len(self.timeseries) == 0:
-            merged_tseries = pd.DataFrame([])
-        return merged_tseries
+        if len(self.timeseries) == 0:
+            return pd.DataFrame([])
+
+        # The data of all the timeseries are merged in a single call to
+        # concat to avoid copying the merged data for each timeseries.
+        return pd.concat([
+            pd.DataFrame({
+                self.data_type: tseries._data.values,
+                'obs_id': tseries.id,
+                'sonde_id': tseries.sonde_id,
+                'datetime': tseries._data.index})
+            for tseries in self.timeseries
+            ], ignore_index=True)
 
     # ---- Data selection
     def clear_selected_data(self):
@@ -185,15 +186,22 @@ class TimeSeries(Mapping):
                  tseries_units=None, tseries_color=None,
                  sonde_id=None):
         super().__init__()
+        # The data may be a view of data that are shared with other
+        # consumers, so they are copied before they are changed for the
+        # first time.
         self._data = data
+        self._data_is_shared = True
         self.name = tseries_name
         self.id = tseries_id
         self.units = tseries_units
         self.color = tseries_color
         self.sonde_id = sonde_id
 
+        # The undo stack holds a tuple with the positions and the old
+        # values of the data for each change made to the data.
         self._undo_stack = []
-        self._selected_data_indexes = pd.DatetimeIndex([])
+        self._selected_data_mask = np.zeros(len(data), dtype=bool)
+        self._lod_pyramid = None
 
     def __len__(self, key):
         return len(self._data)
@@ -223,6 +231,36 @@ class TimeSeries(Mapping):
     def strftime(self):
         return self._data.index.strftime("%Y-%m-%dT%H:%M:%S").values.tolist()
 
+    # ---- Level of detail
+    @property
+    def lod_pyramid(self):
+        """
+        Return the min/max pyramid of the data of this timeseries, which is
+        built the first time it is requested after the data changed.
+        """
+        if self._lod_pyramid is None:
+            data = self._data
+            if not data.index.is_monotonic_increasing:
+                data = data.sort_index(kind='mergesort')
+            self._lod_pyramid = MinMaxPyramid(
+                data.index.values, data.values,
+                min_size=LOD_MIN_SIZE // LOD_POINTS_PER_PIXEL)
+        return self._lod_pyramid
+
+    def get_lod_data(self, start=None, end=None, max_size=LOD_MIN_SIZE):
+        """
+        Return the datetimes and values of this timeseries to draw for the
+        period between start and end with at most about max_size points.
+
+        The data are returned at full resolution when there is less than
+        max_size readings in that period, else the data are decimated so
+        that the minimum and maximum values of the period are preserved.
+        """
+        return self.lod_pyramid.get_data(
+            None if start is None else np.datetime64(start, 'ns'),
+            None if end is None else np.datetime64(end, 'ns'),
+            max_size)
+
     # ---- Data Selection
     def select_data(self, xrange=None, yrange=None):
         """
@@ -232,9 +270,9 @@ class TimeSeries(Mapping):
         of the timeseries corresponding to the data in the specified
         period and range of values.
 
-        The resulting datetime indexes are also added to a list of
-        already selected indexes, whose corresponding data can be obtained
-        with the get_selected_data method.
+        The corresponding data are also added to the data that were
+        already selected, which can be obtained with the get_selected_data
+        method.
 
         Parameters
         ----------
@@ -250,36 +288,38 @@ class TimeSeries(Mapping):
             A pandas datetime index corresponding to the data in the
             specified period and range of values.
         """
+        if xrange is None and yrange is None:
+            return pd.DatetimeIndex([])
+
         if xrange is not None and self._data.index.tzinfo is None:
             # Make sure the datetime objects or the specified period
             # use the same timezone info as that of the timeseries.
             xrange = (xrange[0].replace(tzinfo=self._data.index.tzinfo),
                       xrange[1].replace(tzinfo=self._data.index.tzinfo))
 
-        if xrange and yrange:
-            indexes = (
-                self._data[(self._data.index >= xrange[0]) &
-                           (self._data.index <= xrange[1]) &
-                           (self._data >= yrange[0]) &
-                           (self._data <= yrange[1])
-                           ]).index
-        elif xrange:
-            indexes = (
-                self._data[(self._data.index >= xrange[0]) &
-                           (self._data.index <= xrange[1])
-                           ]).index
-        elif yrange:
-            indexes = (
-                self._data[(self._data >= yrange[0]) &
-                           (self._data <= yrange[1])
-                           ]).index
+        # Select the data in the specified period. When the datetime
+        # indexes are sorted, the period is found with a binary search,
+        # so that the data outside the period are never compared.
+        index = self._data.index
+        if xrange is None:
+            start, end = 0, len(index)
+            mask = np.ones(len(index), dtype=bool)
+        elif index.is_monotonic_increasing:
+            start = index.searchsorted(xrange[0], side='left')
+            end = index.searchsorted(xrange[1], side='right')
+            mask = np.ones(end - start, dtype=bool)
         else:
-            indexes = pd.DatetimeIndex([])
+            start, end = 0, len(index)
+            mask = (index >= xrange[0]) & (index <= xrange[1])
 
-        self._selected_data_indexes = (
-            self._selected_data_indexes.append(indexes))
+        # Select the data in the specified range of values.
+        if yrange is not None:
+            values = self._data.values[start:end]
+            mask &= (values >= yrange[0]) & (values <= yrange[1])
 
-        return indexes
+        self._selected_data_mask[start:end] |= mask
+
+        return index[start:end][mask]
 
     def get_selected_data(self):
         """
@@ -288,7 +328,7 @@ class TimeSeries(Mapping):
         Return a pandas Series containing the data of this timeseries that
         were previously selected by the user.
         """
-        return self._data.loc[self._selected_data_indexes]
+        return self._data[self._selected_data_mask]
 
     def clear_selected_data(self):
         """
@@ -297,7 +337,7 @@ class TimeSeries(Mapping):
         Clear the data of this timeseries that were previously selected
         by the user.
         """
-        self._selected_data_indexes = pd.DatetimeIndex([])
+        self._selected_data_mask[:] = False
 
     # ---- Versionning
     @property
@@ -314,8 +354,10 @@ class TimeSeries(Mapping):
     def undo(self):
         """Undo the last changes made to the water level data."""
         if self.has_uncommited_changes:
-            changes = self._undo_stack.pop(-1)
-            self._data[changes.index] = changes
+            positions, values = self._undo_stack.pop(-1)
+            self._copy_data_on_write()
+            self._data.iloc[positions] = values
+            self._lod_pyramid = None
 
     def clear_all_changes(self):
         """
@@ -326,19 +368,44 @@ class TimeSeries(Mapping):
             self.undo()
 
     def delete_waterlevels_at(self, indexes):
-        """Delete the water level data at the specified indexes."""
+        """
+        Delete the water level data at the specified indexes, which are
+        either integer positions or a boolean mask, like the one of the
+        selected data.
+        """
+        indexes = np.asarray(indexes)
+        if indexes.dtype == bool:
+            indexes = np.flatnonzero(indexes)
         if len(indexes):
             self._add_to_undo_stack(indexes)
+            self._copy_data_on_write()
             self._data.iloc[indexes] = np.nan
+            self._lod_pyramid = None
+
+    def _copy_data_on_write(self):
+        """
+        Copy the data of this timeseries before they are changed for the
+        first time, since they may be shared with other consumers.
+        """
+        if self._data_is_shared:
+            self._data = self._data.copy()
+            self._data_is_shared = False
 
     def _add_to_undo_stack(self, indexes):
         """
         Store the old water level values at the specified indexes in a stack
         before changing or deleting them. This allow to undo or cancel any
         changes made to the water level data before commiting them.
+
+        Only the integer positions and the old values of the data are
+        stored, with the positions stored as 32-bit integers when possible.
         """
         if len(indexes):
-            self._undo_stack.append(self._data.iloc[indexes, 0].copy())
+            positions = np.asarray(indexes)
+            if len(self._data) <= np.iinfo(np.int32).max:
+                positions = positions.astype(np.int32)
+            self._undo_stack.append(
+                (positions, self._data.values[positions]))
 
 
 # ---- Plotting devices
@@ -400,6 +467,7 @@ class TimeSeriesAxes(BaseAxes):
             'data': {},
             'selected_data': {},
             'manual_measurements': None}
+        self._lod_view = None
 
         # Set and plot the timeseries for this axe.
         self.set_timeseries_group(tseries_group)
@@ -529,13 +597,22 @@ class TimeSeriesAxes(BaseAxes):
     def _add_timeseries(self, tseries):
         """
         Plot the data of the timeseries and init selected data artist.
+
+        Only the points of the coarsest useful level of detail of the
+        timeseries are plotted here. The drawn points are then updated
+        to the resolution of the view when the axe is drawn.
+
+        The selected data artist is animated, so that it is not drawn
+        with the rest of the figure, but blitted by the canvas on top of
+        the last full draw of the figure instead.
         """
         self._mpl_artist_handles['data'][tseries.id], = (
-            self.plot(tseries.data, '.-', color=tseries.color, clip_on=True,
-                      ms=self._markersize, lw=self._linewidth))
+            self.plot(*tseries.get_lod_data(), '.-', color=tseries.color,
+                      clip_on=True, ms=self._markersize, lw=self._linewidth))
+        self._lod_view = None
         self._mpl_artist_handles['selected_data'][tseries.id], = (
             self.plot(tseries.get_selected_data(), '.', color='orange',
-                      clip_on=True))
+                      clip_on=True, animated=True))
 
     def clear_selected_data(self):
         """
@@ -545,6 +622,42 @@ class TimeSeriesAxes(BaseAxes):
         self._draw_selected_data()
 
     # ---- Drawing methods
+    def draw(self, renderer, *args, **kwargs):
+        """
+        Extend matplotlib method to update the level of detail of the
+        timeseries data before drawing this axe.
+        """
+        self._update_lod_data()
+        super().draw(renderer, *args, **kwargs)
+
+    def _update_lod_data(self):
+        """
+        Update the points that are drawn for the timeseries of this axe,
+        so that the data are decimated to about LOD_POINTS_PER_PIXEL points
+        per pixel of the width of the axe in the current period of the
+        xaxis and shown at full resolution when zoomed in.
+
+        The points are only updated when the xaxis limits or the width of
+        the axe changed since the last time this axe was drawn.
+        """
+        xmin, xmax = self.get_xlim()
+        width = int(self.bbox.width)
+        lod_view = (xmin, xmax, width, [
+            tseries.lod_pyramid for tseries in self.tseries_group])
+        if lod_view == self._lod_view:
+            return
+        self._lod_view = lod_view
+
+        # The limits are clipped to the range of dates that can be
+        # represented by the numpy datetimes of the timeseries.
+        start, end = (
+            num2date(np.clip(x, *LOD_DATE_RANGE)).replace(tzinfo=None)
+            for x in (xmin, xmax))
+        max_size = max(LOD_MIN_SIZE, LOD_POINTS_PER_PIXEL * width)
+        for tseries in self.tseries_group:
+            self._mpl_artist_handles['data'][tseries.id].set_data(
+                *tseries.get_lod_data(start, end, max_size))
+
     def set_linewidth(self, linewidth):
         """Set the line width for the plots of this axe."""
         self._linewidth = linewidth
@@ -567,6 +680,10 @@ class TimeSeriesAxes(BaseAxes):
         """
         If this axe is current, draw the selected data of the timeseries
         associated with this axe.
+
+        The selected data are blitted over the last full draw of the
+        canvas, so that the whole figure is not redrawn each time the
+        selection changes.
         """
         for tseries in self.tseries_group:
             handle = self._mpl_artist_handles['selected_data'][tseries.id]
@@ -577,7 +694,7 @@ class TimeSeriesAxes(BaseAxes):
                 handle.set_data(selected_data.index.values,
                                 selected_data.values)
         if draw:
-            self.figure.canvas.draw()
+            self.figure.canvas.blit_selected_data()
 
     # ----Data selection handlers
     def _handle_drag_select_data(self, eclick, erelease):
@@ -793,6 +910,25 @@ class TimeSeriesCanvas(FigureCanvasQTAgg):
         # in which the data plotted in this canvas were acquired.
         self._obs_well_data = None
 
+        # The background of the figure on top of which the selected data
+        # are blitted. Note that the 'draw_event' must be connected before
+        # that of the data selectors of the axes, so that the background
+        # of the selectors includes the selected data.
+        self._blit_background = None
+        self.mpl_connect('draw_event', self._on_draw_event)
+
+        # Setup timers to coalesce the full draws of the canvas and the
+        # blits of the selected data that are requested in bursts.
+        self._draw_timer = QTimer(self)
+        self._draw_timer.setSingleShot(True)
+        self._draw_timer.setInterval(MSEC_MIN_REDRAW_INTERVAL)
+        self._draw_timer.timeout.connect(self.draw)
+
+        self._blit_timer = QTimer(self)
+        self._blit_timer.setSingleShot(True)
+        self._blit_timer.setInterval(0)
+        self._blit_timer.timeout.connect(self._blit_selected_data)
+
         figure.setup_base_axes()
 
         # Setup a matplotlib navigation toolbar, but hide it.
@@ -874,7 +1010,7 @@ class TimeSeriesCanvas(FigureCanvasQTAgg):
                      xdata + right_xrange * scale_factor])
         ax.set_ylim([ydata - bottom_yrange * scale_factor,
                      ydata + top_yrange * scale_factor])
-        self.draw()
+        self.schedule_draw()
 
     def home(self):
         """Reset the orgininal view of this canvas' figure."""
@@ -914,7 +1050,85 @@ class TimeSeriesCanvas(FigureCanvasQTAgg):
         for axe in self.figure.tseries_axes_list:
             axe.vspan_selector.set_active(toggle)
 
+    # ---- Drawing and blitting
+    def schedule_draw(self):
+        """
+        Schedule a full draw of the canvas.
+
+        The draws that are scheduled while a draw is already pending are
+        coalesced, so that the canvas is drawn at most once every
+        MSEC_MIN_REDRAW_INTERVAL milliseconds during a burst of scroll
+        or zoom events.
+        """
+        if not self._draw_timer.isActive():
+            self._draw_timer.start()
+
+    def blit_selected_data(self):
+        """
+        Schedule a blit of the selected data of the axes over the last
+        full draw of the canvas.
+
+        The blit is deferred to the next iteration of the event loop,
+        because the data selectors restore their own background right
+        after calling their selection handler.
+        """
+        self._blit_timer.start()
+
+    def _get_selected_data_artists(self):
+        """
+        Return a list of the visible selected data artists of the axes
+        of this canvas' figure.
+        """
+        return [
+            handle for axe in self.figure.tseries_axes_list if
+            axe.get_visible() for handle in
+            axe._mpl_artist_handles['selected_data'].values() if
+            handle.get_visible()]
+
+    def _on_draw_event(self, event):
+        """
+        Handle when this canvas' figure has been drawn fully.
+
+        The background of the figure is saved and the selected data are
+        drawn on top of it.
+        """
+        if self.is_saving():
+            return
+        self._blit_background = self.copy_from_bbox(self.figure.bbox)
+        for artist in self._get_selected_data_artists():
+            artist.axes.draw_artist(artist)
+
+    def _blit_selected_data(self):
+        """
+        Restore the background of the figure, draw the selected data on
+        top of it and blit the result to the screen.
+        """
+        if self._blit_background is None or self._draw_timer.isActive():
+            # The selected data will be drawn with the next full draw.
+            self.draw_idle()
+            return
+        self.restore_region(self._blit_background)
+        for artist in self._get_selected_data_artists():
+            artist.axes.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+        # Update the background of the data selectors, so that the
+        # new selected data are not erased by the next selection.
+        for axe in self.figure.tseries_axes_list:
+            for selector in (axe._rect_selector, axe._hspan_selector,
+                             axe._vspan_selector):
+                if selector is not None:
+                    selector.update_background(None)
+
     # ---- FigureCanvasQTAgg API
+    def draw(self):
+        """
+        Extend matplotlib method to cancel the full draw of the canvas
+        that is scheduled, if any.
+        """
+        self._draw_timer.stop()
+        super().draw()
+
     def get_default_filename(self):
         """
         Return a string, which includes extension, suitable for use as
@@ -1215,29 +1429,47 @@ class TimeSeriesPlotViewer(QMainWindow):
 
     # ---- Public API
     def set_data(self, dataf, obs_well_data=None):
-        """Set the data that need to be displayed in this plot viewer."""
+        """
+        Set the data that need to be displayed in this plot viewer.
+
+        The data of each channel are views of the data of dataf when the
+        readings of the channel are contiguous in dataf, so that the data
+        are not copied. The timeseries copy their data before they are
+        changed.
+        """
         self.canvas._obs_well_data = obs_well_data
-        for data_type in DataType:
-            if data_type in dataf.columns:
-                tseries_group = TimeSeriesGroup(
-                    data_type,
-                    yaxis_inverted=(data_type == DataType.WaterLevel)
-                    )
-
-                # Split the data in channels.
-                for obs_id in dataf['obs_id'].unique():
-                    channel_data = dataf[dataf['obs_id'] == obs_id]
-                    sonde_id = channel_data['sonde_id'].unique()[0]
-                    tseries_group.add_timeseries(TimeSeries(
-                        pd.Series(channel_data[data_type].values,
-                                  index=channel_data['datetime'].values),
-                        tseries_id=obs_id,
-                        tseries_name=data_type.title,
-                        tseries_units='',
-                        tseries_color=data_type.color,
-                        sonde_id=sonde_id
-                        ))
-                self.create_axe(tseries_group)
+        data_types = [
+            data_type for data_type in DataType if
+            data_type in dataf.columns]
+
+        # Split the data in channels.
+        channels = []
+        if len(data_types):
+            obs_ids = dataf['obs_id'].values
+            for obs_id in pd.unique(obs_ids):
+                indexes = np.flatnonzero(obs_ids == obs_id)
+                if indexes[-1] - indexes[0] + 1 == len(indexes):
+                    indexes = slice(indexes[0], indexes[-1] + 1)
+                channels.append((obs_id, indexes))
+            datetimes = dataf['datetime'].values
+            sonde_ids = dataf['sonde_id'].values
+
+        for data_type in data_types:
+            tseries_group = TimeSeriesGroup(
+                data_type,
+                yaxis_inverted=(data_type == DataType.WaterLevel)
+                )
+            values = dataf[data_type].values
+            for obs_id, indexes in channels:
+                tseries_group.add_timeseries(TimeSeries(
+                    pd.Series(values[indexes], index=datetimes[indexes]),
+                    tseries_id=obs_id,
+                    tseries_name=data_type.title,
+                    tseries_units='',
+                    tseries_color=data_type.color,
+                    sonde_id=sonde_ids[indexes][0]
+                    ))
+            self.create_axe(tseries_group)
         self.axes_toolbar.setEnabled(self.current_axe_button.count())
 
         # We want the water level axe to be the active one by default.